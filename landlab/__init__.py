@@ -8,28 +8,20 @@
     Mouchene, Nathon Lyons
 :URL: https://landlab.readthedocs.io/en/release/
 :License: MIT
+
+Most of the names in the landlab namespace are loaded lazily, the first
+time they are accessed, so that importing landlab does not import grids,
+fields or plotting (and so matplotlib) until they are used.
 """
+import importlib
+import sys
 
 from numpy import set_printoptions
 
 from ._registry import registry
 from ._version import get_versions
 from .core.errors import MissingKeyError, ParameterValueError
-from .core.model_component import Component
 from .core.model_parameter_loader import load_params
-from .field.scalar_data_fields import FieldError
-from .grid import (
-    HexModelGrid,
-    ModelGrid,
-    NetworkModelGrid,
-    RadialModelGrid,
-    RasterModelGrid,
-    VoronoiDelaunayGrid,
-    create_grid,
-)
-from .grid.linkstatus import LinkStatus
-from .grid.nodestatus import NodeStatus
-from .plot import imshow_grid, imshow_grid_at_node
 
 try:
     set_printoptions(legacy="1.13")
@@ -40,11 +32,72 @@ finally:
 
 cite_as = registry.format_citations
 
+# Names that are imported from a submodule when first accessed.
+_LAZY_ATTRS = {
+    "Component": ".core.model_component",
+    "ComponentEnsemble": ".core.ensemble",
+    "FieldError": ".field.scalar_data_fields",
+    "ModelGrid": ".grid",
+    "HexModelGrid": ".grid",
+    "RadialModelGrid": ".grid",
+    "RasterModelGrid": ".grid",
+    "VoronoiDelaunayGrid": ".grid",
+    "NetworkModelGrid": ".grid",
+    "LinkStatus": ".grid.linkstatus",
+    "NodeStatus": ".grid.nodestatus",
+    "create_grid": ".grid",
+    "imshow_grid": ".plot",
+    "imshow_grid_at_node": ".plot",
+}
+
+# Subpackages that are imported when first accessed as attributes.
+_LAZY_SUBPACKAGES = (
+    "bmi",
+    "ca",
+    "components",
+    "core",
+    "data_record",
+    "field",
+    "graph",
+    "grid",
+    "io",
+    "layers",
+    "plot",
+    "utils",
+    "values",
+)
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBPACKAGES:
+        return importlib.import_module("." + name, __name__)
+    try:
+        module = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_LAZY_SUBPACKAGES))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module-level __getattr__ (PEP 562) is not available, import everything.
+    for _name in _LAZY_ATTRS:
+        __getattr__(_name)
+    del _name
+
 __all__ = [
     "registry",
     "MissingKeyError",
     "ParameterValueError",
     "Component",
+    "ComponentEnsemble",
     "FieldError",
     "load_params",
     "ModelGrid",
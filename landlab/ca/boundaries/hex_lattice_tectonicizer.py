@@ -590,29 +590,29 @@ class LatticeNormalFault(HexLatticeTectonicizer):
         >>> pdata = np.arange(25)
         >>> ohcts = OrientedHexCTS(mg, nsd, xnlist, nsg)
         >>> lnf = LatticeNormalFault(-0.1, grid=mg)
-        >>> pq = ohcts.priority_queue._queue
-        >>> (int(1000 * pq[11][0]), pq[11][1:])
-        (752, (11, 21))
-        >>> (int(1000 * pq[12][0]), pq[12][1:])
-        (483, (9, 18))
-        >>> (int(1000 * pq[30][0]), pq[30][1:])
-        (575, (6, 14))
+        >>> pq = ohcts.priority_queue
+        >>> event = dict((link, (time, count)) for (time, count, link) in pq._queue)
+        >>> (int(1000 * event[21][0]), event[21][1])
+        (752, 11)
+        >>> (int(1000 * event[18][0]), event[18][1])
+        (483, 9)
+        >>> (int(1000 * event[14][0]), event[14][1])
+        (575, 6)
         >>> lnf.do_offset(ca=ohcts)
-        >>> (int(1000 * pq[48][0]), pq[48][1:])
-        (752, (11, 41))
-        >>> (int(1000 * pq[54][0]), pq[54][1:])
-        (483, (9, 38))
-        >>> (int(1000 * pq[61][0]), pq[61][1:])
-        (575, (6, 35))
+        >>> event = dict((link, (time, count)) for (time, count, link) in pq._queue)
+        >>> (int(1000 * event[41][0]), event[41][1])
+        (752, 11)
+        >>> (int(1000 * event[38][0]), event[38][1])
+        (483, 9)
+        >>> (int(1000 * event[35][0]), event[35][1])
+        (575, 6)
         """
-        for i in range(len(ca.priority_queue._queue)):
-            link = ca.priority_queue._queue[i][2]
+        # Links are shifted to higher IDs, so move the events of the
+        # highest links first, before their own IDs are taken over.
+        num_links = self.grid.number_of_links
+        for link in range(num_links - 1, self.first_link_shifted_from - 1, -1):
             if self.link_offset_id[link] != link:
-                ca.priority_queue._queue[i] = (
-                    ca.priority_queue._queue[i][0],
-                    ca.priority_queue._queue[i][1],
-                    self.link_offset_id[link],
-                )
+                ca.priority_queue.move(link, self.link_offset_id[link])
 
     def shift_link_states(self, ca, current_time):
         """Shift link data up and right.
@@ -985,21 +985,14 @@ class LatticeUplifter(HexLatticeTectonicizer):
             ca.next_trn_id[lnk] = ca.next_trn_id[lnk - shift]
             ca.next_update[lnk] = ca.next_update[lnk - shift]
 
-        # Sweep through event queue, shifting links upward. Do NOT shift links
-        # with IDs greater than NL - [SHIFT + (NC - 1)], because these are so
-        # close to the top of the grid that either the events would refer to
-        # non-existent links (>= NL) or would involve shifting an event onto
-        # an upper-boundary link. Note that because the event data are stored
-        # in a tuple, we have to replace the entire tuple (can't simply change
-        # the one item, because tuples are immutable)
+        # Shift events in the queue upward, starting from the top. Do NOT
+        # shift links with IDs greater than NL - [SHIFT + (NC - 1)], because
+        # these are so close to the top of the grid that either the events
+        # would refer to non-existent links (>= NL) or would involve shifting
+        # an event onto an upper-boundary link.
         first_no_shift_id = self.grid.number_of_links - (shift + (nc - 1))
-        for i in range(len(ca.priority_queue._queue)):
-            if ca.priority_queue._queue[i][2] < first_no_shift_id:
-                ca.priority_queue._queue[i] = (
-                    ca.priority_queue._queue[i][0],
-                    ca.priority_queue._queue[i][1],
-                    (ca.priority_queue._queue[i][2] + shift),
-                )
+        for lnk in range(first_no_shift_id - 1, -1, -1):
+            ca.priority_queue.move(lnk, lnk + shift)
 
         # Update state of links along the boundaries.
         for lk in self.links_to_update:
@@ -119,11 +119,14 @@ Created GT Sep 2014, starting from link_cap.py.
 """
 
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pylab as plt
 
 import landlab
 from landlab.ca.cfuncs import (
+    BlockScheduler,
     PriorityQueue,
     get_next_event_new,
     push_transitions_to_event_queue,
@@ -439,6 +442,10 @@ class CellLabCTSModel(object):
         self.priority_queue = PriorityQueue()
         self.next_trn_id = -np.ones(self.grid.number_of_links, dtype=np.int)
 
+        # Event queues of the blocks, when running in blocks
+        self._block_scheduler = None
+        self._blocked_node_state = None
+
         # Assign link types from node types
         self.create_link_state_dict_and_pair_list()
 
@@ -703,6 +710,7 @@ class CellLabCTSModel(object):
             self.next_update[link] = event_time
             self.next_trn_id[link] = trn_id
         else:
+            self.priority_queue.remove(link)
             self.next_update[link] = _NEVER
             self.next_trn_id[link] = -1
 
@@ -753,7 +761,13 @@ class CellLabCTSModel(object):
 
     # @profile
     def run(
-        self, run_to, node_state_grid=None, plot_each_transition=False, plotter=None
+        self,
+        run_to,
+        node_state_grid=None,
+        plot_each_transition=False,
+        plotter=None,
+        n_blocks=1,
+        window=None,
     ):
         """Run the model forward for a specified period of time.
 
@@ -767,6 +781,37 @@ class CellLabCTSModel(object):
             Option to display the grid after each transition
         plotter : CAPlotter object (optional)
             Needed if caller wants to plot after every transition
+        n_blocks : int (optional)
+            Number of blocks, each run on its own thread, into which the
+            lattice is partitioned. Running in blocks is approximate (see
+            Notes)
+        window : float (optional)
+            Length of the time windows at the end of which the blocks are
+            synchronized. Required if *n_blocks* is greater than one.
+
+        Notes
+        -----
+        With *n_blocks* greater than one, the lattice is cut into strips,
+        along its longer axis, each with its own event queue and random
+        number generator. A link that touches a node connected to another
+        strip is a *frontier* link. Time is advanced in windows: the
+        events of each strip, except those at frontier links, are run
+        concurrently to the end of the window, then the events at frontier
+        links are run serially, in time order.
+
+        This is an approximation of the serial model, not a parallel
+        implementation of it. Within a window, the events at frontier links
+        run after the events of the strips, even those that are scheduled
+        later, and so interactions across the frontier may be delayed, or
+        seen out of order, by up to one window. Transition waiting times
+        have no lower bound, so no window is short enough to rule this out.
+        The statistics of the transitions converge to those of the serial
+        run as *window* is reduced, which should be short compared with
+        the mean waiting time of the fastest transition. The sequence of
+        events always differs from that of the serial run.
+
+        Transition callbacks (*prop_update_fn*) and plotting after each
+        transition are not supported when running in blocks.
 
         Examples
         --------
@@ -787,6 +832,16 @@ class CellLabCTSModel(object):
         if node_state_grid is not None:
             self.set_node_state_grid(node_state_grid)
 
+        if n_blocks > 1:
+            if plot_each_transition:
+                raise ValueError("unable to plot each transition when run in blocks")
+            if window is None or window <= 0.0:
+                raise ValueError("a positive window is required to run in blocks")
+            self._run_in_blocks(run_to, n_blocks, window)
+            return
+        elif self._block_scheduler is not None:
+            self._move_events_to_priority_queue()
+
         self.current_time = run_cts_new(
             run_to,
             self.current_time,
@@ -817,3 +872,114 @@ class CellLabCTSModel(object):
             plot_each_transition,
             plotter,
         )
+
+    def _partition_into_blocks(self, n_blocks):
+        """Find the block that owns each link.
+
+        Nodes are divided into *n_blocks* strips along the longer axis of
+        the grid. Links that touch a node connected to a node of another
+        strip are owned by the frontier, which is given the ID *n_blocks*.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.ca.celllab_cts import Transition
+        >>> from landlab.ca.raster_cts import RasterCTS
+        >>> import numpy as np
+        >>> grid = RasterModelGrid((3, 8))
+        >>> nsd = {0 : 'zero', 1 : 'one'}
+        >>> trn_list = [Transition((0, 1, 0), (1, 1, 0), 1.0)]
+        >>> ca = RasterCTS(grid, nsd, trn_list, np.zeros(24, dtype=int))
+        >>> block_at_link = ca._partition_into_blocks(2)
+        >>> block_at_link[grid.active_links]
+        array([0, 0, 2, 2, 1, 1, 0, 0, 2, 2, 2, 1, 1, 0, 0, 2, 2, 1, 1])
+        """
+        grid = self.grid
+        if np.ptp(grid.x_of_node) >= np.ptp(grid.y_of_node):
+            coord = grid.x_of_node
+        else:
+            coord = grid.y_of_node
+        strip_at_node = np.unique(coord, return_inverse=True)[1]
+        block_at_node = strip_at_node * n_blocks // (strip_at_node.max() + 1)
+
+        tail = grid.node_at_link_tail[grid.active_links]
+        head = grid.node_at_link_head[grid.active_links]
+        crosses = block_at_node[tail] != block_at_node[head]
+        is_frontier_node = np.zeros(grid.number_of_nodes, dtype=bool)
+        is_frontier_node[tail[crosses]] = True
+        is_frontier_node[head[crosses]] = True
+
+        block_at_link = np.full(grid.number_of_links, n_blocks, dtype=int)
+        block_at_link[grid.active_links] = np.where(
+            is_frontier_node[tail] | is_frontier_node[head],
+            n_blocks,
+            block_at_node[tail],
+        )
+        return block_at_link
+
+    def _run_in_blocks(self, run_to, n_blocks, window):
+        """Run the model forward with the lattice partitioned into blocks."""
+        if np.any(self.trn_prop_update_fn != 0):
+            raise ValueError("unable to run transition callbacks in blocks")
+
+        # Events pushed onto the priority queue, or a new node-state grid,
+        # mean that the model was changed from outside since the last run.
+        if (
+            self._block_scheduler is None
+            or self._block_scheduler.n_blocks != n_blocks
+            or self._blocked_node_state is not self.node_state
+            or len(self.priority_queue) > 0
+        ):
+            self._block_scheduler = BlockScheduler(
+                self._partition_into_blocks(n_blocks),
+                n_blocks,
+                np.random.randint(1, 2 ** 62, size=n_blocks + 1, dtype=np.uint64),
+                self.grid.active_links,
+                self.next_update,
+                self.grid.node_at_link_tail,
+                self.grid.node_at_link_head,
+                self.node_state,
+                self.next_trn_id,
+                self.trn_to,
+                self.grid.status_at_node,
+                self.num_node_states,
+                self.num_node_states_sq,
+                self.bnd_lnk,
+                self.link_orientation,
+                self.link_state,
+                self.n_trn,
+                self.trn_id,
+                self.trn_rate,
+                self.grid.links_at_node,
+                self.grid.active_link_dirs_at_node,
+                self.trn_propswap,
+                self.propid,
+            )
+            self._block_scheduler.rebuild()
+            self._blocked_node_state = self.node_state
+            self.priority_queue = PriorityQueue()
+
+        scheduler = self._block_scheduler
+        with ThreadPoolExecutor(max_workers=n_blocks) as executor:
+            while self.current_time < run_to:
+                window_end = min(self.current_time + window, run_to)
+                for _ in executor.map(
+                    scheduler.run_block, range(n_blocks), [window_end] * n_blocks
+                ):
+                    pass
+                scheduler.run_frontier(window_end)
+                self.current_time = window_end
+        scheduler.reset_properties(self.prop_data, self.prop_reset_value)
+
+    def _move_events_to_priority_queue(self):
+        """Queue the events held by the blocks on the serial priority queue."""
+        links = self.grid.active_links[
+            self.next_update[self.grid.active_links] < _NEVER
+        ]
+        links = links[np.argsort(self.next_update[links], kind="stable")]
+
+        self.priority_queue = PriorityQueue()
+        for link in links:
+            self.priority_queue.push(link, self.next_update[link])
+        self._block_scheduler = None
+        self._blocked_node_state = None
@@ -9,7 +9,7 @@ cimport numpy as np
 cimport cython
 from landlab.grid.nodestatus import NodeStatus
 from _heapq import heappush, heappop
-from libc.stdlib cimport rand
+from libc.stdlib cimport rand, calloc, malloc, realloc, free
 from libc.math cimport log
 
 
@@ -34,24 +34,306 @@ ctypedef np.uint8_t DTYPE_UINT8_t
 cdef char _DEBUG = 0
 
 
+cdef struct QueuedEvent:
+    double time
+    long count
+    long link
+
+
+cdef struct EventHeap:
+    QueuedEvent *events
+    long size
+    long capacity
+    long count
+    long *position
+
+
+cdef int _heap_init(EventHeap *heap, long *position) except -1:
+    """Initialize an empty heap.
+
+    *position* holds, for each link, its index in the heap, or -1 if the
+    link is not queued. It may be shared by heaps that hold different
+    links.
+    """
+    heap.events = <QueuedEvent *>malloc(16 * sizeof(QueuedEvent))
+    if not heap.events:
+        raise MemoryError()
+    heap.capacity = 16
+    heap.size = 0
+    heap.count = 0
+    heap.position = position
+    return 0
+
+
+cdef inline bint _event_is_before(QueuedEvent *a, QueuedEvent *b) nogil:
+    return a.time < b.time or (a.time == b.time and a.count < b.count)
+
+
+cdef inline void _heap_place(EventHeap *heap, long i, QueuedEvent event) nogil:
+    heap.events[i] = event
+    heap.position[event.link] = i
+
+
+cdef void _heap_sift_up(EventHeap *heap, long i) nogil:
+    cdef QueuedEvent event = heap.events[i]
+    cdef long parent
+
+    while i > 0:
+        parent = (i - 1) >> 1
+        if _event_is_before(&event, &heap.events[parent]):
+            _heap_place(heap, i, heap.events[parent])
+            i = parent
+        else:
+            break
+    _heap_place(heap, i, event)
+
+
+cdef void _heap_sift_down(EventHeap *heap, long i) nogil:
+    cdef QueuedEvent event = heap.events[i]
+    cdef long child
+
+    while True:
+        child = 2 * i + 1
+        if child >= heap.size:
+            break
+        if child + 1 < heap.size and _event_is_before(
+            &heap.events[child + 1], &heap.events[child]
+        ):
+            child += 1
+        if _event_is_before(&heap.events[child], &event):
+            _heap_place(heap, i, heap.events[child])
+            i = child
+        else:
+            break
+    _heap_place(heap, i, event)
+
+
+cdef int _heap_push(EventHeap *heap, long link, double time) except -1 nogil:
+    """Schedule an event at a link, replacing any queued for the link.
+
+    Events are ordered by time and then by when they were pushed.
+    """
+    cdef long i = heap.position[link]
+    cdef QueuedEvent *events
+
+    if i < 0:
+        if heap.size == heap.capacity:
+            events = <QueuedEvent *>realloc(
+                heap.events, 2 * heap.capacity * sizeof(QueuedEvent)
+            )
+            if not events:
+                with gil:
+                    raise MemoryError()
+            heap.events = events
+            heap.capacity *= 2
+        i = heap.size
+        heap.size += 1
+        heap.events[i].link = link
+    elif time >= heap.events[i].time:
+        heap.events[i].time = time
+        heap.events[i].count = heap.count
+        heap.count += 1
+        _heap_sift_down(heap, i)
+        return 0
+
+    heap.events[i].time = time
+    heap.events[i].count = heap.count
+    heap.count += 1
+    _heap_sift_up(heap, i)
+    return 0
+
+
+cdef QueuedEvent _heap_pop(EventHeap *heap) nogil:
+    """Pop the earliest event from a (non-empty) heap."""
+    cdef QueuedEvent top = heap.events[0]
+
+    heap.position[top.link] = -1
+    heap.size -= 1
+    if heap.size > 0:
+        _heap_place(heap, 0, heap.events[heap.size])
+        _heap_sift_down(heap, 0)
+    return top
+
+
+cdef void _heap_remove(EventHeap *heap, long link) nogil:
+    """Remove the event queued for a link, if there is one."""
+    cdef long i = heap.position[link]
+    cdef QueuedEvent last
+
+    if i < 0:
+        return
+    heap.position[link] = -1
+    heap.size -= 1
+    if i < heap.size:
+        last = heap.events[heap.size]
+        _heap_place(heap, i, last)
+        if i > 0 and _event_is_before(&last, &heap.events[(i - 1) >> 1]):
+            _heap_sift_up(heap, i)
+        else:
+            _heap_sift_down(heap, i)
+
+
+cdef void _heap_clear(EventHeap *heap) nogil:
+    cdef long i
+
+    for i in range(heap.size):
+        heap.position[heap.events[i].link] = -1
+    heap.size = 0
+
+
+cdef struct IdList:
+    long *ids
+    long size
+    long capacity
+
+
+cdef int _id_list_init(IdList *id_list) except -1:
+    id_list.ids = <long *>malloc(16 * sizeof(long))
+    if not id_list.ids:
+        raise MemoryError()
+    id_list.capacity = 16
+    id_list.size = 0
+    return 0
+
+
+cdef int _id_list_append(IdList *id_list, long id_) except -1 nogil:
+    cdef long *ids
+
+    if id_list.size == id_list.capacity:
+        ids = <long *>realloc(id_list.ids, 2 * id_list.capacity * sizeof(long))
+        if not ids:
+            with gil:
+                raise MemoryError()
+        id_list.ids = ids
+        id_list.capacity *= 2
+
+    id_list.ids[id_list.size] = id_
+    id_list.size += 1
+    return 0
+
+
 cdef class PriorityQueue:
     """
     Implements a priority queue.
-    """
-    cdef public object _queue
-    cdef public int _index
 
-    def __init__(self):
-        self._queue = []
-        self._index = 0
+    Items (link IDs) are held in a binary heap that is indexed by item, so
+    that an item is in the queue at most once. Pushing an item that is
+    already in the queue changes its priority in place.
 
-    def push(self, int item, double priority):
-        heappush(self._queue, (priority, self._index, item))
-        self._index += 1
+    Examples
+    --------
+    >>> from landlab.ca.cfuncs import PriorityQueue
+    >>> pq = PriorityQueue()
+    >>> pq.push(3, 2.0)
+    >>> pq.push(1, 1.5)
+    >>> pq.push(3, 0.5)
+    >>> len(pq)
+    2
+    >>> pq.pop()
+    (0.5, 2, 3)
+    >>> pq.remove(1)
+    >>> len(pq)
+    0
+    """
+    cdef EventHeap heap
+    cdef long *position
+    cdef long n_positions
+
+    def __cinit__(self):
+        self.position = NULL
+        self.heap.events = NULL
+        self._reserve(15)
+        _heap_init(&self.heap, self.position)
+
+    def __dealloc__(self):
+        free(self.heap.events)
+        free(self.position)
+
+    cdef int _reserve(self, long item) except -1:
+        """Make sure that there is room in the index for *item*."""
+        cdef long n_positions = max(16, self.n_positions)
+        cdef long *position
+        cdef long i
+
+        if item < 0:
+            raise ValueError("item must be non-negative ({0})".format(item))
+        if item < self.n_positions:
+            return 0
+        while n_positions <= item:
+            n_positions *= 2
+        position = <long *>realloc(self.position, n_positions * sizeof(long))
+        if not position:
+            raise MemoryError()
+        for i in range(self.n_positions, n_positions):
+            position[i] = -1
+        self.position = position
+        self.heap.position = position
+        self.n_positions = n_positions
+        return 0
+
+    cdef int _push(self, long item, double priority) except -1:
+        self._reserve(item)
+        _heap_push(&self.heap, item, priority)
+        return 0
+
+    cdef void _remove(self, long item):
+        if 0 <= item < self.n_positions:
+            _heap_remove(&self.heap, item)
+
+    def push(self, long item, double priority):
+        """Queue *item*, or change its priority if it is already queued."""
+        self._push(item, priority)
 
     def pop(self):
-        assert len(self._queue) > 0, 'Q is empty'
-        return heappop(self._queue)
+        """Remove the item with the smallest priority.
+
+        Returns
+        -------
+        tuple of (float, int, int)
+            The priority, the push count and the item.
+        """
+        cdef QueuedEvent event
+
+        assert self.heap.size > 0, 'Q is empty'
+        event = _heap_pop(&self.heap)
+        return (event.time, event.count, event.link)
+
+    def remove(self, long item):
+        """Remove *item* from the queue. Does nothing if it is not queued."""
+        self._remove(item)
+
+    def move(self, long item, long new_item):
+        """Give the entry of *item* to *new_item*.
+
+        Any entry of *new_item* is replaced. If *item* is not queued, this
+        just removes the entry of *new_item*.
+        """
+        cdef long i
+
+        if item == new_item:
+            return
+        self._remove(new_item)
+        if 0 <= item < self.n_positions and self.position[item] >= 0:
+            self._reserve(new_item)
+            i = self.position[item]
+            self.position[item] = -1
+            self.heap.events[i].link = new_item
+            self.position[new_item] = i
+
+    def __len__(self):
+        return self.heap.size
+
+    def __contains__(self, long item):
+        return 0 <= item < self.n_positions and self.position[item] >= 0
+
+    @property
+    def _queue(self):
+        """The queued (priority, count, item) entries, in heap order."""
+        return [
+            (self.heap.events[i].time, self.heap.events[i].count,
+             self.heap.events[i].link)
+            for i in range(self.heap.size)
+        ]
 
 
 cdef class Event:
@@ -466,11 +748,12 @@ cpdef push_transitions_to_event_queue(int number_of_active_links,
             (ev_time, this_trn_id) = get_next_event_new(i, link_state[i], 0.0,
                                                         n_trn, trn_id,
                                                         trn_rate)
-            priority_queue.push(i, ev_time)
+            priority_queue._push(i, ev_time)
             next_update[i] = ev_time
             next_trn_id[i] = this_trn_id
 
         else:
+            priority_queue._remove(i)
             next_update[i] = _NEVER
 
 @cython.boundscheck(True)
@@ -585,10 +868,11 @@ cdef void update_link_state_new(DTYPE_INT_t link, DTYPE_INT_t new_link_state,
         (event_time, this_trn_id) = get_next_event_new(link, new_link_state,
                                                        current_time,
                                                        n_trn, trn_id, trn_rate)
-        priority_queue.push(link, event_time)
+        priority_queue._push(link, event_time)
         next_update[link] = event_time
         next_trn_id[link] = this_trn_id
     else:
+        priority_queue._remove(link)
         next_update[link] = _NEVER
         next_trn_id[link] = -1
 
@@ -994,20 +1278,22 @@ cpdef double run_cts_new(double run_to, double current_time,
     """
     import sys
     cdef double ev_time
-    cdef int ev_idx
     cdef int ev_link
+    cdef QueuedEvent event
 
     # Continue until we've run out of either time or events
-    while current_time < run_to and priority_queue._queue:
+    while current_time < run_to and priority_queue.heap.size > 0:
 
         if _DEBUG:
             print('current time = ', current_time)
 
         # Is there an event scheduled to occur within this run?
-        if priority_queue._queue[0][0] <= run_to:
+        if priority_queue.heap.events[0].time <= run_to:
 
             # If so, pick the next transition event from the event queue
-            (ev_time, ev_idx, ev_link) = priority_queue.pop()
+            event = _heap_pop(&priority_queue.heap)
+            ev_time = event.time
+            ev_link = event.link
 
             # ... and execute the transition
             do_transition_new(ev_link, ev_time, priority_queue, next_update,
@@ -1446,3 +1732,328 @@ cpdef double run_cts_lean(double run_to, double current_time,
             current_time = run_to
 
     return current_time
+
+
+cdef inline double _random_uniform(unsigned long long *state) nogil:
+    """Draw from [0, 1) with a xorshift64* generator."""
+    cdef unsigned long long x = state[0]
+    x ^= x >> 12
+    x ^= x << 25
+    x ^= x >> 27
+    state[0] = x
+    return ((x * 2685821657736338717ULL) >> 11) * (1.0 / 9007199254740992.0)
+
+
+cdef class BlockScheduler:
+
+    """Event queues for a lattice that is partitioned into blocks.
+
+    Every active link is owned either by one of *n_blocks* blocks or, if
+    it touches a node that is connected to a node of another block, by the
+    block frontier. Each block, and the frontier, has its own event queue
+    and random number generator. The events of a block only change the
+    states of nodes, and links, that the block owns and so the blocks can
+    be run concurrently (each call to :meth:`run_block` releases the GIL).
+    Events at frontier links are run, serially and in time order, by
+    :meth:`run_frontier`. As these run after the events of the blocks up
+    to the same time, the result approximates that of the serial event
+    loop (see :meth:`CellLabCTSModel.run`).
+
+    Transition times are drawn from the generators of the blocks, not from
+    numpy's global random state.
+
+    Parameters
+    ----------
+    block_at_link : ndarray of int
+        Block that owns each link, or *n_blocks* for frontier links.
+    n_blocks : int
+        Number of blocks.
+    seeds : ndarray of uint64
+        Nonzero seeds for the random number generators of the blocks and
+        of the frontier (*n_blocks* + 1 values).
+    (see celllab_cts.py for other parameters)
+    """
+
+    cdef readonly long n_blocks
+    cdef EventHeap *heaps
+    cdef long *position
+    cdef unsigned long long *rng_state
+    cdef IdList *reset_ids
+    cdef const DTYPE_INT_t[:] block_at_link
+    cdef const DTYPE_INT_t[:] active_links
+    cdef const DTYPE_INT_t[:] frontier_links
+    cdef DTYPE_t[:] next_update
+    cdef const DTYPE_INT_t[:] node_at_link_tail
+    cdef const DTYPE_INT_t[:] node_at_link_head
+    cdef DTYPE_INT_t[:] node_state
+    cdef DTYPE_INT_t[:] next_trn_id
+    cdef const DTYPE_INT_t[:] trn_to
+    cdef const DTYPE_UINT8_t[:] status_at_node
+    cdef long num_node_states
+    cdef long num_node_states_sq
+    cdef const DTYPE_INT8_t[:] bnd_lnk
+    cdef const DTYPE_INT8_t[:] link_orientation
+    cdef DTYPE_INT_t[:] link_state
+    cdef const DTYPE_INT_t[:] n_trn
+    cdef const DTYPE_INT_t[:, :] trn_id
+    cdef const DTYPE_t[:] trn_rate
+    cdef const DTYPE_INT_t[:, :] links_at_node
+    cdef const DTYPE_INT8_t[:, :] active_link_dirs_at_node
+    cdef const DTYPE_INT8_t[:] trn_propswap
+    cdef DTYPE_INT_t[:] propid
+
+    def __cinit__(self, block_at_link, long n_blocks, *args, **kwds):
+        cdef long i
+        cdef long n_links = len(block_at_link)
+
+        self.n_blocks = n_blocks
+        self.heaps = <EventHeap *>calloc(n_blocks + 1, sizeof(EventHeap))
+        self.position = <long *>malloc(max(n_links, 1) * sizeof(long))
+        self.reset_ids = <IdList *>calloc(n_blocks + 1, sizeof(IdList))
+        self.rng_state = <unsigned long long *>malloc(
+            (n_blocks + 1) * sizeof(unsigned long long)
+        )
+        if (
+            not self.heaps
+            or not self.position
+            or not self.reset_ids
+            or not self.rng_state
+        ):
+            raise MemoryError()
+        for i in range(n_links):
+            self.position[i] = -1
+        for i in range(n_blocks + 1):
+            _heap_init(&self.heaps[i], self.position)
+            _id_list_init(&self.reset_ids[i])
+
+    def __dealloc__(self):
+        cdef long i
+
+        if self.heaps:
+            for i in range(self.n_blocks + 1):
+                free(self.heaps[i].events)
+            free(self.heaps)
+        if self.reset_ids:
+            for i in range(self.n_blocks + 1):
+                free(self.reset_ids[i].ids)
+            free(self.reset_ids)
+        free(self.position)
+        free(self.rng_state)
+
+    def __init__(self,
+                 const DTYPE_INT_t[:] block_at_link,
+                 long n_blocks,
+                 np.ndarray[np.uint64_t, ndim=1] seeds,
+                 const DTYPE_INT_t[:] active_links,
+                 DTYPE_t[:] next_update,
+                 const DTYPE_INT_t[:] node_at_link_tail,
+                 const DTYPE_INT_t[:] node_at_link_head,
+                 DTYPE_INT_t[:] node_state,
+                 DTYPE_INT_t[:] next_trn_id,
+                 const DTYPE_INT_t[:] trn_to,
+                 const DTYPE_UINT8_t[:] status_at_node,
+                 long num_node_states,
+                 long num_node_states_sq,
+                 const DTYPE_INT8_t[:] bnd_lnk,
+                 const DTYPE_INT8_t[:] link_orientation,
+                 DTYPE_INT_t[:] link_state,
+                 const DTYPE_INT_t[:] n_trn,
+                 const DTYPE_INT_t[:, :] trn_id,
+                 const DTYPE_t[:] trn_rate,
+                 const DTYPE_INT_t[:, :] links_at_node,
+                 const DTYPE_INT8_t[:, :] active_link_dirs_at_node,
+                 const DTYPE_INT8_t[:] trn_propswap,
+                 DTYPE_INT_t[:] propid):
+        cdef long i
+
+        for i in range(n_blocks + 1):
+            self.rng_state[i] = seeds[i]
+
+        self.block_at_link = block_at_link
+        self.active_links = active_links
+        self.frontier_links = np.asarray(active_links)[
+            np.asarray(block_at_link)[active_links] == n_blocks
+        ]
+        self.next_update = next_update
+        self.node_at_link_tail = node_at_link_tail
+        self.node_at_link_head = node_at_link_head
+        self.node_state = node_state
+        self.next_trn_id = next_trn_id
+        self.trn_to = trn_to
+        self.status_at_node = status_at_node
+        self.num_node_states = num_node_states
+        self.num_node_states_sq = num_node_states_sq
+        self.bnd_lnk = bnd_lnk
+        self.link_orientation = link_orientation
+        self.link_state = link_state
+        self.n_trn = n_trn
+        self.trn_id = trn_id
+        self.trn_rate = trn_rate
+        self.links_at_node = links_at_node
+        self.active_link_dirs_at_node = active_link_dirs_at_node
+        self.trn_propswap = trn_propswap
+        self.propid = propid
+
+    def rebuild(self):
+        """Fill the event queues with the events scheduled in *next_update*."""
+        cdef long i, link
+
+        for i in range(self.n_blocks + 1):
+            _heap_clear(&self.heaps[i])
+        for i in range(self.active_links.shape[0]):
+            link = self.active_links[i]
+            if self.next_update[link] < _NEVER:
+                _heap_push(
+                    &self.heaps[self.block_at_link[link]],
+                    link,
+                    self.next_update[link],
+                )
+
+    def run_block(self, long block, double run_to):
+        """Run the events of a block that are scheduled up to *run_to*."""
+        with nogil:
+            self._run_events(block, run_to)
+
+    def run_frontier(self, double run_to):
+        """Run the events at frontier links that are scheduled up to *run_to*.
+
+        The states of frontier links may have been changed by the blocks,
+        so their queue is first refilled from *next_update*.
+        """
+        cdef long i, link
+        cdef EventHeap *heap = &self.heaps[self.n_blocks]
+
+        _heap_clear(heap)
+        for i in range(self.frontier_links.shape[0]):
+            link = self.frontier_links[i]
+            if self.next_update[link] <= run_to:
+                _heap_push(heap, link, self.next_update[link])
+
+        with nogil:
+            self._run_events(self.n_blocks, run_to)
+
+    def reset_properties(self, prop_data, prop_reset_value):
+        """Reset the properties that were swapped onto boundary nodes."""
+        cdef long i, j
+
+        for i in range(self.n_blocks + 1):
+            for j in range(self.reset_ids[i].size):
+                prop_data[self.reset_ids[i].ids[j]] = prop_reset_value
+            self.reset_ids[i].size = 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int _run_events(self, long block, double run_to) except -1 nogil:
+        cdef EventHeap *heap = &self.heaps[block]
+        cdef QueuedEvent event
+
+        while heap.size > 0 and heap.events[0].time <= run_to:
+            event = _heap_pop(heap)
+            if event.time == self.next_update[event.link]:
+                self._do_transition(block, event.link, event.time)
+        return 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef int _do_transition(
+        self, long block, long event_link, double event_time
+    ) except -1 nogil:
+        cdef long tail_node = self.node_at_link_tail[event_link]
+        cdef long head_node = self.node_at_link_head[event_link]
+        cdef long old_tail_node_state = self.node_state[tail_node]
+        cdef long old_head_node_state = self.node_state[head_node]
+        cdef long this_trn_id = self.next_trn_id[event_link]
+        cdef long this_trn_to = self.trn_to[this_trn_id]
+        cdef long tmp
+
+        if self.status_at_node[tail_node] == _CORE:
+            self.node_state[tail_node] = (
+                this_trn_to / self.num_node_states
+            ) % self.num_node_states
+        if self.status_at_node[head_node] == _CORE:
+            self.node_state[head_node] = this_trn_to % self.num_node_states
+
+        self._update_link_state(block, event_link, this_trn_to, event_time)
+
+        if self.node_state[tail_node] != old_tail_node_state:
+            self._update_links_at_node(block, tail_node, event_link, event_time)
+        if self.node_state[head_node] != old_head_node_state:
+            self._update_links_at_node(block, head_node, event_link, event_time)
+
+        if self.trn_propswap[this_trn_id]:
+            tmp = self.propid[tail_node]
+            self.propid[tail_node] = self.propid[head_node]
+            self.propid[head_node] = tmp
+            if self.status_at_node[tail_node] != _CORE:
+                _id_list_append(&self.reset_ids[block], self.propid[tail_node])
+            if self.status_at_node[head_node] != _CORE:
+                _id_list_append(&self.reset_ids[block], self.propid[head_node])
+        return 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int _update_links_at_node(
+        self, long block, long node, long event_link, double event_time
+    ) except -1 nogil:
+        cdef long i, link
+
+        for i in range(self.links_at_node.shape[1]):
+            link = self.links_at_node[node, i]
+            if self.active_link_dirs_at_node[node, i] != 0 and link != event_link:
+                self._update_link_state(
+                    block,
+                    link,
+                    self.link_orientation[link] * self.num_node_states_sq
+                    + self.node_state[self.node_at_link_tail[link]]
+                    * self.num_node_states
+                    + self.node_state[self.node_at_link_head[link]],
+                    event_time,
+                )
+        return 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int _update_link_state(
+        self, long block, long link, long new_link_state, double current_time
+    ) except -1 nogil:
+        """Set the state of a link and schedule its next transition.
+
+        Blocks only queue the events of their own links. The frontier
+        queues events for all links, as no block runs at the same time.
+        Events at frontier links that are scheduled by a block are queued
+        by :meth:`run_frontier`.
+        """
+        cdef long owner = self.block_at_link[link]
+        cdef long i, this_trn_id
+        cdef double next_time, this_next
+
+        if self.bnd_lnk[link]:
+            new_link_state = (
+                self.link_orientation[link] * self.num_node_states_sq
+                + self.node_state[self.node_at_link_tail[link]]
+                * self.num_node_states
+                + self.node_state[self.node_at_link_head[link]]
+            )
+
+        self.link_state[link] = new_link_state
+        if self.n_trn[new_link_state] > 0:
+            next_time = _NEVER
+            this_trn_id = -1
+            for i in range(self.n_trn[new_link_state]):
+                this_next = -log(
+                    1.0 - _random_uniform(&self.rng_state[block])
+                ) / self.trn_rate[self.trn_id[new_link_state, i]]
+                if this_next < next_time:
+                    next_time = this_next
+                    this_trn_id = self.trn_id[new_link_state, i]
+            self.next_update[link] = current_time + next_time
+            self.next_trn_id[link] = this_trn_id
+            if owner == block or block == self.n_blocks:
+                _heap_push(&self.heaps[owner], link, self.next_update[link])
+        else:
+            self.next_update[link] = _NEVER
+            self.next_trn_id[link] = -1
+            if owner == block or block == self.n_blocks:
+                _heap_remove(&self.heaps[owner], link)
+        return 0
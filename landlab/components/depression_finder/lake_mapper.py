@@ -190,7 +190,15 @@ class DepressionFinderAndRouter(Component):
         },
     }
 
-    def __init__(self, grid, routing="D8", pits="flow__sink_flag", reroute_flow=True):
+    def __init__(
+        self,
+        grid,
+        routing="D8",
+        pits="flow__sink_flag",
+        reroute_flow=True,
+        incremental=False,
+        tolerance=0.0,
+    ):
         """Create a DepressionFinderAndRouter.
 
         Constructor assigns a copy of the grid, sets the current time, and
@@ -216,6 +224,16 @@ class DepressionFinderAndRouter(Component):
             the grid produced by the FlowAccumulator component, this component
             will modify the existing flow fields to route the flow across the
             lake surface(s).
+        incremental : bool, optional
+            If True, keep the lakes mapped by the previous call to
+            *map_depressions* and only re-map, and re-route flow across,
+            those near nodes whose elevation has changed since then. The time
+            this takes then depends on the size of the changed area rather
+            than the number of lakes. Intended for landscape evolution models
+            where, from one step to the next, most lakes are unchanged.
+        tolerance : float, optional
+            If *incremental*, elevation changes no greater than this are
+            ignored when deciding which lakes need to be re-mapped.
         """
         super().__init__(grid)
 
@@ -286,6 +304,18 @@ class DepressionFinderAndRouter(Component):
         )
         self._lake_map = np.empty(self._grid.number_of_nodes, dtype=int)
         self._lake_map.fill(self._grid.BAD_INDEX)
+        # work space for the nodes of the depression currently being mapped
+        self._nodes_this_depression = self._grid.empty("node", dtype=int)
+
+        self._incremental = incremental
+        self._tolerance = tolerance
+        # If incremental, the lakes, as {lake_code: (outlet_node, lake_nodes)},
+        # the codes of the lakes that drain through each outlet, and the
+        # elevations the lakes were mapped with.
+        self._lakes = None
+        self._lakes_at_outlet = None
+        self._last_elev = None
+        self._is_routed = None
 
     def updated_boundary_conditions(self):
         """Call this if boundary conditions on the grid are updated after the
@@ -699,6 +729,8 @@ class DepressionFinderAndRouter(Component):
             depression.
         """
         n = nodes_this_depression
+        if self._last_elev is not None:
+            self._save_lake_state(n)
 
         # three cases possible - new lake is fresh; new lake is smaller than
         # an existing lake (subsumed, and unimportant), new lake is equal to
@@ -715,6 +747,8 @@ class DepressionFinderAndRouter(Component):
             self._pits_flooded += 1
             pit_node_where = np.searchsorted(self._pit_node_ids, pit_node)
             self._unique_pits[pit_node_where] = True
+            if self._lakes is not None:
+                self._add_lake(pit_node, outlet_id, n)
         elif np.any(fresh_nodes):  # lake is bigger than one or more existing
             self._flood_status[n] = _FLOODED
             depth_this_lake = self._elev[outlet_id] - self._elev[n]
@@ -731,6 +765,10 @@ class DepressionFinderAndRouter(Component):
             # -1 for the self._grid.BAD_INDEX that must be present; another -1
             # because a single lake is just replaced by a new lake.
             self._lake_map[n] = pit_node
+            if self._lakes is not None:
+                for lake_code in subsumed_lakes[1:]:
+                    self._forget_lake(lake_code)
+                self._add_lake(pit_node, outlet_id, n)
         else:  # lake is subsumed within an existing lake
             print(" eaten lake")
             assert np.all(np.equal(self._flood_status[n], _CURRENT_LAKE))
@@ -759,7 +797,7 @@ class DepressionFinderAndRouter(Component):
         max_count = self._grid.number_of_nodes + 1
 
         # Place pit_node at top of depression list
-        nodes_this_depression = self.grid.zeros("node", dtype=int)
+        nodes_this_depression = self._nodes_this_depression
         nodes_this_depression[0] = pit_node
         pit_count = 1
 
@@ -869,10 +907,50 @@ class DepressionFinderAndRouter(Component):
         if self._bc_set_code != self._grid.bc_set_code:
             self.updated_boundary_conditions()
             self._bc_set_code = self._grid.bc_set_code
-        self._lake_map.fill(self._grid.BAD_INDEX)
-        self._depression_outlet_map.fill(self._grid.BAD_INDEX)
-        self._depression_depth.fill(0.0)
-        self._depression_outlets = []  # reset these
+            self._last_elev = None  # lakes must all be re-mapped
+        self._find_pit_node_ids()
+
+        if self._incremental and self._last_elev is not None:
+            remapped_lakes = self._remap_changed_depressions()
+        else:
+            remapped_lakes = None
+            if self._incremental:
+                self._lakes, self._lakes_at_outlet = {}, {}
+            self._lake_map.fill(self._grid.BAD_INDEX)
+            self._depression_outlet_map.fill(self._grid.BAD_INDEX)
+            self._depression_depth.fill(0.0)
+            self._depression_outlets = []  # reset these
+            # Set up "lake code" array
+            self._flood_status.fill(_UNFLOODED)
+            self._flood_status[self._pit_node_ids] = _PIT
+
+            self._identify_depressions_and_outlets(self._reroute_flow)
+
+        if self._reroute_flow and ("flow__receiver_node" in self._grid.at_node):
+
+            self._receivers = self._grid.at_node["flow__receiver_node"]
+            self._sinks = self._grid.at_node["flow__sink_flag"]
+            self._grads = self._grid.at_node["topographic__steepest_slope"]
+            self._links = self._grid.at_node["flow__link_to_receiver_node"]
+            if remapped_lakes is None or self._is_routed is None:
+                self._route_flow()
+            else:
+                self._restore_routing()
+                self._route_flow(
+                    [
+                        (self._lakes[code][0], code, self._lakes[code][1])
+                        for code in remapped_lakes
+                    ]
+                )
+            if self._incremental:
+                self._remember_routing(remapped_lakes)
+            self._reaccumulate_flow()
+
+        if self._incremental and remapped_lakes is None:
+            self._remember_lakes()
+
+    def _find_pit_node_ids(self):
+        """Set the pits from which depressions are mapped."""
         # Locate nodes with pits
         if isinstance(self._user_supplied_pits, str):
             try:
@@ -901,20 +979,222 @@ class DepressionFinderAndRouter(Component):
             self._number_of_pits = self._pit_node_ids.size
             self._is_pit.fill(False)
             self._is_pit[self._pit_node_ids] = True
-        # Set up "lake code" array
-        self._flood_status.fill(_UNFLOODED)
-        self._flood_status[self._pit_node_ids] = _PIT
 
-        self._identify_depressions_and_outlets(self._reroute_flow)
+    def _add_lake(self, lake_code, outlet_node, nodes_in_lake):
+        """Keep track of a newly mapped lake."""
+        lake_code, outlet_node = int(lake_code), int(outlet_node)
+        self._lakes[lake_code] = (outlet_node, np.array(nodes_in_lake))
+        self._lakes_at_outlet.setdefault(outlet_node, set()).add(lake_code)
+
+    def _forget_lake(self, lake_code):
+        """Stop keeping track of a lake, returning its outlet and nodes."""
+        outlet_node, nodes_in_lake = self._lakes.pop(lake_code)
+        lakes_at_outlet = self._lakes_at_outlet[outlet_node]
+        lakes_at_outlet.discard(lake_code)
+        if not lakes_at_outlet:
+            del self._lakes_at_outlet[outlet_node]
+        return outlet_node, nodes_in_lake
+
+    def _lakes_at(self, nodes):
+        """Codes of the lakes that include, or drain through, any of nodes."""
+        lake_codes = set(self._lake_map[nodes].tolist())
+        lake_codes.discard(self._grid.BAD_INDEX)
+        for node in nodes.tolist():
+            lake_codes.update(self._lakes_at_outlet.get(node, ()))
+        return lake_codes
+
+    def _nodes_near(self, nodes):
+        """Nodes along with their neighbors.
 
-        if self._reroute_flow and ("flow__receiver_node" in self._grid.at_node):
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import DepressionFinderAndRouter
+        >>> mg = RasterModelGrid((4, 5))
+        >>> z = mg.add_zeros("topographic__elevation", at="node")
+        >>> df = DepressionFinderAndRouter(mg, routing="D4")
+        >>> df._nodes_near([7])
+        array([ 2,  6,  7,  8, 12])
+        """
+        nbrs = self._node_nbrs[nodes].reshape((-1,))
+        return np.union1d(nodes, nbrs[nbrs != self._grid.BAD_INDEX])
 
-            self._receivers = self._grid.at_node["flow__receiver_node"]
-            self._sinks = self._grid.at_node["flow__sink_flag"]
-            self._grads = self._grid.at_node["topographic__steepest_slope"]
-            self._links = self._grid.at_node["flow__link_to_receiver_node"]
-            self._route_flow()
-            self._reaccumulate_flow()
+    def _remember_lakes(self):
+        """Store what is needed to later re-map lakes incrementally."""
+        self._last_elev = self._elev.copy()
+        self._is_saved = self._grid.zeros("node", dtype=bool)
+        self._saved = []
+        if not (self._reroute_flow and "flow__receiver_node" in self._grid.at_node):
+            self._is_routed = None
+
+    def _remember_routing(self, lake_codes=None):
+        """Store the flow routing across lakes, to restore for kept lakes.
+
+        Parameters
+        ----------
+        lake_codes : iterable of int, optional
+            Lakes that flow has just been routed across. The default is all
+            lakes.
+        """
+        if lake_codes is None or self._is_routed is None:
+            self._is_routed = self.lake_at_node
+            self._is_routed[self.lake_outlets] = True
+            self._routed_receivers = self._receivers.copy()
+            self._routed_links = self._links.copy()
+            self._routed_grads = self._grads.copy()
+        else:
+            for lake_code in lake_codes:
+                outlet_node, nodes_in_lake = self._lakes[lake_code]
+                nodes = np.append(nodes_in_lake, outlet_node)
+                self._is_routed[nodes] = True
+                self._routed_receivers[nodes] = self._receivers[nodes]
+                self._routed_links[nodes] = self._links[nodes]
+                self._routed_grads[nodes] = self._grads[nodes]
+
+    def _restore_routing(self):
+        """Route flow across kept lakes as it was when they were mapped."""
+        nodes = np.flatnonzero(self._is_routed)
+        self._receivers[nodes] = self._routed_receivers[nodes]
+        self._links[nodes] = self._routed_links[nodes]
+        self._grads[nodes] = self._routed_grads[nodes]
+
+    def _save_lake_state(self, nodes):
+        """Save lakes, depths and outlets, as they were before this call."""
+        nodes = nodes[~self._is_saved[nodes]]
+        self._is_saved[nodes] = True
+        self._saved.append(
+            (
+                nodes,
+                self._lake_map[nodes],
+                self._depression_depth[nodes],
+                self._depression_outlet_map[nodes],
+            )
+        )
+
+    def _changed_lake_nodes(self):
+        """Nodes whose lake, depth or outlet differ from before this call.
+
+        As lakes are mapped in order of their codes, a lake whose code has
+        changed may be mapped before, rather than after, a neighboring lake.
+        """
+        if not self._saved:
+            return np.empty(0, dtype=int)
+        nodes, lake_map, depth, outlet = (
+            np.concatenate(values) for values in zip(*self._saved)
+        )
+        is_changed = (
+            (self._lake_map[nodes] != lake_map)
+            | (self._depression_depth[nodes] != depth)
+            | (self._depression_outlet_map[nodes] != outlet)
+        )
+        return nodes[is_changed]
+
+    def _clear_lakes(self, lake_codes):
+        """Unmap lakes, along with any lakes that drain through them.
+
+        Lakes that share an outlet are unmapped together as each, when
+        mapped, sets the receiver of the outlet.
+
+        Returns
+        -------
+        ndarray of int
+            The nodes that were in the lakes.
+        """
+        lake_codes = list(lake_codes)
+        cleared = [np.empty(0, dtype=int)]
+        while lake_codes:
+            lake_code = lake_codes.pop()
+            if lake_code not in self._lakes:
+                continue
+            outlet_node, nodes_in_lake = self._forget_lake(lake_code)
+
+            self._save_lake_state(nodes_in_lake)
+            self._lake_map[nodes_in_lake] = self._grid.BAD_INDEX
+            self._depression_depth[nodes_in_lake] = 0.0
+            self._depression_outlet_map[nodes_in_lake] = self._grid.BAD_INDEX
+            self._flood_status[nodes_in_lake] = _UNFLOODED
+            if self._is_routed is not None:
+                self._is_routed[nodes_in_lake] = False
+                self._is_routed[outlet_node] = False
+
+            lake_codes.extend(self._lakes_at(nodes_in_lake))
+            lake_codes.extend(self._lakes_at_outlet.get(outlet_node, ()))
+            cleared.append(nodes_in_lake)
+        return np.concatenate(cleared)
+
+    def _remap_changed_depressions(self):
+        """Re-map only those lakes affected by elevation changes.
+
+        A lake from the previous call is kept, as is, if no node within two
+        nodes of it, or of its outlet, has changed elevation by more than the
+        tolerance since it was mapped. The other lakes are unmapped and the
+        pits near the changes mapped again. Should a kept lake, or its
+        outlet, then be within a node of a lake that changed, it is unmapped
+        as well and the mapping repeated, as the lakes may merge or drain
+        differently. Only the changed nodes, the re-mapped lakes and their
+        surroundings are visited.
+
+        Flow is routed across re-mapped lakes only. The receiver of the
+        outlet of a re-mapped lake can differ from that of a full re-mapping
+        when a kept lake, that would be mapped after it, borders the outlet.
+        Either receiver drains the lake.
+
+        Returns
+        -------
+        list of int
+            Codes of the lakes that were mapped.
+        """
+        changed = np.flatnonzero(np.abs(self._elev - self._last_elev) > self._tolerance)
+        self._last_elev[changed] = self._elev[changed]
+
+        # lakes are identified by their pit, so make sure those of kept lakes
+        # are still among the pits
+        pit_node_ids = self._pit_node_ids
+        lake_codes = np.fromiter(self._lakes, dtype=int, count=len(self._lakes))
+        self._pit_node_ids = as_id_array(np.union1d(pit_node_ids, lake_codes))
+        self._unique_pits = np.zeros_like(self._pit_node_ids, dtype=bool)
+
+        near_change = self._nodes_near(self._nodes_near(changed))
+        lakes_to_remap = self._lakes_at(near_change)
+        while True:
+            near_change = np.union1d(near_change, self._clear_lakes(lakes_to_remap))
+
+            pits = near_change[
+                self._is_pit[near_change]
+                & (self._flood_status[near_change] != _FLOODED)
+            ]
+            self._flood_status[pits] = _PIT
+            self._depression_outlets = []
+            for pit_node in pits:
+                if self._flood_status[pit_node] == _PIT:
+                    self.find_depression_from_pit(pit_node, self._reroute_flow)
+            remapped = [code for code in pits.tolist() if code in self._lakes]
+
+            reached = self._lakes_at(self._nodes_near(self._changed_lake_nodes()))
+            reached.difference_update(remapped)
+            if not reached:
+                break
+            lakes_to_remap = reached.union(remapped)
+
+        for nodes, *_ in self._saved:
+            self._is_saved[nodes] = False
+        self._saved = []
+
+        self._pits_flooded = len(remapped)
+        lake_codes = np.fromiter(self._lakes, dtype=int, count=len(self._lakes))
+        self._pit_node_ids = as_id_array(np.union1d(pit_node_ids, lake_codes))
+        self._number_of_pits = self._pit_node_ids.size
+        self._is_pit[lake_codes] = True
+        self._unique_pits = np.isin(self._pit_node_ids, lake_codes)
+        self._depression_outlets = np.full_like(
+            self._pit_node_ids, self._grid.BAD_INDEX
+        )
+        self._depression_outlets[self._unique_pits] = self._depression_outlet_map[
+            self._pit_node_ids[self._unique_pits]
+        ]
+        self._unique_lake_outlets = self.lake_outlets
+
+        return remapped
 
     def _find_unresolved_neighbors(self, nbrs, receivers):
         """Make and return list of neighbors of node with unresolved flow dir.
@@ -1082,18 +1362,37 @@ class DepressionFinderAndRouter(Component):
             counter += 1
             assert counter < self._grid.number_of_nodes, "inf loop in lake"
 
-    def _route_flow(self):
+    def _route_flow(self, lakes=None):
         """Route flow across lake flats.
 
         Route flow across lake flats, which have already been
         identified.
+
+        Parameters
+        ----------
+        lakes : iterable of tuple, optional
+            The lakes to route flow across, as
+            ``(outlet_node, lake_code, nodes_in_lake)``. The default is all
+            lakes.
         """
+        if lakes is None:
+            # Group the lake nodes by lake, once, rather than searching the
+            # whole grid for the nodes of each lake.
+            lake_nodes = np.where(self._lake_map != self._grid.BAD_INDEX)[0]
+            lake_nodes = lake_nodes[
+                np.argsort(self._lake_map[lake_nodes], kind="stable")
+            ]
+            codes_of_lake_nodes = self._lake_map[lake_nodes]
+            first = np.searchsorted(codes_of_lake_nodes, self.lake_codes)
+            last = np.searchsorted(codes_of_lake_nodes, self.lake_codes + 1)
+            lakes = zip(
+                self.lake_outlets,
+                self.lake_codes,
+                (lake_nodes[i:j] for i, j in zip(first, last)),
+            )
 
         # Process each lake.
-        for outlet_node, lake_code in zip(self.lake_outlets, self.lake_codes):
-
-            # Get the nodes in the lake
-            nodes_in_lake = np.where(self._lake_map == lake_code)[0]
+        for outlet_node, lake_code, nodes_in_lake in lakes:
             if len(nodes_in_lake) > 0:
 
                 # find the correct outlet for the lake, if necessary
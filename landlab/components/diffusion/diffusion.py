@@ -1,5 +1,5 @@
 #! /usr/env/python
-"""Component that models 2D diffusion using an explicit finite-volume method.
+"""Component that models 2D diffusion using a finite-volume method.
 
 Created July 2013 GT Last updated March 2016 DEJH with LL v1.0 component
 style
@@ -7,6 +7,9 @@ style
 
 
 import numpy as np
+import scipy.sparse as sparse
+from scipy.fft import dct, dst, idct, idst
+from scipy.sparse.linalg import splu
 
 from landlab import Component, FieldError, LinkStatus, NodeStatus, RasterModelGrid
 
@@ -34,6 +37,17 @@ class LinearDiffuser(Component):
     the diffusivity at each patch will be the mean vector sum of that at the
     bounding links.
 
+    By default, the component steps explicitly in time, dividing each time
+    step into as many substeps as are needed for stability. With
+    *implicit=True*, it instead takes a single backward-Euler step, which
+    is stable for any time step, by solving a linear system for the new
+    values at the core nodes. The system is factored once and reused for as
+    long as the time step, the diffusivities and the boundary conditions
+    stay the same. On a raster whose core nodes fill its interior, whose
+    diffusivity is uniform and whose opposite edges are either both
+    fixed-value or both closed (or fixed-gradient), the system is instead
+    solved with fast sine and cosine transforms.
+
     The primary method of this class is :func:`run_one_step`.
 
     Examples
@@ -91,6 +105,29 @@ class LinearDiffuser(Component):
     >>> np.all(z2[mg2.core_nodes] < z1[mg2.core_nodes])
     True
 
+    The implicit solver takes one step no matter how large the time step.
+    For small time steps it is close to the explicit solution.
+
+    >>> mg = RasterModelGrid((9, 9))
+    >>> z = mg.add_zeros("topographic__elevation", at="node")
+    >>> z.reshape((9, 9))[4, 4] = 1.
+    >>> mg.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    >>> ld = LinearDiffuser(mg, linear_diffusivity=1., implicit=True)
+    >>> for i in range(100):
+    ...     ld.run_one_step(0.01)
+    >>> z_implicit = z.copy()
+    >>> z[:] = 0.
+    >>> z.reshape((9, 9))[4, 4] = 1.
+    >>> ld = LinearDiffuser(mg, linear_diffusivity=1.)
+    >>> for i in range(100):
+    ...     ld.run_one_step(0.01)
+    >>> np.allclose(z_implicit, z, atol=0.005)
+    True
+    >>> ld = LinearDiffuser(mg, linear_diffusivity=1., implicit=True)
+    >>> ld.run_one_step(1.0e6)
+    >>> np.allclose(z[mg.core_nodes], 1. / 49.)
+    True
+
     References
     ----------
     **Required Software Citation(s) Specific to this Component**
@@ -135,7 +172,14 @@ class LinearDiffuser(Component):
         },
     }
 
-    def __init__(self, grid, linear_diffusivity=0.01, method="simple", deposit=True):
+    def __init__(
+        self,
+        grid,
+        linear_diffusivity=0.01,
+        method="simple",
+        deposit=True,
+        implicit=False,
+    ):
         """
         Parameters
         ----------
@@ -171,6 +215,10 @@ class LinearDiffuser(Component):
             fluvial detachment-limited incision with linear diffusion, the channels
             will not reach the predicted analytical solution unless deposit is set
             to False.
+        implicit : bool, optional
+            If True, take each time step with a single, unconditionally
+            stable, backward-Euler step rather than with explicit substeps.
+            Requires method='simple' and deposit=True.
         """
         super().__init__(grid)
 
@@ -218,6 +266,13 @@ class LinearDiffuser(Component):
 
         self._deposit = deposit
 
+        if implicit and method != "simple":
+            raise ValueError("implicit solver requires method='simple'")
+        if implicit and not deposit:
+            raise ValueError("implicit solver requires deposit=True")
+        self._implicit = bool(implicit)
+        self._implicit_key = None
+
         self._values_to_diffuse = "topographic__elevation"
 
         # Set internal time step
@@ -377,6 +432,7 @@ class LinearDiffuser(Component):
         )
         if self._use_diags:
             self._g.fill(0.0)
+        self._implicit_key = None
 
         if self._kd_on_links or self._use_patches:
             mg = self._grid
@@ -410,7 +466,8 @@ class LinearDiffuser(Component):
 
         If the imposed timestep dt is longer than the Courant-Friedrichs-Lewy
         condition for the diffusion, this timestep will be internally divided
-        as the component runs, as needed.
+        as the component runs, as needed, unless the component uses the
+        implicit solver.
 
         Parameters
         ----------
@@ -455,6 +512,10 @@ class LinearDiffuser(Component):
             kd_links = kd_links.copy()
             kd_links[self._grid.status_at_link == LinkStatus.INACTIVE] = 0.0
 
+        if self._implicit:
+            self._run_implicit(dt, kd_activelinks)
+            return
+
         # Take the smaller of delt or built-in time-step size self._dt
         self._tstep_ratio = dt / self._dt
         repeats = int(self._tstep_ratio // 1.0)
@@ -588,6 +649,147 @@ class LinearDiffuser(Component):
                 vals[self._fixed_grad_anchors] + self._fixed_grad_offsets
             )
 
+    def _run_implicit(self, dt, kd_activelinks):
+        """Take one backward-Euler step of length dt."""
+        grid = self._grid
+        z = grid.at_node[self._values_to_diffuse]
+        kd_activelinks = np.broadcast_to(kd_activelinks, grid.active_links.shape)
+
+        if (
+            self._implicit_key is None
+            or self._implicit_key[0] != dt
+            or not np.array_equal(self._implicit_key[1], kd_activelinks)
+        ):
+            self._build_implicit_solver(dt, kd_activelinks)
+            self._implicit_key = (dt, kd_activelinks.copy())
+
+        core_nodes = grid.node_at_core_cell
+        z[core_nodes] = self._implicit_solve(
+            z[core_nodes] + self._implicit_coupling.dot(z)
+        )
+        z[self._fixed_grad_nodes] = (
+            z[self._fixed_grad_anchors] + self._fixed_grad_offsets
+        )
+
+        self._g[grid.active_links] = grid.calc_grad_at_link(z)[grid.active_links]
+        self._qs[grid.active_links] = -kd_activelinks * self._g[grid.active_links]
+        grid.calc_flux_div_at_node(self._qs, out=self._dqsds)
+
+    def _build_implicit_solver(self, dt, kd_activelinks):
+        """Set up the linear system of a backward-Euler step.
+
+        The new values at the core nodes, *z_core*, solve::
+
+            A z_core = z_core_old + coupling . z_old
+
+        where *coupling* holds the fluxes from the boundary nodes. Sets
+        `_implicit_coupling` and `_implicit_solve`, a function that returns
+        the solution of the system for a given right-hand side.
+        """
+        grid = self._grid
+        core_nodes = grid.node_at_core_cell
+        row_at_node = np.full(grid.number_of_nodes, -1, dtype=int)
+        row_at_node[core_nodes] = np.arange(len(core_nodes))
+
+        links = grid.active_links
+        conductance = (
+            kd_activelinks
+            * grid.length_of_face[grid.face_at_link[links]]
+            / grid.length_of_link[links]
+        )
+
+        rows, cols, weights = [], [], []
+        for node, neighbor in (
+            (grid.node_at_link_tail[links], grid.node_at_link_head[links]),
+            (grid.node_at_link_head[links], grid.node_at_link_tail[links]),
+        ):
+            is_core = row_at_node[node] >= 0
+            rows.append(row_at_node[node[is_core]])
+            cols.append(neighbor[is_core])
+            weights.append(
+                dt
+                * conductance[is_core]
+                / grid.area_of_cell[grid.cell_at_node[node[is_core]]]
+            )
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        weights = np.concatenate(weights)
+
+        n_rows = len(core_nodes)
+        to_core = row_at_node[cols] >= 0
+        self._implicit_coupling = sparse.csr_matrix(
+            (weights[~to_core], (rows[~to_core], cols[~to_core])),
+            shape=(n_rows, grid.number_of_nodes),
+        )
+
+        self._implicit_solve = self._transform_solver(dt, kd_activelinks)
+        if self._implicit_solve is None:
+            matrix = sparse.diags(
+                1.0 + np.bincount(rows, weights=weights, minlength=n_rows)
+            ) - sparse.csr_matrix(
+                (weights[to_core], (rows[to_core], row_at_node[cols[to_core]])),
+                shape=(n_rows, n_rows),
+            )
+            self._implicit_solve = splu(matrix.tocsc()).solve
+
+    def _transform_solver(self, dt, kd_activelinks):
+        """Solver of a backward-Euler step that uses fast transforms.
+
+        Returns None unless the grid is a raster whose core nodes fill its
+        interior, the diffusivity is uniform, and the edges along each axis
+        are either both fixed-value (solved with a type-I sine transform)
+        or both closed or fixed-gradient (solved with a type-II cosine
+        transform).
+        """
+        grid = self._grid
+        if not isinstance(grid, RasterModelGrid) or min(grid.shape) < 3:
+            return None
+        shape = (grid.shape[0] - 2, grid.shape[1] - 2)
+        if grid.number_of_core_nodes != shape[0] * shape[1]:
+            return None
+        if len(kd_activelinks) == 0 or np.ptp(kd_activelinks) != 0.0:
+            return None
+        kd = kd_activelinks[0]
+
+        status = grid.status_at_node.reshape(grid.shape)
+        edges = (
+            (status[0, 1:-1], status[-1, 1:-1], grid.dy),
+            (status[1:-1, 0], status[1:-1, -1], grid.dx),
+        )
+        transforms = []
+        eigenvalues = []
+        for axis, (low, high, spacing) in enumerate(edges):
+            n_points = shape[axis]
+            edge_status = np.concatenate((low, high))
+            if np.all(edge_status == NodeStatus.FIXED_VALUE):
+                transforms.append((dst, idst, 1))
+                k = np.arange(1, n_points + 1)
+                angle = np.pi * k / (n_points + 1)
+            elif np.all(
+                (edge_status == NodeStatus.CLOSED)
+                | (edge_status == NodeStatus.FIXED_GRADIENT)
+            ):
+                transforms.append((dct, idct, 2))
+                angle = np.pi * np.arange(n_points) / n_points
+            else:
+                return None
+            eigenvalues.append((2.0 - 2.0 * np.cos(angle)) / spacing ** 2)
+
+        denominator = 1.0 + dt * kd * (
+            eigenvalues[0][:, np.newaxis] + eigenvalues[1][np.newaxis, :]
+        )
+
+        def solve(rhs):
+            values = rhs.reshape(shape)
+            for axis, (forward, _, kind) in enumerate(transforms):
+                values = forward(values, type=kind, axis=axis, norm="ortho")
+            values /= denominator
+            for axis, (_, inverse, kind) in enumerate(transforms):
+                values = inverse(values, type=kind, axis=axis, norm="ortho")
+            return values.reshape(-1)
+
+        return solve
+
     @property
     def time_step(self):
         """Returns internal time-step size (as a property)."""
@@ -189,8 +189,11 @@ class Flexure(Component):
             Effective elastic thickness (m).
         youngs : float, optional
             Young's modulus.
-        method : {'airy', 'flexure'}, optional
-            Method to use to calculate deflections.
+        method : {'airy', 'flexure', 'fft'}, optional
+            Method to use to calculate deflections. Both 'flexure' and
+            'fft' superpose the deflections of every loaded node; 'fft'
+            does so through a zero-padded FFT convolution, which is much
+            faster on large grids.
         rho_mantle : float, optional
             Density of the mantle (kg / m^3).
         gravity : float, optional
@@ -198,7 +201,7 @@ class Flexure(Component):
         n_procs : int, optional
             Number of processors to use for calculations.
         """
-        if method not in ("airy", "flexure"):
+        if method not in ("airy", "flexure", "fft"):
             raise ValueError("{method}: method not understood".format(method=method))
 
         super().__init__(grid)
@@ -212,10 +215,6 @@ class Flexure(Component):
 
         self.initialize_output_fields()
 
-        self._r = self._create_kei_func_grid(
-            self._grid.shape, (self._grid.dy, self._grid.dx), self.alpha
-        )
-
     @property
     def eet(self):
         """Effective elastic thickness (m)."""
@@ -229,6 +228,7 @@ class Flexure(Component):
         self._r = self._create_kei_func_grid(
             self._grid.shape, (self._grid.dy, self._grid.dx), self.alpha
         )
+        self._kei_spectrum = None
 
     @property
     def youngs(self):
@@ -272,6 +272,42 @@ class Flexure(Component):
 
         return kei(np.sqrt(dx ** 2 + dy ** 2) / alpha)
 
+    @staticmethod
+    def _create_kei_func_spectrum(r):
+        """Spectrum of the kei kernel for a zero-padded, circular convolution.
+
+        The kernel, *r*, gives the deflection at every distance (in rows and
+        columns) from a load. It is mirrored about both axes onto a grid of
+        shape ``(2 * n_rows - 1, 2 * n_cols - 1)`` so that a circular
+        convolution with a load padded to that shape does not wrap around.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab.components.flexure import Flexure
+        >>> r = np.arange(6.0).reshape((2, 3))
+        >>> spectrum = Flexure._create_kei_func_spectrum(r)
+        >>> np.fft.irfft2(spectrum, s=(3, 5))
+        array([[ 0.,  1.,  2.,  2.,  1.],
+               [ 3.,  4.,  5.,  5.,  4.],
+               [ 3.,  4.,  5.,  5.,  4.]])
+        """
+        n_rows, n_cols = r.shape
+        rows = np.arange(2 * n_rows - 1)
+        cols = np.arange(2 * n_cols - 1)
+        rows = np.minimum(rows, 2 * n_rows - 1 - rows)
+        cols = np.minimum(cols, 2 * n_cols - 1 - cols)
+
+        return np.fft.rfft2(r[np.ix_(rows, cols)])
+
+    def _get_kei_func_spectrum(self):
+        """Spectrum of the kei kernel, computed only when it is out of date."""
+        key = (self._eet, self._youngs, self.gamma_mantle, self._grid.shape)
+        if self._kei_spectrum is None or self._kei_spectrum_key != key:
+            self._kei_spectrum = self._create_kei_func_spectrum(self._r)
+            self._kei_spectrum_key = key
+        return self._kei_spectrum
+
     def update(self):
         """Update fields with current loading conditions."""
         load = self._grid.at_node["lithosphere__overlying_pressure_increment"]
@@ -306,6 +342,9 @@ class Flexure(Component):
         dz = out.reshape(self._grid.shape)
         load = loads.reshape(self._grid.shape)
 
+        if self.method == "fft":
+            return self._subside_loads_with_fft(load, out=out)
+
         from .cfuncs import subside_grid_in_parallel
 
         subside_grid_in_parallel(
@@ -318,3 +357,33 @@ class Flexure(Component):
         )
 
         return out
+
+    def _subside_loads_with_fft(self, loads, out):
+        """Subside surface due to multiple loads by FFT convolution.
+
+        Parameters
+        ----------
+        loads : ndarray of float
+            Loads applied to each grid node.
+        out : ndarray of float
+            Buffer to add resulting deflection values to.
+
+        Returns
+        -------
+        ndarray of float
+            Deflections caused by the loading.
+        """
+        n_rows, n_cols = self._grid.shape
+        padded_shape = (2 * n_rows - 1, 2 * n_cols - 1)
+
+        load_spectrum = np.fft.rfft2(
+            loads.reshape(self._grid.shape) * self._grid.dx * self._grid.dy,
+            s=padded_shape,
+        )
+        load_spectrum *= self._get_kei_func_spectrum()
+        w = np.fft.irfft2(load_spectrum, s=padded_shape)[:n_rows, :n_cols]
+
+        w *= -1.0 / (2.0 * np.pi * self.gamma_mantle * self.alpha ** 2)
+        out.reshape(self._grid.shape)[:] += w
+
+        return out
@@ -1,6 +1,7 @@
 from .flow_accum_bw import (
     find_drainage_area_and_discharge,
     flow_accumulation,
+    make_flow_structures_and_accumulate,
     make_ordered_node_array,
 )
 from .flow_accumulator import FlowAccumulator
@@ -12,4 +13,5 @@ __all__ = [
     "make_ordered_node_array",
     "find_drainage_area_and_discharge",
     "flow_accumulation",
+    "make_flow_structures_and_accumulate",
 ]
@@ -35,49 +35,51 @@ cpdef _add_to_stack(DTYPE_INT_t l, DTYPE_INT_t j,
 
 
 @cython.boundscheck(False)
-cpdef _accumulate_to_n(DTYPE_INT_t np, DTYPE_INT_t q,
-                       np.ndarray[DTYPE_INT_t, ndim=1] s,
-                       np.ndarray[DTYPE_INT_t, ndim=2] r,
-                       np.ndarray[DTYPE_FLOAT_t, ndim=2] p,
-                       np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
-                       np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+@cython.wraparound(False)
+cpdef _accumulate_to_n(DTYPE_INT_t n_nodes, DTYPE_INT_t q,
+                       const DTYPE_INT_t[:] s,
+                       const DTYPE_INT_t[:, :] r,
+                       const DTYPE_FLOAT_t[:, :] p,
+                       DTYPE_FLOAT_t[:] drainage_area,
+                       DTYPE_FLOAT_t[:] discharge):
     """
     Accumulates drainage area and discharge, permitting transmission losses.
+
+    Sums are in double precision and the GIL is released.
     """
-    cdef int donor, recvr, i, v
-    cdef float accum, proportion
+    cdef long donor, recvr, i, v
+    cdef double accum, proportion
 
-    # Iterate backward through the list, which means we work from upstream to
-    # downstream.
-    for i in range(np-1, -1, -1):
-        donor = s[i]
-        for v in range(q):
-            recvr = r[donor, v]
-            proportion = p[donor, v]
-            if proportion > 0.:
-                if donor != recvr:
-                    drainage_area[recvr] += proportion*drainage_area[donor]
-                    accum = discharge[recvr] + proportion*discharge[donor]
-                    if accum < 0.:
-                        accum = 0.
-                    discharge[recvr] = accum
+    with nogil:
+        # Iterate backward through the list, which means we work from
+        # upstream to downstream.
+        for i in range(n_nodes - 1, -1, -1):
+            donor = s[i]
+            for v in range(q):
+                recvr = r[donor, v]
+                proportion = p[donor, v]
+                if proportion > 0.:
+                    if donor != recvr:
+                        drainage_area[recvr] += proportion * drainage_area[donor]
+                        accum = discharge[recvr] + proportion * discharge[donor]
+                        if accum < 0.:
+                            accum = 0.
+                        discharge[recvr] = accum
 
 
 @cython.boundscheck(False)
-cpdef _accumulate_bw(DTYPE_INT_t np,
-                     np.ndarray[DTYPE_INT_t, ndim=1] s,
-                     np.ndarray[DTYPE_INT_t, ndim=1] r,
-                     np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
-                     np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
-    """
-    Accumulates drainage area and discharge, permitting transmission losses.
-    """
-    cdef int donor, recvr, i
-    cdef float accum
+@cython.wraparound(False)
+cdef void _accumulate_bw_nogil(long n_nodes,
+                               const DTYPE_INT_t[:] s,
+                               const DTYPE_INT_t[:] r,
+                               DTYPE_FLOAT_t[:] drainage_area,
+                               DTYPE_FLOAT_t[:] discharge) nogil:
+    cdef long donor, recvr, i
+    cdef double accum
 
     # Iterate backward through the list, which means we work from upstream to
     # downstream.
-    for i in range(np-1, -1, -1):
+    for i in range(n_nodes - 1, -1, -1):
         donor = s[i]
         recvr = r[donor]
         if donor != recvr:
@@ -88,6 +90,22 @@ cpdef _accumulate_bw(DTYPE_INT_t np,
             discharge[recvr] = accum
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _accumulate_bw(DTYPE_INT_t n_nodes,
+                     const DTYPE_INT_t[:] s,
+                     const DTYPE_INT_t[:] r,
+                     DTYPE_FLOAT_t[:] drainage_area,
+                     DTYPE_FLOAT_t[:] discharge):
+    """
+    Accumulates drainage area and discharge, permitting transmission losses.
+
+    Sums are in double precision and the GIL is released.
+    """
+    with nogil:
+        _accumulate_bw_nogil(n_nodes, s, r, drainage_area, discharge)
+
+
 @cython.boundscheck(False)
 cpdef _make_donors(DTYPE_INT_t np,
                    np.ndarray[DTYPE_INT_t, ndim=1] w,
@@ -120,3 +138,174 @@ cpdef _make_donors_to_n(DTYPE_INT_t np,
                 ind = delta[ri] + w[ri]
                 D[ind] = i
                 w[ri] += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef long _make_stack_bw_nogil(const DTYPE_INT_t[:] r,
+                               DTYPE_INT_t[:] delta,
+                               DTYPE_INT_t[:] D,
+                               DTYPE_INT_t[:] s,
+                               DTYPE_INT_t[:] w) nogil:
+    cdef long n_nodes = r.shape[0]
+    cdef long i, j, k, l, m, top
+
+    # number of donors of each node, summed into offsets to their donors
+    for i in range(n_nodes + 1):
+        delta[i] = 0
+    for i in range(n_nodes):
+        delta[r[i] + 1] += 1
+    for i in range(n_nodes):
+        delta[i + 1] += delta[i]
+
+    for i in range(n_nodes):
+        w[i] = delta[i]
+    for i in range(n_nodes):
+        D[w[r[i]]] = i
+        w[r[i]] += 1
+
+    # w is now free to be used as the stack of nodes still to visit
+    j = 0
+    for k in range(n_nodes):
+        if r[k] != k:
+            continue
+        w[0] = k
+        top = 1
+        while top > 0:
+            top -= 1
+            l = w[top]
+            s[j] = l
+            j += 1
+            for i in range(delta[l + 1] - 1, delta[l] - 1, -1):
+                m = D[i]
+                if m != l:
+                    w[top] = m
+                    top += 1
+
+    for i in range(j, n_nodes):
+        s[i] = 0
+
+    return j
+
+
+cpdef _make_stack_bw(const DTYPE_INT_t[:] r,
+                     DTYPE_INT_t[:] delta,
+                     DTYPE_INT_t[:] D,
+                     DTYPE_INT_t[:] s,
+                     DTYPE_INT_t[:] w):
+    """Builds delta, the donor array and the stack in one pass.
+
+    The stack is built depth first from each baselevel node, in the same
+    order as repeated calls to _add_to_stack, but without recursion. *w* is
+    scratch space, of the same length as *r*. Returns the number of nodes
+    in the stack.
+    """
+    cdef long n_stack
+
+    with nogil:
+        n_stack = _make_stack_bw_nogil(r, delta, D, s, w)
+
+    return n_stack
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _flow_accumulation_bw(const DTYPE_INT_t[:] r,
+                            const DTYPE_FLOAT_t[:] node_cell_area,
+                            const DTYPE_FLOAT_t[:] runoff,
+                            DTYPE_INT_t[:] delta,
+                            DTYPE_INT_t[:] D,
+                            DTYPE_INT_t[:] s,
+                            DTYPE_INT_t[:] w,
+                            DTYPE_FLOAT_t[:] drainage_area,
+                            DTYPE_FLOAT_t[:] discharge):
+    """
+    Builds delta, donors and the stack, and accumulates drainage area and
+    discharge, without allocating memory or holding the GIL.
+    """
+    cdef long n_nodes = r.shape[0]
+    cdef long n_stack, i
+
+    with nogil:
+        n_stack = _make_stack_bw_nogil(r, delta, D, s, w)
+
+        for i in range(n_nodes):
+            drainage_area[i] = node_cell_area[i]
+            discharge[i] = node_cell_area[i] * runoff[i]
+
+        _accumulate_bw_nogil(n_stack, s, r, drainage_area, discharge)
+
+        # nodes at channel heads can still be negative (and, like clip,
+        # replace -0. with 0.)
+        for i in range(n_nodes):
+            if discharge[i] <= 0.:
+                discharge[i] = 0.
+
+    return n_stack
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _make_stack_to_n(np.ndarray[DTYPE_INT_t, ndim=2] r,
+                       np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                       np.ndarray[DTYPE_INT_t, ndim=1] D,
+                       np.ndarray[DTYPE_INT_t, ndim=1] s,
+                       np.ndarray[DTYPE_INT_t, ndim=1] level,
+                       np.ndarray[DTYPE_INT_t, ndim=1] queue):
+    """Builds the route-to-n stack by a topological (Kahn) sort.
+
+    Nodes are visited outward from the baselevel nodes, a node being
+    queued once all of its receivers have been. The level of each node is
+    one more than the greatest level of its receivers (baselevel nodes are
+    at level 0, nodes that are never reached are at level -1). The stack
+    is the nodes ordered by level and then by ID. *level* is scratch space
+    of the same length as *s*, *queue* is scratch space one longer.
+    """
+    cdef long n_nodes = r.shape[0]
+    cdef long n_receivers = r.shape[1]
+    cdef long head = 0
+    cdef long tail = 0
+    cdef long i, v, c, d
+
+    # s holds the number of receivers not yet visited
+    for i in range(n_nodes):
+        level[i] = -1
+        s[i] = 0
+        for v in range(n_receivers):
+            if r[i, v] >= 0:
+                s[i] += 1
+
+    for i in range(n_nodes):
+        if r[i, 0] == i:
+            level[i] = 0
+            queue[tail] = i
+            tail += 1
+
+    while head < tail:
+        c = queue[head]
+        head += 1
+        for i in range(delta[c], delta[c + 1]):
+            d = D[i]
+            if level[d] == 0:
+                continue
+            if level[d] < level[c] + 1:
+                level[d] = level[c] + 1
+            s[d] -= 1
+            if s[d] == 0:
+                queue[tail] = d
+                tail += 1
+
+    # counting sort of the nodes by level, with queue holding the offset
+    # into the stack to each level
+    for i in range(n_nodes + 1):
+        queue[i] = 0
+    for i in range(n_nodes):
+        queue[level[i] + 1] += 1
+    c = 0
+    for i in range(n_nodes + 1):
+        d = queue[i]
+        queue[i] = c
+        c += d
+    for i in range(n_nodes):
+        s[queue[level[i] + 1]] = i
+        queue[level[i] + 1] += 1
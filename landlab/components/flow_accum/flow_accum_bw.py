@@ -22,13 +22,25 @@ If you simply want the ordered list by itself, use::
 
     s = make_ordered_node_array(r)
 
+If you want everything (the delta and donor arrays, the ordered list, drainage
+area and discharge) from a single pass, written into arrays that you reuse
+from one call to the next, use::
+
+    make_flow_structures_and_accumulate(r, out=(delta, D, s, a, q))
+
 Created: GT Nov 2013
 """
 import numpy
 
 from landlab.core.utils import as_id_array
 
-from .cfuncs import _accumulate_bw, _add_to_stack, _make_donors
+from .cfuncs import (
+    _accumulate_bw,
+    _add_to_stack,
+    _flow_accumulation_bw,
+    _make_donors,
+    _make_stack_bw,
+)
 
 
 class _DrainageStack:
@@ -196,17 +208,110 @@ def make_ordered_node_array(receiver_nodes):
     >>> s
     array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
     """
-    node_id = numpy.arange(receiver_nodes.size)
-    baselevel_nodes = numpy.where(node_id == receiver_nodes)[0]
-    nd = _make_number_of_donors_array(receiver_nodes)
-    delta = _make_delta_array(nd)
-    D = _make_array_of_donors(receiver_nodes, delta)
-    dstack = _DrainageStack(delta, D)
-    add_it = dstack.add_to_stack
-    for k in baselevel_nodes:
-        add_it(k)  # don't think this is a bottleneck, so no C++
+    receiver_nodes = as_id_array(receiver_nodes)
+    n_nodes = len(receiver_nodes)
+    delta = numpy.empty(n_nodes + 1, dtype=int)
+    D = numpy.empty(n_nodes, dtype=int)
+    s = numpy.empty(n_nodes, dtype=int)
+
+    _make_stack_bw(receiver_nodes, delta, D, s, numpy.empty(n_nodes, dtype=int))
+
+    return s
+
+
+def make_flow_structures_and_accumulate(
+    receiver_nodes, node_cell_area=1.0, runoff=1.0, out=None, work=None
+):
+
+    """Build the stack and accumulate drainage area and discharge in one pass.
 
-    return dstack.s
+    This does, in a single compiled call, the work of
+    :func:`_make_number_of_donors_array`, :func:`_make_delta_array`,
+    :func:`_make_array_of_donors`, :func:`make_ordered_node_array` and
+    :func:`find_drainage_area_and_discharge`. If arrays to hold the results
+    (and the scratch space) are provided, no memory is allocated.
+
+    Parameters
+    ----------
+    receiver_nodes : ndarray of int
+        Receiver IDs for each node.
+    node_cell_area : float or ndarray
+        Cell surface areas for each node.
+    runoff : float or ndarray
+        Local runoff rate at each cell (in water depth per time).
+    out : tuple of ndarray, optional
+        Arrays into which to write the delta array (of length one more than
+        the number of nodes, and of int), the donor array and stack (of int),
+        and drainage area and discharge (of float).
+    work : ndarray of int, optional
+        Scratch space, of the same length as *receiver_nodes*.
+
+    Returns
+    -------
+    tuple of ndarray
+        delta, donors, stack, drainage area and discharge.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import (
+    ...     make_flow_structures_and_accumulate)
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8]) - 1
+    >>> delta, D, s, a, q = make_flow_structures_and_accumulate(r)
+    >>> delta
+    array([ 0,  0,  2,  2,  2,  6,  7,  9, 10, 10, 10])
+    >>> D
+    array([0, 2, 1, 4, 5, 7, 6, 3, 8, 9])
+    >>> s
+    array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+    >>> a
+    array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
+
+    The same arrays can be used again.
+
+    >>> out = make_flow_structures_and_accumulate(
+    ...     r, runoff=2.0, out=(delta, D, s, a, q)
+    ... )
+    >>> out[4] is q
+    True
+    >>> q
+    array([  2.,   6.,   2.,   2.,  20.,   8.,   6.,   4.,   2.,   2.])
+    """
+    receiver_nodes = as_id_array(receiver_nodes)
+    n_nodes = len(receiver_nodes)
+
+    if out is None:
+        out = (
+            numpy.empty(n_nodes + 1, dtype=int),
+            numpy.empty(n_nodes, dtype=int),
+            numpy.empty(n_nodes, dtype=int),
+            numpy.empty(n_nodes, dtype=float),
+            numpy.empty(n_nodes, dtype=float),
+        )
+    if work is None:
+        work = numpy.empty(n_nodes, dtype=int)
+
+    node_cell_area = numpy.asarray(node_cell_area, dtype=float)
+    if node_cell_area.ndim == 0:
+        node_cell_area = numpy.full(n_nodes, node_cell_area)
+    runoff = numpy.asarray(runoff, dtype=float)
+    if runoff.ndim == 0:
+        runoff = numpy.full(n_nodes, runoff)
+
+    delta, D, s, drainage_area, discharge = out
+    _flow_accumulation_bw(
+        receiver_nodes,
+        node_cell_area,
+        runoff,
+        delta,
+        D,
+        s,
+        work,
+        drainage_area,
+        discharge,
+    )
+
+    return out
 
 
 def find_drainage_area_and_discharge(
@@ -268,8 +373,8 @@ def find_drainage_area_and_discharge(
     # out as the area of the cell in question, then (unless the cell has no
     # donors) grows from there. Discharge starts out as the cell's local runoff
     # rate times the cell's surface area.
-    drainage_area = numpy.zeros(np, dtype=int) + node_cell_area
-    discharge = numpy.zeros(np, dtype=int) + node_cell_area * runoff
+    drainage_area = numpy.zeros(np, dtype=float) + node_cell_area
+    discharge = numpy.zeros(np, dtype=float) + node_cell_area * runoff
 
     # Optionally zero out drainage area and discharge at boundary nodes
     if boundary_nodes is not None:
@@ -448,15 +553,19 @@ def flow_accumulation(
     array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
     """
 
-    s = as_id_array(make_ordered_node_array(receiver_nodes))
+    node_cell_area = numpy.broadcast_to(
+        numpy.asarray(node_cell_area, dtype=float), (len(receiver_nodes),)
+    ).copy()
+    if boundary_nodes is not None:
+        node_cell_area[boundary_nodes] = 0.0
+
+    _, _, s, a, q = make_flow_structures_and_accumulate(
+        receiver_nodes, node_cell_area, runoff_rate
+    )
     # Note that this ordering of s DOES INCLUDE closed nodes. It really shouldn't!
     # But as we don't have a copy of the grid accessible here, we'll solve this
     # problem as part of route_flow_dn.
 
-    a, q = find_drainage_area_and_discharge(
-        s, receiver_nodes, node_cell_area, runoff_rate, boundary_nodes
-    )
-
     return a, q, s
 
 
@@ -49,7 +49,7 @@ import numpy
 
 from landlab.core.utils import as_id_array
 
-from .cfuncs import _accumulate_to_n, _make_donors_to_n
+from .cfuncs import _accumulate_to_n, _make_donors_to_n, _make_stack_to_n
 
 
 class _DrainageStack_to_n:
@@ -62,7 +62,9 @@ class _DrainageStack_to_n:
     such that a given node is always located earlier in the list than all
     upstream nodes that contribute to it.
 
-    It is used by the make_ordered_node_array_to_n() function.
+    It was used by the make_ordered_node_array_to_n() function, which now
+    uses the compiled topological sort of :func:`_make_stack_from_donors_to_n`
+    instead.
     """
 
     def __init__(self, delta, D, num_receivers):
@@ -409,19 +411,74 @@ def make_ordered_node_array_to_n(receiver_nodes, receiver_proportion):
     >>> len(set([0, 3, 8])-set(s[6:9]))
     0
     """
-    node_id = numpy.arange(receiver_nodes.shape[0])
-    baselevel_nodes = numpy.where(node_id == receiver_nodes[:, 0])[0]
     nd = _make_number_of_donors_array_to_n(receiver_nodes, receiver_proportion)
     delta = _make_delta_array_to_n(nd)
     D = _make_array_of_donors_to_n(receiver_nodes, receiver_proportion, delta)
 
-    num_receivers = numpy.sum(receiver_nodes >= 0, axis=1)
+    return _make_stack_from_donors_to_n(receiver_nodes, delta, D)
 
-    dstack = _DrainageStack_to_n(delta, D, num_receivers)
-    construct_it = dstack.construct__stack
 
-    construct_it(baselevel_nodes)  # don't think this is a bottleneck, so no C++
-    return dstack.s
+def _make_stack_from_donors_to_n(r, delta, D):
+
+    """Create an array of node IDs ordered from downstream to upstream.
+
+    The nodes are sorted topologically (following Kahn's algorithm), working
+    upstream from the baselevel nodes. A node is added to the stack only
+    once all of its receivers have been. Nodes are ordered by the number of
+    steps they are upstream of baselevel (one more than the greatest number
+    of steps of any of their receivers) and then by ID. This is a valid
+    topological order, with every node after all of its receivers, but it
+    is not necessarily the same order as that of
+    _DrainageStack_to_n.construct__stack. Accumulating flow along either
+    stack gives the same drainage areas and discharges.
+
+    Parameters
+    ----------
+    r : ndarray size (np, q)
+        Receivers of each node.
+    delta : ndarray of int
+        Delta array.
+    D : ndarray of int
+        Donors of each node.
+
+    Returns
+    -------
+    ndarray of int
+        Node IDs, downstream to upstream.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_to_n import(
+    ... _make_stack_from_donors_to_n)
+    >>> r = np.array([[ 1,  2],
+    ...               [ 4,  5],
+    ...               [ 1,  5],
+    ...               [ 6,  2],
+    ...               [ 4, -1],
+    ...               [ 4, -1],
+    ...               [ 5,  7],
+    ...               [ 4,  5],
+    ...               [ 6,  7],
+    ...               [ 7,  8]])
+    >>> delta = np.array([ 0,  0,  2,  4,  4,  8,  12,  14, 17, 18, 18])
+    >>> D = np.array([0, 2, 0, 3, 1, 4, 5, 7, 6, 1, 2, 7, 3, 8, 9, 6, 8, 9])
+    >>> _make_stack_from_donors_to_n(r, delta, D)
+    array([4, 5, 1, 7, 2, 6, 0, 3, 8, 9])
+    """
+    n_nodes = r.shape[0]
+    s = numpy.empty(n_nodes, dtype=int)
+
+    _make_stack_to_n(
+        as_id_array(r),
+        as_id_array(delta),
+        as_id_array(D),
+        s,
+        numpy.empty(n_nodes, dtype=int),
+        numpy.empty(n_nodes + 1, dtype=int),
+    )
+
+    return s
 
 
 def find_drainage_area_and_discharge_to_n(
@@ -432,8 +489,9 @@ def find_drainage_area_and_discharge_to_n(
 
     Parameters
     ----------
-    s : ndarray of int
-        Ordered (downstream to upstream) array of node IDs
+    s : ndarray of int or None
+        Ordered (downstream to upstream) array of node IDs. If None, it is
+        created from r and p with make_ordered_node_array_to_n.
     r : ndarray size (np, q) where r[i, :] gives all receivers of node i. Each
         node recieves flow fom up to q donors.
     p : ndarray size (np, q) where p[i, v] give the proportion of flow going
@@ -499,9 +557,19 @@ def find_drainage_area_and_discharge_to_n(
     array([  1.    ,   2.575 ,   1.5   ,   1.    ,  10.    ,   5.2465,
              2.74  ,   2.845 ,   1.05  ,   1.    ])
     >>> q.round(4)
+    array([  1.    ,   2.575 ,   1.5   ,   1.    ,  10.    ,   5.2465,
+             2.74  ,   2.845 ,   1.05  ,   1.    ])
+
+    The stack can be made for you.
+
+    >>> a, q = find_drainage_area_and_discharge_to_n(None, r, p)
+    >>> a.round(4)
     array([  1.    ,   2.575 ,   1.5   ,   1.    ,  10.    ,   5.2465,
              2.74  ,   2.845 ,   1.05  ,   1.    ])
     """
+    if s is None:
+        s = make_ordered_node_array_to_n(r, p)
+
     # Number of points
     np = r.shape[0]
     q = r.shape[1]
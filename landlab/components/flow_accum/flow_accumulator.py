@@ -750,6 +750,11 @@ class FlowAccumulator(Component):
             self._delta_structure[:] = self._grid.BAD_INDEX
 
         self._D_structure = self._grid.BAD_INDEX * grid.ones(at="link", dtype=int)
+        # buffers that are reused, every time flow is accumulated, by the
+        # route-to-one (Braun and Willett) method
+        self._delta = np.empty(grid.number_of_nodes + 1, dtype=int)
+        self._donors = np.empty(grid.number_of_nodes, dtype=int)
+        self._stack_work = np.empty(grid.number_of_nodes, dtype=int)
         self._nodes_not_in_stack = True
 
         if len(self._kwargs) > 0:
@@ -821,7 +826,7 @@ class FlowAccumulator(Component):
         ...      flow_director='MFD')
         >>> fa.run_one_step()
         >>> fa.link_order_upstream()
-        array([ 5, 14, 10,  6, 11,  7, 23, 19, 15, 20, 16, 28, 24, 29, 25])
+        array([ 5, 10,  6, 14, 11,  7, 19, 15, 23, 20, 16, 28, 24, 29, 25])
         """
         downstream_links = self._grid["node"]["flow__link_to_receiver_node"][
             self._upstream_ordered_nodes
@@ -1108,20 +1113,29 @@ class FlowAccumulator(Component):
                 if self._flow_director._name == "FlowDirectorSteepest":
                     self._flow_director._determine_link_directions()
 
-            # step 3. Stack, D, delta construction
-            nd = as_id_array(flow_accum_bw._make_number_of_donors_array(r))
-            delta = as_id_array(flow_accum_bw._make_delta_array(nd))
-            D = as_id_array(flow_accum_bw._make_array_of_donors(r, delta))
-            s = as_id_array(flow_accum_bw.make_ordered_node_array(r))
+            # step 3. Stack, D, delta construction and
+            # step 4. Accumulate, in a single pass into reusable buffers
+            s = self._grid.at_node["flow__upstream_node_order"]
+            flow_accum_bw.make_flow_structures_and_accumulate(
+                r,
+                self._node_cell_area,
+                self._grid.at_node["water__unit_flux_in"],
+                out=(self._delta, self._donors, s, a, q),
+                work=self._stack_work,
+            )
 
             # put these in grid so that depression finder can use it.
             # store the generated data in the grid
-            self._grid.at_node["flow__data_structure_delta"][:] = delta[1:]
-            self._D_structure = D
-            self._grid.at_node["flow__upstream_node_order"][:] = s
+            self._grid.at_node["flow__data_structure_delta"][:] = self._delta[1:]
+            self._D_structure = self._donors
 
-            # step 4. Accumulate (to one or to N depending on direction method)
-            a[:], q[:] = self._accumulate_A_Q_to_one(s, r)
+            # components that accumulate differently (e.g. with losses)
+            # override this method
+            if (
+                type(self)._accumulate_A_Q_to_one
+                is not FlowAccumulator._accumulate_A_Q_to_one
+            ):
+                a[:], q[:] = self._accumulate_A_Q_to_one(s, r)
 
         else:
             # Get p
@@ -1131,14 +1145,13 @@ class FlowAccumulator(Component):
             nd = as_id_array(flow_accum_to_n._make_number_of_donors_array_to_n(r, p))
             delta = as_id_array(flow_accum_to_n._make_delta_array_to_n(nd))
             D = as_id_array(flow_accum_to_n._make_array_of_donors_to_n(r, p, delta))
-            s = as_id_array(flow_accum_to_n.make_ordered_node_array_to_n(r, p))
+            s = flow_accum_to_n._make_stack_from_donors_to_n(r, delta, D)
 
             # put theese in grid so that depression finder can use it.
             # store the generated data in the grid
             self._grid["node"]["flow__data_structure_delta"][:] = delta[1:]
             self._D_structure = D
 
-            self._grid["node"]["flow__upstream_node_order"][:] = s
             self._grid["node"]["flow__upstream_node_order"][:] = s
 
             # step 4. Accumulate (to one or to N depending on direction method)
@@ -5,6 +5,8 @@
 """
 
 import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.linalg import spsolve
 
 from landlab import Component, LinkStatus
 from landlab.grid.mappers import (
@@ -37,13 +39,20 @@ def get_link_hydraulic_conductivity(grid, K):
     K: (2x2) array of floats (m/s)
         The hydraulic conductivity tensor:
         [[Kxx, Kxy],[Kyx,Kyy]]
-    """
 
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> grid = RasterModelGrid((3, 3))
+    >>> K = np.array([[1e-4, 0.0], [0.0, 4e-4]])
+    >>> K_link = get_link_hydraulic_conductivity(grid, K)
+    >>> K_link[grid.horizontal_links]
+    array([ 0.0001,  0.0001,  0.0001,  0.0001,  0.0001,  0.0001])
+    >>> K_link[grid.vertical_links]
+    array([ 0.0004,  0.0004,  0.0004,  0.0004,  0.0004,  0.0004])
+    """
     u = grid.unit_vector_at_link
-    K_link = np.zeros(len(u))
-    for i in range(len(u)):
-        K_link[i] = np.dot(np.dot(u[i, :], K), u[i, :])
-    return K_link
+    return np.einsum("ij,jk,ik->i", u, K, u)
 
 
 class GroundwaterDupuitPercolator(Component):
@@ -152,6 +161,12 @@ class GroundwaterDupuitPercolator(Component):
     numerical solution. Flow discharge between neighboring nodes is calculated
     using the saturated thickness at the up-gradient node.
 
+    The ``run_with_implicit_solver`` method instead takes backward Euler
+    steps, which are stable for any time step. The nonlinear update is
+    solved for the water table at core nodes with Newton's method, holding
+    the fraction of excess water that seeps to the surface fixed within
+    each iteration.
+
     References
     ----------
     **Required Software Citation(s) Specific to this Component**
@@ -366,6 +381,10 @@ class GroundwaterDupuitPercolator(Component):
         self.courant_coefficient = courant_coefficient
         self.vn_coefficient = vn_coefficient
 
+        self._num_substeps = 0
+        self._num_iterations = 0
+        self._implicit_pattern = None
+
     @property
     def courant_coefficient(self):
         """Courant coefficient for adaptive time step.
@@ -473,6 +492,14 @@ class GroundwaterDupuitPercolator(Component):
 
         return self._num_substeps
 
+    @property
+    def number_of_iterations(self):
+        """
+        The number of Newton iterations used by the run_with_implicit_solver
+        method in the latest method call.
+        """
+        return self._num_iterations
+
     def calc_recharge_flux_in(self):
         """Calculate flux into the domain from recharge.
 
@@ -727,3 +754,267 @@ class GroundwaterDupuitPercolator(Component):
             self._num_substeps += 1
 
         self._qsavg[:] = qs_cumulative / dt
+
+    def _build_implicit_pattern(self):
+        """Build the sparsity pattern of the implicit solver's Jacobian.
+
+        The unknowns are the water table elevations at core nodes. Each
+        active link with a core node at one end adds to the diagonal entry
+        of the row of that node and, if the node at its other end is also a
+        core node, to an off-diagonal entry. The values of the entries
+        change with each iteration but the pattern does not.
+        """
+        grid = self._grid
+        n_cores = len(self._cores)
+
+        core_id = np.full(grid.number_of_nodes, -1, dtype=int)
+        core_id[self._cores] = np.arange(n_cores)
+
+        links = grid.active_links
+        node = np.concatenate(
+            (grid.node_at_link_tail[links], grid.node_at_link_head[links])
+        )
+        other = np.concatenate(
+            (grid.node_at_link_head[links], grid.node_at_link_tail[links])
+        )
+        link = np.concatenate((links, links))
+        node_is_tail = np.arange(len(node)) < len(links)
+
+        at_core = core_id[node] >= 0
+        node, other, link = node[at_core], other[at_core], link[at_core]
+        node_is_tail = node_is_tail[at_core]
+
+        # Conductance of each link, per unit transmissivity, as seen by the
+        # cell of the node at one of its ends.
+        coef = grid.length_of_face[grid.face_at_link[link]] / (
+            grid.length_of_link[link] * grid.cell_area_at_node[node]
+        )
+
+        row = core_id[node]
+        other_is_core = core_id[other] >= 0
+        rows = np.concatenate(
+            (np.arange(n_cores), row, row[other_is_core]),
+        )
+        cols = np.concatenate(
+            (np.arange(n_cores), row, core_id[other[other_is_core]]),
+        )
+        keys, slot = np.unique(rows * n_cores + cols, return_inverse=True)
+
+        self._implicit_pattern = {
+            "slot": slot,
+            "indices": keys % n_cores,
+            "indptr": np.searchsorted(keys // n_cores, np.arange(n_cores + 1)),
+            "node": node,
+            "other": other,
+            "link": link,
+            "row": row,
+            "coef": coef,
+            "node_is_tail": node_is_tail,
+            "other_is_core": other_is_core,
+        }
+
+    def run_with_implicit_solver(self, dt, tolerance=1e-8, max_iterations=50):
+        """
+        Advance component by one implicit (backward Euler) time step of size
+        dt. The time step is not limited by the stability conditions of the
+        explicit solvers, so it can be as long as the time step of the
+        forcing.
+
+        The water table at core nodes is found with Newton's method. Each
+        iteration linearizes the groundwater fluxes, which use the upwind
+        aquifer thickness, about the current estimate of the new water
+        table, holding fixed the fraction of the excess water at each node
+        that seeps to the surface, and solves the resulting sparse linear
+        system. Iterations stop once the water table changes by less than
+        *tolerance*. The sparsity pattern of the system is built once and
+        reused.
+
+        The fluxes are those at the end of the time step, and
+        average_surface_water__specific_discharge is set to the surface
+        water specific discharge.
+
+        Parameters
+        ----------
+        dt: float (time in seconds)
+            The imposed timestep.
+        tolerance: float (m)
+            Largest change in water table elevation between iterations at
+            which the solution is accepted.
+            Default = 1e-8
+        max_iterations: int
+            Maximum number of Newton iterations.
+            Default = 50
+
+        Raises
+        ------
+        ValueError
+            If *max_iterations* is less than one.
+        RuntimeError
+            If the water table has not converged after *max_iterations*
+            iterations.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import GroundwaterDupuitPercolator
+
+        A single cell drained by one open boundary reaches a steady state,
+        where the aquifer thickness is sqrt(R / K), in a few long steps.
+
+        >>> grid = RasterModelGrid(
+        ...     (3, 3), bc={"top": "closed", "left": "closed", "bottom": "closed"}
+        ... )
+        >>> _ = grid.add_zeros("aquifer_base__elevation", at="node")
+        >>> _ = grid.add_ones("topographic__elevation", at="node")
+        >>> gdp = GroundwaterDupuitPercolator(
+        ...     grid, recharge_rate=1.0e-8, hydraulic_conductivity=0.01
+        ... )
+        >>> for _ in range(5):
+        ...     gdp.run_with_implicit_solver(1e7)
+        >>> round(grid.at_node["aquifer__thickness"][4], 6)
+        0.001
+        """
+        if max_iterations < 1:
+            raise ValueError("max_iterations must be >= 1.")
+
+        grid = self._grid
+        cores = self._cores
+
+        # check water table above surface
+        if (self._wtable > self._elev).any():
+            self._wtable[self._wtable > self._elev] = self._elev[
+                self._wtable > self._elev
+            ]
+            self._thickness[cores] = self._wtable[cores] - self._base[cores]
+        self._thickness[self._thickness < 0] = 0.0
+
+        if self._implicit_pattern is None:
+            self._build_implicit_pattern()
+        pattern = self._implicit_pattern
+        node, other, link = pattern["node"], pattern["other"], pattern["link"]
+        row, coef = pattern["row"], pattern["coef"]
+        node_is_tail = pattern["node_is_tail"]
+        other_is_core = pattern["other_is_core"]
+        n_cores = len(cores)
+
+        # Calculate base gradient
+        self._base_grad[grid.active_links] = grid.calc_grad_at_link(self._base)[
+            grid.active_links
+        ]
+        cosa = np.cos(np.arctan(self._base_grad))
+
+        reg_thickness = self._elev - self._base
+        soil_present = reg_thickness > 0.0
+        rel_thickness = np.ones_like(self._elev)
+
+        storage_coef = self._n[cores] / dt
+        old_thickness = self._thickness.copy()
+        recharge = self._recharge[cores]
+
+        self._num_iterations = 0
+        for _ in range(max_iterations):
+            self._num_iterations += 1
+
+            # Transmissivity of links, using the upwind thickness, and its
+            # derivative with respect to the water table at the upwind node
+            wtable_at_node, wtable_at_other = self._wtable[node], self._wtable[other]
+            node_is_upwind = np.where(
+                node_is_tail,
+                wtable_at_node > wtable_at_other,
+                ~(wtable_at_other > wtable_at_node),
+            )
+            K_cos2 = (self.K * cosa ** 2)[link]
+            h_upwind = np.where(
+                node_is_upwind, self._thickness[node], self._thickness[other]
+            )
+            conductance = coef * K_cos2 * h_upwind
+            d_conductance = coef * K_cos2 * (h_upwind > 0.0)
+            drop = wtable_at_node - wtable_at_other
+
+            # Flux divergence at core nodes, and the fraction of the excess
+            # water that seeps to the surface (held fixed for the iteration)
+            dqdx = np.bincount(row, weights=conductance * drop, minlength=n_cores)
+            rel_thickness[soil_present] = np.minimum(
+                1, self._thickness[soil_present] / (reg_thickness[soil_present])
+            )
+            seepage_fraction = _regularize_G(rel_thickness[cores], self._r) * (
+                recharge - dqdx > 0.0
+            )
+            retained = 1.0 - seepage_fraction
+
+            # Residual of n (h - h_old) / dt = (1 - s) (R - div(q)), and
+            # its Jacobian with respect to the water table at core nodes
+            residual = storage_coef * (
+                self._thickness[cores] - old_thickness[cores]
+            ) - retained * (recharge - dqdx)
+
+            d_drop = retained[row] * d_conductance * drop
+            values = np.bincount(
+                pattern["slot"],
+                weights=np.concatenate(
+                    (
+                        storage_coef,
+                        retained[row] * conductance + d_drop * node_is_upwind,
+                        (-retained[row] * conductance + d_drop * ~node_is_upwind)[
+                            other_is_core
+                        ],
+                    )
+                ),
+                minlength=len(pattern["indices"]),
+            )
+            jacobian = sparse.csr_matrix(
+                (values, pattern["indices"], pattern["indptr"]),
+                shape=(n_cores, n_cores),
+            )
+
+            thickness = np.maximum(
+                self._thickness[cores] - spsolve(jacobian, residual), 0.0
+            )
+            change = np.max(np.abs(thickness - self._thickness[cores]), initial=0.0)
+
+            self._thickness[cores] = thickness
+            self._wtable[cores] = (self._base + self._thickness)[cores]
+
+            if change < tolerance:
+                break
+        else:
+            raise RuntimeError(
+                "water table did not converge to within {0} m in {1} "
+                "iterations (last change was {2} m)".format(
+                    tolerance, max_iterations, change
+                )
+            )
+
+        # Calculate hydraulic gradient, velocity and specific discharge at the
+        # end of the time step
+        self._hydr_grad[grid.active_links] = (
+            grid.calc_grad_at_link(self._wtable)[grid.active_links]
+            * cosa[grid.active_links]
+        )
+        self._vel[:] = -self.K * self._hydr_grad
+        self._vel[grid.status_at_link == LinkStatus.INACTIVE] = 0.0
+        hlink = (
+            map_value_at_max_node_to_link(
+                grid, "water_table__elevation", "aquifer__thickness"
+            )
+            * cosa
+        )
+        self._q[:] = hlink * self._vel
+        dqdx = grid.calc_flux_div_at_node(self._q)
+
+        # Surface water discharge and water table velocity from the mass
+        # balance of the time step
+        rel_thickness[soil_present] = np.minimum(
+            1, self._thickness[soil_present] / (reg_thickness[soil_present])
+        )
+        self._qs[:] = _regularize_G(rel_thickness, self._r) * _regularize_R(
+            self._recharge - dqdx
+        )
+        self._dhdt[:] = 0.0
+        self._dhdt[cores] = (self._thickness[cores] - old_thickness[cores]) / dt
+        self._qs[cores] = np.where(
+            seepage_fraction > 0.0,
+            _regularize_R(recharge - dqdx[cores] - self._n[cores] * self._dhdt[cores]),
+            0.0,
+        )
+        self._qsavg[:] = self._qs
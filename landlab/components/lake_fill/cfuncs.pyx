@@ -0,0 +1,467 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.math cimport fabs, nextafter
+from libc.stdlib cimport malloc, free
+
+from ...utils.ext.stable_heap cimport StableHeap
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+ctypedef np.uint8_t DTYPE_BOOL_t
+
+
+cdef double LARGE_ELEV = 9999999999.0
+cdef DTYPE_BOOL_t _CORE_NODE = 0
+cdef DTYPE_BOOL_t _CLOSED_NODE = 4
+
+_OVERFILL_MSG = (
+    "Pit is overfilled due to creation of two outlets as the minimum "
+    "gradient gets applied. Suppress this Error with the ignore_overfill "
+    "flag at component instantiation."
+)
+
+
+cdef class _PriorityFloodQueues:
+
+    """The open (stable, by elevation) and pit (by node ID) queues.
+
+    The open queue reproduces the ordering of a
+    :class:`~landlab.utils.StablePriorityQueue` (ties in elevation are broken
+    by insertion order) and the pit queue that of a :mod:`heapq` of node IDs,
+    so that the compiled fill visits nodes in exactly the same order as the
+    pure Python implementation. Each node enters one of the queues at most
+    once, so both are sized by the number of nodes.
+    """
+
+    cdef StableHeap open_queue
+    cdef long *pit_heap
+    cdef long n_pit
+
+    def __cinit__(self, long n_nodes):
+        self.open_queue = StableHeap(n_nodes)
+        self.pit_heap = <long *>malloc(n_nodes * sizeof(long))
+        if not self.pit_heap:
+            raise MemoryError()
+        self.n_pit = 0
+
+    def __dealloc__(self):
+        free(self.pit_heap)
+
+    cdef void push_pit(self, long node):
+        cdef long i = self.n_pit
+        cdef long parent
+
+        self.pit_heap[i] = node
+        self.n_pit += 1
+        while i > 0:
+            parent = (i - 1) >> 1
+            if self.pit_heap[i] < self.pit_heap[parent]:
+                self.pit_heap[i], self.pit_heap[parent] = (
+                    self.pit_heap[parent], self.pit_heap[i]
+                )
+                i = parent
+            else:
+                break
+
+    cdef long pop_pit(self):
+        cdef long top = self.pit_heap[0]
+        cdef long i = 0
+        cdef long child, smallest
+
+        self.n_pit -= 1
+        self.pit_heap[0] = self.pit_heap[self.n_pit]
+        while True:
+            smallest = i
+            child = 2 * i + 1
+            if child < self.n_pit and self.pit_heap[child] < self.pit_heap[smallest]:
+                smallest = child
+            child += 1
+            if child < self.n_pit and self.pit_heap[child] < self.pit_heap[smallest]:
+                smallest = child
+            if smallest == i:
+                break
+            self.pit_heap[i], self.pit_heap[smallest] = (
+                self.pit_heap[smallest], self.pit_heap[i]
+            )
+            i = smallest
+        return top
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def fill_to_flat(
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] fill_surface,
+    np.ndarray[DTYPE_INT_t, ndim=2] all_neighbors,
+    np.ndarray[DTYPE_BOOL_t, ndim=1] closed,
+    np.ndarray[DTYPE_INT_t, ndim=1] edges,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_at_node,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_nodes,
+):
+    """Priority-flood a surface to flat, labelling lakes by their outlet.
+
+    Parameters
+    ----------
+    fill_surface : ndarray of float, shape (n_nodes, )
+        The surface to fill. Modified in place.
+    all_neighbors : ndarray of int, shape (n_nodes, max_neighbors)
+        Neighbors of each node, padded with -1.
+    closed : ndarray of uint8, shape (n_nodes, )
+        Nodes that are not to be explored (e.g., closed boundaries). The
+        *edges* are closed by this function. Modified in place.
+    edges : ndarray of int
+        Nodes that seed the flood (the grid outlets).
+    lake_at_node : ndarray of int, shape (n_nodes, )
+        On return, the outlet of the lake each node belongs to, or -1.
+    lake_nodes : ndarray of int, shape (n_nodes, )
+        On return, the lake nodes in the order they were flooded.
+
+    Returns
+    -------
+    int
+        The number of flooded nodes (valid entries of *lake_nodes*).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components.lake_fill.cfuncs import fill_to_flat
+    >>> mg = RasterModelGrid((5, 6))
+    >>> for edge in ('left', 'top', 'bottom'):
+    ...     mg.status_at_node[mg.nodes_at_edge(edge)] = mg.BC_NODE_IS_CLOSED
+    >>> z = mg.node_x.max() - mg.node_x
+    >>> z[[10, 23]] = 1.1
+    >>> z[7] = 2.
+    >>> z[9] = 0.5
+    >>> z[15] = 0.3
+    >>> z[14] = 0.6
+    >>> z[22] = 0.9
+    >>> closed = (mg.status_at_node == mg.BC_NODE_IS_CLOSED).view(np.uint8)
+    >>> lake_at_node = np.empty(mg.number_of_nodes, dtype=int)
+    >>> lake_nodes = np.empty(mg.number_of_nodes, dtype=int)
+    >>> n_flooded = fill_to_flat(
+    ...     z, mg.adjacent_nodes_at_node, closed, np.array([11, 17, 23]),
+    ...     lake_at_node, lake_nodes,
+    ... )
+    >>> lake_nodes[:n_flooded]
+    array([15,  9, 14, 22,  7])
+    >>> lake_at_node[lake_nodes[:n_flooded]]
+    array([16, 16, 16, 16,  8])
+    """
+    cdef long n_nodes = fill_surface.shape[0]
+    cdef long n_neighbors = all_neighbors.shape[1]
+    cdef long n_edges = edges.shape[0]
+    cdef long outlet = -1
+    cdef long n_flooded = 0
+    cdef long i, c, n
+    cdef _PriorityFloodQueues queues = _PriorityFloodQueues(n_nodes)
+
+    lake_at_node[:] = -1
+
+    for i in range(n_edges):
+        queues.open_queue.push(edges[i], fill_surface[edges[i]])
+        closed[edges[i]] = True
+
+    while True:
+        if queues.n_pit > 0:
+            c = queues.pop_pit()
+            lake_at_node[c] = outlet
+            lake_nodes[n_flooded] = c
+            n_flooded += 1
+        elif queues.open_queue.size > 0:
+            c = queues.open_queue.pop()
+            outlet = c
+        else:
+            break
+
+        for i in range(n_neighbors):
+            n = all_neighbors[c, i]
+            if n == -1 or closed[n]:
+                continue
+            closed[n] = True
+            if fill_surface[n] <= fill_surface[c]:
+                fill_surface[n] = fill_surface[c]
+                queues.push_pit(n)
+            else:
+                queues.open_queue.push(n, fill_surface[n])
+
+    return n_flooded
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def fill_to_slant(
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] fill_surface,
+    np.ndarray[DTYPE_INT_t, ndim=2] all_neighbors,
+    np.ndarray[DTYPE_BOOL_t, ndim=1] closed,
+    np.ndarray[DTYPE_INT_t, ndim=1] edges,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_at_node,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_nodes,
+    ignore_overfill=False,
+):
+    """Priority-flood a surface to a minimally inclined, draining surface.
+
+    Lake nodes are raised to the next representable float above their
+    downstream neighbor so that flow routing can cross the filled surface.
+
+    Parameters
+    ----------
+    fill_surface : ndarray of float, shape (n_nodes, )
+        The surface to fill. Modified in place.
+    all_neighbors : ndarray of int, shape (n_nodes, max_neighbors)
+        Neighbors of each node, padded with -1.
+    closed : ndarray of uint8, shape (n_nodes, )
+        Nodes that are not to be explored (e.g., closed boundaries). The
+        *edges* are closed by this function. Modified in place.
+    edges : ndarray of int
+        Nodes that seed the flood (the grid outlets).
+    lake_at_node : ndarray of int, shape (n_nodes, )
+        On return, the outlet of the lake each node belongs to, or -1.
+    lake_nodes : ndarray of int, shape (n_nodes, )
+        On return, the lake nodes in the order they were flooded.
+    ignore_overfill : bool, optional
+        If False, raise a ValueError if the applied gradient would create a
+        second outlet for a pit.
+
+    Returns
+    -------
+    (int, bool)
+        The number of flooded nodes and whether any pit was overfilled.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components.lake_fill.cfuncs import fill_to_slant
+    >>> mg = RasterModelGrid((5, 6))
+    >>> for edge in ('left', 'top', 'bottom'):
+    ...     mg.status_at_node[mg.nodes_at_edge(edge)] = mg.BC_NODE_IS_CLOSED
+    >>> z = mg.zeros('node')
+    >>> z.reshape(mg.shape)[2, 1:-1] = [2., 1., 0.5, 1.5]
+    >>> z.reshape(mg.shape)[1, 1:-1] = [2.1, 1.1, 0.6, 1.6]
+    >>> z.reshape(mg.shape)[3, 1:-1] = [2.2, 1.2, 0.7, 1.7]
+    >>> closed = (mg.status_at_node == mg.BC_NODE_IS_CLOSED).view(np.uint8)
+    >>> lake_at_node = np.empty(mg.number_of_nodes, dtype=int)
+    >>> lake_nodes = np.empty(mg.number_of_nodes, dtype=int)
+    >>> n_flooded, overfilled = fill_to_slant(
+    ...     z, mg.adjacent_nodes_at_node, closed, np.array([11, 17, 23]),
+    ...     lake_at_node, lake_nodes,
+    ... )
+    >>> lake_nodes[:n_flooded]
+    array([15,  9,  8, 14, 20, 21])
+    >>> overfilled
+    False
+    """
+    cdef long n_nodes = fill_surface.shape[0]
+    cdef long n_neighbors = all_neighbors.shape[1]
+    cdef long n_edges = edges.shape[0]
+    cdef bint ignore = ignore_overfill
+    cdef bint overfilled = False
+    cdef long outlet = -1
+    cdef long n_flooded = 0
+    cdef double pit_top = LARGE_ELEV
+    cdef double large_tol = 1e-8 + 1e-5 * fabs(LARGE_ELEV)
+    cdef double nextval
+    cdef long i, c, n
+    cdef _PriorityFloodQueues queues = _PriorityFloodQueues(n_nodes)
+
+    lake_at_node[:] = -1
+
+    for i in range(n_edges):
+        queues.open_queue.push(edges[i], fill_surface[edges[i]])
+        closed[edges[i]] = True
+
+    while True:
+        if queues.n_pit > 0:
+            c = queues.pop_pit()
+            # same tolerance as numpy.isclose(pit_top, LARGE_ELEV)
+            if fabs(pit_top - LARGE_ELEV) <= large_tol:
+                pit_top = fill_surface[c]
+            lake_at_node[c] = outlet
+            lake_nodes[n_flooded] = c
+            n_flooded += 1
+        elif queues.open_queue.size > 0:
+            c = queues.open_queue.pop()
+            outlet = c
+            pit_top = LARGE_ELEV
+        else:
+            break
+
+        for i in range(n_neighbors):
+            n = all_neighbors[c, i]
+            if n == -1 or closed[n]:
+                continue
+            closed[n] = True
+            nextval = nextafter(fill_surface[c], LARGE_ELEV)
+            if fill_surface[n] <= nextval:
+                if pit_top < fill_surface[n] and nextval >= fill_surface[n]:
+                    if ignore:
+                        overfilled = True
+                    else:
+                        raise ValueError(_OVERFILL_MSG)
+                fill_surface[n] = nextval
+                queues.push_pit(n)
+            else:
+                queues.open_queue.push(n, fill_surface[n])
+
+    return n_flooded, overfilled
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def redirect_flow_in_lakes(
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] surface,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] fill_surface,
+    np.ndarray[DTYPE_BOOL_t, ndim=1] status_at_node,
+    np.ndarray[DTYPE_INT_t, ndim=2] all_neighbors,
+    np.ndarray[DTYPE_INT_t, ndim=2] links_to_neighbors,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] length_of_link,
+    np.ndarray[DTYPE_INT_t, ndim=1] outlets,
+    np.ndarray[DTYPE_INT_t, ndim=1] offset_to_lake,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_nodes,
+    np.ndarray[DTYPE_INT_t, ndim=1] receivers,
+    np.ndarray[DTYPE_INT_t, ndim=1] receiver_links,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] steepest_slopes,
+):
+    """Route flow across filled lakes toward their outlets.
+
+    This is the compiled equivalent of
+    :meth:`LakeMapperBarnes._redirect_flowdirs`. Lake nodes are explored
+    outward from each outlet in order of their elevation on the original
+    *surface*; each one drains to the node from which it was reached. The
+    outlet and any perimeter nodes that used to drain into the lake are
+    redirected along their steepest descent on *fill_surface*.
+
+    Parameters
+    ----------
+    surface : ndarray of float, shape (n_nodes, )
+        The surface before filling.
+    fill_surface : ndarray of float, shape (n_nodes, )
+        The filled surface.
+    status_at_node : ndarray of uint8, shape (n_nodes, )
+        Grid node boundary status.
+    all_neighbors : ndarray of int, shape (n_nodes, max_neighbors)
+        Neighbors of each node, padded with -1.
+    links_to_neighbors : ndarray of int, shape (n_nodes, max_neighbors)
+        The link (or diagonal) joining each node to each of *all_neighbors*.
+    length_of_link : ndarray of float
+        Length of each link (and diagonal).
+    outlets : ndarray of int, shape (n_lakes, )
+        Outlet of each lake.
+    offset_to_lake : ndarray of int, shape (n_lakes + 1, )
+        Offsets into *lake_nodes* to the nodes of each lake.
+    lake_nodes : ndarray of int
+        Nodes of each lake, stored contiguously.
+    receivers, receiver_links : ndarray of int, shape (n_nodes, )
+        Flow receiver of each node and the link to it. Modified in place.
+    steepest_slopes : ndarray of float, shape (n_nodes, )
+        Slope toward the receiver of each node. Modified in place.
+    """
+    cdef long n_nodes = surface.shape[0]
+    cdef long n_neighbors = all_neighbors.shape[1]
+    cdef long n_lakes = outlets.shape[0]
+    cdef long lake, outlet, i, j, c, n, link, n_liminal, liminal
+    cdef long min_node, min_link
+    cdef double min_elev, max_grad
+    cdef _PriorityFloodQueues queues = _PriorityFloodQueues(n_nodes)
+    # lake (0), lake margin (1), and closed (2)
+    cdef np.ndarray[np.int8_t, ndim=1] closed = np.ones(n_nodes, dtype=np.int8)
+    cdef long *liminal_nodes = <long *>malloc(n_nodes * sizeof(long))
+
+    if not liminal_nodes:
+        raise MemoryError()
+
+    try:
+        for i in range(n_nodes):
+            if status_at_node[i] != _CORE_NODE:
+                closed[i] = 2
+
+        for lake in range(n_lakes):
+            outlet = outlets[lake]
+            for i in range(offset_to_lake[lake], offset_to_lake[lake + 1]):
+                closed[lake_nodes[i]] = 0
+            n_liminal = 0
+            queues.open_queue.push(outlet, surface[outlet])
+
+            # the outlet may have drained *into* the lake, so send it to its
+            # lowest neighbor outside of the lake
+            if status_at_node[outlet] == _CORE_NODE:
+                min_elev = LARGE_ELEV
+                min_link = -1
+                for j in range(n_neighbors):
+                    n = all_neighbors[outlet, j]
+                    if (
+                        n == -1
+                        or closed[n] == 0
+                        or status_at_node[n] == _CLOSED_NODE
+                    ):
+                        continue
+                    if surface[n] < min_elev:
+                        min_elev = surface[n]
+                        min_node = n
+                        min_link = links_to_neighbors[outlet, j]
+                if min_link != -1:
+                    receivers[outlet] = min_node
+                    receiver_links[outlet] = min_link
+                    steepest_slopes[outlet] = (
+                        surface[outlet] - surface[min_node]
+                    ) / length_of_link[min_link]
+
+            while queues.open_queue.size > 0:
+                c = queues.open_queue.pop()
+                closed[c] = 2
+                for j in range(n_neighbors):
+                    n = all_neighbors[c, j]
+                    if n == -1 or closed[n] == 2:
+                        continue
+                    elif status_at_node[n] != _CORE_NODE:
+                        closed[n] = 2
+                    elif closed[n] == 0:
+                        receivers[n] = c
+                        receiver_links[n] = links_to_neighbors[c, j]
+                        steepest_slopes[n] = 0.0
+                        closed[n] = 2
+                        queues.open_queue.push(n, surface[n])
+                    elif c != outlet:
+                        # on the lake margin; its gradient is likely wrong
+                        closed[n] = 2
+                        liminal_nodes[n_liminal] = n
+                        n_liminal += 1
+
+            for i in range(n_liminal):
+                liminal = liminal_nodes[i]
+                min_elev = LARGE_ELEV
+                min_link = -1
+                for j in range(n_neighbors):
+                    n = all_neighbors[liminal, j]
+                    if n == -1 or status_at_node[n] == _CLOSED_NODE:
+                        continue
+                    if fill_surface[n] < min_elev:
+                        min_elev = fill_surface[n]
+                        min_node = n
+                        min_link = links_to_neighbors[liminal, j]
+                        max_grad = (
+                            fill_surface[liminal] - min_elev
+                        ) / length_of_link[min_link]
+                if min_link == -1:
+                    raise AssertionError(
+                        "no receiver found for node {0}".format(liminal)
+                    )
+                receivers[liminal] = min_node
+                receiver_links[liminal] = min_link
+                steepest_slopes[liminal] = max_grad
+
+            # reclose the lake
+            closed[outlet] = 1
+            for i in range(offset_to_lake[lake], offset_to_lake[lake + 1]):
+                closed[lake_nodes[i]] = 1
+            for i in range(n_liminal):
+                closed[liminal_nodes[i]] = 1
+    finally:
+        free(liminal_nodes)
@@ -18,14 +18,70 @@ import numpy as np
 
 from landlab import Component, NodeStatus, RasterModelGrid
 from landlab.components import FlowAccumulator
-from landlab.utils import StablePriorityQueue
 from landlab.utils.return_array import return_array_at_node
 
+from .cfuncs import fill_to_flat, fill_to_slant, redirect_flow_in_lakes
+
 LARGE_ELEV = 9999999999.0
 
 # TODO: Needs to have rerouting functionality...
 
 
+def _group_lake_nodes(lake_at_node, lake_nodes):
+    """Group flooded nodes by the outlet of their lake.
+
+    Parameters
+    ----------
+    lake_at_node : 1-D array of int of length nnodes
+        The outlet of the lake each node belongs to.
+    lake_nodes : 1-D array of int
+        The flooded nodes, in the order in which they were flooded.
+
+    Returns
+    -------
+    (outlets, offset_to_lake, nodes) : tuple of 1-D arrays of int
+        The outlet of each lake, in the order in which the lakes were first
+        flooded, and the nodes of each lake (in flood order) stored
+        contiguously such that the nodes of lake *i* are
+        ``nodes[offset_to_lake[i]:offset_to_lake[i + 1]]``.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.lake_fill.lake_fill_barnes import (
+    ...     _group_lake_nodes
+    ... )
+    >>> lake_at_node = np.array([-1, 5, 5, -1, 0, -1, 5])
+    >>> outlets, offset_to_lake, nodes = _group_lake_nodes(
+    ...     lake_at_node, np.array([6, 1, 4, 2])
+    ... )
+    >>> outlets
+    array([5, 0])
+    >>> offset_to_lake
+    array([0, 3, 4])
+    >>> nodes
+    array([6, 1, 2, 4])
+    """
+    outlet_of_node = lake_at_node[lake_nodes]
+    _, first_node, inverse, counts = np.unique(
+        outlet_of_node, return_index=True, return_inverse=True, return_counts=True
+    )
+    # number the lakes in the order they were first flooded
+    lake_order = np.argsort(first_node, kind="stable")
+    lake_rank = np.empty_like(lake_order)
+    lake_rank[lake_order] = np.arange(len(lake_order))
+
+    by_lake = np.argsort(lake_rank[inverse], kind="stable")
+    offset_to_lake = np.zeros(len(counts) + 1, dtype=int)
+    np.cumsum(counts[lake_order], out=offset_to_lake[1:])
+
+    return (
+        outlet_of_node[first_node[lake_order]],
+        offset_to_lake,
+        lake_nodes[by_lake],
+    )
+
+
 def _fill_one_node_to_flat(fill_surface, all_neighbors, pitq, openq, closedq, dummy):
     """Implements the Barnes et al. algorithm for a simple fill. Assumes the
     _open and _closed lists have already been updated per Barnes algos 2&3, lns
@@ -51,6 +107,7 @@ def _fill_one_node_to_flat(fill_surface, all_neighbors, pitq, openq, closedq, du
     --------
     >>> import numpy as np
     >>> from landlab import RasterModelGrid
+    >>> from landlab.utils import StablePriorityQueue
     >>> mg = RasterModelGrid((5, 6))
     >>> for edge in ('left', 'top', 'bottom'):
     ...     mg.status_at_node[mg.nodes_at_edge(edge)] = mg.BC_NODE_IS_CLOSED
@@ -334,6 +391,12 @@ class LakeMapperBarnes(Component):
         self._ignore_overfill = ignore_overfill
         self._overfill_flag = False
         self._track_lakes = track_lakes
+        self._lastcountforlakedict = -1  # lake_dict has not yet been built
+
+        # work arrays for the compiled flood, which labels each node with
+        # the outlet of its lake and records lake nodes in flood order
+        self._lake_labels = self._grid.empty("node", dtype=int)
+        self._lake_nodes = self._grid.empty("node", dtype=int)
 
         # get the neighbour call set up:
         if method not in {"Steepest", "D8"}:
@@ -427,6 +490,7 @@ class LakeMapperBarnes(Component):
                 self._neighbor_arrays = (self._grid.adjacent_nodes_at_node,)
                 self._link_arrays = (self._grid.links_at_node,)
                 self._neighbor_lengths = self._grid.length_of_link
+            self._alllinks = np.concatenate(self._link_arrays, axis=1)
 
         if reaccumulate_flow:
             if not redirect_flow_steepest_descent:
@@ -1658,9 +1722,6 @@ class LakeMapperBarnes(Component):
                     "to start this process."
                 )
                 raise NotImplementedError(msg)
-        # do the prep:
-        # create the StasblePriorityQueue locaslly to permit garbage collection
-        _open = StablePriorityQueue()
         # increment the run counter
         self._runcount = next(self._runcounter)
         # First get _fill_surface in order.
@@ -1671,49 +1732,57 @@ class LakeMapperBarnes(Component):
         if not self._dontredirect:
             orig_topo = self._track_original_surface()
         # now, return _closed to its initial cond, w only the BC_NODE_IS_CLOSED
-        # and grid draining nodes pre-closed:
+        # and grid draining nodes pre-closed (the flood closes the edges):
         closedq = self._closed.copy()
+        # the compiled flood works on float64; if fill_surface is anything
+        # else, work on a copy and write it back after.
+        fill_surface = np.ascontiguousarray(self._fill_surface, dtype=float)
+        if self._fill_flat:
+            n_flooded = fill_to_flat(
+                fill_surface,
+                self._allneighbors,
+                closedq.view(np.uint8),
+                self._edges,
+                self._lake_labels,
+                self._lake_nodes,
+            )
+        else:
+            n_flooded, overfilled = fill_to_slant(
+                fill_surface,
+                self._allneighbors,
+                closedq.view(np.uint8),
+                self._edges,
+                self._lake_labels,
+                self._lake_nodes,
+                ignore_overfill=self._ignore_overfill,
+            )
+            self._overfill_flag |= overfilled
+        if fill_surface is not self._fill_surface:
+            self._fill_surface[:] = fill_surface
         if self._track_lakes:
-            for edgenode in self._edges:
-                _open.add_task(edgenode, priority=self._surface[edgenode])
-            closedq[self._edges] = True
-            if self._fill_flat:
-                self._lakemappings = self._fill_to_flat_with_tracking(
-                    self._fill_surface, self._allneighbors, self._pit, _open, closedq,
-                )
-            else:
-                self._lakemappings = self._fill_to_slant_with_optional_tracking(
-                    self._fill_surface,
-                    self._allneighbors,
-                    self._pit,
-                    _open,
-                    closedq,
-                    ignore_overfill=self._ignore_overfill,
-                    track_lakes=True,
-                )
-            if not self._dontredirect:
-                self._redirect_flowdirs(orig_topo, self._lakemappings, _open)
-                if self._reaccumulate:
-                    _, _ = self._fa.accumulate_flow(update_flow_director=False)
-
-        else:  # not tracked
-            # note we've already checked _dontredirect is True in setup,
-            # so we don't need to worry about these cases.
-            for edgenode in self._edges:
-                _open.add_task(edgenode, priority=self._surface[edgenode])
-            closedq[self._edges] = True
-            while True:
-                try:
-                    self._fill_one_node(
-                        self._fill_surface,
-                        self._allneighbors,
-                        self._pit,
-                        _open,
-                        closedq,
-                        self._ignore_overfill,
-                    )
-                except KeyError:  # run out of nodes to fill...
-                    break
+            self._lakes = _group_lake_nodes(
+                self._lake_labels, self._lake_nodes[:n_flooded]
+            )
+
+        if not self._dontredirect:
+            outlets, offset_to_lake, lake_nodes = self._lakes
+            redirect_flow_in_lakes(
+                np.ascontiguousarray(orig_topo, dtype=float),
+                fill_surface,
+                self._grid.status_at_node,
+                self._allneighbors,
+                self._alllinks,
+                self._neighbor_lengths,
+                outlets,
+                offset_to_lake,
+                lake_nodes,
+                self._receivers,
+                self._receiverlinks,
+                self._steepestslopes,
+            )
+            self._grid.at_node["flow__sink_flag"][lake_nodes] = 0
+            if self._reaccumulate:
+                _, _ = self._fa.accumulate_flow(update_flow_director=False)
 
     @property
     def lake_dict(self):
@@ -1757,6 +1826,15 @@ class LakeMapperBarnes(Component):
         """
         if not self._track_lakes:
             raise ValueError("Enable tracking to access information about lakes")
+        if self._runcount > self._lastcountforlakedict:
+            outlets, offset_to_lake, nodes = self._lakes
+            self._lakemappings = {
+                outlet: deque(nodes[start:end].tolist())
+                for outlet, start, end in zip(
+                    outlets.tolist(), offset_to_lake[:-1], offset_to_lake[1:]
+                )
+            }
+            self._lastcountforlakedict = self._runcount
         return self._lakemappings
 
     @property
@@ -1799,7 +1877,7 @@ class LakeMapperBarnes(Component):
         """
         if not self._track_lakes:
             raise ValueError("Enable tracking to access information about lakes")
-        return list(self._lakemappings.keys())
+        return list(self.lake_dict.keys())
 
     @property
     def number_of_lakes(self):
@@ -1846,7 +1924,7 @@ class LakeMapperBarnes(Component):
         """
         if not self._track_lakes:
             raise ValueError("Enable tracking to access information about lakes")
-        return len(self._lakemappings)
+        return len(self.lake_dict)
 
     @property
     def lake_map(self):
@@ -1915,11 +1993,11 @@ class LakeMapperBarnes(Component):
         """
         if self._runcount > self._lastcountforlakemap:
             # things have changed since last call to lake_map
-            self._lake_map = np.full(
-                self._grid.number_of_nodes, self._grid.BAD_INDEX, dtype=int
+            if not self._track_lakes:
+                raise ValueError("Enable tracking to access information about lakes")
+            self._lake_map = np.where(
+                self._lake_labels == -1, self._grid.BAD_INDEX, self._lake_labels
             )
-            for (outlet, lakenodes) in self.lake_dict.items():
-                self._lake_map[lakenodes] = outlet
         else:
             pass  # old map is fine
         self._lastcountforlakemap = self._runcount
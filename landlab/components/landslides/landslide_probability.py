@@ -27,6 +27,8 @@ Last edit June 7, 2017
 """
 
 import copy
+from collections import deque
+from multiprocessing import Pool
 
 import numpy as np
 import scipy.constants
@@ -353,6 +355,9 @@ class LandslideProbability(Component):
         groundwater__recharge_standard_deviation=None,
         groundwater__recharge_HSD_inputs=[],
         seed=0,
+        vectorized=False,
+        chunk_size=2 ** 20,
+        n_procs=1,
     ):
         """
         Parameters
@@ -390,9 +395,26 @@ class LandslideProbability(Component):
             other than the default value of zero, it will create different
             sequence. To create a certain sequence repititively, use the same
             value as input for seed.
+        vectorized: bool, optional
+            If True, run the Monte Carlo simulation for many nodes at once,
+            in chunks, rather than node by node. Samples are then drawn from
+            a separate random-number generator for each chunk, seeded from
+            *seed*, and so differ from those of the node-by-node simulation.
+        chunk_size: int, optional
+            For a vectorized simulation, the maximum number of samples
+            (nodes times iterations) to draw at once. Memory use is roughly
+            100 bytes per sample. Results depend on this value, as it
+            decides the seed used for each node.
+        n_procs: int, optional
+            For a vectorized simulation, the number of processes over which
+            to spread the chunks. Results do not depend on this value.
         """
         # Initialize seeded random number generation
         self._seed_generator(seed)
+        self._seed = seed
+        self._vectorized = bool(vectorized)
+        self._chunk_size = int(chunk_size)
+        self._n_procs = int(n_procs)
 
         super().__init__(grid)
 
@@ -587,14 +609,17 @@ class LandslideProbability(Component):
         self._mean_Relative_Wetness = np.full(self._grid.number_of_nodes, -9999.0)
         self._prob_fail = np.full(self._grid.number_of_nodes, -9999.0)
         self._prob_sat = np.full(self._grid.number_of_nodes, -9999.0)
-        # Run factor of safety Monte Carlo for all core nodes in domain
-        # i refers to each core node id
-        for i in self._grid.core_nodes:
-            self.calculate_factor_of_safety(i)
-            # Populate storage arrays with calculated values
-            self._mean_Relative_Wetness[i] = self._soil__mean_relative_wetness
-            self._prob_fail[i] = self._landslide__probability_of_failure
-            self._prob_sat[i] = self._soil__probability_of_saturation
+        if self._vectorized:
+            self._calculate_landslide_probability_in_chunks()
+        else:
+            # Run factor of safety Monte Carlo for all core nodes in domain
+            # i refers to each core node id
+            for i in self._grid.core_nodes:
+                self.calculate_factor_of_safety(i)
+                # Populate storage arrays with calculated values
+                self._mean_Relative_Wetness[i] = self._soil__mean_relative_wetness
+                self._prob_fail[i] = self._landslide__probability_of_failure
+                self._prob_sat[i] = self._soil__probability_of_saturation
         # Values can't be negative
         self._mean_Relative_Wetness[self._mean_Relative_Wetness < 0.0] = 0.0
         self._prob_fail[self._prob_fail < 0.0] = 0.0
@@ -603,6 +628,93 @@ class LandslideProbability(Component):
         self._grid.at_node["landslide__probability_of_failure"] = self._prob_fail
         self._grid.at_node["soil__probability_of_saturation"] = self._prob_sat
 
+    def _calculate_landslide_probability_in_chunks(self):
+        """Run the Monte Carlo simulation for chunks of core nodes at once.
+
+        Core nodes are split into chunks of at most *chunk_size* samples,
+        each of which is given its own random-number generator spawned
+        from *seed* so that results are the same whether chunks are run
+        one after another or spread over a process pool.
+        """
+        core_nodes = self._grid.core_nodes
+        nodes_per_chunk = max(1, self._chunk_size // self._n)
+        chunks = [
+            core_nodes[start : start + nodes_per_chunk]
+            for start in range(0, len(core_nodes), nodes_per_chunk)
+        ]
+        seeds = np.random.SeedSequence(self._seed).spawn(len(chunks))
+
+        if self._n_procs > 1 and len(chunks) > 1:
+            # the parameters of a chunk are built only when it is submitted,
+            # and at most two chunks per process are in flight at once, to
+            # keep memory bounded
+            max_pending = 2 * self._n_procs
+            pending = deque()
+            with Pool(processes=self._n_procs) as pool:
+                for nodes, seed in zip(chunks, seeds):
+                    if len(pending) == max_pending:
+                        done, result = pending.popleft()
+                        self._store_chunk_result(done, result.get())
+                    pending.append(
+                        (
+                            nodes,
+                            pool.apply_async(
+                                _calculate_factor_of_safety_chunk,
+                                self._chunk_parameters(nodes) + (seed,),
+                            ),
+                        )
+                    )
+                for done, result in pending:
+                    self._store_chunk_result(done, result.get())
+        else:
+            for nodes, seed in zip(chunks, seeds):
+                self._store_chunk_result(
+                    nodes,
+                    _calculate_factor_of_safety_chunk(
+                        *self._chunk_parameters(nodes) + (seed,)
+                    ),
+                )
+
+    def _store_chunk_result(self, nodes, result):
+        mean_rel_wetness, prob_fail, prob_sat = result
+        self._mean_Relative_Wetness[nodes] = mean_rel_wetness
+        self._prob_fail[nodes] = prob_fail
+        self._prob_sat[nodes] = prob_sat
+
+    def _chunk_parameters(self, nodes):
+        """Arguments to *_calculate_factor_of_safety_chunk* for some nodes."""
+        at_node = self._grid.at_node
+        soil = {
+            "a": at_node["topographic__specific_contributing_area"][nodes],
+            "theta": at_node["topographic__slope"][nodes],
+            "T": at_node["soil__transmissivity"][nodes],
+            "Ksat": at_node["soil__saturated_hydraulic_conductivity"][nodes],
+            "Cmode": at_node["soil__mode_total_cohesion"][nodes],
+            "Cmin": at_node["soil__minimum_total_cohesion"][nodes],
+            "Cmax": at_node["soil__maximum_total_cohesion"][nodes],
+            "phi": at_node["soil__internal_friction_angle"][nodes],
+            "rho": at_node["soil__density"][nodes],
+            "hs": at_node["soil__thickness"][nodes],
+        }
+
+        if self._groundwater__recharge_distribution == "lognormal_spatial":
+            mean = self._recharge_mean[nodes]
+            stdev = self._recharge_stdev[nodes]
+            recharge = (
+                np.log(mean ** 2 / np.sqrt(stdev ** 2 + mean ** 2)),
+                np.sqrt(np.log(stdev ** 2 / mean ** 2 + 1)),
+            )
+        elif self._groundwater__recharge_distribution == "data_driven_spatial":
+            recharge = np.empty((len(nodes), self._n))
+            for row, i in enumerate(nodes):
+                self._calculate_HSD_recharge(i)
+                recharge[row] = self._Re
+            recharge /= 1000.0  # mm->m
+        else:
+            recharge = self._Re
+
+        return (soil, recharge, self._n, self._g, bool(self._Ksat_provided))
+
     def _seed_generator(self, seed=0):
         """Method to initiate random seed.
 
@@ -658,3 +770,106 @@ class LandslideProbability(Component):
             Re_adj = Re_temp * fract_temp
             store_Re = np.vstack((store_Re, np.array(Re_adj)))
         self._Re = np.sum(store_Re, 0)
+
+
+def _calculate_factor_of_safety_chunk(soil, recharge, n, g, ksat_provided, seed):
+    """Monte Carlo simulation of factor of safety for a chunk of nodes.
+
+    This is the vectorized equivalent of
+    :meth:`LandslideProbability.calculate_factor_of_safety`, with samples
+    stored as arrays of shape (number of nodes, *n*).
+
+    Parameters
+    ----------
+    soil : dict of ndarray
+        Topographic and soil properties at each node.
+    recharge : ndarray or tuple of ndarray
+        Recharge (m) for each iteration, either the same for all nodes or
+        one row per node, or the *mu* and *sigma* of a lognormal
+        distribution of recharge (mm) at each node.
+    n : int
+        Number of iterations.
+    g : float
+        Acceleration due to gravity.
+    ksat_provided : bool
+        If True, calculate transmissivity from hydraulic conductivity.
+    seed : int or SeedSequence
+        Seed for the random-number generator of this chunk.
+
+    Returns
+    -------
+    tuple of ndarray
+        Mean relative wetness, probability of failure, and probability of
+        saturation at each node.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.landslides.landslide_probability import (
+    ...     _calculate_factor_of_safety_chunk
+    ... )
+    >>> soil = dict(
+    ...     a=np.array([30.0, 900.0]), theta=np.array([0.2, 0.9]),
+    ...     T=np.array([10.0, 10.0]), Ksat=np.zeros(2),
+    ...     Cmode=np.array([500.0, 30.0]), Cmin=np.array([490.0, 25.0]),
+    ...     Cmax=np.array([510.0, 35.0]), phi=np.array([35.0, 26.0]),
+    ...     rho=np.array([2000.0, 2000.0]), hs=np.array([1.0, 5.0]),
+    ... )
+    >>> recharge = np.full(100, 0.02)
+    >>> _, prob_fail, prob_sat = _calculate_factor_of_safety_chunk(
+    ...     soil, recharge, 100, 9.81, False, 0
+    ... )
+    >>> prob_fail
+    array([ 0.,  1.])
+    >>> prob_sat
+    array([ 0.,  1.])
+    """
+    rng = np.random.default_rng(seed)
+    shape = (len(soil["a"]), n)
+
+    def triangular(mode, low, high):
+        return rng.triangular(
+            low[:, np.newaxis], mode[:, np.newaxis], high[:, np.newaxis], size=shape
+        )
+
+    if isinstance(recharge, tuple):
+        mu, sigma = recharge
+        Re = rng.lognormal(mu[:, np.newaxis], sigma[:, np.newaxis], size=shape)
+        Re /= 1000.0  # Convert mm to m
+    else:
+        Re = recharge
+
+    C = triangular(soil["Cmode"], soil["Cmin"], soil["Cmax"])
+    phi_mode = soil["phi"]
+    phi = triangular(phi_mode, phi_mode - 0.18 * phi_mode, phi_mode + 0.32 * phi_mode)
+    hs_mode = soil["hs"]
+    hs = triangular(hs_mode, hs_mode - 0.3 * hs_mode, hs_mode + 0.1 * hs_mode)
+    hs[hs <= 0.0] = 0.005
+    if ksat_provided:
+        Ksat_mode = soil["Ksat"]
+        T = triangular(
+            Ksat_mode, Ksat_mode - 0.3 * Ksat_mode, Ksat_mode + 0.1 * Ksat_mode
+        )
+        T *= hs
+    else:
+        T_mode = soil["T"]
+        T = triangular(T_mode, T_mode - 0.3 * T_mode, T_mode + 0.1 * T_mode)
+
+    slope_angle = np.arctan(soil["theta"])[:, np.newaxis]
+    sin_slope = np.sin(slope_angle)
+
+    # dimensionless cohesion
+    C /= hs * (soil["rho"][:, np.newaxis] * g)
+    rel_wetness = np.divide(Re, T, out=T)
+    rel_wetness *= soil["a"][:, np.newaxis] / sin_slope
+
+    prob_sat = np.count_nonzero(rel_wetness >= 1.0, axis=1) / n
+    np.minimum(rel_wetness, 1.0, out=rel_wetness)
+    mean_rel_wetness = rel_wetness.mean(axis=1)
+
+    Y = np.tan(np.radians(phi, out=phi), out=phi)
+    Y *= 1.0 - 0.5 * rel_wetness
+    FS = C / sin_slope + np.cos(slope_angle) * (Y / sin_slope)
+    prob_fail = np.count_nonzero(FS <= 1.0, axis=1) / n
+
+    return mean_rel_wetness, prob_fail, prob_sat
@@ -1,9 +1,23 @@
+import inspect
+
 import numpy as np
 import scipy.sparse as sparse
 import scipy.sparse.linalg as linalg
 
 from landlab import Component
 
+_ITERATIVE_SOLVERS = {
+    "bicgstab": linalg.bicgstab,
+    "gmres": linalg.gmres,
+    "lgmres": linalg.lgmres,
+}
+
+# scipy renamed the relative tolerance of its iterative solvers in v1.12
+if "rtol" in inspect.signature(linalg.bicgstab).parameters:
+    _RTOL_KEYWORD = "rtol"
+else:
+    _RTOL_KEYWORD = "tol"
+
 # Things to add: 1. Explicit stability check.
 # 2. Implicit handling of scenarios where kappa*dt exceeds critical step -
 #    subdivide dt automatically.
@@ -87,6 +101,8 @@ class PerronNLDiffuse(Component):
         S_crit=33.0 * np.pi / 180.0,
         rock_density=2700.0,
         sed_density=2700.0,
+        solver="direct",
+        solver_tolerance=1.0e-10,
     ):
         """
         Parameters
@@ -101,6 +117,14 @@ class PerronNLDiffuse(Component):
             The density of intact rock
         sed_density : float (kg*m**-3)
             The density of the mobile (sediment) layer
+        solver : {'direct', 'bicgstab', 'gmres', 'lgmres'}, optional
+            How to solve the linear system of each step. 'direct' uses a
+            sparse direct solver. The others are Jacobi-preconditioned
+            iterative solvers that start from the current elevations
+            (the solution of the previous step, plus any uplift), which
+            fall back to the direct solver if they do not converge.
+        solver_tolerance : float, optional
+            Relative tolerance of the iterative solvers.
         """
         super().__init__(grid)
 
@@ -110,6 +134,14 @@ class PerronNLDiffuse(Component):
         self._rock_density = rock_density
         self._sed_density = sed_density
         self._S_crit = S_crit
+        if solver != "direct" and solver not in _ITERATIVE_SOLVERS:
+            raise ValueError(
+                "{0}: solver not understood (must be one of {1})".format(
+                    solver, ", ".join(["direct"] + sorted(_ITERATIVE_SOLVERS))
+                )
+            )
+        self._solver = solver
+        self._solver_tolerance = solver_tolerance
         self._uplift = 0.0
         self._delta_x = grid.dx
         self._delta_y = grid.dy
@@ -145,85 +177,11 @@ class PerronNLDiffuse(Component):
         self._top_list = _top_list
 
         self._core_nodes = self._coreIDtoreal(np.arange(ncorenodes, dtype=int))
-        self._corenodesbyintIDs = self._realIDtointerior(self._core_nodes)
         self._ncorenodes = len(self._core_nodes)
-
-        self._corner_interior_IDs = self._realIDtointerior(self._interior_corners)
-        # ^i.e., interior corners as interior IDs
-        self._bottom_interior_IDs = self._realIDtointerior(np.array(_bottom_list))
-        self._top_interior_IDs = self._realIDtointerior(np.array(_top_list))
-        self._left_interior_IDs = self._realIDtointerior(np.array(_left_list))
-        self._right_interior_IDs = self._realIDtointerior(np.array(_right_list))
-
-        # build an ID map to let us easily map the variables of the core nodes
-        # onto the operating matrix:
-        # This array is ninteriornodes long, but the IDs it contains are
-        # REAL IDs
-        operating_matrix_ID_map = np.empty((ninteriornodes, 9))
         self._interior_IDs_as_real = self._interiorIDtoreal(np.arange(ninteriornodes))
-        for j in range(ninteriornodes):
-            i = self._interior_IDs_as_real[j]
-            operating_matrix_ID_map[j, :] = np.array(
-                [
-                    (i - ncols - 1),
-                    (i - ncols),
-                    (i - ncols + 1),
-                    (i - 1),
-                    i,
-                    (i + 1),
-                    (i + ncols - 1),
-                    (i + ncols),
-                    (i + ncols + 1),
-                ]
-            )
-        self._operating_matrix_ID_map = operating_matrix_ID_map
-        self._operating_matrix_core_int_IDs = self._realIDtointerior(
-            operating_matrix_ID_map[self._corenodesbyintIDs, :]
-        )
-        # ^shape(ncorenodes,9)
-        # see below for corner and edge maps
-
-        # Build masks for the edges and corners to be applied to the operating
-        # matrix map.
-        # Antimasks are the boundary nodes, masks are "normal"
-        self._topleft_mask = [1, 2, 4, 5]
-        topleft_antimask = [0, 3, 6, 7, 8]
-        self._topright_mask = [0, 1, 3, 4]
-        topright_antimask = [2, 5, 6, 7, 8]
-        self._bottomleft_mask = [4, 5, 7, 8]
-        bottomleft_antimask = [0, 1, 2, 3, 6]
-        self._bottomright_mask = [3, 4, 6, 7]
-        bottomright_antimask = [0, 1, 2, 5, 8]
-        self._corners_masks = np.vstack(
-            (
-                self._bottomleft_mask,
-                self._bottomright_mask,
-                self._topleft_mask,
-                self._topright_mask,
-            )
-        )
-        # ^(each_corner,mask_for_each_corner)
-        self._corners_antimasks = np.vstack(
-            (
-                bottomleft_antimask,
-                bottomright_antimask,
-                topleft_antimask,
-                topright_antimask,
-            )
-        )
-        # ^so shape becomes (4,5)
-        self._left_mask = [1, 2, 4, 5, 7, 8]
-        self._left_antimask = [0, 3, 6]
-        self._top_mask = [0, 1, 2, 3, 4, 5]
-        self._top_antimask = [6, 7, 8]
-        self._right_mask = [0, 1, 3, 4, 6, 7]
-        self._right_antimask = [2, 5, 8]
-        self._bottom_mask = [3, 4, 5, 6, 7, 8]
-        self._bottom_antimask = [0, 1, 2]
-        self._antimask_corner_position = [0, 2, 2, 4]
-        # ^this is the position w/i the corner antimasks that the true corner
-        # actually occupies
 
+        # Offsets from a node to the nodes of its nine-node stencil, from
+        # lower left to upper right
         self._modulator_mask = np.array(
             [-ncols - 1, -ncols, -ncols + 1, -1, 0, 1, ncols - 1, ncols, ncols + 1]
         )
@@ -330,39 +288,206 @@ class PerronNLDiffuse(Component):
 
         self._corner_flags = grid.status_at_node[[0, ncols - 1, -ncols, -1]]
 
-        op_mat_just_corners = self._operating_matrix_ID_map[
-            self._corner_interior_IDs, :
-        ]
-        op_mat_cnr0 = op_mat_just_corners[0, self._bottomleft_mask]
-        op_mat_cnr1 = op_mat_just_corners[1, self._bottomright_mask]
-        op_mat_cnr2 = op_mat_just_corners[2, self._topleft_mask]
-        op_mat_cnr3 = op_mat_just_corners[3, self._topright_mask]
-        op_mat_just_active_cnrs = np.vstack(
-            (op_mat_cnr0, op_mat_cnr1, op_mat_cnr2, op_mat_cnr3)
-        )
-        self._operating_matrix_corner_int_IDs = self._realIDtointerior(
-            op_mat_just_active_cnrs
-        )
-        # ^(4corners,4nodesactivepercorner)
-        self._operating_matrix_bottom_int_IDs = self._realIDtointerior(
-            self._operating_matrix_ID_map[self._bottom_interior_IDs, :][
-                :, self._bottom_mask
-            ]
-        )
-        # ^(nbottomnodes,6activenodeseach)
-        self._operating_matrix_top_int_IDs = self._realIDtointerior(
-            self._operating_matrix_ID_map[self._top_interior_IDs, :][:, self._top_mask]
-        )
-        self._operating_matrix_left_int_IDs = self._realIDtointerior(
-            self._operating_matrix_ID_map[self._left_interior_IDs, :][
-                :, self._left_mask
-            ]
+        self._build_operating_pattern()
+
+    def _build_operating_pattern(self):
+        """Build the sparsity pattern of the operating matrix.
+
+        Each entry of the operating matrix is the coefficient,
+        ``nine_node_map[node, k]``, of one of the nine stencil nodes of an
+        interior node. Stencil nodes in the interior fill the row of the
+        node directly. Stencil nodes on closed (or fixed-gradient) edges are
+        reflected back into the interior, and those on looped edges are
+        wrapped around to the opposite edge; their coefficients are scaled
+        by the time step. Stencil nodes on fixed-value (or fixed-gradient)
+        edges are moved to the right-hand side.
+
+        The pattern only depends on the boundary conditions, so it is built
+        once and each step just fills in the values.
+        """
+        mod = self._modulator_mask
+        c0, c1, c2, c3 = self._interior_corners
+        bottom = self._bottom_list
+        top = self._top_list
+        left = self._left_list
+        right = self._right_list
+
+        entries = []
+        rhs_terms = []
+
+        def add_entries(nodes, stencil, cols, reflected=True):
+            nodes, stencil = np.broadcast_arrays(
+                np.reshape(nodes, (-1, 1)), np.reshape(stencil, (1, -1))
+            )
+            cols = np.reshape(cols, nodes.shape)
+            entries.append(
+                (
+                    nodes.ravel(),
+                    stencil.ravel(),
+                    cols.ravel(),
+                    np.full(nodes.size, reflected),
+                )
+            )
+
+        def add_rhs_terms(nodes, stencil, fixed_gradient=False):
+            nodes, stencil = np.broadcast_arrays(
+                np.reshape(nodes, (-1, 1)), np.reshape(stencil, (1, -1))
+            )
+            rhs_terms.append(
+                (nodes.ravel(), stencil.ravel(), np.full(nodes.size, fixed_gradient))
+            )
+
+        def stencil_nodes(nodes, stencil):
+            return np.reshape(nodes, (-1, 1)) + mod[stencil]
+
+        # Stencil nodes in the interior
+        add_entries(
+            self._core_nodes,
+            np.arange(9),
+            stencil_nodes(self._core_nodes, np.arange(9)),
+            reflected=False,
+        )
+        for corner, stencil in zip(
+            self._interior_corners, ([4, 5, 7, 8], [3, 4, 6, 7], [1, 2, 4, 5], [0, 1, 3, 4])
+        ):
+            add_entries(
+                corner, stencil, stencil_nodes(corner, stencil), reflected=False
+            )
+        for edge, stencil in (
+            (bottom, [3, 4, 5, 6, 7, 8]),
+            (top, [0, 1, 2, 3, 4, 5]),
+            (left, [1, 2, 4, 5, 7, 8]),
+            (right, [0, 1, 3, 4, 6, 7]),
+        ):
+            add_entries(edge, stencil, stencil_nodes(edge, stencil), reflected=False)
+
+        # The true corners of the grid
+        for corner, flag, stencil in zip(
+            self._interior_corners, self._corner_flags, (0, 2, 6, 8)
+        ):
+            if flag == 1:
+                add_rhs_terms(corner, stencil)
+            elif flag == 2:
+                add_rhs_terms(corner, stencil, fixed_gradient=True)
+            elif flag != 4 and flag != 3:
+                raise NameError(
+                    """Sorry! This module cannot yet handle fixed
+                    gradient or looped BCs..."""
+                )
+
+        # Note that reflected true corners are all mapped next to the
+        # left-hand corner of their edge.
+        if self._bottom_flag == 1 or self._bottom_flag == 2:
+            is_fixed_gradient = self._bottom_flag == 2
+            add_rhs_terms(bottom, [0, 1, 2], is_fixed_gradient)
+            add_rhs_terms(c0, [1, 2], is_fixed_gradient)
+            add_rhs_terms(c1, [0, 1], is_fixed_gradient)
+        if self._bottom_flag == 4 or self._bottom_flag == 2:
+            add_entries(bottom, [0, 1, 2], stencil_nodes(bottom, [3, 4, 5]))
+            add_entries(c0, [1, 2], [c0, c0 + 1])
+            add_entries(c1, [0, 1], [c1 - 1, c1])
+            add_entries(c0, 0, c0 + 1)
+            add_entries(c1, 2, c0 + 1)
+        elif self._bottom_flag == 3:
+            add_entries(bottom, [0, 1, 2], stencil_nodes(top, [3, 4, 5]))
+            add_entries(c0, [1, 2], [c2, c2 + 1])
+            add_entries(c1, [0, 1], [c3 - 1, c3])
+            add_entries(c0, 0, c2 + 1)
+            add_entries(c1, 2, c2 + 1)
+        elif self._bottom_flag != 1:
+            raise NameError(
+                """Something is very wrong with your boundary
+                            conditions...!"""
+            )
+
+        if self._top_flag == 1 or self._top_flag == 2:
+            is_fixed_gradient = self._top_flag == 2
+            add_rhs_terms(top, [6, 7, 8], is_fixed_gradient)
+            add_rhs_terms(c2, [7, 8], is_fixed_gradient)
+            add_rhs_terms(c3, [6, 7], is_fixed_gradient)
+        if self._top_flag == 4 or self._top_flag == 2:
+            add_entries(top, [6, 7, 8], stencil_nodes(top, [3, 4, 5]))
+            add_entries(c2, [7, 8], [c2, c2 + 1])
+            add_entries(c3, [6, 7], [c3 - 1, c3])
+            add_entries(c2, 6, c2 + 1)
+            add_entries(c3, 8, c2 + 1)
+        elif self._top_flag == 3 and self._bottom_flag == 3:
+            add_entries(top, [6, 7, 8], stencil_nodes(bottom, [3, 4, 5]))
+            add_entries(c2, [7, 8], [c0, c0 + 1])
+            add_entries(c3, [6, 7], [c1 - 1, c1])
+            add_entries(c2, 6, c0 + 1)
+            add_entries(c3, 8, c0 + 1)
+        elif self._top_flag != 1:
+            raise NameError(
+                """Something is very wrong with your boundary
+                            conditions...!"""
+            )
+
+        if self._left_flag == 1 or self._left_flag == 2:
+            is_fixed_gradient = self._left_flag == 2
+            add_rhs_terms(left, [0, 3, 6], is_fixed_gradient)
+            add_rhs_terms(c0, [3, 6], is_fixed_gradient)
+            add_rhs_terms(c2, [0, 3], is_fixed_gradient)
+        if self._left_flag == 4 or self._left_flag == 2:
+            add_entries(left, [0, 3, 6], stencil_nodes(left, [1, 4, 7]))
+            add_entries(c0, [3, 6], [c0, c0 + self._ncols])
+            add_entries(c2, [0, 3], [c2 - self._ncols, c2])
+        elif self._left_flag == 3:
+            add_entries(left, [0, 3, 6], stencil_nodes(right, [1, 4, 7]))
+            add_entries(c0, [3, 6], [c1, c1 + self._ncols])
+            add_entries(c2, [0, 3], [c3 - self._ncols, c3])
+        elif self._left_flag != 1:
+            raise NameError(
+                """Something is very wrong with your boundary
+                            conditions...!"""
+            )
+
+        if self._right_flag == 1 or self._right_flag == 2:
+            is_fixed_gradient = self._right_flag == 2
+            add_rhs_terms(right, [2, 5, 8], is_fixed_gradient)
+            add_rhs_terms(c1, [5, 8], is_fixed_gradient)
+            add_rhs_terms(c3, [2, 5], is_fixed_gradient)
+        if self._right_flag == 4 or self._right_flag == 2:
+            add_entries(right, [2, 5, 8], stencil_nodes(right, [1, 4, 7]))
+            add_entries(c1, [5, 8], [c1, c1 + self._ncols])
+            add_entries(c3, [2, 5], [c3 - self._ncols, c3])
+        elif self._right_flag == 3 and self._left_flag == 3:
+            add_entries(right, [2, 5, 8], stencil_nodes(left, [1, 4, 7]))
+            add_entries(c1, [5, 8], [c0, c0 + self._ncols])
+            add_entries(c3, [2, 5], [c2 - self._ncols, c2])
+        elif self._right_flag != 1:
+            raise NameError(
+                """Something is very wrong with your boundary
+                            conditions...!"""
+            )
+
+        nodes, stencil, cols, reflected = (np.concatenate(x) for x in zip(*entries))
+        n_interior_nodes = self._ninteriornodes
+        keys, self._op_slot = np.unique(
+            self._realIDtointerior(nodes) * n_interior_nodes
+            + self._realIDtointerior(cols),
+            return_inverse=True,
         )
-        self._operating_matrix_right_int_IDs = self._realIDtointerior(
-            self._operating_matrix_ID_map[self._right_interior_IDs, :][
-                :, self._right_mask
-            ]
+        self._op_indices = keys % n_interior_nodes
+        self._op_indptr = np.searchsorted(
+            keys // n_interior_nodes, np.arange(n_interior_nodes + 1)
         )
+        self._op_node = nodes
+        self._op_stencil = stencil
+        self._op_is_reflected = reflected
+
+        if rhs_terms:
+            nodes, stencil, fixed_gradient = (
+                np.concatenate(x) for x in zip(*rhs_terms)
+            )
+        else:
+            nodes = stencil = np.empty(0, dtype=int)
+            fixed_gradient = np.empty(0, dtype=bool)
+        self._rhs_row = self._realIDtointerior(nodes)
+        self._rhs_node = nodes
+        self._rhs_stencil = stencil
+        self._rhs_boundary_node = nodes + mod[stencil]
+        self._rhs_is_fixed_gradient = fixed_gradient
 
     def _gear_timestep(self, timestep_in, new_grid):
         """This method allows the gearing between the model run step and the
@@ -416,14 +541,12 @@ class PerronNLDiffuse(Component):
     def _set_variables(self, grid):
         """This function sets the variables needed for update().
 
-        Now vectorized, shouold run faster. At the moment, this method
-        can only handle fixed value BCs.
+        The values of the operating matrix are refilled, in place of the
+        sparsity pattern built by :meth:`_build_operating_pattern`, from the
+        nine-node stencil of each interior node.
         """
         n_interior_nodes = grid.number_of_interior_nodes
 
-        # Initialize the local builder lists
-        _mat_RHS = np.zeros(n_interior_nodes)
-
         try:
             elev = grid["node"][self._values_to_diffuse]
         except KeyError:
@@ -443,27 +566,6 @@ class PerronNLDiffuse(Component):
         _kappa = self._kappa
         _b = self._b
         _S_crit = self._S_crit
-        _core_nodes = self._core_nodes
-        corenodesbyintIDs = self._corenodesbyintIDs
-        operating_matrix_core_int_IDs = self._operating_matrix_core_int_IDs
-        operating_matrix_corner_int_IDs = self._operating_matrix_corner_int_IDs
-        _interior_corners = self._interior_corners
-        corners_antimasks = self._corners_antimasks
-        corner_interior_IDs = self._corner_interior_IDs
-        modulator_mask = self._modulator_mask
-        corner_flags = self._corner_flags
-        bottom_interior_IDs = self._bottom_interior_IDs
-        top_interior_IDs = self._top_interior_IDs
-        left_interior_IDs = self._left_interior_IDs
-        right_interior_IDs = self._right_interior_IDs
-        bottom_antimask = self._bottom_antimask
-        _bottom_list = self._bottom_list
-        top_antimask = self._top_antimask
-        _top_list = self._top_list
-        left_antimask = self._left_antimask
-        _left_list = self._left_list
-        right_antimask = self._right_antimask
-        _right_list = self._right_list
 
         # Need to modify the "effective" values of the edge nodes if any of
         # the edges are inactive:
@@ -635,13 +737,6 @@ class PerronNLDiffuse(Component):
             )
         )
 
-        # Remember, the RHS is getting wiped each loop as part of
-        # self._set_variables()
-        # _mat_RHS is ninteriornodes long, but were only working on a
-        # ncorenodes long subset here
-        _mat_RHS[corenodesbyintIDs] += elev[_core_nodes] + _delta_t * (
-            _func_on_z[_core_nodes] - _equ_RHS_calc_frag[_core_nodes]
-        )
         low_row = (
             np.vstack((_F_iminus1jminus1, _F_iminus1j, _F_iminus1jplus1)) * -_delta_t
         )
@@ -651,727 +746,41 @@ class PerronNLDiffuse(Component):
         top_row = np.vstack((_F_iplus1jminus1, _F_iplus1j, _F_iplus1jplus1)) * -_delta_t
         nine_node_map = np.vstack((low_row, mid_row, top_row)).T
         # ^Note shape is (nnodes,9); it's realID indexed
-        core_op_mat_row = np.repeat(corenodesbyintIDs, 9)
-        core_op_mat_col = operating_matrix_core_int_IDs.astype(int).flatten()
-        core_op_mat_data = nine_node_map[_core_nodes, :].flatten()
 
-        # Now the interior corners; BL,BR,TL,TR
-        _mat_RHS[corner_interior_IDs] += elev[_interior_corners] + _delta_t * (
-            _func_on_z[_interior_corners] - _equ_RHS_calc_frag[_interior_corners]
-        )
-        corners_op_mat_row = np.repeat(self._corner_interior_IDs, 4)
-        corners_op_mat_col = operating_matrix_corner_int_IDs.astype(int).flatten()
-        corners_op_mat_data = nine_node_map[_interior_corners, :][
-            (np.arange(4).reshape((4, 1)), self._corners_masks)
-        ].flatten()
-        # ^1st index gives (4,9), 2nd reduces to (4,4), then flattened
-        for i in range(4):  # loop over each corner, as so few
-            # Note that this ONLY ADDS THE VALUES FOR THE TRUE GRID CORNERS.
-            # The sides get done in the edge tests, below.
-            if corner_flags[i] == 1:
-                true_corner = self._antimask_corner_position[i]
-                _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                    nine_node_map[_interior_corners[i], :][
-                        corners_antimasks[i, true_corner]
-                    ]
-                    * elev[
-                        _interior_corners[i]
-                        + modulator_mask[corners_antimasks[i, true_corner]]
-                    ]
-                )
-            elif corner_flags[i] == 4 or corner_flags[i] == 3:
-                # ^inactive boundary cell
-                # Actually the easiest case! Equivalent to fixed gradient,
-                # but the gradient is zero, so material only goes in the linked
-                # cell. And because it's a true corner, that linked cell
-                # doesn't appear in the interior matrix at all!
-                pass
-            elif corner_flags[i] == 2:
-                true_corner = self._antimask_corner_position[i]
-                _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                    nine_node_map[_interior_corners[i], :][
-                        corners_antimasks[i, true_corner]
-                    ]
-                    * self._fixed_gradient_offset_map[
-                        _interior_corners[i]
-                        + modulator_mask[corners_antimasks[i, true_corner]]
-                    ]
-                )
-            else:
-                raise NameError(
-                    """Sorry! This module cannot yet handle fixed
-                    gradient or looped BCs..."""
-                )
-            # Todo: handle these BCs properly, once the grid itself works with
-            # them.
-            # Can follow old routines; see self.set_bc_cell() commented out
-            # method below.
-
-        # Now the edges
-        _mat_RHS[bottom_interior_IDs] += elev[_bottom_list] + _delta_t * (
-            _func_on_z[_bottom_list] - _equ_RHS_calc_frag[_bottom_list]
-        )
-        _mat_RHS[top_interior_IDs] += elev[_top_list] + _delta_t * (
-            _func_on_z[_top_list] - _equ_RHS_calc_frag[_top_list]
-        )
-        _mat_RHS[left_interior_IDs] += elev[_left_list] + _delta_t * (
-            _func_on_z[_left_list] - _equ_RHS_calc_frag[_left_list]
-        )
-        _mat_RHS[right_interior_IDs] += elev[_right_list] + _delta_t * (
-            _func_on_z[_right_list] - _equ_RHS_calc_frag[_right_list]
-        )
-        bottom_op_mat_row = np.repeat(bottom_interior_IDs, 6)
-        top_op_mat_row = np.repeat(top_interior_IDs, 6)
-        left_op_mat_row = np.repeat(left_interior_IDs, 6)
-        right_op_mat_row = np.repeat(right_interior_IDs, 6)
-        bottom_op_mat_col = self._operating_matrix_bottom_int_IDs.astype(int).flatten()
-        top_op_mat_col = self._operating_matrix_top_int_IDs.astype(int).flatten()
-        left_op_mat_col = self._operating_matrix_left_int_IDs.astype(int).flatten()
-        right_op_mat_col = self._operating_matrix_right_int_IDs.astype(int).flatten()
-        bottom_op_mat_data = nine_node_map[_bottom_list, :][
-            :, self._bottom_mask
-        ].flatten()
-        top_op_mat_data = nine_node_map[_top_list, :][:, self._top_mask].flatten()
-        left_op_mat_data = nine_node_map[_left_list, :][:, self._left_mask].flatten()
-        right_op_mat_data = nine_node_map[_right_list, :][:, self._right_mask].flatten()
-
-        if self._bottom_flag == 1:
-            # goes to RHS only
-            _mat_RHS[bottom_interior_IDs] -= _delta_t * np.sum(
-                nine_node_map[_bottom_list, :][:, bottom_antimask]
-                * elev[
-                    _bottom_list.reshape((len(_bottom_list), 1))
-                    + (modulator_mask[bottom_antimask]).reshape((1, 3))
-                ],
-                axis=1,
-            )
-            # ^note the broadcasting to (nedge,3) in final fancy index
-            # ...& the corners
-            edges = [(1, 2), (0, 1), (0, 0), (0, 0)]
-            for i in [0, 1]:
-                edge_list = edges[i]
-                _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                    nine_node_map[_interior_corners[i], :][
-                        corners_antimasks[i, edge_list]
-                    ]
-                    * elev[
-                        _interior_corners[i]
-                        + modulator_mask[corners_antimasks[i, edge_list]]
-                    ]
-                )
-            # make dummy array objects for the x,y coords in coo creation of
-            # _operating_matrix
-            bottom_op_mat_row_add = np.empty(0)
-            bottom_op_mat_col_add = np.empty(0)
-            bottom_op_mat_data_add = np.empty(0)
-        elif self._bottom_flag == 4 or self._bottom_flag == 2:
-            # ^i.e., fixed zero gradient (4) or more general case...
-            bottom_op_mat_row_add = np.empty((bottom_interior_IDs.size * 3 + 6))
-            bottom_op_mat_col_add = np.empty((bottom_interior_IDs.size * 3 + 6))
-            bottom_op_mat_data_add = np.empty((bottom_interior_IDs.size * 3 + 6))
-            # Equivalent to fixed gradient, but the gradient is zero, so
-            # material only goes in the linked cell(i.e., each cell in the
-            # op_mat edges points back to itself).
-            bottom_op_mat_row_add[: (bottom_interior_IDs.size * 3)] = np.repeat(
-                bottom_interior_IDs, 3
-            )
-            bottom_op_mat_col_add[
-                : (bottom_interior_IDs.size * 3)
-            ] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._bottom_interior_IDs, :][
-                    :, self._bottom_mask[0:3]
-                ]
-            ).flatten()
-            bottom_op_mat_data_add[: (bottom_interior_IDs.size * 3)] = (
-                _delta_t
-                * (nine_node_map[_bottom_list, :][:, bottom_antimask]).flatten()
-            )
-            # ...& the corners
-            this_corner_coords = np.array([0, 1])
-            # order is bottom 2 lower left, bottom 2 lower right, lower left
-            # true corner, lower right true corner.
-            bottom_op_mat_row_add[-6:-2] = np.repeat(
-                corner_interior_IDs[this_corner_coords], 2
-            )
-            bottom_op_mat_col_add[-6:-2] = self._operating_matrix_corner_int_IDs[
-                this_corner_coords.reshape((2, 1)), this_corner_coords
-            ].flatten()
-            bottom_op_mat_row_add[-2:] = corner_interior_IDs[this_corner_coords]
-            bottom_op_mat_col_add[-2:] = self._operating_matrix_corner_int_IDs[
-                (this_corner_coords[0], this_corner_coords[0]),
-                (this_corner_coords[1], this_corner_coords[1]),
-            ].flatten()
-            bottom_op_mat_data_add[-6:-4] = (
-                _delta_t
-                * nine_node_map[_interior_corners[0], :][
-                    corners_antimasks[0, [1, 2]]
-                ].flatten()
-            )
-            bottom_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[1], :][
-                    corners_antimasks[1, [0, 1]]
-                ].flatten()
-            )
-            bottom_op_mat_data_add[-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[0], :][corners_antimasks[0, 0]]
-            )
-            bottom_op_mat_data_add[-1] = (
-                _delta_t
-                * nine_node_map[_interior_corners[1], :][corners_antimasks[1, 2]]
-            )
-            if self._bottom_flag == 2:
-                # Read the offsets from the map we made in the __init__,
-                # use them as constant terms, incorporated into RHS
-                _mat_RHS[bottom_interior_IDs] -= _delta_t * np.sum(
-                    nine_node_map[_bottom_list, :][:, bottom_antimask]
-                    * self._fixed_gradient_offset_map[
-                        _bottom_list.reshape((len(_bottom_list), 1))
-                        + (modulator_mask[bottom_antimask]).reshape((1, 3))
-                    ],
-                    axis=1,
-                )
-                # ^note the broadcasting to (nedge,3) in final fancy index
-                # ...& the corners
-                edges = [(1, 2), (0, 1), (0, 0), (0, 0)]
-                for i in [0, 1]:
-                    edge_list = edges[i]
-                    _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                        nine_node_map[_interior_corners[i], :][
-                            corners_antimasks[i, edge_list]
-                        ]
-                        * self._fixed_gradient_offset_map[
-                            _interior_corners[i]
-                            + modulator_mask[corners_antimasks[i, edge_list]]
-                        ]
-                    )
-        elif self._bottom_flag == 3:
-            # This will handle both top and bottom BCs...
-            bottom_op_mat_row_add = np.empty((bottom_interior_IDs.size * 3 + 6))
-            bottom_op_mat_col_add = np.empty((bottom_interior_IDs.size * 3 + 6))
-            bottom_op_mat_data_add = np.empty((bottom_interior_IDs.size * 3 + 6))
-            bottom_op_mat_row_add[: (bottom_interior_IDs.size * 3)] = np.repeat(
-                bottom_interior_IDs, 3
-            )
-            # ^...put the values in the same places in the operating matrix...
-            bottom_op_mat_col_add[
-                : (bottom_interior_IDs.size * 3)
-            ] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._top_interior_IDs, :][
-                    :, self._top_mask[3:6]
-                ]
-            ).flatten()
-            bottom_op_mat_data_add[: (bottom_interior_IDs.size * 3)] = (
-                _delta_t
-                * (nine_node_map[_bottom_list, :][:, bottom_antimask]).flatten()
-            )
-            # ^...but the values refer to the TOP of the grid
-            top_op_mat_row_add = np.empty((top_interior_IDs.size * 3 + 6))
-            top_op_mat_col_add = np.empty((top_interior_IDs.size * 3 + 6))
-            top_op_mat_data_add = np.empty((top_interior_IDs.size * 3 + 6))
-            top_op_mat_row_add[: (top_interior_IDs.size * 3)] = np.repeat(
-                top_interior_IDs, 3
-            )
-            top_op_mat_col_add[: (top_interior_IDs.size * 3)] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._bottom_interior_IDs, :][
-                    :, self._bottom_mask[0:3]
-                ]
-            ).flatten()
-            top_op_mat_data_add[: (top_interior_IDs.size * 3)] = (
-                _delta_t * (nine_node_map[_top_list, :][:, top_antimask]).flatten()
-            )
-            # & the corners
-            bottom_corner_coords = np.array([0, 1])
-            top_corner_coords = np.array([2, 3])
-            bottom_op_mat_row_add[-6:-2] = np.repeat(
-                corner_interior_IDs[bottom_corner_coords], 2
-            )
-            bottom_op_mat_col_add[-6:-2] = self._operating_matrix_corner_int_IDs[
-                top_corner_coords.reshape((2, 1)), top_corner_coords
-            ].flatten()
-            bottom_op_mat_row_add[-2:] = corner_interior_IDs[bottom_corner_coords]
-            bottom_op_mat_col_add[-2:] = self._operating_matrix_corner_int_IDs[
-                (top_corner_coords[0], top_corner_coords[0]),
-                (top_corner_coords[1], top_corner_coords[1]),
-            ].flatten()
-            bottom_op_mat_data_add[-6:-4] = (
-                _delta_t
-                * nine_node_map[_interior_corners[0], :][
-                    corners_antimasks[0, [1, 2]]
-                ].flatten()
-            )
-            bottom_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[1], :][
-                    corners_antimasks[1, [0, 1]]
-                ].flatten()
-            )
-            bottom_op_mat_data_add[-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[0], :][corners_antimasks[0, 0]]
-            )
-            bottom_op_mat_data_add[-1] = (
-                _delta_t
-                * nine_node_map[_interior_corners[1], :][corners_antimasks[1, 2]]
-            )
-            top_op_mat_row_add[-6:-2] = np.repeat(
-                corner_interior_IDs[top_corner_coords], 2
-            )
-            top_op_mat_col_add[-6:-2] = self._operating_matrix_corner_int_IDs[
-                bottom_corner_coords.reshape((2, 1)), bottom_corner_coords
-            ].flatten()
-            top_op_mat_row_add[-2:] = corner_interior_IDs[top_corner_coords]
-            top_op_mat_col_add[-2:] = self._operating_matrix_corner_int_IDs[
-                (bottom_corner_coords[0], bottom_corner_coords[0]),
-                (bottom_corner_coords[1], bottom_corner_coords[1]),
-            ].flatten()
-            top_op_mat_data_add[-6:-4] = (
-                _delta_t
-                * nine_node_map[_interior_corners[2], :][
-                    corners_antimasks[2, [3, 4]]
-                ].flatten()
-            )
-            top_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[3], :][
-                    corners_antimasks[3, [2, 3]]
-                ].flatten()
-            )
-            top_op_mat_data_add[-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[2], :][corners_antimasks[2, 2]]
-            )
-            top_op_mat_data_add[-1] = (
-                _delta_t
-                * nine_node_map[_interior_corners[3], :][corners_antimasks[3, 4]]
-            )
-        else:
-            raise NameError(
-                """Something is very wrong with your boundary
-                            conditions...!"""
-            )
-
-        if self._top_flag == 1:
-            # goes to RHS only
-            _mat_RHS[top_interior_IDs] -= _delta_t * np.sum(
-                nine_node_map[_top_list, :][:, top_antimask]
-                * elev[
-                    _top_list.reshape((len(_top_list), 1))
-                    + (modulator_mask[top_antimask]).reshape((1, 3))
-                ],
-                axis=1,
-            )
-            # ...& the corners
-            edges = [(0, 0), (0, 0), (3, 4), (2, 3)]
-            for i in [2, 3]:
-                edge_list = edges[i]
-                _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                    nine_node_map[_interior_corners[i], :][
-                        corners_antimasks[i, edge_list]
-                    ]
-                    * elev[
-                        _interior_corners[i]
-                        + modulator_mask[corners_antimasks[i, edge_list]]
-                    ]
-                )
-            top_op_mat_row_add = np.empty(0)
-            top_op_mat_col_add = np.empty(0)
-            top_op_mat_data_add = np.empty(0)
-        elif self._top_flag == 4 or self._top_flag == 2:
-            top_op_mat_row_add = np.empty((top_interior_IDs.size * 3 + 6))
-            top_op_mat_col_add = np.empty((top_interior_IDs.size * 3 + 6))
-            top_op_mat_data_add = np.empty((top_interior_IDs.size * 3 + 6))
-            # Equivalent to fixed gradient, but the gradient is zero, so
-            # material only goes in the linked cell(i.e., each cell in the
-            # op_mat edges points back to itself).
-            top_op_mat_row_add[: (top_interior_IDs.size * 3)] = np.repeat(
-                top_interior_IDs, 3
-            )
-            top_op_mat_col_add[: (top_interior_IDs.size * 3)] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._top_interior_IDs, :][
-                    :, self._top_mask[3:6]
-                ]
-            ).flatten()
-            top_op_mat_data_add[: (top_interior_IDs.size * 3)] = (
-                _delta_t * (nine_node_map[_top_list, :][:, top_antimask]).flatten()
-            )
-            # ...& the corners
-            this_corner_coords = np.array([2, 3])
-            top_op_mat_row_add[-6:-2] = np.repeat(
-                corner_interior_IDs[this_corner_coords], 2
-            )
-            top_op_mat_col_add[-6:-2] = self._operating_matrix_corner_int_IDs[
-                this_corner_coords.reshape((2, 1)), this_corner_coords
-            ].flatten()
-            top_op_mat_row_add[-2:] = corner_interior_IDs[this_corner_coords]
-            top_op_mat_col_add[-2:] = self._operating_matrix_corner_int_IDs[
-                (this_corner_coords[0], this_corner_coords[0]),
-                (this_corner_coords[1], this_corner_coords[1]),
-            ].flatten()
-            top_op_mat_data_add[-6:-4] = (
-                _delta_t
-                * nine_node_map[_interior_corners[2], :][
-                    corners_antimasks[2, [3, 4]]
-                ].flatten()
-            )
-            top_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[3], :][
-                    corners_antimasks[3, [2, 3]]
-                ].flatten()
-            )
-            top_op_mat_data_add[-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[2], :][corners_antimasks[2, 2]]
-            )
-            top_op_mat_data_add[-1] = (
-                _delta_t
-                * nine_node_map[_interior_corners[3], :][corners_antimasks[3, 4]]
-            )
-            if self._top_flag == 2:
-                _mat_RHS[top_interior_IDs] -= _delta_t * np.sum(
-                    nine_node_map[_top_list, :][:, top_antimask]
-                    * self._fixed_gradient_offset_map[
-                        _top_list.reshape((len(_top_list), 1))
-                        + (modulator_mask[top_antimask]).reshape((1, 3))
-                    ],
-                    axis=1,
-                )
-                # ...& the corners
-                edges = [(0, 0), (0, 0), (3, 4), (2, 3)]
-                for i in [2, 3]:
-                    edge_list = edges[i]
-                    _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                        nine_node_map[_interior_corners[i], :][
-                            corners_antimasks[i, edge_list]
-                        ]
-                        * self._fixed_gradient_offset_map[
-                            _interior_corners[i]
-                            + modulator_mask[corners_antimasks[i, edge_list]]
-                        ]
-                    )
-        elif self._top_flag == 3:
-            pass  # dealt with above
-        else:
-            raise NameError(
-                """Something is very wrong with your boundary
-                            conditions...!"""
-            )
-
-        if self._left_flag == 1:
-            # goes to RHS only
-            _mat_RHS[left_interior_IDs] -= _delta_t * np.sum(
-                nine_node_map[_left_list, :][:, left_antimask]
-                * elev[
-                    _left_list.reshape((len(_left_list), 1))
-                    + (modulator_mask[left_antimask]).reshape((1, 3))
-                ],
-                axis=1,
-            )
-            # ...& the corners
-            edges = [(3, 4), (0, 0), (0, 1), (0, 0)]
-            for i in [0, 2]:
-                edge_list = edges[i]
-                _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                    nine_node_map[_interior_corners[i], :][
-                        corners_antimasks[i, edge_list]
-                    ]
-                    * elev[
-                        _interior_corners[i]
-                        + modulator_mask[corners_antimasks[i, edge_list]]
-                    ]
-                )
-            left_op_mat_row_add = np.empty(0)
-            left_op_mat_col_add = np.empty(0)
-            left_op_mat_data_add = np.empty(0)
-        elif self._left_flag == 4 or self._left_flag == 2:
-            left_op_mat_row_add = np.empty((left_interior_IDs.size * 3 + 4))
-            left_op_mat_col_add = np.empty((left_interior_IDs.size * 3 + 4))
-            left_op_mat_data_add = np.empty((left_interior_IDs.size * 3 + 4))
-            # Equivalent to fixed gradient, but the gradient is zero, so
-            # material only goes in the linked cell(i.e., each cell in the
-            # op_mat edges points back to itself).
-            left_op_mat_row_add[: (left_interior_IDs.size * 3)] = np.repeat(
-                left_interior_IDs, 3
-            )
-            left_op_mat_col_add[
-                : (left_interior_IDs.size * 3)
-            ] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._left_interior_IDs, :][
-                    :, self._left_mask[::2]
-                ]
-            ).flatten()
-            left_op_mat_data_add[: (left_interior_IDs.size * 3)] = (
-                _delta_t * (nine_node_map[_left_list, :][:, left_antimask]).flatten()
-            )
-            # ...& the corners
-            this_corner_coords = np.array([0, 2])
-            left_op_mat_row_add[-4:] = np.repeat(
-                corner_interior_IDs[this_corner_coords], 2
-            )
-            left_op_mat_col_add[-4:] = self._operating_matrix_corner_int_IDs[
-                this_corner_coords.reshape((2, 1)), this_corner_coords
-            ].flatten()
-            left_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[0], :][
-                    corners_antimasks[0, [3, 4]]
-                ].flatten()
-            )
-            left_op_mat_data_add[-2:] = (
-                _delta_t
-                * nine_node_map[_interior_corners[2], :][
-                    corners_antimasks[2, [0, 1]]
-                ].flatten()
-            )
-            if self._left_flag == 2:
-                _mat_RHS[left_interior_IDs] -= _delta_t * np.sum(
-                    nine_node_map[_left_list, :][:, left_antimask]
-                    * self._fixed_gradient_offset_map[
-                        _left_list.reshape((len(_left_list), 1))
-                        + (modulator_mask[left_antimask]).reshape((1, 3))
-                    ],
-                    axis=1,
-                )
-                # ...& the corners
-                edges = [(3, 4), (0, 0), (0, 1), (0, 0)]
-                for i in [0, 2]:
-                    edge_list = edges[i]
-                    _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                        nine_node_map[_interior_corners[i], :][
-                            corners_antimasks[i, edge_list]
-                        ]
-                        * self._fixed_gradient_offset_map[
-                            _interior_corners[i]
-                            + modulator_mask[corners_antimasks[i, edge_list]]
-                        ]
-                    )
-        elif self._left_flag == 3:
-            left_op_mat_row_add = np.empty((left_interior_IDs.size * 3 + 4))
-            left_op_mat_col_add = np.empty((left_interior_IDs.size * 3 + 4))
-            left_op_mat_data_add = np.empty((left_interior_IDs.size * 3 + 4))
-            left_op_mat_row_add[: (left_interior_IDs.size * 3)] = np.repeat(
-                left_interior_IDs, 3
-            )
-            left_op_mat_col_add[
-                : (left_interior_IDs.size * 3)
-            ] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._right_interior_IDs, :][
-                    :, self._right_mask[1::2]
-                ]
-            ).flatten()
-            left_op_mat_data_add[: (left_interior_IDs.size * 3)] = (
-                _delta_t * (nine_node_map[_left_list, :][:, left_antimask]).flatten()
-            )
-            right_op_mat_row_add = np.empty((right_interior_IDs.size * 3 + 4))
-            right_op_mat_col_add = np.empty((right_interior_IDs.size * 3 + 4))
-            right_op_mat_data_add = np.empty((right_interior_IDs.size * 3 + 4))
-            right_op_mat_row_add[: (right_interior_IDs.size * 3)] = np.repeat(
-                right_interior_IDs, 3
-            )
-            right_op_mat_col_add[
-                : (right_interior_IDs.size * 3)
-            ] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._left_interior_IDs, :][
-                    :, self._left_mask[::2]
-                ]
-            ).flatten()
-            right_op_mat_data_add[: (right_interior_IDs.size * 3)] = (
-                _delta_t * (nine_node_map[_right_list, :][:, right_antimask]).flatten()
-            )
-            # & the corners
-            left_corner_coords = np.array([0, 2])
-            right_corner_coords = np.array([1, 3])
-            left_op_mat_row_add[-4:] = np.repeat(
-                corner_interior_IDs[left_corner_coords], 2
-            )
-            left_op_mat_col_add[-4:] = self._operating_matrix_corner_int_IDs[
-                right_corner_coords.reshape((2, 1)), right_corner_coords
-            ].flatten()
-            left_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[0], :][
-                    corners_antimasks[0, [3, 4]]
-                ].flatten()
-            )
-            left_op_mat_data_add[-2:] = (
-                _delta_t
-                * nine_node_map[_interior_corners[2], :][
-                    corners_antimasks[2, [0, 1]]
-                ].flatten()
-            )
-            right_op_mat_row_add[-4:] = np.repeat(
-                corner_interior_IDs[right_corner_coords], 2
-            )
-            right_op_mat_col_add[-4:] = self._operating_matrix_corner_int_IDs[
-                left_corner_coords.reshape((2, 1)), left_corner_coords
-            ].flatten()
-            right_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[1], :][
-                    corners_antimasks[1, [3, 4]]
-                ].flatten()
-            )
-            right_op_mat_data_add[-2:] = (
-                _delta_t
-                * nine_node_map[_interior_corners[3], :][
-                    corners_antimasks[3, [0, 1]]
-                ].flatten()
-            )
-        else:
-            raise NameError(
-                """Something is very wrong with your boundary
-                            conditions...!"""
-            )
-
-        if self._right_flag == 1:
-            # goes to RHS only
-            _mat_RHS[right_interior_IDs] -= _delta_t * np.sum(
-                nine_node_map[_right_list, :][:, right_antimask]
-                * elev[
-                    _right_list.reshape((len(_right_list), 1))
-                    + (modulator_mask[right_antimask]).reshape((1, 3))
-                ],
-                axis=1,
-            )
-            # ...& the corners
-            edges = [(0, 0), (3, 4), (0, 0), (0, 1)]
-            for i in [1, 3]:
-                edge_list = edges[i]
-                _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                    nine_node_map[_interior_corners[i], :][
-                        corners_antimasks[i, edge_list]
-                    ]
-                    * elev[
-                        _interior_corners[i]
-                        + modulator_mask[corners_antimasks[i, edge_list]]
-                    ]
-                )
-            right_op_mat_row_add = np.empty(0)
-            right_op_mat_col_add = np.empty(0)
-            right_op_mat_data_add = np.empty(0)
-        elif self._right_flag == 4 or self._right_flag == 2:
-            right_op_mat_row_add = np.empty((right_interior_IDs.size * 3 + 4))
-            right_op_mat_col_add = np.empty((right_interior_IDs.size * 3 + 4))
-            right_op_mat_data_add = np.empty((right_interior_IDs.size * 3 + 4))
-            # Equivalent to fixed gradient, but the gradient is zero, so
-            # material only goes in the linked cell(i.e., each cell in the
-            # op_mat edges points back to itself).
-            right_op_mat_row_add[: (right_interior_IDs.size * 3)] = np.repeat(
-                right_interior_IDs, 3
-            )
-            right_op_mat_col_add[
-                : (right_interior_IDs.size * 3)
-            ] = self._realIDtointerior(
-                self._operating_matrix_ID_map[self._right_interior_IDs, :][
-                    :, self._right_mask[1::2]
-                ]
-            ).flatten()
-            right_op_mat_data_add[: (right_interior_IDs.size * 3)] = (
-                _delta_t * (nine_node_map[_right_list, :][:, right_antimask]).flatten()
-            )
-            # ...& the corners
-            this_corner_coords = np.array([1, 3])
-            right_op_mat_row_add[-4:] = np.repeat(
-                corner_interior_IDs[this_corner_coords], 2
-            )
-            right_op_mat_col_add[-4:] = self._operating_matrix_corner_int_IDs[
-                this_corner_coords.reshape((2, 1)), this_corner_coords
-            ].flatten()
-            right_op_mat_data_add[-4:-2] = (
-                _delta_t
-                * nine_node_map[_interior_corners[1], :][
-                    corners_antimasks[1, [3, 4]]
-                ].flatten()
-            )
-            right_op_mat_data_add[-2:] = (
-                _delta_t
-                * nine_node_map[_interior_corners[3], :][
-                    corners_antimasks[3, [0, 1]]
-                ].flatten()
-            )
-            if self._right_flag == 2:
-                _mat_RHS[right_interior_IDs] -= _delta_t * np.sum(
-                    nine_node_map[_right_list, :][:, right_antimask]
-                    * self._fixed_gradient_offset_map[
-                        _right_list.reshape((len(_right_list), 1))
-                        + (modulator_mask[right_antimask]).reshape((1, 3))
-                    ],
-                    axis=1,
-                )
-                # ...& the corners
-                edges = [(0, 0), (3, 4), (0, 0), (0, 1)]
-                for i in [1, 3]:
-                    edge_list = edges[i]
-                    _mat_RHS[corner_interior_IDs[i]] -= _delta_t * np.sum(
-                        nine_node_map[_interior_corners[i], :][
-                            corners_antimasks[i, edge_list]
-                        ]
-                        * self._fixed_gradient_offset_map[
-                            _interior_corners[i]
-                            + modulator_mask[corners_antimasks[i, edge_list]]
-                        ]
-                    )
-        elif self._top_flag == 3:
-            pass  # dealt with above
-        else:
-            raise NameError(
-                """Something is very wrong with your boundary
-                            conditions...!"""
-            )
-
-        # new approach using COO sparse matrix requires we build the matrix
-        # only now...
-        self._operating_matrix = sparse.coo_matrix(
+        # Fill the values of the cached sparsity pattern (see
+        # _build_operating_pattern); duplicate entries are summed.
+        coefficients = nine_node_map[self._op_node, self._op_stencil]
+        coefficients[self._op_is_reflected] *= _delta_t
+        self._operating_matrix = sparse.csr_matrix(
             (
-                np.concatenate(
-                    (
-                        core_op_mat_data,
-                        corners_op_mat_data,
-                        bottom_op_mat_data,
-                        top_op_mat_data,
-                        left_op_mat_data,
-                        right_op_mat_data,
-                        bottom_op_mat_data_add,
-                        top_op_mat_data_add,
-                        left_op_mat_data_add,
-                        right_op_mat_data_add,
-                    )
-                ),
-                (
-                    np.concatenate(
-                        (
-                            core_op_mat_row,
-                            corners_op_mat_row,
-                            bottom_op_mat_row,
-                            top_op_mat_row,
-                            left_op_mat_row,
-                            right_op_mat_row,
-                            bottom_op_mat_row_add,
-                            top_op_mat_row_add,
-                            left_op_mat_row_add,
-                            right_op_mat_row_add,
-                        )
-                    ),
-                    np.concatenate(
-                        (
-                            core_op_mat_col,
-                            corners_op_mat_col,
-                            bottom_op_mat_col,
-                            top_op_mat_col,
-                            left_op_mat_col,
-                            right_op_mat_col,
-                            bottom_op_mat_col_add,
-                            top_op_mat_col_add,
-                            left_op_mat_col_add,
-                            right_op_mat_col_add,
-                        )
-                    ),
+                np.bincount(
+                    self._op_slot,
+                    weights=coefficients,
+                    minlength=self._op_indices.size,
                 ),
+                self._op_indices,
+                self._op_indptr,
             ),
             shape=(n_interior_nodes, n_interior_nodes),
-        ).tocsr()
+        )
+
+        interior_nodes = self._interior_IDs_as_real
+        _mat_RHS = elev[interior_nodes] + _delta_t * (
+            _func_on_z[interior_nodes] - _equ_RHS_calc_frag[interior_nodes]
+        )
+        if self._rhs_node.size > 0:
+            boundary_values = elev[self._rhs_boundary_node]
+            fixed_gradient = self._rhs_is_fixed_gradient
+            if np.any(fixed_gradient):
+                boundary_values[fixed_gradient] = self._fixed_grad_offset_map[
+                    self._rhs_boundary_node[fixed_gradient]
+                ]
+            _mat_RHS -= _delta_t * np.bincount(
+                self._rhs_row,
+                weights=nine_node_map[self._rhs_node, self._rhs_stencil]
+                * boundary_values,
+                minlength=n_interior_nodes,
+            )
         self._mat_RHS = _mat_RHS
 
     # These methods translate ID numbers between arrays of differing sizes
@@ -1426,6 +835,24 @@ class PerronNLDiffuse(Component):
         assert np.all(interior_ID < self._ninteriornodes)
         return interior_ID.astype(int)
 
+    def _solve(self, matrix, rhs):
+        """Solve the linear system of a step for the interior elevations."""
+        if self._solver == "direct":
+            return linalg.spsolve(matrix, rhs)
+
+        x0 = self._grid.at_node[self._values_to_diffuse][self._interior_IDs_as_real]
+        solution, info = _ITERATIVE_SOLVERS[self._solver](
+            matrix,
+            rhs,
+            x0=x0,
+            M=sparse.diags(1.0 / matrix.diagonal()),
+            atol=0.0,
+            **{_RTOL_KEYWORD: self._solver_tolerance}
+        )
+        if info != 0:
+            solution = linalg.spsolve(matrix, rhs)
+        return solution
+
     def run_one_step(self, dt):
         """Run the diffuser for one timestep, dt.
 
@@ -1445,7 +872,7 @@ class PerronNLDiffuse(Component):
                 # Initialize the variables for the step:
                 self._set_variables(self._grid)
                 # Solve interior of grid:
-                _interior_elevs = linalg.spsolve(self._operating_matrix, self._mat_RHS)
+                _interior_elevs = self._solve(self._operating_matrix, self._mat_RHS)
                 # this fn solves Ax=B for x
 
                 # Handle the BC cells; test common cases first for speed
@@ -0,0 +1,474 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.math cimport fabs, isfinite, pow, sqrt
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+cdef double _SEVEN_OVER_THREE = 7.0 / 3.0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _calc_depth_and_slope_at_links(
+    const DTYPE_INT_t[:] active_links,
+    const DTYPE_INT_t[:] node_at_link_tail,
+    const DTYPE_INT_t[:] node_at_link_head,
+    const DTYPE_FLOAT_t[:] length_of_link,
+    const DTYPE_FLOAT_t[:] z,
+    const DTYPE_FLOAT_t[:] h,
+    DTYPE_FLOAT_t[:] h_at_link,
+    DTYPE_FLOAT_t[:] slope_at_link,
+) nogil:
+    cdef long i, link, tail, head
+    cdef double w_tail, w_head
+
+    for i in range(active_links.shape[0]):
+        link = active_links[i]
+        tail = node_at_link_tail[link]
+        head = node_at_link_head[link]
+        w_tail = h[tail] + z[tail]
+        w_head = h[head] + z[head]
+        h_at_link[link] = max(w_tail, w_head) - max(z[tail], z[head])
+        slope_at_link[link] = (w_head - w_tail) / length_of_link[link]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _calc_discharge_at_links(
+    const DTYPE_INT_t[:] links,
+    const DTYPE_INT_t[:] neighbor_before,
+    const DTYPE_INT_t[:] neighbor_after,
+    const DTYPE_FLOAT_t[:] q_old,
+    const DTYPE_FLOAT_t[:] h_at_link,
+    const DTYPE_FLOAT_t[:] slope_at_link,
+    const DTYPE_FLOAT_t[:] mannings_n,
+    DTYPE_FLOAT_t[:] q,
+    double dt,
+    double g,
+    double theta,
+) nogil:
+    cdef long i, link
+    cdef double q_before, q_after, n
+
+    for i in range(links.shape[0]):
+        link = links[i]
+        q_before = q_old[neighbor_before[i]] if neighbor_before[i] >= 0 else 0.0
+        q_after = q_old[neighbor_after[i]] if neighbor_after[i] >= 0 else 0.0
+        n = mannings_n[link]
+        q[link] = (
+            theta * q_old[link]
+            + (1.0 - theta) / 2.0 * (q_before + q_after)
+            - g * h_at_link[link] * dt * slope_at_link[link]
+        ) / (
+            1.0
+            + g * dt * (n * n) * fabs(q_old[link])
+            / pow(h_at_link[link], _SEVEN_OVER_THREE)
+        )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _limit_discharge_at_links(
+    const DTYPE_FLOAT_t[:] h_at_link,
+    DTYPE_FLOAT_t[:] q,
+    double dt,
+    double dx,
+    double g,
+) nogil:
+    cdef long link
+    cdef double q_at_link, h_at_this_link, froude, courant, h_over_4
+
+    for link in range(q.shape[0]):
+        q_at_link = q[link]
+        if q_at_link == 0.0:
+            continue
+        h_at_this_link = h_at_link[link]
+        froude = (q_at_link / h_at_this_link) / sqrt(g * h_at_this_link)
+        courant = q_at_link * dt / dx
+        h_over_4 = h_at_this_link / 4.0
+
+        if q_at_link > 0.0:
+            if courant > h_over_4:
+                q[link] = (h_at_this_link * dx / 5.0) / dt
+            elif froude > 1.0:
+                q[link] = h_at_this_link * (sqrt(g * h_at_this_link) * 1.0)
+        else:
+            if fabs(courant) > h_over_4:
+                q[link] = 0.0 - (h_at_this_link * dx / 5.0) / dt
+            elif fabs(froude) > 1.0:
+                q[link] = 0.0 - (h_at_this_link * sqrt(g * h_at_this_link) * 1.0)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _update_depth_at_nodes(
+    const DTYPE_INT_t[:] core_nodes,
+    const DTYPE_INT_t[:, :] links_at_core_node,
+    const DTYPE_FLOAT_t[:, :] flux_at_core_node,
+    const DTYPE_FLOAT_t[:] area_at_core_node,
+    const DTYPE_FLOAT_t[:] q,
+    const DTYPE_FLOAT_t[:] rainfall,
+    DTYPE_FLOAT_t[:] h,
+    double dt,
+) nogil:
+    cdef long i, node, c
+    cdef double net_flux
+
+    for i in range(core_nodes.shape[0]):
+        node = core_nodes[i]
+        net_flux = 0.0
+        for c in range(links_at_core_node.shape[1]):
+            net_flux -= q[links_at_core_node[i, c]] * flux_at_core_node[i, c]
+        h[node] = h[node] + (rainfall[node] - net_flux / area_at_core_node[i]) * dt
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def advance_overland_flow(
+    const DTYPE_INT_t[:] active_links,
+    const DTYPE_INT_t[:] node_at_link_tail,
+    const DTYPE_INT_t[:] node_at_link_head,
+    const DTYPE_FLOAT_t[:] length_of_link,
+    const DTYPE_INT_t[:] horizontal_links,
+    const DTYPE_INT_t[:] west_neighbors,
+    const DTYPE_INT_t[:] east_neighbors,
+    const DTYPE_INT_t[:] vertical_links,
+    const DTYPE_INT_t[:] south_neighbors,
+    const DTYPE_INT_t[:] north_neighbors,
+    const DTYPE_INT_t[:] fixed_links,
+    const DTYPE_INT_t[:] fixed_link_neighbors,
+    const DTYPE_INT_t[:] core_nodes,
+    const DTYPE_INT_t[:, :] links_at_core_node,
+    const DTYPE_FLOAT_t[:, :] flux_at_core_node,
+    const DTYPE_FLOAT_t[:] area_at_core_node,
+    const DTYPE_FLOAT_t[:] z,
+    const DTYPE_FLOAT_t[:] mannings_n,
+    const DTYPE_FLOAT_t[:] rainfall,
+    DTYPE_FLOAT_t[:] h,
+    DTYPE_FLOAT_t[:] h_at_link,
+    DTYPE_FLOAT_t[:] slope_at_link,
+    DTYPE_FLOAT_t[:] q,
+    DTYPE_FLOAT_t[:] q_old,
+    double dt,
+    double dx,
+    double g,
+    double theta,
+    bint steep_slopes,
+    double h_init,
+):
+    """Advance overland flow by one time step of the de Almeida scheme.
+
+    Water depths, discharges and water-surface slopes are updated in place
+    in a single pass over the links and nodes of the grid.
+
+    Parameters
+    ----------
+    active_links : ndarray of int
+        Links whose water depth and water-surface slope are updated.
+    node_at_link_tail, node_at_link_head : ndarray of int
+        Nodes at the ends of each link.
+    length_of_link : ndarray of float
+        Length of each link.
+    horizontal_links, vertical_links : ndarray of int
+        Horizontal and vertical links of the grid.
+    west_neighbors, east_neighbors : ndarray of int
+        For each horizontal link, its horizontal neighbors (or -1).
+    south_neighbors, north_neighbors : ndarray of int
+        For each vertical link, its vertical neighbors (or -1).
+    fixed_links, fixed_link_neighbors : ndarray of int
+        Links whose discharge is set to that of a neighboring link before
+        and after the discharge is updated.
+    core_nodes : ndarray of int
+        Nodes whose water depth is updated.
+    links_at_core_node : ndarray of int, shape *(n_core_nodes, 4)*
+        Links of each core node.
+    flux_at_core_node : ndarray of float, shape *(n_core_nodes, 4)*
+        Direction of each link of a core node times the length of its face.
+    area_at_core_node : ndarray of float
+        Area of the cell of each core node.
+    z : ndarray of float
+        Elevation of the ground surface at nodes.
+    mannings_n : ndarray of float
+        Manning's roughness coefficient at links.
+    rainfall : ndarray of float
+        Rainfall intensity at nodes.
+    h : ndarray of float
+        Water depth at nodes.
+    h_at_link : ndarray of float
+        Water depth at links.
+    slope_at_link : ndarray of float
+        Water-surface slope at links.
+    q : ndarray of float
+        Water discharge at links.
+    q_old : ndarray of float
+        Work buffer of discharge at links.
+    dt : float
+        Time step.
+    dx : float
+        Grid spacing used to limit the discharge for steep slopes.
+    g : float
+        Acceleration due to gravity.
+    theta : float
+        Weighting factor of de Almeida et al., 2012.
+    steep_slopes : bool
+        Limit the discharge by the Froude and Courant numbers.
+    h_init : float
+        Minimum water depth, if *steep_slopes*.
+
+    Returns
+    -------
+    float
+        The maximum water depth at nodes after the time step.
+    """
+    cdef long i, node
+    cdef double h_min = h_init * 10.0 ** -3
+    cdef double h_max = -np.inf
+
+    with nogil:
+        _calc_depth_and_slope_at_links(
+            active_links,
+            node_at_link_tail,
+            node_at_link_head,
+            length_of_link,
+            z,
+            h,
+            h_at_link,
+            slope_at_link,
+        )
+
+        for i in range(fixed_links.shape[0]):
+            q[fixed_links[i]] = q[fixed_link_neighbors[i]]
+
+        q_old[:] = q
+        _calc_discharge_at_links(
+            horizontal_links,
+            west_neighbors,
+            east_neighbors,
+            q_old,
+            h_at_link,
+            slope_at_link,
+            mannings_n,
+            q,
+            dt,
+            g,
+            theta,
+        )
+        _calc_discharge_at_links(
+            vertical_links,
+            north_neighbors,
+            south_neighbors,
+            q_old,
+            h_at_link,
+            slope_at_link,
+            mannings_n,
+            q,
+            dt,
+            g,
+            theta,
+        )
+
+        for i in range(fixed_links.shape[0]):
+            q[fixed_links[i]] = q[fixed_link_neighbors[i]]
+
+        if steep_slopes:
+            _limit_discharge_at_links(h_at_link, q, dt, dx, g)
+
+        _update_depth_at_nodes(
+            core_nodes,
+            links_at_core_node,
+            flux_at_core_node,
+            area_at_core_node,
+            q,
+            rainfall,
+            h,
+            dt,
+        )
+
+        for node in range(h.shape[0]):
+            if steep_slopes and h[node] < h_init:
+                h[node] = h_min
+            if h[node] > h_max or h[node] != h[node]:
+                h_max = h[node]
+
+    return h_max
+
+
+@cython.cdivision(True)
+cdef bint _solve_water_depth(
+    double x,
+    double a,
+    double b,
+    double c,
+    double d,
+    double e,
+    double tol,
+    long max_iter,
+    double *root,
+) nogil:
+    """Find the new water depth of the implicit kinematic-wave equation.
+
+    Solve :math:`x - c + a (b x + (b - 1) c)^d - e = 0` (see
+    :func:`~.generate_overland_flow_implicit_kinwave.water_fn`) with Newton's
+    method, starting from *x*. The function increases with *x*, so if the
+    root is known to lie between the edge of its domain and *c + e*, a
+    Newton step that leaves this bracket is replaced by bisection.
+
+    The last iterate is stored in *root*. Returns ``True`` if the iteration
+    converged, or ``False`` if it ran out of iterations or left the domain
+    of the function.
+    """
+    cdef double lower, upper, h, f, df, x_new
+    cdef bint bracketed = False
+    cdef long i
+
+    if b > 0.0:
+        lower = (1.0 - b) * c / b
+        upper = c + e
+        if upper >= lower:
+            bracketed = True
+            x = min(max(x, lower), upper)
+
+    root[0] = x
+    for i in range(max_iter):
+        h = b * x + (b - 1.0) * c
+        f = x - c + a * pow(h, d) - e
+        df = 1.0 + a * d * b * pow(h, d - 1.0)
+
+        if f == 0.0:
+            return True
+
+        x_new = x - f / df
+        if bracketed:
+            if f > 0.0:
+                upper = x
+            else:
+                lower = x
+            if not (lower <= x_new <= upper):
+                x_new = 0.5 * (lower + upper)
+
+        if not isfinite(x_new):
+            return False
+
+        root[0] = x_new
+        if fabs(x_new - x) <= tol:
+            return True
+        x = x_new
+
+    return False
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def sweep_kinwave_implicit(
+    const DTYPE_INT_t[:] nodes_ordered,
+    const np.uint8_t[:] status_at_node,
+    const DTYPE_INT_t[:, :] adjacent_nodes_at_node,
+    const DTYPE_FLOAT_t[:, :] proportions,
+    const DTYPE_FLOAT_t[:] area_at_node,
+    const DTYPE_FLOAT_t[:] alpha,
+    const DTYPE_FLOAT_t[:] grad_width_sum,
+    DTYPE_FLOAT_t[:] depth,
+    DTYPE_FLOAT_t[:] disch_in,
+    double dt,
+    double runoff_rate,
+    double vel_coef,
+    double depth_exp,
+    double weight,
+    double tol=1.48e-8,
+    long max_iter=50,
+):
+    """Solve for water depths from upstream to downstream.
+
+    Parameters
+    ----------
+    nodes_ordered : ndarray of int
+        Nodes ordered from downstream to upstream.
+    status_at_node : ndarray of uint8
+        Status of each node. Only core nodes are solved for.
+    adjacent_nodes_at_node : ndarray of int, shape *(n_nodes, n_neighbors)*
+        Neighbors of each node.
+    proportions : ndarray of float, shape *(n_nodes, n_neighbors)*
+        Proportion of the outflow of each node sent to each of its neighbors.
+    area_at_node : ndarray of float
+        Area of the cell of each node.
+    alpha : ndarray of float
+        Prefactor of the outflow term of the water-depth equation.
+    grad_width_sum : ndarray of float
+        Sum of square root of gradient times face width over the outflow
+        faces of each node.
+    depth : ndarray of float
+        Water depth at nodes, updated in place.
+    disch_in : ndarray of float
+        Inflow discharge at nodes, which should be zero on input.
+    dt : float
+        Time step.
+    runoff_rate : float
+        Runoff rate.
+    vel_coef : float
+        Velocity coefficient (one over roughness).
+    depth_exp : float
+        Depth-discharge exponent.
+    weight : float
+        Weighting on depth at new time step versus old time step.
+    tol : float, optional
+        Tolerance on the change in depth between Newton iterations.
+    max_iter : int, optional
+        Maximum number of Newton iterations per node.
+
+    Returns
+    -------
+    int
+        The first node at which the depth did not converge, in which case
+        the sweep stops there, or -1 if the depths at all nodes converged.
+    """
+    cdef long n_nodes = nodes_ordered.shape[0]
+    cdef long n_neighbors = adjacent_nodes_at_node.shape[1]
+    cdef long i, k, node, neighbor
+    cdef long failed = -1
+    cdef double old_depth, inflow, outflow
+
+    with nogil:
+        for i in range(n_nodes - 1, -1, -1):
+            node = nodes_ordered[i]
+            if status_at_node[node] != 0:
+                continue
+
+            old_depth = depth[node]
+            inflow = (dt * runoff_rate) + (dt * disch_in[node] / area_at_node[node])
+            if not _solve_water_depth(
+                old_depth,
+                alpha[node],
+                weight,
+                old_depth,
+                depth_exp,
+                inflow,
+                tol,
+                max_iter,
+                &depth[node],
+            ):
+                failed = node
+                break
+
+            outflow = (
+                vel_coef
+                * pow(weight * depth[node] + (1.0 - weight) * old_depth, depth_exp)
+                * grad_width_sum[node]
+            )
+
+            for k in range(n_neighbors):
+                neighbor = adjacent_nodes_at_node[node, k]
+                if neighbor >= 0:
+                    disch_in[neighbor] += outflow * proportions[node, k]
+
+    return failed
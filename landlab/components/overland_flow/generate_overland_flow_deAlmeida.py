@@ -92,7 +92,7 @@ import scipy.constants
 from landlab import Component, FieldError
 from landlab.grid.structured_quad import links
 
-_SEVEN_OVER_THREE = 7.0 / 3.0
+from .cfuncs import advance_overland_flow
 
 
 def _active_links_at_node(grid, *args):
@@ -336,7 +336,7 @@ class OverlandFlow(Component):
         self._elapsed_time = 1.0
 
         self._dt = None
-        self._dhdt = grid.zeros()
+        self._q_old = None
 
         # When we instantiate the class we recognize that neighbors have not
         # been found. After the user either calls self.set_up_neighbor_array
@@ -502,6 +502,42 @@ class OverlandFlow(Component):
         # Once the neighbor arrays are set up, we change the flag to True!
         self._neighbor_flag = True
 
+    def _set_up_ids_at_core_nodes(self):
+        """Cache the grid elements used by each time step.
+
+        Cache the core nodes, active links and fixed links of the grid,
+        and, for each core node, its links and the factors that convert
+        the discharge along them into a net flux out of its cell. These
+        depend on the boundary conditions, and so are updated whenever the
+        status of the grid nodes changes.
+        """
+        grid = self._grid
+
+        self._status_at_node = np.array(grid.status_at_node)
+        self._core_nodes = grid.core_nodes
+        self._active_links = grid.active_links
+
+        if self._default_fixed_links is True:
+            self._fixed_links = grid.fixed_links
+            if len(self._fixed_links) != len(self._active_neighbors):
+                raise ValueError(
+                    "number of fixed links does not match the number of their "
+                    "active neighbors ({0} != {1})".format(
+                        len(self._fixed_links), len(self._active_neighbors)
+                    )
+                )
+            self._fixed_link_neighbors = self._active_neighbors
+        else:
+            self._fixed_links = np.empty(0, dtype=int)
+            self._fixed_link_neighbors = np.empty(0, dtype=int)
+
+        self._links_at_core_node = grid.links_at_node[self._core_nodes]
+        self._flux_at_core_node = (
+            grid.link_dirs_at_node[self._core_nodes]
+            * grid.length_of_face[grid.face_at_link[self._links_at_core_node]]
+        )
+        self._area_at_core_node = grid.area_of_cell[grid.cell_at_node[self._core_nodes]]
+
     def overland_flow(self, dt=None):
         """Generate overland flow across a grid.
 
@@ -514,12 +550,47 @@ class OverlandFlow(Component):
         Outputs water depth, discharge and shear stress values through time at
         every point in the input grid.
         """
+        # First, we check and see if the neighbor arrays have been
+        # initialized
+        if self._neighbor_flag is False:
+            self.set_up_neighbor_arrays()
+            self._set_up_ids_at_core_nodes()
+        elif not np.array_equal(self._status_at_node, self._grid.status_at_node):
+            self._set_up_ids_at_core_nodes()
+
+        # In case another component has added data to the fields, we just
+        # reset our water depths, topographic elevations and water
+        # discharge variables to the fields.
+        self._h = self._grid["node"]["surface_water__depth"]
+        self._z = self._grid["node"]["topographic__elevation"]
+        self._q = self._grid["link"]["surface_water__discharge"]
+        self._h_links = self._grid["link"]["surface_water__depth"]
+
+        # Manning's n and rainfall intensity can be either scalars or arrays,
+        # which the time-stepping kernel sees as values at every link and node.
+        mannings_n = np.broadcast_to(
+            np.asarray(self._mannings_n, dtype=float), (self._grid.number_of_links,)
+        )
+        rainfall = np.broadcast_to(
+            np.asarray(self._rainfall_intensity, dtype=float),
+            (self._grid.number_of_nodes,),
+        )
+        z = np.asarray(self._z, dtype=float)
+        if self._q_old is None or len(self._q_old) != len(self._q):
+            self._q_old = np.empty_like(self._q)
+
         # DH adds a loop to enable an imposed tstep while maintaining stability
         local_elapsed_time = 0.0
+        h_max = None
         if dt is None:
             dt = np.inf  # to allow the loop to begin
         while local_elapsed_time < dt:
-            dt_local = self.calc_time_step()
+            # The maximum water depth of the previous step is returned by the
+            # kernel, so the grid is only searched for it on the first step.
+            if h_max is None:
+                dt_local = self.calc_time_step()
+            else:
+                dt_local = self._alpha * self._grid.dx / np.sqrt(self._g * h_max)
             # Can really get into trouble if nothing happens but we still run:
             if not dt_local < np.inf:
                 break
@@ -527,266 +598,42 @@ class OverlandFlow(Component):
                 dt_local = dt - local_elapsed_time
             self._dt = dt_local
 
-            # First, we check and see if the neighbor arrays have been
-            # initialized
-            if self._neighbor_flag is False:
-                self.set_up_neighbor_arrays()
-
-            # In case another component has added data to the fields, we just
-            # reset our water depths, topographic elevations and water
-            # discharge variables to the fields.
-            self._h = self._grid["node"]["surface_water__depth"]
-            self._z = self._grid["node"]["topographic__elevation"]
-            self._q = self._grid["link"]["surface_water__discharge"]
-            self._h_links = self._grid["link"]["surface_water__depth"]
-
-            # Here we identify the core nodes and active links for later use.
-            self._core_nodes = self._grid.core_nodes
-            self._active_links = self._grid.active_links
-
-            # Per Bates et al., 2010, this solution needs to find difference
-            # between the highest water surface in the two cells and the
-            # highest bed elevation
-            zmax = self._grid.map_max_of_link_nodes_to_link(self._z)
-            w = self._h + self._z
-            wmax = self._grid.map_max_of_link_nodes_to_link(w)
-            hflow = wmax[self._grid.active_links] - zmax[self._grid.active_links]
-
-            # Insert this water depth into an array of water depths at the
-            # links.
-            self._h_links[self._active_links] = hflow
-
-            # Now we calculate the slope of the water surface elevation at
-            # active links
-            self._water_surface__gradient = self._grid.calc_grad_at_link(w)[
-                self._grid.active_links
-            ]
-
-            # And insert these values into an array of all links
-            self._water_surface_slope[
-                self._active_links
-            ] = self._water_surface__gradient
-            # If the user chooses to set boundary links to the neighbor value,
-            # we set the discharge array to have the boundary links set to
-            # their neighbor value
-            if self._default_fixed_links is True:
-                self._q[self._grid.fixed_links] = self._q[self._active_neighbors]
-
-            # Now we can calculate discharge. To handle links with neighbors
-            # that do not exist, we will do a fancy indexing trick. Non-
-            # existent links or inactive links have an index of '-1', which in
-            # Python, looks to the end of a list or array. To accommodate these
-            # '-1' indices, we will simply insert an value of 0.0 discharge (in
-            # units of L^2/T) to the end of the discharge array.
-            self._q = np.append(self._q, [0])
-
-            horiz = self._horizontal_ids
-            vert = self._vertical_ids
-            # Now we calculate discharge in the horizontal direction
-            try:
-                self._q[horiz] = (
-                    self._theta * self._q[horiz]
-                    + (1.0 - self._theta)
-                    / 2.0
-                    * (self._q[self._west_neighbors] + self._q[self._east_neighbors])
-                    - self._g
-                    * self._h_links[horiz]
-                    * self._dt
-                    * self._water_surface_slope[horiz]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n ** 2.0
-                    * abs(self._q[horiz])
-                    / self._h_links[horiz] ** _SEVEN_OVER_THREE
-                )
-
-                # ... and in the vertical direction
-                self._q[vert] = (
-                    self._theta * self._q[vert]
-                    + (1 - self._theta)
-                    / 2.0
-                    * (self._q[self._north_neighbors] + self._q[self._south_neighbors])
-                    - self._g
-                    * self._h_links[vert]
-                    * self._dt
-                    * self._water_surface_slope[vert]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n ** 2.0
-                    * abs(self._q[vert])
-                    / self._h_links[vert] ** _SEVEN_OVER_THREE
-                )
-
-            except ValueError:
-                self._mannings_n = self._grid["link"]["mannings_n"]
-                # if manning's n in a field
-                # calc discharge in horizontal
-                self._q[horiz] = (
-                    self._theta * self._q[horiz]
-                    + (1.0 - self._theta)
-                    / 2.0
-                    * (self._q[self._west_neighbors] + self._q[self._east_neighbors])
-                    - self._g
-                    * self._h_links[horiz]
-                    * self._dt
-                    * self._water_surface_slope[horiz]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n[horiz] ** 2.0
-                    * abs(self._q[horiz])
-                    / self._h_links[horiz] ** _SEVEN_OVER_THREE
-                )
-
-                # ... and in the vertical direction
-                self._q[vert] = (
-                    self._theta * self._q[vert]
-                    + (1 - self._theta)
-                    / 2.0
-                    * (self._q[self._north_neighbors] + self._q[self._south_neighbors])
-                    - self._g
-                    * self._h_links[vert]
-                    * self._dt
-                    * self._water_surface_slope[self._vertical_ids]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n[vert] ** 2.0
-                    * abs(self._q[vert])
-                    / self._h_links[vert] ** _SEVEN_OVER_THREE
-                )
-
-            # Now to return the array to its original length (length of number
-            # of all links), we delete the extra 0.0 value from the end of the
-            # array.
-            self._q = np.delete(self._q, len(self._q) - 1)
-
-            # Updating the discharge array to have the boundary links set to
-            # their neighbor
-            if self._default_fixed_links is True:
-                self._q[self._grid.fixed_links] = self._q[self._active_neighbors]
-
-            if self._steep_slopes is True:
-                # To prevent water from draining too fast for our time steps...
-                # Our Froude number.
-                Fr = 1.0
-                # Our two limiting factors, the froude number and courant
-                # number.
-                # Looking a calculated q to be compared to our Fr number.
-                calculated_q = (self._q / self._h_links) / np.sqrt(
-                    self._g * self._h_links
-                )
-
-                # Looking at our calculated q and comparing it to Courant no.,
-                q_courant = self._q * self._dt / self._grid.dx
-
-                # Water depth split equally between four links..
-                water_div_4 = self._h_links / 4.0
-
-                # IDs where water discharge is positive...
-                (positive_q,) = np.where(self._q > 0)
-
-                # ... and negative.
-                (negative_q,) = np.where(self._q < 0)
-
-                # Where does our calculated q exceed the Froude number? If q
-                # does exceed the Froude number, we are getting supercritical
-                # flow and discharge needs to be reduced to maintain stability.
-                (Froude_logical,) = np.where((calculated_q) > Fr)
-                (Froude_abs_logical,) = np.where(abs(calculated_q) > Fr)
-
-                # Where does our calculated q exceed the Courant number and
-                # water depth divided amongst 4 links? If the calculated q
-                # exceeds the Courant number and is greater than the water
-                # depth divided by 4 links, we reduce discharge to maintain
-                # stability.
-                (water_logical,) = np.where(q_courant > water_div_4)
-                (water_abs_logical,) = np.where(abs(q_courant) > water_div_4)
-
-                # Where are these conditions met? For positive and negative q,
-                # there are specific rules to reduce q. This step finds where
-                # the discharge values are positive or negative and where
-                # discharge exceeds the Froude or Courant number.
-                self._if_statement_1 = np.intersect1d(positive_q, Froude_logical)
-                self._if_statement_2 = np.intersect1d(negative_q, Froude_abs_logical)
-                self._if_statement_3 = np.intersect1d(positive_q, water_logical)
-                self._if_statement_4 = np.intersect1d(negative_q, water_abs_logical)
-
-                # Rules 1 and 2 reduce discharge by the Froude number.
-                self._q[self._if_statement_1] = self._h_links[self._if_statement_1] * (
-                    np.sqrt(self._g * self._h_links[self._if_statement_1]) * Fr
-                )
-
-                self._q[self._if_statement_2] = 0.0 - (
-                    self._h_links[self._if_statement_2]
-                    * np.sqrt(self._g * self._h_links[self._if_statement_2])
-                    * Fr
-                )
-
-                # Rules 3 and 4 reduce discharge by the Courant number.
-                self._q[self._if_statement_3] = (
-                    (self._h_links[self._if_statement_3] * self._grid.dx) / 5.0
-                ) / self._dt
-
-                self._q[self._if_statement_4] = (
-                    0.0
-                    - (self._h_links[self._if_statement_4] * self._grid.dx / 5.0)
-                    / self._dt
-                )
-
-            # Once stability has been restored, we calculate the change in
-            # water depths on all core nodes by finding the difference between
-            # inputs (rainfall) and the inputs/outputs (flux divergence of
-            # discharge)
-            self._dhdt = self._rainfall_intensity - self._grid.calc_flux_div_at_node(
-                self._q
-            )
-
-            # Updating our water depths...
-            self._h[self._core_nodes] = (
-                self._h[self._core_nodes] + self._dhdt[self._core_nodes] * self._dt
+            # Update water depths and water-surface slopes at active links,
+            # discharge at all links (limited, with steep slopes, by the
+            # Froude and Courant numbers) and water depth at core nodes.
+            h_max = advance_overland_flow(
+                self._active_links,
+                self._grid.node_at_link_tail,
+                self._grid.node_at_link_head,
+                self._grid.length_of_link,
+                self._horizontal_ids,
+                self._west_neighbors,
+                self._east_neighbors,
+                self._vertical_ids,
+                self._south_neighbors,
+                self._north_neighbors,
+                self._fixed_links,
+                self._fixed_link_neighbors,
+                self._core_nodes,
+                self._links_at_core_node,
+                self._flux_at_core_node,
+                self._area_at_core_node,
+                z,
+                mannings_n,
+                rainfall,
+                self._h,
+                self._h_links,
+                self._water_surface_slope,
+                self._q,
+                self._q_old,
+                self._dt,
+                self._grid.dx,
+                self._g,
+                self._theta,
+                self._steep_slopes,
+                self._h_init,
             )
 
-            # To prevent divide by zero errors, a minimum threshold water depth
-            # must be maintained. To reduce mass imbalances, this is set to
-            # find locations where water depth is smaller than h_init (default
-            # is 0.001) and the new value is self._h_init * 10^-3. This was set
-            # as it showed the smallest amount of mass creation in the grid
-            # during testing.
-            if self._steep_slopes is True:
-                self._h[self._h < self._h_init] = self._h_init * 10.0 ** -3
-
-            # And reset our field values with the newest water depth and
-            # discharge.
-            self._grid.at_node["surface_water__depth"] = self._h
-            self._grid.at_link["surface_water__discharge"] = self._q
-            #
-            #
-            #            self._helper_q = self._grid.map_upwind_node_link_max_to_node(self._q)
-            #            self._helper_s = self._grid.map_upwind_node_link_max_to_node(
-            #                                                    self._water_surface_slope)
-            #
-            #            self._helper_q = self._grid.map_max_of_link_nodes_to_link(self._helper_q)
-            #            self._helper_s = self._grid.map_max_of_link_nodes_to_link(self._helper_s)
-            #
-            #            self._grid['link']['surface_water__discharge'][
-            #                     self._active_links_at_open_bdy] = self._helper_q[
-            #                     self._active_links_at_open_bdy]
-            #
-            #            self._grid['link']['water_surface__gradient'][
-            #                self._active_links_at_open_bdy] = self._helper_s[
-            #                self._active_links_at_open_bdy]
-            # Update nodes near boundary locations - nodes adjacent to
-            # boundaries may have discharge and water surface slopes
-            # artifically reduced due to boundary effects. This step removes
-            # those errors.
-
             if dt is np.inf:
                 break
             local_elapsed_time += self._dt
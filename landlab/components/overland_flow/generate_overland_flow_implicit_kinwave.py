@@ -9,17 +9,18 @@ Created on Fri May 27 14:26:13 2016
 
 
 import numpy as np
-from scipy.optimize import newton
 
 from landlab import Component
 from landlab.components import FlowAccumulator
 
+from .cfuncs import sweep_kinwave_implicit
+
 
 def water_fn(x, a, b, c, d, e):
     r"""Evaluates the solution to the water-depth equation.
 
-    Called by scipy.newton() to find solution for :math:`x`
-    using Newton's method.
+    The compiled solver used by :class:`KinwaveImplicitOverlandFlow` finds
+    the root of this function, for :math:`x`, using Newton's method.
 
     Parameters
     ----------
@@ -130,8 +131,10 @@ class KinwaveImplicitOverlandFlow(Component):
     When we combine these equations, we have an equation that includes the
     unknown :math:`H^{t+1}` and a bunch of terms that are known.
     If :math:`w\ne 0`, it is a nonlinear equation in :math:`H^{t+1}`,
-    and must be solved iteratively. We do this using a root-finding
-    method in the scipy.optimize library.
+    and must be solved iteratively. We do this using Newton's method,
+    falling back to bisection if an iteration leaves the interval known
+    to contain the solution. The sweep from upstream to downstream nodes,
+    and the root finding at each node, are compiled.
 
     Examples
     --------
@@ -296,7 +299,13 @@ class KinwaveImplicitOverlandFlow(Component):
         return self._depth
 
     def run_one_step(self, dt):
-        """Calculate water flow for a time period `dt`."""
+        """Calculate water flow for a time period `dt`.
+
+        Raises
+        ------
+        RuntimeError
+            If the water depth at a node does not converge.
+        """
 
         # If it's our first iteration, or if the topography may be changing,
         # do flow routing and calculate square root of slopes at links
@@ -340,48 +349,39 @@ class KinwaveImplicitOverlandFlow(Component):
         # Zero out inflow discharge
         self._disch_in[:] = 0.0
 
-        # Upstream-to-downstream loop
-        for i in range(len(self._nodes_ordered) - 1, -1, -1):
-            n = self._nodes_ordered[i]
-            if self._grid.status_at_node[n] == 0:
-
-                # Solve for new water depth
-                aa = self._alpha[n]
-                cc = self._depth[n]
-                ee = (dt * self._runoff_rate) + (
-                    dt
-                    * self._disch_in[n]
-                    / self._grid.area_of_cell[self._grid.cell_at_node[n]]
-                )
-                self._depth[n] = newton(
-                    water_fn,
-                    self._depth[n],
-                    args=(aa, self._weight, cc, self._depth_exp, ee),
-                )
-
-                # Calc outflow
-                Heff = self._weight * self._depth[n] + (1.0 - self._weight) * cc
-                outflow = (
-                    self._vel_coef * (Heff ** self._depth_exp) * self._grad_width_sum[n]
-                )  # this is manning/chezy/darcy
-
-                # Send flow downstream. Here we take total inflow discharge
-                # and partition it among the node's neighbors. For this, we use
-                # the flow director's "proportions" array, which contains, for
-                # each node, the proportion of flow that heads out toward each
-                # of its N neighbors. The proportion is zero if the neighbor is
-                # uphill; otherwise, it is S^1/2 / sum(S^1/2). If for example
-                # we have a raster grid, there will be four neighbors and four
-                # proportions, some of which may be zero and some between 0 and
-                # 1.
-                self._disch_in[self._grid.adjacent_nodes_at_node[n]] += (
-                    outflow * self._flow_accum.flow_director._proportions[n]
-                )
+        # Upstream-to-downstream loop. At each core node we solve for the new
+        # water depth, then send the outflow downstream. For this, we use the
+        # flow director's "proportions" array, which contains, for each node,
+        # the proportion of flow that heads out toward each of its N
+        # neighbors. The proportion is zero if the neighbor is uphill;
+        # otherwise, it is S^1/2 / sum(S^1/2). If for example we have a raster
+        # grid, there will be four neighbors and four proportions, some of
+        # which may be zero and some between 0 and 1.
+        failed = sweep_kinwave_implicit(
+            self._nodes_ordered,
+            self._grid.status_at_node,
+            self._grid.adjacent_nodes_at_node,
+            self._flow_accum.flow_director._proportions,
+            self._grid.cell_area_at_node,
+            self._alpha,
+            self._grad_width_sum,
+            self._depth,
+            self._disch_in,
+            dt,
+            self._runoff_rate,
+            self._vel_coef,
+            self._depth_exp,
+            self._weight,
+        )
+        if failed >= 0:
+            raise RuntimeError(
+                "water depth did not converge at node {0}".format(failed)
+            )
 
-                # TODO: the above is enough to implement the solution for flow
-                # depth, but it does not provide any information about flow
-                # velocity or discharge on links. This could be added as an
-                # optional method, perhaps done just before output.
+        # TODO: the above is enough to implement the solution for flow
+        # depth, but it does not provide any information about flow
+        # velocity or discharge on links. This could be added as an
+        # optional method, perhaps done just before output.
 
 
 if __name__ == "__main__":
@@ -140,6 +140,7 @@ class VegCA(Component):
         tpmaxTreeSeedling=18,
         method="Grid",
         Edit_VegCov=True,
+        seed=None,
     ):
         """
         Parameters
@@ -189,6 +190,10 @@ class VegCA(Component):
             'vegetation__boolean_vegetated' will be output, (i.e.) if a cell is
             vegetated the corresponding cell of the field will be 1, otherwise
             it will be 0.
+        seed: int, optional
+            Seed for the random number generator used for plant ages,
+            establishment and mortality. If not given, numpy's global
+            random state is used.
 
         """
         super().__init__(grid)
@@ -215,6 +220,7 @@ class VegCA(Component):
         self._tpmax_tr_s = tpmaxTreeSeedling  # Maximum age - tree seedling
 
         self._method = method
+        self._rng = np.random if seed is None else np.random.RandomState(seed)
 
         assert_method_is_valid(self._method)
 
@@ -230,10 +236,10 @@ class VegCA(Component):
         VegType = grid["cell"]["vegetation__plant_functional_type"]
 
         tp = np.zeros(grid.number_of_cells, dtype=int)
-        tp[VegType == TREE] = np.random.randint(
+        tp[VegType == TREE] = self._rng.randint(
             0, self._tpmax_tr, np.where(VegType == TREE)[0].shape
         )
-        tp[VegType == SHRUB] = np.random.randint(
+        tp[VegType == SHRUB] = self._rng.randint(
             0, self._tpmax_sh, np.where(VegType == SHRUB)[0].shape
         )
         locs_trees = np.where(VegType == TREE)[0]
@@ -297,17 +303,15 @@ class VegCA(Component):
         Phi_sh = Sh_WS_fr / 8.0
         Phi_tr = (Tr_WS_fr + Tr_WS_sr / 2.0) / 8.0
         Phi_g = np.mean(self._live_index[np.where(self._VegType == GRASS)])
-        Pemaxg = self._Pemaxg * np.ones(n_bare)
-        Pemaxsh = self._Pemaxsh * np.ones(n_bare)
-        Pemaxtr = self._Pemaxtr * np.ones(n_bare)
-        Peg = np.amin(np.vstack((Phi_g / (n * self._INg), Pemaxg)), axis=0)
-        Pesh = np.amin(np.vstack((Phi_sh, Pemaxsh)), axis=0)
-        Petr = np.amin(np.vstack((Phi_tr, Pemaxtr)), axis=0)
-        Select_PFT_E = np.random.choice([GRASS, SHRUBSEEDLING, TREESEEDLING], n_bare)
+        with np.errstate(divide="ignore"):
+            Peg = np.minimum(Phi_g / (n * self._INg), self._Pemaxg)
+        Pesh = np.minimum(Phi_sh, self._Pemaxsh)
+        Petr = np.minimum(Phi_tr, self._Pemaxtr)
+        Select_PFT_E = self._rng.choice([GRASS, SHRUBSEEDLING, TREESEEDLING], n_bare)
         # Grass - 0; Shrub Seedling - 4; Tree Seedling - 5
         Pest = np.choose(Select_PFT_E, [Peg, 0, 0, 0, Pesh, Petr])
         # Probability of establishment
-        R_Est = np.random.rand(n_bare)
+        R_Est = self._rng.rand(n_bare)
         # Random number for comparison to establish
         Establish = np.int32(np.where(np.greater_equal(Pest, R_Est))[0])
         self._VegType[bare_cells[Establish]] = Select_PFT_E[Establish]
@@ -352,7 +356,7 @@ class VegCA(Component):
         )
         PM = PMd + PMa + PMb
         PM[PM > 1.0] = 1.0
-        R_Mor = np.random.rand(n_plant)  # Random number for comparison to kill
+        R_Mor = self._rng.rand(n_plant)  # Random number for comparison to kill
         Mortality = np.int32(np.where(np.greater_equal(PM, R_Mor))[0])
         self._VegType[plant_cells[Mortality]] = BARE
         self._tp[plant_cells[Mortality]] = 0
@@ -375,20 +379,34 @@ class VegCA(Component):
 
 
 def count(Arr, value):
-    Res = np.zeros(Arr.shape[0], dtype=int)
-    x, y = Arr.shape
-    for i in range(0, x):
-        for j in range(0, y):
-            if Arr[i][j] == value:
-                Res[i] += 1
-    return Res
+    """Count the elements of each row of an array that equal a value.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.plant_competition_ca.plant_competition_ca import (
+    ...     count,
+    ... )
+    >>> count(np.array([[0, 1, 1], [3, 3, 3]]), 1)
+    array([2, 0])
+    """
+    return np.count_nonzero(Arr == value, axis=1)
 
 
 def WS_PFT(VegType, PlantType, WS):
-    Phi = np.zeros(WS.shape[0])
-    x, y = WS.shape
-    for i in range(0, x):
-        for j in range(0, y):
-            if VegType[i][j] == PlantType:
-                Phi[i] += WS[i][j]
-    return Phi
+    """Sum, for each row, the values of the elements of a plant type.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.plant_competition_ca.plant_competition_ca import (
+    ...     WS_PFT,
+    ... )
+    >>> WS_PFT(
+    ...     np.array([[0, 1, 1], [3, 1, 3]]),
+    ...     1,
+    ...     np.array([[0.5, 0.25, 0.5], [1.0, 0.125, 1.0]]),
+    ... )
+    array([ 0.75 ,  0.125])
+    """
+    return np.where(VegType == PlantType, WS, 0.0).sum(axis=1)
@@ -1,4 +1,5 @@
 from .fill_sinks import SinkFiller
+from .fill_tiled import fill_sinks_tiled
 from .sink_fill_barnes import SinkFillerBarnes
 
-__all__ = ["SinkFiller", "SinkFillerBarnes"]
+__all__ = ["SinkFiller", "SinkFillerBarnes", "fill_sinks_tiled"]
@@ -0,0 +1,174 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.stdlib cimport malloc, free
+
+from ...utils.ext.stable_heap cimport StableHeap
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+ctypedef np.uint8_t DTYPE_BOOL_t
+
+
+cdef class _TileQueues:
+
+    """The open (stable, by elevation) and pit (first-in, first-out) queues.
+
+    Each cell enters one of the queues at most once, so both are sized by
+    the number of cells in the tile.
+    """
+
+    cdef StableHeap open_queue
+    cdef long *pit_queue
+    cdef long pit_start
+    cdef long pit_end
+
+    def __cinit__(self, long n_cells):
+        self.open_queue = StableHeap(n_cells)
+        self.pit_queue = <long *>malloc(n_cells * sizeof(long))
+        if not self.pit_queue:
+            raise MemoryError()
+        self.pit_start = 0
+        self.pit_end = 0
+
+    def __dealloc__(self):
+        free(self.pit_queue)
+
+    cdef inline void push_pit(self, long node):
+        self.pit_queue[self.pit_end] = node
+        self.pit_end += 1
+
+    cdef inline long pop_pit(self):
+        self.pit_start += 1
+        return self.pit_queue[self.pit_start - 1]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def fill_tile_to_flat(
+    np.ndarray[DTYPE_FLOAT_t, ndim=2] z,
+    np.ndarray[DTYPE_BOOL_t, ndim=2] nodata,
+    np.ndarray[DTYPE_INT_t, ndim=2] label,
+    d8=True,
+):
+    """Priority-flood a tile from its perimeter, labelling its watersheds.
+
+    This is the first stage of the parallel priority-flood of Barnes (2016).
+    Every cell on the perimeter of the tile is treated as an outlet. Each
+    outlet that is not reached from another outlet starts a new watershed,
+    the label of which is given to all of the cells that are flooded from it.
+
+    Parameters
+    ----------
+    z : ndarray of float, shape (n_rows, n_cols)
+        Elevations of the tile. Filled in place.
+    nodata : ndarray of uint8, shape (n_rows, n_cols)
+        Cells that are not part of the surface. They are neither filled
+        nor explored.
+    label : ndarray of int, shape (n_rows, n_cols)
+        On return, the watershed label of each cell (starting from 1), or
+        -1 for *nodata* cells.
+    d8 : bool, optional
+        If True, diagonal cells are neighbors.
+
+    Returns
+    -------
+    (int, dict)
+        The number of watersheds and, for each pair of adjacent watersheds
+        (as a tuple of labels, smallest first), the elevation of the lowest
+        spill point between them.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.sink_fill.cfuncs import fill_tile_to_flat
+    >>> z = np.array(
+    ...     [
+    ...         [3.0, 3.0, 3.0, 3.0, 3.0],
+    ...         [3.0, 1.0, 3.0, 0.5, 3.0],
+    ...         [2.0, 1.0, 3.0, 0.5, 3.0],
+    ...         [3.0, 3.0, 3.0, 3.0, 3.0],
+    ...     ]
+    ... )
+    >>> nodata = np.zeros(z.shape, dtype=np.uint8)
+    >>> label = np.empty(z.shape, dtype=int)
+    >>> n_labels, spill = fill_tile_to_flat(z, nodata, label, d8=False)
+    >>> z
+    array([[ 3.,  3.,  3.,  3.,  3.],
+           [ 3.,  2.,  3.,  3.,  3.],
+           [ 2.,  2.,  3.,  3.,  3.],
+           [ 3.,  3.,  3.,  3.,  3.]])
+    >>> n_labels
+    14
+    >>> label[1:3, 1:4]
+    array([[1, 1, 5],
+           [1, 1, 5]])
+    """
+    cdef long n_rows = z.shape[0]
+    cdef long n_cols = z.shape[1]
+    cdef long n_cells = n_rows * n_cols
+    cdef long n_neighbors = 8 if d8 else 4
+    cdef long[8] d_row = [0, 1, 0, -1, 1, 1, -1, -1]
+    cdef long[8] d_col = [1, 0, -1, 0, 1, -1, -1, 1]
+    cdef long n_labels = 0
+    cdef long c, n, row, col, i, j, a, b
+    cdef double spill_elev
+    cdef np.ndarray[DTYPE_BOOL_t, ndim=2] visited = nodata.copy()
+    cdef _TileQueues queues = _TileQueues(n_cells)
+    cdef dict spill = {}
+
+    for row in range(n_rows):
+        for col in range(n_cols):
+            label[row, col] = -1 if nodata[row, col] else 0
+
+    for row in range(n_rows):
+        for col in range(n_cols):
+            if row == 0 or row == n_rows - 1 or col == 0 or col == n_cols - 1:
+                if not visited[row, col]:
+                    visited[row, col] = True
+                    queues.open_queue.push(row * n_cols + col, z[row, col])
+
+    while True:
+        if queues.pit_start < queues.pit_end:
+            c = queues.pop_pit()
+        elif queues.open_queue.size > 0:
+            c = queues.open_queue.pop()
+        else:
+            break
+
+        row = c // n_cols
+        col = c % n_cols
+        if label[row, col] == 0:
+            n_labels += 1
+            label[row, col] = n_labels
+
+        for j in range(n_neighbors):
+            i = row + d_row[j]
+            n = col + d_col[j]
+            if i < 0 or i >= n_rows or n < 0 or n >= n_cols or nodata[i, n]:
+                continue
+
+            if label[i, n] > 0 and label[i, n] != label[row, col]:
+                a = min(label[i, n], label[row, col])
+                b = max(label[i, n], label[row, col])
+                spill_elev = max(z[i, n], z[row, col])
+                if spill_elev < spill.get((a, b), spill_elev + 1.0):
+                    spill[(a, b)] = spill_elev
+
+            if visited[i, n]:
+                continue
+            visited[i, n] = True
+            label[i, n] = label[row, col]
+            if z[i, n] <= z[row, col]:
+                z[i, n] = z[row, col]
+                queues.push_pit(i * n_cols + n)
+            else:
+                queues.open_queue.push(i * n_cols + n, z[i, n])
+
+    return n_labels, spill
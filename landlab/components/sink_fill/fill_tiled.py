@@ -0,0 +1,355 @@
+#!/usr/env/python
+
+"""fill_tiled.py.
+
+Fill sinks in a raster that is too large to hold in memory, following the
+parallel priority-flood algorithm of Barnes (2016).
+
+The raster is split into tiles that are filled independently (and, if
+asked for, in parallel) with each cell on the perimeter of a tile treated
+as an outlet. As it is filled, each tile is divided into watersheds, one for
+each of the perimeter cells that drains the rest, and the lowest spill
+elevation between each pair of adjacent watersheds is noted. The spill
+elevations between the watersheds of neighboring tiles, and from watersheds
+on the edge of the raster to the outside world, complete a graph that is
+small enough to be flooded in memory. A last pass over the tiles raises
+each cell to at least the spill elevation of its watershed.
+
+Only a few tiles are ever held in memory at once. The tiles as filled in
+the first pass, and the watershed labels of their cells, are kept in
+scratch files on disk until the last pass.
+
+References
+----------
+Barnes, R. (2016). Parallel priority-flood depression filling for trillion
+cell digital elevation models on desktops or clusters. Computers and
+Geosciences 96, 56 - 68. https://doi.org/10.1016/j.cageo.2016.07.001
+"""
+
+import heapq
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .cfuncs import fill_tile_to_flat
+
+
+def _iter_tiles(shape, tile_shape):
+    """Windows of the tiles of a raster.
+
+    Examples
+    --------
+    >>> from landlab.components.sink_fill.fill_tiled import _iter_tiles
+    >>> for rows, cols in _iter_tiles((5, 4), (3, 3)):
+    ...     print(rows.start, rows.stop, cols.start, cols.stop)
+    0 3 0 3
+    0 3 3 4
+    3 5 0 3
+    3 5 3 4
+    """
+    for start_row in range(0, shape[0], tile_shape[0]):
+        for start_col in range(0, shape[1], tile_shape[1]):
+            yield (
+                slice(start_row, min(start_row + tile_shape[0], shape[0])),
+                slice(start_col, min(start_col + tile_shape[1], shape[1])),
+            )
+
+
+def _nodata_mask(values, nodata=None):
+    """Cells that are not part of the surface.
+
+    Missing values are those that are masked, not a number, or equal to
+    *nodata*.
+    """
+    mask = np.ma.getmaskarray(values) | np.isnan(np.ma.getdata(values))
+    if nodata is not None:
+        mask |= np.ma.getdata(values) == nodata
+    return mask
+
+
+def _read_tile(elevation, window, nodata=None):
+    values = elevation[window]
+    return (
+        window,
+        np.array(np.ma.getdata(values), dtype=float),
+        _nodata_mask(values, nodata=nodata),
+    )
+
+
+def _fill_tile(window, z, nodata, d8):
+    """Fill a tile from its perimeter and label its watersheds.
+
+    Returns
+    -------
+    tuple
+        The tile's window, the filled elevations, the watershed label of
+        each cell, the number of watersheds, and the lowest spill elevation
+        between adjacent watersheds (as arrays of the watershed pairs and
+        the elevations).
+    """
+    labels = np.empty(z.shape, dtype=int)
+    n_labels, spill = fill_tile_to_flat(z, nodata.view(np.uint8), labels, d8=bool(d8))
+    pairs = np.array(list(spill.keys()), dtype=int).reshape((-1, 2))
+    elevs = np.fromiter(spill.values(), dtype=float, count=len(spill))
+
+    return window, z, labels, n_labels, (pairs, elevs)
+
+
+def _imap_bounded(func, args, n_workers=1):
+    """Apply a function to arguments, in parallel, a few at a time.
+
+    Arguments are only taken from *args* (which may be a generator) as
+    workers become free so that, along with the results waiting to be
+    collected, no more than about twice the number of workers are in
+    memory at once. Results are yielded as they become available, which
+    is not necessarily in the order of *args*.
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    if n_workers == 1:
+        for arg in args:
+            yield func(*arg)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        pending = set()
+        for arg in args:
+            if len(pending) >= 2 * n_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(func, *arg))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def _spill_between(labels_a, labels_b, z_a, z_b):
+    """Spill elevations between the watersheds of pairs of adjacent cells."""
+    is_edge = (labels_a > 0) & (labels_b > 0) & (labels_a != labels_b)
+    return (
+        np.stack((labels_a[is_edge], labels_b[is_edge]), axis=1),
+        np.maximum(z_a[is_edge], z_b[is_edge]),
+    )
+
+
+def _spill_between_tiles(labels, filled, tile_shape, d8=True):
+    """Spill elevations between the watersheds of neighboring tiles.
+
+    The cells on either side of each boundary between tiles are read a
+    pair of rows (or columns) at a time.
+    """
+    n_rows, n_cols = labels.shape
+    boundaries = [
+        (np.s_[row - 1, :], np.s_[row, :])
+        for row in range(tile_shape[0], n_rows, tile_shape[0])
+    ] + [
+        (np.s_[:, col - 1], np.s_[:, col])
+        for col in range(tile_shape[1], n_cols, tile_shape[1])
+    ]
+    shifts = (0, 1, -1) if d8 else (0,)
+
+    for before, after in boundaries:
+        labels_a, labels_b = np.asarray(labels[before]), np.asarray(labels[after])
+        z_a, z_b = np.asarray(filled[before]), np.asarray(filled[after])
+        for shift in shifts:
+            a = slice(max(0, -shift), len(labels_a) - max(0, shift))
+            b = slice(max(0, shift), len(labels_b) - max(0, -shift))
+            yield _spill_between(labels_a[a], labels_b[b], z_a[a], z_b[b])
+
+
+def _spill_to_outlets(labels, filled):
+    """Spill elevations from the watersheds on the raster's edge to outside.
+
+    The outside world is watershed 0, every cell on the edge of the raster
+    (other than missing values) is an outlet to it.
+    """
+    for edge in (np.s_[0, :], np.s_[-1, :], np.s_[:, 0], np.s_[:, -1]):
+        labels_at_edge = np.asarray(labels[edge])
+        is_outlet = labels_at_edge > 0
+        yield (
+            np.stack(
+                (np.zeros(is_outlet.sum(), dtype=int), labels_at_edge[is_outlet]),
+                axis=1,
+            ),
+            np.asarray(filled[edge])[is_outlet],
+        )
+
+
+def _flood_spill_graph(n_labels, pairs, elevs):
+    """Priority-flood the spill graph from the outside world (watershed 0).
+
+    Returns
+    -------
+    ndarray of float, shape (n_labels + 1, )
+        The spill elevation of each watershed. Watersheds that do not drain
+        to the edge of the raster have a spill elevation of infinity.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.sink_fill.fill_tiled import _flood_spill_graph
+    >>> pairs = np.array([[0, 1], [1, 2], [2, 3], [1, 3], [4, 5]])
+    >>> elevs = np.array([1.0, 3.0, 2.0, 5.0, 0.0])
+    >>> _flood_spill_graph(5, pairs, elevs)
+    array([-inf,   1.,   3.,   3.,  inf,  inf])
+    """
+    nodes = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    neighbors = np.concatenate((pairs[:, 1], pairs[:, 0]))
+    elevs = np.concatenate((elevs, elevs))
+
+    sorted_by_node = np.argsort(nodes, kind="stable")
+    offset_to_node = np.searchsorted(
+        nodes[sorted_by_node], np.arange(n_labels + 2)
+    ).tolist()
+    neighbors = neighbors[sorted_by_node].tolist()
+    elevs = elevs[sorted_by_node].tolist()
+
+    spill = [np.inf] * (n_labels + 1)
+    spill[0] = -np.inf
+    done = [False] * (n_labels + 1)
+
+    queue = [(-np.inf, 0)]
+    while queue:
+        elev, node = heapq.heappop(queue)
+        if done[node]:
+            continue
+        done[node] = True
+        for i in range(offset_to_node[node], offset_to_node[node + 1]):
+            spill_elev = max(elev, elevs[i])
+            if spill_elev < spill[neighbors[i]]:
+                spill[neighbors[i]] = spill_elev
+                heapq.heappush(queue, (spill_elev, neighbors[i]))
+
+    return np.array(spill)
+
+
+def fill_sinks_tiled(
+    elevation,
+    out=None,
+    tile_shape=(1024, 1024),
+    method="D8",
+    nodata=None,
+    n_workers=1,
+    scratch_dir=None,
+):
+    """Fill the sinks of a raster, tile by tile.
+
+    Pits are filled to flat so that the result is the same as that of the
+    :class:`~landlab.components.SinkFillerBarnes` component (with
+    ``fill_flat=True``) run on a :class:`~landlab.RasterModelGrid` whose
+    perimeter nodes are open boundaries and whose missing values are closed
+    nodes. Unlike the component, though, the raster need not fit in memory.
+
+    Parameters
+    ----------
+    elevation : array_like of float, shape (n_rows, n_cols)
+        The surface to fill. Anything that can be sliced to give a tile
+        of the raster (a numpy array, a numpy.memmap, or a netCDF4 variable,
+        for instance).
+    out : array_like of float, shape (n_rows, n_cols), optional
+        Where to write the filled surface, anything that tiles can be
+        assigned to. It can be *elevation* itself. If not provided, a new
+        array is created in memory.
+    tile_shape : tuple of int, optional
+        Number of rows and columns in each tile.
+    method : {'Steepest', 'D8'}
+        Whether or not to recognise diagonals as valid flow paths.
+    nodata : float, optional
+        Value that marks missing values. Masked values and NaNs are always
+        missing. Missing values are neither filled nor flooded across.
+    n_workers : int or None, optional
+        Number of processes that fill tiles. If 1, tiles are filled in this
+        process. If None, use as many processes as there are processors.
+    scratch_dir : str, optional
+        Directory for the scratch files that hold tiles between passes. If
+        not provided, use the system's temporary directory.
+
+    Returns
+    -------
+    array_like of float, shape (n_rows, n_cols)
+        The filled surface, *out* if it was provided.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.sink_fill import fill_sinks_tiled
+    >>> z = np.array(
+    ...     [
+    ...         [3.0, 3.0, 3.0, 3.0, 3.0, 3.0],
+    ...         [3.0, 1.0, 2.0, 2.5, 1.5, 3.0],
+    ...         [3.0, 1.0, 2.5, 0.5, 1.5, 3.0],
+    ...         [3.0, 3.0, 3.0, 3.0, 2.0, 3.0],
+    ...     ]
+    ... )
+    >>> fill_sinks_tiled(z, tile_shape=(2, 3), method="Steepest")
+    array([[ 3. ,  3. ,  3. ,  3. ,  3. ,  3. ],
+           [ 3. ,  2.5,  2.5,  2.5,  2. ,  3. ],
+           [ 3. ,  2.5,  2.5,  2. ,  2. ,  3. ],
+           [ 3. ,  3. ,  3. ,  3. ,  2. ,  3. ]])
+    """
+    if method not in {"Steepest", "D8"}:
+        raise ValueError(
+            "{method}: method must be 'Steepest' or 'D8'".format(method=method)
+        )
+    d8 = method == "D8"
+
+    shape = tuple(elevation.shape)
+    if len(shape) != 2:
+        raise ValueError("elevation must be 2D")
+    if out is None:
+        out = np.empty(shape, dtype=float)
+    elif tuple(out.shape) != shape:
+        raise ValueError("out must be the same shape as elevation")
+    tile_shape = (min(tile_shape[0], shape[0]), min(tile_shape[1], shape[1]))
+
+    with tempfile.TemporaryDirectory(dir=scratch_dir) as tmp_dir:
+        filled = np.memmap(
+            os.path.join(tmp_dir, "filled.dat"), dtype=float, mode="w+", shape=shape
+        )
+        labels = np.memmap(
+            os.path.join(tmp_dir, "labels.dat"), dtype=int, mode="w+", shape=shape
+        )
+
+        n_labels, spill_pairs, spill_elevs = 0, [], []
+        tiles = (
+            _read_tile(elevation, window, nodata=nodata) + (d8,)
+            for window in _iter_tiles(shape, tile_shape)
+        )
+        for window, z, tile_labels, n, (pairs, elevs) in _imap_bounded(
+            _fill_tile, tiles, n_workers=n_workers
+        ):
+            filled[window] = z
+            labels[window] = np.where(tile_labels > 0, tile_labels + n_labels, -1)
+            spill_pairs.append(pairs + n_labels)
+            spill_elevs.append(elevs)
+            n_labels += n
+
+        for pairs, elevs in _spill_between_tiles(labels, filled, tile_shape, d8=d8):
+            spill_pairs.append(pairs)
+            spill_elevs.append(elevs)
+        for pairs, elevs in _spill_to_outlets(labels, filled):
+            spill_pairs.append(pairs)
+            spill_elevs.append(elevs)
+
+        spill = _flood_spill_graph(
+            n_labels, np.concatenate(spill_pairs), np.concatenate(spill_elevs)
+        )
+
+        for window in _iter_tiles(shape, tile_shape):
+            tile_labels = np.asarray(labels[window])
+            spill_at_tile = spill[np.maximum(tile_labels, 0)]
+            drains = (tile_labels > 0) & np.isfinite(spill_at_tile)
+            out[window] = np.where(
+                drains,
+                np.maximum(filled[window], spill_at_tile),
+                np.ma.getdata(elevation[window]),
+            )
+
+        del filled, labels
+
+    return out
@@ -595,174 +595,145 @@ class SoilMoisture(Component):
         # else:
         #     self._fr = (self._vegcover[0]*LAIl/LAIt)
         self._fr[self._fr > 1.0] = 1.0
-        self._Sini = np.zeros(self._SO.shape)
-        self._ETmax = np.zeros(self._SO.shape)
-
-        for cell in range(0, self._grid.number_of_cells):
-            P = P_[cell]
-            # print cell
-            s = self._SO[cell]
-            fbare = self._fbare
-            ZR = self._zr[cell]
-            pc = self._soil_pc[cell]
-            fc = self._soil_fc[cell]
-            scc = self._soil_sc[cell]
-            wp = self._soil_wp[cell]
-            hgw = self._soil_hgw[cell]
-            beta = self._soil_beta[cell]
-            if self._vegtype[cell] == 0:  # 0 - GRASS
-                sc = scc * self._fr[cell] + (1 - self._fr[cell]) * fc
-            else:
-                sc = scc
-
-            Inf_cap = (
-                self._soil_Ib[cell] * (1 - self._vegcover[cell])
-                + self._soil_Iv[cell] * self._vegcover[cell]
+        fbare = self._fbare
+        ZR = self._zr
+        pc = self._soil_pc
+        fc = self._soil_fc
+        wp = self._soil_wp
+        hgw = self._soil_hgw
+        beta = self._soil_beta
+        sc = np.where(
+            self._vegtype == 0,  # 0 - GRASS
+            self._soil_sc * self._fr + (1 - self._fr) * fc,
+            self._soil_sc,
+        )
+
+        Inf_cap = self._soil_Ib * (1 - self._vegcover) + self._soil_Iv * self._vegcover
+        # Infiltration capacity
+        Int_cap = np.minimum(self._vegcover * self._interception_cap, P_)
+        # Interception capacity
+        Peff = np.maximum(P_ - Int_cap, 0.0)  # Effective precipitation depth
+        mu = (Inf_cap / 1000.0) / (pc * ZR * (np.exp(beta * (1.0 - fc)) - 1.0))
+        Ep = np.maximum(
+            (self._PET * self._fr + fbare * self._PET * (1.0 - self._fr)) - Int_cap,
+            0.0001,
+        )  # mm/d
+        self._ETmax = Ep
+        nu = ((Ep / 24.0) / 1000.0) / (pc * ZR)  # Loss function parameter
+        nuw = ((self._soil_Ew / 24.0) / 1000.0) / (pc * ZR)
+        # Loss function parameter
+        sini = self._SO + ((Peff + self._runon) / (pc * ZR * 1000.0))
+
+        self._runoff[:] = np.where(sini > 1.0, (sini - 1.0) * pc * ZR * 1000.0, 0.0)
+        sini = np.minimum(sini, 1.0)
+
+        # Each cell follows one branch of the water balance, depending on
+        # its initial saturation (above field capacity, above stomatal
+        # closure, above wilting point or below it) and on how Tb compares
+        # with the times to reach each of these. The expressions of every
+        # branch are evaluated for all cells (so may be out of their
+        # domain) and then selected.
+        above_fc = sini >= fc
+        above_sc = ~above_fc & (sini >= sc)
+        above_wp = ~above_fc & ~above_sc & (sini >= wp)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            exp_sini_fc = np.exp(beta * (sini - fc))
+
+            tfc = np.where(
+                above_fc,
+                (1.0 / (beta * (mu - nu)))
+                * (beta * (fc - sini) + np.log((nu - mu + mu * exp_sini_fc) / nu)),
+                0.0,
+            )
+            tsc = np.select(
+                [above_fc, above_sc], [((fc - sc) / nu) + tfc, (sini - sc) / nu], 0.0
+            )
+            twp = np.select(
+                [above_fc | above_sc, above_wp],
+                [
+                    ((sc - wp) / (nu - nuw)) * np.log(nu / nuw) + tsc,
+                    ((sc - wp) / (nu - nuw))
+                    * np.log(1 + (nu - nuw) * (sini - wp) / (nuw * (sc - wp))),
+                ],
+                0.0,
             )
-            # Infiltration capacity
-            Int_cap = min(self._vegcover[cell] * self._interception_cap[cell], P)
-            # Interception capacity
-            Peff = max(P - Int_cap, 0.0)  # Effective precipitation depth
-            mu = (Inf_cap / 1000.0) / (pc * ZR * (np.exp(beta * (1.0 - fc)) - 1.0))
-            Ep = max(
-                (
-                    self._PET[cell] * self._fr[cell]
-                    + fbare * self._PET[cell] * (1.0 - self._fr[cell])
-                )
-                - Int_cap,
-                0.0001,
-            )  # mm/d
-            self._ETmax[cell] = Ep
-            nu = ((Ep / 24.0) / 1000.0) / (pc * ZR)  # Loss function parameter
-            nuw = ((self._soil_Ew / 24.0) / 1000.0) / (pc * ZR)
-            # Loss function parameter
-            sini = self._SO[cell] + ((Peff + self._runon) / (pc * ZR * 1000.0))
-
-            if sini > 1.0:
-                self._runoff[cell] = (sini - 1.0) * pc * ZR * 1000.0
-                # print 'Runoff =', self._runoff
-                sini = 1.0
-            else:
-                self._runoff[cell] = 0.0
-
-            if sini >= fc:
-                tfc = (1.0 / (beta * (mu - nu))) * (
-                    beta * (fc - sini)
-                    + np.log((nu - mu + mu * np.exp(beta * (sini - fc))) / nu)
-                )
-                tsc = ((fc - sc) / nu) + tfc
-                twp = ((sc - wp) / (nu - nuw)) * np.log(nu / nuw) + tsc
-
-                if Tb < tfc:
-                    s = abs(
+
+            # The first matching condition gives the branch.
+            is_leaking = above_fc & (Tb < tfc)
+            is_draining = above_fc & (Tb >= tfc) & (Tb < tsc)
+            is_stressed = (above_fc | above_sc) & (Tb >= tsc) & (Tb < twp)
+            is_unstressed = above_sc & (Tb < tsc)
+            is_stressed_below_sc = above_wp & (Tb < twp)
+
+            s = np.select(
+                [
+                    is_leaking,
+                    is_draining,
+                    is_stressed,
+                    above_fc,
+                    is_unstressed,
+                    is_stressed_below_sc,
+                    above_sc | above_wp,
+                ],
+                [
+                    np.abs(
                         sini
                         - (1.0 / beta)
                         * np.log(
                             (
-                                (nu - mu + mu * np.exp(beta * (sini - fc)))
+                                (nu - mu + mu * exp_sini_fc)
                                 * np.exp(beta * (nu - mu) * Tb)
-                                - mu * np.exp(beta * (sini - fc))
+                                - mu * exp_sini_fc
                             )
                             / (nu - mu)
                         )
-                    )
-
-                    self._D[cell] = ((pc * ZR * 1000.0) * (sini - s)) - (
-                        Tb * (Ep / 24.0)
-                    )
-                    self._ETA[cell] = Tb * (Ep / 24.0)
-
-                elif Tb >= tfc and Tb < tsc:
-                    s = fc - (nu * (Tb - tfc))
-                    self._D[cell] = ((pc * ZR * 1000.0) * (sini - fc)) - (
-                        (tfc) * (Ep / 24.0)
-                    )
-                    self._ETA[cell] = Tb * (Ep / 24.0)
-
-                elif Tb >= tsc and Tb < twp:
-                    s = wp + (sc - wp) * (
-                        (nu / (nu - nuw))
-                        * np.exp((-1) * ((nu - nuw) / (sc - wp)) * (Tb - tsc))
-                        - (nuw / (nu - nuw))
-                    )
-                    self._D[cell] = ((pc * ZR * 1000.0) * (sini - fc)) - (
-                        tfc * Ep / 24.0
-                    )
-                    self._ETA[cell] = (1000.0 * ZR * pc * (sini - s)) - self._D[cell]
-
-                else:
-                    s = hgw + (wp - hgw) * np.exp(
-                        (-1) * (nuw / (wp - hgw)) * max(Tb - twp, 0.0)
-                    )
-                    self._D[cell] = ((pc * ZR * 1000.0) * (sini - fc)) - (
-                        tfc * Ep / 24.0
-                    )
-                    self._ETA[cell] = (1000.0 * ZR * pc * (sini - s)) - self._D[cell]
-
-            elif sini < fc and sini >= sc:
-                tfc = 0.0
-                tsc = (sini - sc) / nu
-                twp = ((sc - wp) / (nu - nuw)) * np.log(nu / nuw) + tsc
-
-                if Tb < tsc:
-                    s = sini - nu * Tb
-                    self._D[cell] = 0.0
-                    self._ETA[cell] = 1000.0 * ZR * pc * (sini - s)
-
-                elif Tb >= tsc and Tb < twp:
-                    s = wp + (sc - wp) * (
+                    ),
+                    fc - (nu * (Tb - tfc)),
+                    wp
+                    + (sc - wp)
+                    * (
                         (nu / (nu - nuw))
                         * np.exp((-1) * ((nu - nuw) / (sc - wp)) * (Tb - tsc))
                         - (nuw / (nu - nuw))
-                    )
-                    self._D[cell] = 0
-                    self._ETA[cell] = 1000.0 * ZR * pc * (sini - s)
-
-                else:
-                    s = hgw + (wp - hgw) * np.exp(
-                        (-1) * (nuw / (wp - hgw)) * (Tb - twp)
-                    )
-                    self._D[cell] = 0.0
-                    self._ETA[cell] = 1000.0 * ZR * pc * (sini - s)
-
-            elif sini < sc and sini >= wp:
-                tfc = 0
-                tsc = 0
-                twp = ((sc - wp) / (nu - nuw)) * np.log(
-                    1 + (nu - nuw) * (sini - wp) / (nuw * (sc - wp))
-                )
-
-                if Tb < twp:
-                    s = wp + ((sc - wp) / (nu - nuw)) * (
+                    ),
+                    hgw
+                    + (wp - hgw)
+                    * np.exp((-1) * (nuw / (wp - hgw)) * np.maximum(Tb - twp, 0.0)),
+                    sini - nu * Tb,
+                    wp
+                    + ((sc - wp) / (nu - nuw))
+                    * (
                         (np.exp((-1) * ((nu - nuw) / (sc - wp)) * Tb))
                         * (nuw + ((nu - nuw) / (sc - wp)) * (sini - wp))
                         - nuw
-                    )
-                    self._D[cell] = 0.0
-                    self._ETA[cell] = 1000.0 * ZR * pc * (sini - s)
-
-                else:
-                    s = hgw + (wp - hgw) * np.exp(
-                        (-1) * (nuw / (wp - hgw)) * (Tb - twp)
-                    )
-                    self._D[cell] = 0.0
-                    self._ETA[cell] = 1000.0 * ZR * pc * (sini - s)
-
-            else:
-                tfc = 0.0
-                tsc = 0.0
-                twp = 0.0
-
-                s = hgw + (sini - hgw) * np.exp((-1) * (nuw / (wp - hgw)) * Tb)
-                self._D[cell] = 0.0
-                self._ETA[cell] = 1000.0 * ZR * pc * (sini - s)
-
-            self._water_stress[cell] = min(
-                ((max(((sc - (s + sini) / 2.0) / (sc - wp)), 0.0)) ** 4.0), 1.0
+                    ),
+                    hgw + (wp - hgw) * np.exp((-1) * (nuw / (wp - hgw)) * (Tb - twp)),
+                ],
+                hgw + (sini - hgw) * np.exp((-1) * (nuw / (wp - hgw)) * Tb),
             )
-            self._S[cell] = s
-            self._SO[cell] = s
-            self._Sini[cell] = sini
+
+        self._D[:] = np.select(
+            [is_leaking, is_draining, above_fc],
+            [
+                ((pc * ZR * 1000.0) * (sini - s)) - (Tb * (Ep / 24.0)),
+                ((pc * ZR * 1000.0) * (sini - fc)) - ((tfc) * (Ep / 24.0)),
+                ((pc * ZR * 1000.0) * (sini - fc)) - (tfc * Ep / 24.0),
+            ],
+            0.0,
+        )
+        self._ETA[:] = np.where(
+            is_leaking | is_draining,
+            Tb * (Ep / 24.0),
+            (1000.0 * ZR * pc * (sini - s)) - self._D,
+        )
+
+        self._water_stress[:] = np.minimum(
+            np.maximum(((sc - (s + sini) / 2.0) / (sc - wp)), 0.0) ** 4.0, 1.0
+        )
+        self._S[:] = s
+        self._SO[:] = s
+        self._Sini = sini
 
         self.current_time += (Tb + Tr) / (24.0 * 365.25)
         return current_time
@@ -521,94 +521,67 @@ class Vegetation(Component):
         else:
             PETthreshold = self._ETthresholddown
 
-        for cell in range(0, self._grid.number_of_cells):
-
-            WUE = self._WUE[cell]
-            LAImax = self._LAI_max[cell]
-            cb = self._cb[cell]
-            cd = self._cd[cell]
-            ksg = self._ksg[cell]
-            kdd = self._kdd[cell]
-            kws = self._kws[cell]
-            # ETdmax = self._ETdmax[cell]
-            LAIlive = min(cb * self._Blive_ini[cell], LAImax)
-            LAIdead = min(cd * self._Bdead_ini[cell], (LAImax - LAIlive))
-            NPP = max((ActualET[cell] / (Tb + Tr)) * WUE * 24.0 * self._w * 1000, 0.001)
-
-            if self._vegtype[cell] == 0:
-                if PET30_[cell] > PETthreshold:
-                    # Growing Season
-                    Bmax = (LAImax - LAIdead) / cb
-                    Yconst = 1 / (
-                        (1 / Bmax) + (((kws * Water_stress[cell]) + ksg) / NPP)
-                    )
-                    Blive = (self._Blive_ini[cell] - Yconst) * np.exp(
-                        -(NPP / Yconst) * ((Tb + Tr) / 24.0)
-                    ) + Yconst
-                    Bdead = (
-                        self._Bdead_ini[cell]
-                        + (Blive - max(Blive * np.exp(-1 * ksg * Tb / 24.0), 0.00001))
-                    ) * np.exp(-1 * kdd * min(PET[cell] / self._Tdmax, 1.0) * Tb / 24.0)
-                else:  # Senescense
-                    Blive = max(
-                        self._Blive_ini[cell] * np.exp((-2) * ksg * Tb / 24.0), 1
-                    )
-                    Bdead = max(
-                        (
-                            self._Bdead_ini[cell]
-                            + (
-                                self._Blive_ini[cell]
-                                - (
-                                    max(
-                                        self._Blive_ini[cell]
-                                        * np.exp((-2) * ksg * Tb / 24.0),
-                                        0.000001,
-                                    )
-                                )
-                            )
-                            * np.exp(
-                                (-1)
-                                * kdd
-                                * min(PET[cell] / self._Tdmax, 1.0)
-                                * Tb
-                                / 24.0
-                            ),
-                            0.0,
-                        )
-                    )
-
-            elif self._vegtype[cell] == 3:
-                Blive = 0.0
-                Bdead = 0.0
-
-            else:
-                Bmax = LAImax / cb
-                Yconst = 1.0 / (
-                    (1.0 / Bmax) + (((kws * Water_stress[cell]) + ksg) / NPP)
+        WUE = self._WUE
+        LAImax = self._LAI_max
+        cb = self._cb
+        cd = self._cd
+        ksg = self._ksg
+        kdd = self._kdd
+        kws = self._kws
+        # ETdmax = self._ETdmax
+        Blive_ini = self._Blive_ini
+        Bdead_ini = self._Bdead_ini
+
+        LAIlive = np.minimum(cb * Blive_ini, LAImax)
+        LAIdead = np.minimum(cd * Bdead_ini, (LAImax - LAIlive))
+        NPP = np.maximum((ActualET / (Tb + Tr)) * WUE * 24.0 * self._w * 1000, 0.001)
+
+        is_grass = self._vegtype == 0
+        is_dormant = is_grass & ~(PET30_ > PETthreshold)
+        is_bare = self._vegtype == 3
+
+        # Values for each vegetation type (and season, for grass) are
+        # evaluated for all cells and then selected.
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            # Growing Season (grass), shrubs and trees
+            Bmax = np.where(is_grass, (LAImax - LAIdead) / cb, LAImax / cb)
+            Yconst = 1.0 / ((1.0 / Bmax) + (((kws * Water_stress) + ksg) / NPP))
+            Blive_growing = (Blive_ini - Yconst) * np.exp(
+                -(NPP / Yconst) * ((Tb + Tr) / 24.0)
+            ) + Yconst
+            Bdead_growing = (
+                Bdead_ini
+                + (
+                    Blive_growing
+                    - np.maximum(Blive_growing * np.exp(-ksg * Tb / 24.0), 0.00001)
                 )
-                Blive = (self._Blive_ini[cell] - Yconst) * np.exp(
-                    -(NPP / Yconst) * ((Tb + Tr) / 24.0)
-                ) + Yconst
-                Bdead = (
-                    self._Bdead_ini[cell]
-                    + (Blive - max(Blive * np.exp(-ksg * Tb / 24.0), 0.00001))
-                ) * np.exp(-kdd * min(PET[cell] / self._Tdmax, 1.0) * Tb / 24.0)
-
-            LAIlive = min(cb * (Blive + self._Blive_ini[cell]) / 2.0, LAImax)
-            LAIdead = min(
-                cd * (Bdead + self._Bdead_ini[cell]) / 2.0, (LAImax - LAIlive)
+            ) * np.exp(-kdd * np.minimum(PET / self._Tdmax, 1.0) * Tb / 24.0)
+
+            # Senescense (grass)
+            Blive_dormant = np.maximum(Blive_ini * np.exp((-2) * ksg * Tb / 24.0), 1)
+            Bdead_dormant = np.maximum(
+                Bdead_ini
+                + (
+                    Blive_ini
+                    - np.maximum(Blive_ini * np.exp((-2) * ksg * Tb / 24.0), 0.000001)
+                )
+                * np.exp((-1) * kdd * np.minimum(PET / self._Tdmax, 1.0) * Tb / 24.0),
+                0.0,
             )
-            if self._vegtype[cell] == 0:
-                Vt = 1.0 - np.exp(-0.75 * (LAIlive + LAIdead))
-            else:
-                # Vt = 1 - np.exp(-0.75 * LAIlive)
-                Vt = 1.0
-
-            self._LAIlive[cell] = LAIlive
-            self._LAIdead[cell] = LAIdead
-            self._VegCov[cell] = Vt
-            self._Blive[cell] = Blive
-            self._Bdead[cell] = Bdead
+
+        Blive = np.select([is_dormant, is_bare], [Blive_dormant, 0.0], Blive_growing)
+        Bdead = np.select([is_dormant, is_bare], [Bdead_dormant, 0.0], Bdead_growing)
+
+        LAIlive = np.minimum(cb * (Blive + Blive_ini) / 2.0, LAImax)
+        LAIdead = np.minimum(cd * (Bdead + Bdead_ini) / 2.0, (LAImax - LAIlive))
+        # Vt = 1 - np.exp(-0.75 * LAIlive), for shrubs and trees
+        Vt = np.where(is_grass, 1.0 - np.exp(-0.75 * (LAIlive + LAIdead)), 1.0)
+
+        self._LAIlive[:] = LAIlive
+        self._LAIdead[:] = LAIdead
+        self._VegCov[:] = Vt
+        self._Blive[:] = Blive
+        self._Bdead[:] = Bdead
 
         self._Blive_ini = self._Blive
         self._Bdead_ini = self._Bdead
@@ -0,0 +1,361 @@
+#! /usr/bin/env python
+"""Run an ensemble of component models that share a single grid.
+
+Parameter sweeps (of, say, K_sp, m_sp and n_sp for a FastscapeEroder)
+are usually run by building one grid, with its own connectivity and
+fields, for every member of the ensemble. The grid connectivity, though,
+is the same for all of the members. A :class:`ComponentEnsemble` builds
+the grid once and stores only the fields that differ between members,
+each as a 2D array of shape *(n_members, n_elements)*. A member is
+advanced by copying its rows into the fields of the shared grid, running
+the components and copying the updated values back.
+"""
+import inspect
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .model_component import Component
+
+_WORKER = {}
+
+
+def _init_worker(grid, components):
+    _WORKER["grid"] = grid
+    _WORKER["components"] = components
+    _WORKER["instances"] = {}
+
+
+def _advance_in_worker(members, state, shared, dt):
+    _update_fields(_WORKER["grid"], shared)
+    _advance_members(
+        _WORKER["grid"], _WORKER["components"], _WORKER["instances"], members, state, dt
+    )
+    return state
+
+
+def _update_fields(grid, fields):
+    """Copy values into the fields of a grid, adding fields as needed.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A grid.
+    fields : dict of ndarray
+        Values of fields, keyed by ``(at, name)``.
+    """
+    for (at, name), values in fields.items():
+        if name in grid[at] and grid[at][name].shape == np.shape(values):
+            np.copyto(grid[at][name], values)
+        else:
+            grid.add_field(name, np.array(values), at=at, clobber=True)
+
+
+def _advance_members(grid, components, instances, members, state, dt):
+    """Advance members of an ensemble by one time step.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        The grid shared by the members.
+    components : list of tuple
+        For each component, its class, the keywords common to all members,
+        the keywords that vary between members and whether its
+        *run_one_step* method takes a time step.
+    instances : dict
+        Components that are shared by all of the members, keyed by their
+        position in *components*. Missing components are added.
+    members : iterable of int
+        The members to advance.
+    state : dict of ndarray
+        For each ``(at, name)`` field of the ensemble, the values of the
+        members being advanced, one row per member. Updated in place.
+    dt : float or None
+        Time step.
+    """
+    for row, member in enumerate(members):
+        for (at, name), values in state.items():
+            np.copyto(grid[at][name], values[row])
+
+        for index, (cls, kwds, member_kwds, takes_dt) in enumerate(components):
+            if member_kwds:
+                params = dict(kwds)
+                params.update(
+                    (key, values[member]) for key, values in member_kwds.items()
+                )
+                component = cls(grid, **params)
+            else:
+                if index not in instances:
+                    instances[index] = cls(grid, **kwds)
+                component = instances[index]
+
+            if takes_dt:
+                component.run_one_step(dt)
+            else:
+                component.run_one_step()
+
+        for (at, name), values in state.items():
+            np.copyto(values[row], grid[at][name])
+
+
+class ComponentEnsemble(Component):
+
+    """Run the members of an ensemble of models on a shared grid.
+
+    The ensemble is made up of a sequence of components (added with
+    :meth:`add_component`) that are run, in order, for each member. Fields
+    whose values differ between members (added with :meth:`add_field`) are
+    stored as stacked arrays, with one row per member. All other fields of
+    the grid are shared scratch space, which, after a time step, hold the
+    values of whichever member was run last.
+
+    Components given keywords that vary between members are created anew,
+    on the shared grid, each time a member is run. They must, therefore,
+    keep any state that is needed from one time step to the next in
+    fields of the ensemble. Components whose keywords are the same for all
+    members are created once and shared.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import FastscapeEroder, FlowAccumulator
+    >>> from landlab.core.ensemble import ComponentEnsemble
+
+    >>> grid = RasterModelGrid((3, 5))
+    >>> grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    >>> z = grid.add_zeros("topographic__elevation", at="node")
+    >>> z[grid.core_nodes] = [1.0, 2.0, 3.0]
+
+    Sweep the erodibility over three members.
+
+    >>> ensemble = ComponentEnsemble(grid, 3)
+    >>> z_of_member = ensemble.add_field("topographic__elevation", at="node")
+    >>> ensemble.add_component(FlowAccumulator)
+    >>> ensemble.add_component(
+    ...     FastscapeEroder, member_kwds={"K_sp": [0.0, 0.1, 0.2]}, m_sp=0.0
+    ... )
+    >>> ensemble.run_one_step(1.0)
+    >>> z_of_member[:, grid.core_nodes]
+    array([[ 1.        ,  2.        ,  3.        ],
+           [ 0.90909091,  1.90082645,  2.90007513],
+           [ 0.83333333,  1.80555556,  2.80092593]])
+    >>> ensemble.at_node["topographic__elevation"] is z_of_member
+    True
+    """
+
+    _name = "ComponentEnsemble"
+
+    _unit_agnostic = True
+
+    _info = {}
+
+    def __init__(self, grid, n_members, n_workers=1):
+        """
+        Parameters
+        ----------
+        grid : ModelGrid
+            The grid shared by all of the members.
+        n_members : int
+            Number of members in the ensemble.
+        n_workers : int, optional
+            Number of processes used to advance the members. If greater
+            than one, the members are split into *n_workers* groups that
+            are run in a pool of processes, each with its own copy of the
+            grid. The current values of the grid's other fields are sent
+            to the processes with each time step. Use 0 to use all of the
+            CPUs. The pool is shut down by :meth:`close`, or on leaving
+            the ensemble's context.
+        """
+        super(ComponentEnsemble, self).__init__(grid)
+
+        n_members = int(n_members)
+        if n_members < 1:
+            raise ValueError(
+                "number of members must be positive ({0})".format(n_members)
+            )
+        if n_workers == 0:
+            n_workers = os.cpu_count() or 1
+
+        self._n_members = n_members
+        self._n_workers = min(int(n_workers), n_members)
+        self._fields = {}
+        self._components = []
+        self._instances = {}
+        self._executor = None
+        self._finalizer = None
+
+    @property
+    def n_members(self):
+        """Number of members in the ensemble."""
+        return self._n_members
+
+    def __getitem__(self, at):
+        """Stacked fields of the ensemble defined at a grid element."""
+        return dict(
+            (name, values)
+            for (field_at, name), values in self._fields.items()
+            if field_at == at
+        )
+
+    @property
+    def at_node(self):
+        """Stacked fields of the ensemble defined at nodes."""
+        return self["node"]
+
+    @property
+    def at_link(self):
+        """Stacked fields of the ensemble defined at links."""
+        return self["link"]
+
+    def add_field(self, name, values=None, at="node"):
+        """Add a field whose values differ between members.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field.
+        values : array_like, optional
+            Initial values, either for all members (an array of shape
+            *(n_elements, )*) or for each member (an array of shape
+            *(n_members, n_elements)*). If not given, use the values of the
+            field on the grid. If the grid does not have the field, it is
+            added.
+        at : str, optional
+            Grid element at which the field is defined.
+
+        Returns
+        -------
+        ndarray
+            The stacked values of the field, one row per member.
+        """
+        self._close_executor()
+
+        if name not in self._grid[at]:
+            if values is None:
+                raise ValueError(
+                    "{0}: field not on grid and no values given".format(name)
+                )
+            dtype = np.asarray(values).dtype
+            self._grid.add_zeros(name, at=at, dtype=dtype)
+        field = self._grid[at][name]
+
+        if values is None:
+            values = field
+
+        stacked = np.empty((self._n_members,) + field.shape, dtype=field.dtype)
+        try:
+            stacked[:] = values
+        except ValueError:
+            raise ValueError(
+                "{0}: values must be of shape {1} or {2} ({3})".format(
+                    name, field.shape, stacked.shape, np.shape(values)
+                )
+            )
+        self._fields[(at, name)] = stacked
+
+        return stacked
+
+    def add_component(self, component, member_kwds=None, **kwds):
+        """Add a component to be run, after those already added, by each member.
+
+        Parameters
+        ----------
+        component : type
+            The component class.
+        member_kwds : dict, optional
+            Keywords whose values differ between members. The values of
+            each keyword are indexed by member.
+        **kwds
+            Keywords that are the same for all members.
+        """
+        self._close_executor()
+
+        member_kwds = dict(member_kwds or {})
+        for key, values in member_kwds.items():
+            if len(values) != self._n_members:
+                raise ValueError(
+                    "{0}: expected one value per member ({1} != {2})".format(
+                        key, len(values), self._n_members
+                    )
+                )
+
+        takes_dt = "dt" in inspect.signature(component.run_one_step).parameters
+
+        params = dict(kwds)
+        params.update((key, values[0]) for key, values in member_kwds.items())
+        instance = component(self._grid, **params)
+        if not member_kwds:
+            self._instances[len(self._components)] = instance
+
+        self._components.append((component, kwds, member_kwds, takes_dt))
+
+    def run_one_step(self, dt=None):
+        """Advance all members of the ensemble by one time step.
+
+        Parameters
+        ----------
+        dt : float, optional
+            Time step, passed to each component whose *run_one_step*
+            method takes one.
+        """
+        members = np.arange(self._n_members)
+        if self._n_workers > 1:
+            self._run_in_pool(members, dt)
+        else:
+            _advance_members(
+                self._grid,
+                self._components,
+                self._instances,
+                members,
+                self._fields,
+                dt,
+            )
+
+    def _run_in_pool(self, members, dt):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._n_workers,
+                initializer=_init_worker,
+                initargs=(self._grid, self._components),
+            )
+            self._finalizer = weakref.finalize(self, self._executor.shutdown)
+
+        shared = dict(
+            ((at, name), self._grid[at][name])
+            for at in self._grid.groups
+            for name in self._grid[at]
+            if (at, name) not in self._fields
+        )
+        groups = np.array_split(members, self._n_workers)
+        futures = [
+            self._executor.submit(
+                _advance_in_worker,
+                group,
+                dict((key, values[group]) for key, values in self._fields.items()),
+                shared,
+                dt,
+            )
+            for group in groups
+        ]
+        for group, future in zip(groups, futures):
+            for key, values in future.result().items():
+                self._fields[key][group] = values
+
+    def _close_executor(self):
+        if self._executor is not None:
+            self._finalizer()
+            self._executor = None
+            self._finalizer = None
+
+    def close(self):
+        """Shut down the pool of processes, if any, used to run the members."""
+        self._close_executor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -59,6 +59,10 @@ class DataRecord(object):
     method ``add_item`` should be used when no new variables are being added.
     The method ``add_record`` should be used when new variables are being
     added or when a variable is only tracked over the **time** dimension.
+
+    Variables that vary with **time** are stored in buffers whose capacity
+    doubles when they fill up, so that records added at times later than
+    any other are appended without copying the whole DataRecord.
     """
 
     _name = "DataRecord"
@@ -341,6 +345,10 @@ class DataRecord(object):
         # create an xarray Dataset:
         self._dataset = xr.Dataset(data_vars=data_vars_dict, coords=coords, attrs=attrs)
 
+        # buffers, along time, of the variables of the dataset
+        self._time_buffers = None
+        self._buffered_variables = None
+
     def _check_grid_element_and_id(self, grid_element, element_id):
         """Check the location and size of grid_element and element_id."""
         if isinstance(grid_element, str):
@@ -589,11 +597,10 @@ class DataRecord(object):
             # add new_record to dict of variables to add
             _new_data_vars.update(new_record)
 
-        # create dataset of new record
-        ds_to_add = xr.Dataset(data_vars=_new_data_vars, coords=coords_to_add)
-
-        # merge new record and original dataset
-        self._dataset = xr.merge((self._dataset, ds_to_add), compat="no_conflicts")
+        # append new record or merge it with the original dataset
+        if not self._append_record(_new_data_vars, coords_to_add):
+            ds_to_add = xr.Dataset(data_vars=_new_data_vars, coords=coords_to_add)
+            self._dataset = xr.merge((self._dataset, ds_to_add), compat="no_conflicts")
 
     def add_item(self, time=None, new_item=None, new_item_spec=None):
         """Add new item(s) to the current DataRecord.
@@ -1312,6 +1319,133 @@ class DataRecord(object):
                     ge[i, j] = ge[i, j - 1]
         self._dataset["grid_element"] = (["item_id", "time"], ge)
 
+    def _append_record(self, data_vars, coords):
+        """Append a record at new times to the buffers of the dataset.
+
+        A record can be appended if its times are later than any in the
+        DataRecord and it has only variables that are already in the
+        DataRecord and vary with time. If it has items, it must have all
+        of them. Variables missing from the record are set to NaN at the
+        new times.
+
+        Returns
+        -------
+        bool
+            True if the record was appended, False if it must be merged
+            with the dataset.
+        """
+        ds = self._dataset
+        if "time" not in coords or "time" not in ds.dims or ds.sizes["time"] == 0:
+            return False
+
+        times = np.asarray(coords["time"])
+        if (
+            times.ndim != 1
+            or len(times) == 0
+            or not np.can_cast(times.dtype, ds["time"].dtype)
+            or not times[0] > ds["time"].values[-1]
+            or not np.all(np.diff(times) > 0)
+        ):
+            return False
+        if "item_id" in coords and not (
+            "item_id" in ds.dims
+            and np.array_equal(coords["item_id"], ds["item_id"].values)
+        ):
+            return False
+        if set(coords) - {"time", "item_id"}:
+            return False
+
+        for name, value in data_vars.items():
+            if (
+                name not in ds.data_vars
+                or not isinstance(value, (tuple, list))
+                or len(value) != 2
+            ):
+                return False
+            dims = (value[0],) if isinstance(value[0], str) else tuple(value[0])
+            shape = tuple(
+                len(times) if dim == "time" else ds.sizes[dim] for dim in dims
+            )
+            data = np.asarray(value[1])
+            if (
+                dims != ds[name].dims
+                or "time" not in dims
+                or data.shape != shape
+                or not np.can_cast(data.dtype, ds[name].dtype)
+            ):
+                return False
+        for name, var in ds.data_vars.items():
+            # variables that are not in the record must be able to hold NaN
+            if "time" in var.dims and name not in data_vars:
+                if var.dtype.kind not in "fcO":
+                    return False
+
+        n_times = ds.sizes["time"]
+        if not self._is_buffered():
+            if not ds.indexes["time"].is_monotonic_increasing:
+                return False
+            self._grow_time_buffers(max(n_times + len(times), 2 * n_times))
+        elif n_times + len(times) > self._time_capacity:
+            self._grow_time_buffers(max(n_times + len(times), 2 * n_times))
+
+        new_times = slice(n_times, n_times + len(times))
+        variables = {}
+        for name, var in ds.variables.items():
+            if name in self._time_buffers:
+                axis = var.dims.index("time")
+                buffer = self._time_buffers[name]
+                if name == "time":
+                    buffer[new_times] = times
+                elif name in data_vars:
+                    buffer[(slice(None),) * axis + (new_times,)] = data_vars[name][1]
+                else:
+                    buffer[(slice(None),) * axis + (new_times,)] = np.nan
+                view = buffer[(slice(None),) * axis + (slice(0, new_times.stop),)]
+                variables[name] = (var.dims, view, var.attrs)
+            else:
+                variables[name] = var
+
+        self._dataset = xr.Dataset(
+            data_vars={name: variables[name] for name in ds.data_vars},
+            coords={name: variables[name] for name in ds.coords},
+            attrs=ds.attrs,
+        )
+        self._buffered_variables = {
+            name: self._dataset.variables[name] for name in self._time_buffers
+        }
+
+        return True
+
+    def _is_buffered(self):
+        """Check if the variables of the dataset are views of the buffers.
+
+        Changing values of the dataset in place changes the buffers too, but
+        variables added to or replaced in the dataset are not buffered.
+        """
+        if self._buffered_variables is None:
+            return False
+        variables = self._dataset.variables
+        return set(self._buffered_variables) == {
+            name for name, var in variables.items() if "time" in var.dims
+        } and all(
+            variables[name] is var for name, var in self._buffered_variables.items()
+        )
+
+    def _grow_time_buffers(self, capacity):
+        """Copy the variables that vary with time into larger buffers."""
+        self._time_buffers = {}
+        for name, var in self._dataset.variables.items():
+            if "time" in var.dims:
+                shape = list(var.shape)
+                shape[var.dims.index("time")] = capacity
+                if var.dtype.kind in "fcO":
+                    buffer = np.full(shape, np.nan, dtype=var.dtype)
+                else:
+                    buffer = np.empty(shape, dtype=var.dtype)
+                buffer[tuple(slice(0, n) for n in var.shape)] = var.values
+                self._time_buffers[name] = buffer
+        self._time_capacity = capacity
+
     @property
     def dataset(self):
         """The xarray Dataset that serves as the core datastructure."""
@@ -4,11 +4,11 @@ This class should not be used directly. Instead, it should be used as a
 base class when defining other types of graphs.
 """
 import inspect
-from functools import lru_cache
 
 import numpy as np
 
 from ..core.utils import as_id_array
+from ..utils.decorators import cache_result_in_object
 from .graph import Graph
 from .graph_convention import ConventionConverter
 from .sort.sort import reverse_one_to_one
@@ -51,19 +51,19 @@ class DualGraph(metaclass=DualGraphMeta):
 
     @property
     def node_at_cell(self):
-        return self.ds["node_at_cell"].values
+        return self._topology["node_at_cell"]
 
     @property
     def nodes_at_face(self):
-        return self.ds["nodes_at_face"].values
+        return self._topology["nodes_at_face"]
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def cell_at_node(self):
         return reverse_one_to_one(self.node_at_cell, minlength=self.number_of_nodes)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def link_at_face(self):
         return self._create_link_at_face()
 
@@ -84,7 +84,7 @@ class DualGraph(metaclass=DualGraphMeta):
         return self._link_at_face
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def face_at_link(self):
         return reverse_one_to_one(self.link_at_face, minlength=self.number_of_links)
 
@@ -59,13 +59,12 @@ array([[4, 3, 0, 1],
        [8, 7, 4, 5]])
 """
 import json
-from functools import lru_cache
 
 import numpy as np
 import xarray as xr
 
 from ..core.utils import as_id_array
-from ..utils.decorators import read_only_array
+from ..utils.decorators import cache_result_in_object, read_only_array
 from .object.at_node import get_links_at_node
 from .object.at_patch import get_nodes_at_patch
 from .quantity.of_link import (
@@ -76,7 +75,7 @@ from .quantity.of_link import (
 from .quantity.of_patch import get_area_of_patch, get_centroid_of_patch
 from .sort import reindex_by_xy
 from .sort.sort import reorient_link_dirs, reverse_one_to_many, sort_spokes_at_hub
-from .ugrid import ugrid_from_unstructured
+from .ugrid import topology_from_unstructured, ugrid_from_topology
 
 
 def find_perimeter_nodes(graph):
@@ -113,32 +112,6 @@ class thawed(object):
             self._graph.freeze()
 
 
-def _update_node_at_cell(ugrid, node_at_cell):
-    node_at_cell = xr.DataArray(
-        data=as_id_array(node_at_cell),
-        dims=("cell",),
-        attrs={
-            "cf_role": "cell_node_connectivity",
-            "long_name": "nodes centered at cells",
-            "start_index": 0,
-        },
-    )
-    ugrid.update({"node_at_cell": node_at_cell})
-
-
-def _update_nodes_at_face(ugrid, nodes_at_face):
-    nodes_at_face = xr.DataArray(
-        data=as_id_array(nodes_at_face),
-        dims=("face", "Two"),
-        attrs={
-            "cf_role": "face_node_connectivity",
-            "long_name": "nodes on either side of a face",
-            "start_index": 0,
-        },
-    )
-    ugrid.update({"nodes_at_face": nodes_at_face})
-
-
 class NetworkGraph:
     """Define the connectivity of a graph of nodes and links.
 
@@ -153,7 +126,7 @@ class NetworkGraph:
         mesh : Dataset
             xarray Dataset that defines the topology in ugrid format.
         """
-        self._ds = ugrid_from_unstructured(node_y_and_x, links=links)
+        self._topology = topology_from_unstructured(node_y_and_x, links=links)
 
         self._frozen = False
         self.freeze()
@@ -175,7 +148,7 @@ class NetworkGraph:
         with self.thawed():
             reorient_link_dirs(self)
             sorted_nodes, sorted_links, sorted_patches = reindex_by_xy(self)
-            if "links_at_patch" in self.ds:
+            if "links_at_patch" in self._topology:
                 sort_spokes_at_hub(
                     self.links_at_patch,
                     np.round(self.xy_of_patch, decimals=4),
@@ -187,8 +160,7 @@ class NetworkGraph:
 
     def freeze(self):
         """Freeze the graph by making arrays read-only."""
-        for var in self.ds.variables:
-            array = self.ds[var].values
+        for array in self._topology.values():
             while array is not None:
                 array.flags.writeable = False
                 array = array.base
@@ -196,25 +168,174 @@ class NetworkGraph:
 
     def thaw(self):
         """Thaw the graph by making arrays writable."""
-        for var in self.ds.variables:
+        for array in self._topology.values():
             arrays = []
-            array = self.ds[var].values
             while array is not None:
                 arrays.append(array)
                 array = array.base
             for array in arrays[::-1]:
                 array.flags.writeable = True
         self._frozen = False
+        self.__dict__.pop("_spatial_index", None)
 
-    def _add_variable(self, name, var, dims=None, attrs=None):
-        kwds = dict(data=var, dims=dims, attrs=attrs)
-        self.ds.update({name: xr.DataArray(**kwds)})
+    def _add_variable(self, name, var):
+        self._topology[name] = var
+        self.__dict__.pop("_ds", None)
         if self._frozen:
             self.freeze()
 
+    @classmethod
+    def _cached_properties(cls):
+        """Map the names of cached properties to the attributes that hold them."""
+        cached = {}
+        for name in dir(cls):
+            prop = getattr(cls, name, None)
+            if isinstance(prop, property):
+                cache_as = getattr(prop.fget, "cache_as", None)
+                if cache_as is not None:
+                    cached[name] = cache_as
+        return cached
+
+    def cached_nbytes(self):
+        """Get the memory used by each of the graph's cached values.
+
+        Derived quantities, like *links_at_node* or *patches_at_node*, are
+        calculated the first time they are requested and then cached.
+
+        Returns
+        -------
+        dict
+            Number of bytes used by each cached value, keyed by property name.
+            Properties that have not been calculated are not included.
+
+        Examples
+        --------
+        >>> from landlab.graph import Graph
+        >>> node_x, node_y = [0, 1, 2, 0, 1, 2], [0, 0, 0, 1, 1, 1]
+        >>> links = ((0, 1), (1, 2), (0, 3), (1, 4), (2, 5), (3, 4), (4, 5))
+        >>> graph = Graph((node_y, node_x), links=links)
+        >>> "links_at_node" in graph.cached_nbytes()
+        False
+        >>> graph.links_at_node.shape
+        (6, 3)
+        >>> graph.cached_nbytes()["links_at_node"] == graph.links_at_node.nbytes
+        True
+
+        LLCATS: GINF
+        """
+        nbytes = {}
+        for name, cache_as in self._cached_properties().items():
+            try:
+                value = self.__dict__[cache_as]
+            except KeyError:
+                continue
+            nbytes[name] = getattr(value, "nbytes", 0)
+        return nbytes
+
+    def clear_cache(self, *names):
+        """Drop cached values of the graph.
+
+        Dropped values are calculated again the next time they are
+        requested.
+
+        Parameters
+        ----------
+        names : str, optional
+            Names of the cached properties to drop. If not given, drop all
+            cached values.
+
+        Examples
+        --------
+        >>> from landlab.graph import Graph
+        >>> node_x, node_y = [0, 1, 2, 0, 1, 2], [0, 0, 0, 1, 1, 1]
+        >>> links = ((0, 1), (1, 2), (0, 3), (1, 4), (2, 5), (3, 4), (4, 5))
+        >>> graph = Graph((node_y, node_x), links=links)
+        >>> graph.length_of_link
+        array([ 1.,  1.,  1.,  1.,  1.,  1.,  1.])
+        >>> sorted(graph.cached_nbytes())
+        ['length_of_link']
+        >>> graph.clear_cache("length_of_link")
+        >>> graph.cached_nbytes()
+        {}
+
+        LLCATS: GINF
+        """
+        cached = self._cached_properties()
+        for name in names or cached:
+            try:
+                cache_as = cached[name]
+            except KeyError:
+                raise ValueError("{0}: not a cached property".format(name))
+            self.__dict__.pop(cache_as, None)
+
+    @property
+    def spatial_index(self):
+        """Index for locating points on the graph.
+
+        The index is created the first time it is requested and kept
+        while the graph is frozen. Thawing the graph, which allows the
+        coordinates of its nodes to change, drops it.
+
+        Examples
+        --------
+        >>> from landlab.graph import Graph
+        >>> node_x, node_y = [0, 1, 2, 0, 1, 2], [0, 0, 0, 1, 1, 1]
+        >>> graph = Graph((node_y, node_x))
+        >>> graph.spatial_index.find_nearest_node([0.2, 1.6], [0.9, 0.2])
+        array([3, 2])
+
+        >>> with graph.thawed():
+        ...     graph.x_of_node[:] += 1.0
+        >>> graph.spatial_index.find_nearest_node([0.2, 1.6], [0.9, 0.2])
+        array([3, 1])
+
+        LLCATS: NINF SUBSET
+        """
+        try:
+            return self.__dict__["_spatial_index"]
+        except KeyError:
+            index = self._create_spatial_index()
+            if self._frozen:
+                self._spatial_index = index
+            return index
+
+    def _create_spatial_index(self):
+        from .spatial_index import SpatialIndex
+
+        return SpatialIndex(self)
+
+    @property
+    @cache_result_in_object()
+    def node_distances(self):
+        """Distances and azimuths between nodes, calculated on demand.
+
+        See :class:`~landlab.graph.node_distances.NodeDistances`. This
+        instance does not cache distances; create a ``NodeDistances``
+        with a *max_cache_bytes* to cache them.
+
+        Examples
+        --------
+        >>> from landlab.graph import Graph
+        >>> node_x, node_y = [0, 1, 2, 0, 1, 2], [0, 0, 0, 1, 1, 1]
+        >>> graph = Graph((node_y, node_x))
+        >>> graph.node_distances.between(0, [1, 2, 4])
+        array([ 1.        ,  2.        ,  1.41421356])
+
+        LLCATS: NINF MEAS
+        """
+        from .node_distances import NodeDistances
+
+        return NodeDistances(self)
+
     @property
+    @cache_result_in_object()
     def ds(self):
-        return self._ds
+        """The topology of the graph as a ugrid dataset.
+
+        The dataset is only created when it is first requested. Its variables
+        share memory with the arrays of the graph.
+        """
+        return ugrid_from_topology(self._topology)
 
     def to_dict(self):
         return self.ds.to_dict()
@@ -292,7 +413,7 @@ class NetworkGraph:
         return 2
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def xy_of_node(self):
         """Get x and y-coordinates of node.
@@ -325,7 +446,7 @@ class NetworkGraph:
 
         LLCATS: NINF
         """
-        return self.ds["x_of_node"].values
+        return self._topology["x_of_node"]
 
     @property
     def y_of_node(self):
@@ -341,19 +462,19 @@ class NetworkGraph:
 
         LLCATS: NINF
         """
-        return self.ds["y_of_node"].values
+        return self._topology["y_of_node"]
 
     @property
-    @lru_cache()
     def node_x(self):
         return self.x_of_node
 
     @property
-    @lru_cache()
     def node_y(self):
         return self.y_of_node
 
     @property
+    @cache_result_in_object()
+    @read_only_array
     def nodes(self):
         """Get identifier for each node.
 
@@ -367,10 +488,10 @@ class NetworkGraph:
 
         LLCATS: NINF
         """
-        return self.ds["node"].values
+        return np.arange(self.number_of_nodes)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def perimeter_nodes(self):
         """Get nodes on the convex hull of a Graph.
@@ -402,7 +523,7 @@ class NetworkGraph:
 
         LLCATS: NINF
         """
-        return self.ds.dims["node"]
+        return len(self._topology["x_of_node"])
 
     @property
     def nodes_at_link(self):
@@ -427,7 +548,7 @@ class NetworkGraph:
 
         LLCATS: NINF
         """
-        return self.ds["nodes_at_link"].values
+        return self._topology["nodes_at_link"]
 
     @property
     def node_at_link_tail(self):
@@ -489,12 +610,12 @@ class NetworkGraph:
         True
         """
         try:
-            return self.ds.dims["link"]
+            return len(self._topology["nodes_at_link"])
         except KeyError:
             return 0
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def links_at_node(self):
         """Get links touching a node.
@@ -517,20 +638,17 @@ class NetworkGraph:
 
         LLCATS: LINF
         """
-        try:
-            return self._links_at_node
-        except AttributeError:
-            (
-                self._links_at_node,
-                self._link_dirs_at_node,
-            ) = self._create_links_and_dirs_at_node()
-            return self._links_at_node
+        links_at_node, link_dirs_at_node = self._create_links_and_dirs_at_node()
+        if not hasattr(self, "_link_dirs_at_node"):
+            link_dirs_at_node.flags.writeable = False
+            self._link_dirs_at_node = link_dirs_at_node
+        return links_at_node
 
     def _create_links_and_dirs_at_node(self):
         return get_links_at_node(self, sort=True)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def link_dirs_at_node(self):
         """Get directions of links touching a node.
@@ -551,17 +669,14 @@ class NetworkGraph:
                [-1,  1,  0,  0], [-1,  1,  1,  0], [ 1,  1,  0,  0]],
               dtype=int8)
         """
-        try:
-            return self._link_dirs_at_node
-        except AttributeError:
-            (
-                self._links_at_node,
-                self._link_dirs_at_node,
-            ) = self._create_links_and_dirs_at_node()
-            return self._link_dirs_at_node
+        links_at_node, link_dirs_at_node = self._create_links_and_dirs_at_node()
+        if not hasattr(self, "_links_at_node"):
+            links_at_node.flags.writeable = False
+            self._links_at_node = links_at_node
+        return link_dirs_at_node
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def angle_of_link(self):
         """Get the angle of each link.
@@ -585,7 +700,7 @@ class NetworkGraph:
         return get_angle_of_link(self)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def length_of_link(self):
         """Get the length of links.
@@ -604,7 +719,7 @@ class NetworkGraph:
         return get_length_of_link(self)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def midpoint_of_link(self):
         """Get the middle of links.
@@ -625,13 +740,13 @@ class NetworkGraph:
         return get_midpoint_of_link(self)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def xy_of_link(self):
         return get_midpoint_of_link(self)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def adjacent_nodes_at_node(self):
         """Get adjacent nodes.
@@ -692,7 +807,7 @@ class NetworkGraph:
         return out
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def adjacent_links_at_link(self):
         from .object.ext.at_link import find_adjacent_links_at_link
@@ -706,7 +821,7 @@ class NetworkGraph:
         return adjacent_links_at_link
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def unit_vector_at_link(self):
         """Make arrays to store the unit vectors associated with each link.
@@ -737,7 +852,7 @@ class NetworkGraph:
         return u / np.linalg.norm(u, axis=1).reshape((-1, 1))
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def unit_vector_at_node(self):
         """Get a unit vector for each node.
@@ -777,7 +892,9 @@ class Graph(NetworkGraph):
     def __init__(self, node_y_and_x, links=None, patches=None, sort=False):
         if patches is not None and len(patches) == 0:
             patches = None
-        self._ds = ugrid_from_unstructured(node_y_and_x, links=links, patches=patches)
+        self._topology = topology_from_unstructured(
+            node_y_and_x, links=links, patches=patches
+        )
 
         self._frozen = False
         self.freeze()
@@ -791,16 +908,16 @@ class Graph(NetworkGraph):
         self._dual = dual
 
         if node_at_cell is not None:
-            _update_node_at_cell(self.ds, node_at_cell)
+            self._add_variable("node_at_cell", as_id_array(node_at_cell))
         if nodes_at_face is not None:
-            _update_nodes_at_face(self.ds, nodes_at_face)
+            self._add_variable("nodes_at_face", as_id_array(nodes_at_face))
 
     def sort(self):
         with self.thawed():
             reorient_link_dirs(self)
             sorted_nodes, sorted_links, sorted_patches = reindex_by_xy(self)
             # reorder_links_at_patch(self)
-            if "links_at_patch" in self.ds:
+            if "links_at_patch" in self._topology:
                 sort_spokes_at_hub(
                     self.links_at_patch,
                     np.round(self.xy_of_patch, decimals=4),
@@ -811,7 +928,7 @@ class Graph(NetworkGraph):
         return sorted_nodes, sorted_links, sorted_patches
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def xy_of_patch(self):
         """Get the centroid of each patch.
@@ -836,7 +953,7 @@ class Graph(NetworkGraph):
         return get_centroid_of_patch(self)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def area_of_patch(self):
         """Get the area of each patch.
@@ -880,7 +997,7 @@ class Graph(NetworkGraph):
         LLCATS: PINF
         """
         try:
-            return self.ds.dims["patch"]
+            return len(self._topology["links_at_patch"])
         except KeyError:
             return 0
 
@@ -905,10 +1022,10 @@ class Graph(NetworkGraph):
 
         LLCATS: LINF
         """
-        return self.ds["links_at_patch"].values
+        return self._topology["links_at_patch"]
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def nodes_at_patch(self):
         """Get the nodes that define a patch.
@@ -938,7 +1055,7 @@ class Graph(NetworkGraph):
         return nodes_at_patch
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def patches_at_node(self):
         """Get the patches that touch each node.
@@ -966,7 +1083,7 @@ class Graph(NetworkGraph):
         return patches_at_node
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def patches_at_link(self):
         """Get the patches on either side of each link.
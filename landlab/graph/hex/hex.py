@@ -51,8 +51,6 @@ array([[ 0. ,  1. ,  2. ,  3. ],
 12
 """
 
-from functools import lru_cache
-
 import numpy as np
 
 from ...core.utils import as_id_array
@@ -874,8 +872,13 @@ class TriGraph(HexGraphExtras, DelaunayGraph):
     def node_layout(self):
         return self._node_layout
 
+    def _create_spatial_index(self):
+        from ..spatial_index import TriSpatialIndex
+
+        return TriSpatialIndex(self)
+
     @property
-    @lru_cache()
+    @cache_result_in_object(cache_as="_immutable_perimeter_nodes")
     @make_return_array_immutable
     def perimeter_nodes(self):
         return self._perimeter_nodes
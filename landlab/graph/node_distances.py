@@ -0,0 +1,337 @@
+"""Distances and azimuths between the nodes of a graph.
+
+:class:`NodeDistances` answers distance queries between nodes without
+building the dense ``number_of_nodes`` by ``number_of_nodes`` matrices of
+distances and azimuths: distances between requested subsets of nodes,
+neighbors within a radius, and k-nearest neighbors. Radius and nearest
+neighbor queries use the k-d tree of the graph's spatial index.
+
+Azimuths are measured in radians, clockwise from north, from the query
+node to the other node, and are in the range ``[0, 2 * pi)``.
+
+Examples
+--------
+>>> from landlab.graph import UniformRectilinearGraph
+>>> graph = UniformRectilinearGraph((3, 4))
+>>> graph.node_distances.between([0, 5], [1, 6, 11])
+array([[ 1.        ,  2.23606798,  3.60555128],
+       [ 1.        ,  1.        ,  2.23606798]])
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from ..core.utils import as_id_array
+
+
+def _calc_distances_and_azimuths(x, y, nodes, other, out_distance, out_azimuth):
+    """Fill arrays with distances and azimuths from *nodes* to *other*."""
+    dx = x[other][None, :] - x[nodes][:, None]
+    dy = y[other][None, :] - y[nodes][:, None]
+
+    np.hypot(dx, dy, out=out_distance)
+    if out_azimuth is not None:
+        np.arctan2(dx, dy, out=out_azimuth)
+        out_azimuth[out_azimuth < 0.0] += 2.0 * np.pi
+
+
+class NodeDistances:
+
+    """Distances and azimuths between the nodes of a graph.
+
+    Distances are calculated when requested. To speed up repeated
+    lookups of distances from the same nodes, distances (and azimuths) from
+    blocks of *block_size* nodes to every node can be cached, up to a
+    total of *max_cache_bytes*. The least recently used blocks are
+    dropped first. The cache is cleared when the graph's spatial index,
+    and so the coordinates of its nodes, change.
+
+    Parameters
+    ----------
+    graph : graph_like
+        A graph of nodes.
+    max_cache_bytes : int, optional
+        Memory to use for caching blocks of distances. The default is to
+        not cache distances.
+    block_size : int, optional
+        Number of nodes in a block. Distances between all nodes are
+        also calculated in blocks of this many nodes, which bounds the
+        size of temporary arrays.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.graph.node_distances import NodeDistances
+    >>> grid = RasterModelGrid((4, 5))
+    >>> distances = NodeDistances(grid, max_cache_bytes=2 ** 20, block_size=4)
+
+    >>> distances.between(7, [2, 6, 8, 12])
+    array([ 1.,  1.,  1.,  1.])
+    >>> _, azimuths = distances.between(7, [2, 6, 8, 12], get_az=True)
+    >>> azimuths * 180.0 / np.pi
+    array([ 180.,  270.,   90.,    0.])
+    >>> distances.nbytes == 2 * 4 * grid.number_of_nodes * 8
+    True
+    """
+
+    def __init__(self, graph, max_cache_bytes=0, block_size=256):
+        if block_size < 1:
+            raise ValueError("block_size must be positive ({0})".format(block_size))
+
+        self._graph = graph
+        self._max_cache_bytes = max_cache_bytes
+        self._block_size = int(block_size)
+        self._blocks = OrderedDict()
+        self._index = None
+
+    @property
+    def max_cache_bytes(self):
+        """Maximum memory used for caching blocks of distances."""
+        return self._max_cache_bytes
+
+    @property
+    def block_size(self):
+        """Number of nodes in a block of distances."""
+        return self._block_size
+
+    @property
+    def nbytes(self):
+        """Memory used by cached blocks of distances."""
+        return sum(
+            distance.nbytes + azimuth.nbytes
+            for distance, azimuth in self._blocks.values()
+        )
+
+    def clear_cache(self):
+        """Drop all cached blocks of distances."""
+        self._blocks.clear()
+
+    def _spatial_index(self):
+        """Get the graph's spatial index, dropping the cache if it changed."""
+        index = self._graph.spatial_index
+        if index is not self._index:
+            self._blocks.clear()
+            self._index = index
+        return index
+
+    def between(self, nodes=None, other=None, get_az=False):
+        """Get distances, and optionally azimuths, between nodes.
+
+        Parameters
+        ----------
+        nodes : int or array_like of int, optional
+            Nodes to measure from. The default is all nodes.
+        other : int or array_like of int, optional
+            Nodes to measure to. The default is all nodes.
+        get_az : bool, optional
+            Return azimuths along with distances.
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            Distances from *nodes* (rows) to *other* (columns) and, if
+            *get_az* is ``True``, azimuths. For scalar *nodes* the arrays
+            are 1D.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid((3, 3))
+        >>> distances = grid.node_distances.between()
+        >>> distances.shape == (grid.number_of_nodes, grid.number_of_nodes)
+        True
+        >>> np.round(distances[4, grid.adjacent_nodes_at_node[4]], 3)
+        array([ 1.,  1.,  1.,  1.,  1.,  1.])
+        """
+        index = self._spatial_index()
+        x_of_node, y_of_node = index._xy_of_node.T
+        n_nodes = len(x_of_node)
+
+        scalar_nodes = nodes is not None and np.ndim(nodes) == 0
+        nodes = np.arange(n_nodes) if nodes is None else as_id_array(nodes)
+        nodes = nodes.reshape((-1,))
+        other = slice(None) if other is None else as_id_array(other)
+
+        n_other = n_nodes if isinstance(other, slice) else other.size
+        out_distance = np.empty((len(nodes), n_other), dtype=float)
+        out_azimuth = np.empty_like(out_distance) if get_az else None
+
+        block_nbytes = 2 * self._block_size * n_nodes * out_distance.itemsize
+        if block_nbytes <= self._max_cache_bytes:
+            block_of_node = nodes // self._block_size
+            for block in np.unique(block_of_node):
+                rows = np.nonzero(block_of_node == block)[0]
+                distance, azimuth = self._get_block(block, x_of_node, y_of_node)
+                offset = nodes[rows] - block * self._block_size
+                out_distance[rows] = distance[offset][:, other]
+                if get_az:
+                    out_azimuth[rows] = azimuth[offset][:, other]
+        else:
+            for start in range(0, len(nodes), self._block_size):
+                rows = slice(start, start + self._block_size)
+                _calc_distances_and_azimuths(
+                    x_of_node,
+                    y_of_node,
+                    nodes[rows],
+                    other,
+                    out_distance[rows],
+                    None if out_azimuth is None else out_azimuth[rows],
+                )
+
+        if scalar_nodes:
+            out_distance = out_distance[0]
+            out_azimuth = None if out_azimuth is None else out_azimuth[0]
+
+        if get_az:
+            return out_distance, out_azimuth
+        else:
+            return out_distance
+
+    def _get_block(self, block, x_of_node, y_of_node):
+        """Get a cached block of distances and azimuths to all nodes."""
+        try:
+            self._blocks.move_to_end(block)
+        except KeyError:
+            nodes = np.arange(
+                block * self._block_size,
+                min((block + 1) * self._block_size, len(x_of_node)),
+            )
+            distance = np.empty((len(nodes), len(x_of_node)), dtype=float)
+            azimuth = np.empty_like(distance)
+            _calc_distances_and_azimuths(
+                x_of_node, y_of_node, nodes, slice(None), distance, azimuth
+            )
+            self._blocks[block] = distance, azimuth
+            while self.nbytes > self._max_cache_bytes:
+                self._blocks.popitem(last=False)
+        return self._blocks[block]
+
+    def within(self, nodes, radius, get_az=False):
+        """Get the nodes within a distance of nodes.
+
+        Parameters
+        ----------
+        nodes : array_like of int
+            Nodes to search around.
+        radius : float
+            Search radius.
+        get_az : bool, optional
+            Return azimuths to the neighbors along with distances.
+
+        Returns
+        -------
+        tuple of ndarray
+            Neighbors, distances to them, (azimuths to them, if *get_az*
+            is ``True``) and offsets. The neighbors of ``nodes[i]``, which
+            include ``nodes[i]`` itself, are
+            ``neighbors[offset[i]:offset[i + 1]]`` and are sorted by
+            distance.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 5))
+        >>> neighbors, distances, offset = grid.node_distances.within(
+        ...     [0, 12], 1.0
+        ... )
+        >>> neighbors[offset[0]:offset[1]]
+        array([0, 1, 5])
+        >>> neighbors[offset[1]:offset[2]]
+        array([12,  7, 11, 13, 17])
+        >>> distances[offset[1]:offset[2]]
+        array([ 0.,  1.,  1.,  1.,  1.])
+        """
+        index = self._spatial_index()
+        nodes = as_id_array(nodes).reshape((-1,))
+
+        neighbors_of_node = index._node_tree().query_ball_point(
+            index._xy_of_node[nodes], radius, return_sorted=True
+        )
+        n_neighbors = np.array([len(n) for n in neighbors_of_node], dtype=int)
+        offset = np.zeros(len(nodes) + 1, dtype=int)
+        np.cumsum(n_neighbors, out=offset[1:])
+
+        node = np.repeat(nodes, n_neighbors)
+        neighbors = (
+            as_id_array(np.concatenate(neighbors_of_node))
+            if len(nodes)
+            else np.empty(0, dtype=int)
+        )
+        distances, azimuths = self._calc_paired(index, node, neighbors)
+
+        # Sort the neighbors of each node by distance, then by node
+        order = np.lexsort(
+            (neighbors, distances, np.repeat(np.arange(len(nodes)), n_neighbors))
+        )
+
+        if get_az:
+            return neighbors[order], distances[order], azimuths[order], offset
+        else:
+            return neighbors[order], distances[order], offset
+
+    def nearest(self, nodes, k, get_az=False):
+        """Get the nearest nodes to nodes.
+
+        Parameters
+        ----------
+        nodes : array_like of int
+            Nodes to search around.
+        k : int
+            Number of neighbors to find.
+        get_az : bool, optional
+            Return azimuths to the neighbors along with distances.
+
+        Returns
+        -------
+        tuple of ndarray
+            Neighbors, distances to them and, if *get_az* is ``True``,
+            azimuths to them. Row ``i`` holds the *k* nodes nearest
+            ``nodes[i]``, which include ``nodes[i]`` itself, sorted by
+            distance.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 5), xy_spacing=(1.0, 2.0))
+        >>> neighbors, distances = grid.node_distances.nearest([7, 19], 3)
+        >>> neighbors
+        array([[ 7,  6,  8],
+               [19, 18, 14]])
+        >>> distances
+        array([[ 0.,  1.,  1.],
+               [ 0.,  1.,  2.]])
+        """
+        index = self._spatial_index()
+        nodes = as_id_array(nodes).reshape((-1,))
+        if not 0 < k <= len(index._xy_of_node):
+            raise ValueError(
+                "k must be between 1 and the number of nodes ({0})".format(k)
+            )
+
+        _, neighbors = index._node_tree().query(
+            index._xy_of_node[nodes], k=np.arange(1, k + 1)
+        )
+        neighbors = as_id_array(neighbors).reshape((len(nodes), k))
+        distances, azimuths = self._calc_paired(
+            index, np.repeat(nodes, k), neighbors.reshape((-1,))
+        )
+        distances, azimuths = distances.reshape((-1, k)), azimuths.reshape((-1, k))
+
+        # Break ties between equally distant neighbors by node
+        order = np.lexsort((neighbors, distances), axis=1)
+        neighbors = np.take_along_axis(neighbors, order, axis=1)
+        distances = np.take_along_axis(distances, order, axis=1)
+
+        if get_az:
+            return neighbors, distances, np.take_along_axis(azimuths, order, axis=1)
+        else:
+            return neighbors, distances
+
+    @staticmethod
+    def _calc_paired(index, nodes, other):
+        """Distances and azimuths from each of *nodes* to each of *other*."""
+        dx = index._xy_of_node[other, 0] - index._xy_of_node[nodes, 0]
+        dy = index._xy_of_node[other, 1] - index._xy_of_node[nodes, 1]
+        azimuths = np.arctan2(dx, dy)
+        azimuths[azimuths < 0.0] += 2.0 * np.pi
+        return np.hypot(dx, dy), azimuths
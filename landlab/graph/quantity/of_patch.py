@@ -30,7 +30,7 @@ def get_centroid_of_patch(graph, out=None):
     #     out,
     # )
 
-    links_at_patch = graph.ds["links_at_patch"].values
+    links_at_patch = graph.links_at_patch
     calc_centroid_at_patch(
         links_at_patch,
         # graph.links_at_patch,
@@ -147,8 +147,7 @@ def reorder_links_at_patch(graph):
     # reverse_element_order(graph._links_at_patch, negative_areas)
 
     # graph._nodes_at_patch = get_nodes_at_patch(graph)
-    if "nodes_at_patch" in graph._ds:
-        graph._ds = graph._ds.drop("nodes_at_patch")
+    graph.clear_cache("nodes_at_patch")
 
     if np.any(get_area_of_patch(graph) < 0.0):
         raise ValueError(
@@ -203,12 +202,12 @@ def sort_links_at_patch(links_at_patch, nodes_at_link, xy_of_node):
 def reindex_by_xy(graph):
     sorted_nodes = reindex_nodes_by_xy(graph)
 
-    if "nodes_at_link" in graph.ds:
+    if "nodes_at_link" in graph._topology:
         sorted_links = reindex_links_by_xy(graph)
     else:
         sorted_links = None
 
-    if "links_at_patch" in graph.ds:
+    if "links_at_patch" in graph._topology:
         sorted_patches = reindex_patches_by_xy(graph)
     else:
         sorted_patches = None
@@ -235,8 +234,7 @@ def reindex_patches_by_xy(graph):
 
     graph.links_at_patch[:] = graph.links_at_patch[sorted_patches, :]
 
-    if "nodes_at_patch" in graph._ds:
-        graph._ds = graph.ds.drop("nodes_at_patch")
+    graph.clear_cache("nodes_at_patch")
 
     return sorted_patches
 
@@ -253,7 +251,7 @@ def reindex_links_by_xy(graph):
     graph.nodes_at_link[:] = graph.nodes_at_link[sorted_links, :]
 
     # if hasattr(graph, '_links_at_patch'):
-    if "links_at_patch" in graph.ds:
+    if "links_at_patch" in graph._topology:
         remap_graph_element_ignore(
             graph.links_at_patch.reshape((-1,)),
             as_id_array(np.argsort(sorted_links)),
@@ -273,12 +271,12 @@ def reindex_nodes_by_xy(graph):
     graph.y_of_node[:] = graph.y_of_node[sorted_nodes]
     graph.x_of_node[:] = graph.x_of_node[sorted_nodes]
 
-    if "nodes_at_link" in graph.ds:
+    if "nodes_at_link" in graph._topology:
         remap_graph_element(
             graph.nodes_at_link.reshape((-1,)), as_id_array(np.argsort(sorted_nodes))
         )
 
-    if "nodes_at_patch" in graph.ds:
+    if "nodes_at_patch" in graph._topology:
         remap_graph_element(
             graph.nodes_at_patch.reshape((-1,)), as_id_array(np.argsort(sorted_nodes))
         )
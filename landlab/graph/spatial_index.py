@@ -0,0 +1,495 @@
+"""Locate points on a graph.
+
+A spatial index maps arrays of *x* and *y* coordinates to the nodes,
+cells and patches of a graph in a single vectorized call. Graphs create
+their index the first time it is needed (see ``Graph.spatial_index``) and
+drop it whenever they are thawed, which is the only way the coordinates of
+their nodes can change.
+
+Structured graphs use closed-form lookups: uniform rectilinear graphs by
+dividing by the node spacing, and triangular (hex) graphs by locating points
+on the triangular lattice. Other graphs use a k-d tree of their nodes and a
+bucket grid of their patches.
+
+Examples
+--------
+>>> from landlab.graph import UniformRectilinearGraph
+>>> graph = UniformRectilinearGraph((3, 4))
+>>> nodes, cells, patches = graph.spatial_index.locate([0.4, 1.2, 5.0], 1.2)
+>>> nodes
+array([4, 5, 7])
+>>> patches
+array([ 3,  4, -1])
+"""
+import numpy as np
+
+from ..core.utils import as_id_array
+
+
+def _as_coordinate_arrays(x, y):
+    """Broadcast coordinates to flat arrays of float and their shape."""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    return x.reshape((-1,)), y.reshape((-1,)), x.shape
+
+
+def _reshape_ids(ids, shape):
+    """Reshape identifiers to *shape*, returning a scalar for 0-d input."""
+    return ids.reshape(shape)[()]
+
+
+class SpatialIndex:
+
+    """Locate points on any graph.
+
+    Nearest nodes are found with a k-d tree of the graph's nodes. Patches
+    are found by testing points against the patches that overlap their
+    bucket in a uniform grid of buckets covering the graph. Cells are
+    the cells of the nearest nodes, which holds for any graph whose cells
+    are the Voronoi regions of its nodes.
+
+    Parameters
+    ----------
+    graph : graph_like
+        The graph to index.
+
+    Examples
+    --------
+    >>> from landlab import VoronoiDelaunayGrid
+    >>> from landlab.graph.spatial_index import SpatialIndex
+    >>> x = [0.0, 1.0, 2.0, 0.1, 1.1, 2.0, 0.0, 1.0, 2.0]
+    >>> y = [0.0, 0.1, 0.0, 1.0, 1.1, 0.9, 2.0, 1.9, 2.0]
+    >>> grid = VoronoiDelaunayGrid(x, y)
+    >>> index = SpatialIndex(grid)
+
+    >>> nodes, cells, patches = index.locate([0.1, 1.2, 2.5], [0.2, 0.9, 2.1])
+    >>> nodes
+    array([0, 5, 8])
+    >>> cells
+    array([-1,  2, -1])
+    >>> patches
+    array([ 2,  3, -1])
+
+    Scalar coordinates give scalar identifiers.
+
+    >>> int(index.find_nearest_node(1.1, 0.9))
+    5
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+        self._xy_of_node = np.column_stack((graph.x_of_node, graph.y_of_node))
+        self._tree = None
+        self._buckets = None
+
+    def locate(self, x, y):
+        """Get the nearest node and the cell and patch that contain points.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Coordinates of the points.
+
+        Returns
+        -------
+        tuple of ndarray of int
+            Nearest node, containing cell and containing patch of each
+            point. Points outside of all cells, or all patches, are
+            given -1.
+        """
+        nodes = self.find_nearest_node(x, y)
+        return nodes, self._cell_at_node(nodes), self.find_patch(x, y)
+
+    def find_nearest_node(self, x, y):
+        """Get the node nearest each point.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Coordinates of the points.
+
+        Returns
+        -------
+        ndarray of int
+            Nearest node to each point.
+        """
+        x, y, shape = _as_coordinate_arrays(x, y)
+        return _reshape_ids(self._find_nearest_node(x, y), shape)
+
+    def find_cell(self, x, y):
+        """Get the cell that contains each point.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Coordinates of the points.
+
+        Returns
+        -------
+        ndarray of int
+            Cell that contains each point, or -1 for points that are not
+            in any cell.
+        """
+        return self._cell_at_node(self.find_nearest_node(x, y))
+
+    def find_patch(self, x, y):
+        """Get the patch that contains each point.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Coordinates of the points.
+
+        Returns
+        -------
+        ndarray of int
+            Patch that contains each point, or -1 for points that are not
+            in any patch.
+        """
+        x, y, shape = _as_coordinate_arrays(x, y)
+        if getattr(self._graph, "number_of_patches", 0) == 0:
+            patches = np.full(len(x), -1, dtype=int)
+        else:
+            patches = self._find_patch(x, y)
+        return _reshape_ids(patches, shape)
+
+    def _cell_at_node(self, nodes):
+        try:
+            cell_at_node = self._graph.cell_at_node
+        except (AttributeError, KeyError):
+            return np.full_like(nodes, -1)
+        else:
+            return cell_at_node[nodes]
+
+    def _node_tree(self):
+        """Get a k-d tree of the graph's nodes, building it if needed."""
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+
+            self._tree = cKDTree(self._xy_of_node)
+        return self._tree
+
+    def _find_nearest_node(self, x, y):
+        return as_id_array(self._node_tree().query(np.column_stack((x, y)))[1])
+
+    def _build_buckets(self):
+        """Sort patches into a grid of buckets by their bounding boxes."""
+        nodes_at_patch = as_id_array(self._graph.nodes_at_patch)
+        nodes_at_patch = np.where(
+            nodes_at_patch == -1, nodes_at_patch[:, :1], nodes_at_patch
+        )
+        n_patches = len(nodes_at_patch)
+
+        x_of_vertex = self._xy_of_node[nodes_at_patch, 0]
+        y_of_vertex = self._xy_of_node[nodes_at_patch, 1]
+        lower_left = np.array((x_of_vertex.min(), y_of_vertex.min()))
+        upper_right = np.array((x_of_vertex.max(), y_of_vertex.max()))
+
+        # About four buckets per patch, with buckets as square as possible.
+        # Smaller buckets enter each patch into more buckets but leave
+        # fewer patches to test for each point.
+        n_buckets = 4 * n_patches
+        width, height = np.maximum(upper_right - lower_left, np.finfo(float).tiny)
+        n_cols = int(
+            np.clip(np.ceil(np.sqrt(n_buckets * width / height)), 1, n_buckets)
+        )
+        n_rows = int(np.clip(np.ceil(n_buckets / n_cols), 1, n_buckets))
+        size = np.array((width / n_cols, height / n_rows))
+
+        first_col, last_col = (
+            np.clip(
+                ((x_of_vertex.min(axis=1), x_of_vertex.max(axis=1)) - lower_left[0])
+                // size[0],
+                0,
+                n_cols - 1,
+            )
+        ).astype(int)
+        first_row, last_row = (
+            np.clip(
+                ((y_of_vertex.min(axis=1), y_of_vertex.max(axis=1)) - lower_left[1])
+                // size[1],
+                0,
+                n_rows - 1,
+            )
+        ).astype(int)
+
+        # Enter each patch into every bucket its bounding box overlaps
+        span = last_col - first_col + 1
+        n_buckets_at_patch = span * (last_row - first_row + 1)
+        patch = np.repeat(np.arange(n_patches), n_buckets_at_patch)
+        offset = np.arange(len(patch)) - np.repeat(
+            np.cumsum(n_buckets_at_patch) - n_buckets_at_patch, n_buckets_at_patch
+        )
+        bucket = (first_row[patch] + offset // span[patch]) * n_cols + (
+            first_col[patch] + offset % span[patch]
+        )
+
+        sorted_by_bucket = np.argsort(bucket, kind="stable")
+        offset_to_bucket = np.zeros(n_rows * n_cols + 1, dtype=int)
+        np.cumsum(
+            np.bincount(bucket, minlength=n_rows * n_cols), out=offset_to_bucket[1:]
+        )
+
+        self._buckets = {
+            "lower_left": lower_left,
+            "upper_right": upper_right,
+            "size": size,
+            "shape": (n_rows, n_cols),
+            "offset": offset_to_bucket,
+            "patches": patch[sorted_by_bucket],
+            "nodes_at_patch": nodes_at_patch,
+        }
+
+    def _find_patch(self, x, y):
+        if self._buckets is None:
+            self._build_buckets()
+        buckets = self._buckets
+        n_rows, n_cols = buckets["shape"]
+
+        lower_left, upper_right = buckets["lower_left"], buckets["upper_right"]
+        in_bounds = (
+            (x >= lower_left[0])
+            & (x <= upper_right[0])
+            & (y >= lower_left[1])
+            & (y <= upper_right[1])
+        )
+        col = np.clip((x - lower_left[0]) // buckets["size"][0], 0, n_cols - 1)
+        row = np.clip((y - lower_left[1]) // buckets["size"][1], 0, n_rows - 1)
+        bucket = np.where(in_bounds, row * n_cols + col, 0).astype(int)
+
+        # Pair each point with the patches of its bucket
+        start = buckets["offset"][bucket]
+        n_candidates = np.where(in_bounds, buckets["offset"][bucket + 1] - start, 0)
+        point = np.repeat(np.arange(len(x)), n_candidates)
+        candidate = buckets["patches"][
+            np.arange(len(point))
+            + np.repeat(start - (np.cumsum(n_candidates) - n_candidates), n_candidates)
+        ]
+
+        is_inside = _is_inside_convex_polygon(
+            x[point],
+            y[point],
+            self._xy_of_node[buckets["nodes_at_patch"][candidate]],
+        )
+
+        # Of the patches that contain a point, keep the lowest numbered
+        patches = np.full(len(x), -1, dtype=int)
+        patches[point[is_inside][::-1]] = candidate[is_inside][::-1]
+        return patches
+
+
+def _is_inside_convex_polygon(x, y, xy_of_vertex):
+    """Test if points are inside, or on the edge of, convex polygons.
+
+    Parameters
+    ----------
+    x, y : ndarray of float, shape (n_points,)
+        Coordinates of the points.
+    xy_of_vertex : ndarray of float, shape (n_points, n_vertices, 2)
+        Vertices of the polygon to test each point against, in either
+        clockwise or counterclockwise order.
+
+    Returns
+    -------
+    ndarray of bool
+        ``True`` for points inside their polygon.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.graph.spatial_index import _is_inside_convex_polygon
+    >>> square = [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]]
+    >>> _is_inside_convex_polygon(
+    ...     np.array([0.5, 1.0, 1.5]), np.array([0.5, 0.5, 0.5]),
+    ...     np.array([square, square[::-1], square]),
+    ... )
+    array([ True,  True, False], dtype=bool)
+    """
+    start = xy_of_vertex
+    end = np.roll(xy_of_vertex, -1, axis=1)
+    cross = (end[..., 0] - start[..., 0]) * (y[:, None] - start[..., 1]) - (
+        end[..., 1] - start[..., 1]
+    ) * (x[:, None] - start[..., 0])
+    return np.all(cross >= 0.0, axis=1) | np.all(cross <= 0.0, axis=1)
+
+
+class UniformRectilinearSpatialIndex(SpatialIndex):
+
+    """Locate points on a uniform rectilinear graph.
+
+    Nodes and patches are found by dividing by the node spacing, so no
+    search structure is built.
+
+    Examples
+    --------
+    >>> from landlab.graph import UniformRectilinearGraph
+    >>> from landlab.graph.spatial_index import UniformRectilinearSpatialIndex
+    >>> graph = UniformRectilinearGraph((3, 4), spacing=(2.0, 1.0))
+    >>> index = UniformRectilinearSpatialIndex(graph)
+
+    >>> index.find_nearest_node([0.4, 1.6, -5.0], [1.2, 2.9, 10.0])
+    array([4, 6, 8])
+    >>> index.find_patch([0.4, 1.6, -5.0], [1.2, 2.9, 10.0])
+    array([ 0,  4, -1])
+    """
+
+    def __init__(self, graph):
+        super().__init__(graph)
+        self._shape = graph.shape
+        self._spacing = (graph.dy, graph.dx)
+        self._origin = (graph.y_of_node[0], graph.x_of_node[0])
+
+    def _row_and_column(self, x, y):
+        return (
+            (y - self._origin[0]) / self._spacing[0],
+            (x - self._origin[1]) / self._spacing[1],
+        )
+
+    def _find_nearest_node(self, x, y):
+        row, col = self._row_and_column(x, y)
+        row = np.clip(np.around(row), 0, self._shape[0] - 1).astype(int)
+        col = np.clip(np.around(col), 0, self._shape[1] - 1).astype(int)
+        return row * self._shape[1] + col
+
+    def _find_patch(self, x, y):
+        row, col = self._row_and_column(x, y)
+        row, col = np.floor(row), np.floor(col)
+        n_rows, n_cols = self._shape[0] - 1, self._shape[1] - 1
+        in_bounds = (row >= 0) & (row < n_rows) & (col >= 0) & (col < n_cols)
+        return np.where(in_bounds, row * n_cols + col, -1).astype(int)
+
+
+class TriSpatialIndex(SpatialIndex):
+
+    """Locate points on a graph of nodes on a triangular lattice.
+
+    Points are first located on the lattice, which gives the two nodes
+    that could be nearest a point and the triangle that contains it. A
+    table that maps lattice positions to node and patch identifiers then
+    finishes the lookup. Points off the edge of the graph, where the
+    nearest node need not be on the lattice next to the point, fall back
+    to a k-d tree.
+
+    Examples
+    --------
+    >>> from landlab.graph import TriGraph
+    >>> from landlab.graph.spatial_index import TriSpatialIndex
+    >>> graph = TriGraph((3, 3), node_layout="hex", sort=True)
+    >>> index = TriSpatialIndex(graph)
+
+    >>> index.find_nearest_node([0.6, 1.4, 3.0], [0.1, 0.8, 2.0])
+    array([0, 4, 9])
+    >>> index.find_patch([0.6, 1.4, 3.0], [0.1, 0.8, 2.0])
+    array([ 0,  3, -1])
+    """
+
+    def __init__(self, graph):
+        super().__init__(graph)
+
+        self._spacing = (graph.spacing * np.sqrt(3.0) / 2.0, graph.spacing / 2.0)
+        self._transpose = graph.orientation == "vertical"
+
+        row, col = self._lattice_coordinates(graph.x_of_node, graph.y_of_node)
+        self._origin = (row.min(), col.min())
+        row, col = self._lattice_index(row, col)
+        self._node_at_lattice = np.full((row.max() + 1, col.max() + 1), -1, dtype=int)
+        self._node_at_lattice[row, col] = np.arange(graph.number_of_nodes)
+        self._parity = (row[0] + col[0]) % 2
+
+        self._patch_at_lattice = None
+
+    def _lattice_coordinates(self, x, y):
+        """Coordinates along and across the lattice rows, in lattice units."""
+        if self._transpose:
+            x, y = y, x
+        return np.asarray(y) / self._spacing[0], np.asarray(x) / self._spacing[1]
+
+    def _lattice_index(self, row, col):
+        return (
+            as_id_array(np.around(row - self._origin[0])),
+            as_id_array(np.around(col - self._origin[1])),
+        )
+
+    def _node_at(self, row, col):
+        n_rows, n_cols = self._node_at_lattice.shape
+        in_bounds = (row >= 0) & (row < n_rows) & (col >= 0) & (col < n_cols)
+        nodes = np.full(len(row), -1, dtype=int)
+        nodes[in_bounds] = self._node_at_lattice[row[in_bounds], col[in_bounds]]
+        return nodes
+
+    def _find_nearest_node(self, x, y):
+        row, col = self._lattice_coordinates(x, y)
+        row, col = row - self._origin[0], col - self._origin[1]
+
+        # The nearest node is in the lattice row below or above the point
+        below = np.floor(row).astype(int)
+        candidates = []
+        for lattice_row in (below, below + 1):
+            parity = (lattice_row + self._parity) % 2
+            lattice_col = (2 * np.around((col - parity) / 2.0) + parity).astype(int)
+            candidates.append(self._node_at(lattice_row, lattice_col))
+        below, above = candidates
+
+        nearest = np.where(
+            self._distance_to_node(x, y, below) <= self._distance_to_node(x, y, above),
+            below,
+            above,
+        )
+
+        off_lattice = (below == -1) | (above == -1)
+        if np.any(off_lattice):
+            nearest[off_lattice] = SpatialIndex._find_nearest_node(
+                self, x[off_lattice], y[off_lattice]
+            )
+        return nearest
+
+    def _distance_to_node(self, x, y, nodes):
+        dx = self._xy_of_node[nodes, 0] - x
+        dy = self._xy_of_node[nodes, 1] - y
+        return np.where(nodes >= 0, dx * dx + dy * dy, np.inf)
+
+    def _build_patch_at_lattice(self):
+        """Map the centroids of triangles on the lattice to patches.
+
+        Centroids sit a third of the way between lattice rows, so rows of
+        the table are in thirds of a lattice row.
+        """
+        row, col = self._lattice_coordinates(*self._graph.xy_of_patch.T)
+        row = as_id_array(np.around(3.0 * (row - self._origin[0])))
+        col = as_id_array(np.around(col - self._origin[1]))
+
+        n_rows, n_cols = self._node_at_lattice.shape
+        self._patch_at_lattice = np.full((3 * n_rows, n_cols + 1), -1, dtype=int)
+        self._patch_at_lattice[row, col] = np.arange(len(row))
+
+    def _find_patch(self, x, y):
+        if self._patch_at_lattice is None:
+            self._build_patch_at_lattice()
+
+        row, col = self._lattice_coordinates(x, y)
+        row, col = row - self._origin[0], col - self._origin[1]
+        below = np.floor(row)
+        height = row - below
+
+        # Between two lattice rows, triangles that point up (with their base
+        # on the lower row) alternate with triangles that point down.
+        col = col - (below + self._parity) % 2
+        left = 2.0 * np.floor((col - height) / 2.0)
+        points_up = col <= left + 2.0 - height
+
+        centroid_row = (3.0 * below + np.where(points_up, 1, 2)).astype(int)
+        centroid_col = (
+            left + np.where(points_up, 1.0, 2.0) + (below + self._parity) % 2
+        ).astype(int)
+
+        n_rows, n_cols = self._patch_at_lattice.shape
+        in_bounds = (
+            (centroid_row >= 0)
+            & (centroid_row < n_rows)
+            & (centroid_col >= 0)
+            & (centroid_col < n_cols)
+        )
+        patches = np.full(len(x), -1, dtype=int)
+        patches[in_bounds] = self._patch_at_lattice[
+            centroid_row[in_bounds], centroid_col[in_bounds]
+        ]
+        return patches
@@ -1,9 +1,8 @@
 from abc import ABC, abstractmethod
-from functools import lru_cache
 
 import numpy as np
 
-from ...utils.decorators import read_only_array
+from ...utils.decorators import cache_result_in_object, read_only_array
 from ..graph import Graph
 
 
@@ -390,7 +389,7 @@ class StructuredQuadGraphTopology:
         return self._shape[1]
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def nodes(self):
         """A shaped array of node ids.
@@ -404,25 +403,25 @@ class StructuredQuadGraphTopology:
         return np.arange(self.shape[0] * self.shape[1]).reshape(self.shape)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def nodes_at_right_edge(self):
         return np.arange(self.shape[1] - 1, np.prod(self.shape), self.shape[1])
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def nodes_at_top_edge(self):
         return np.arange(self.number_of_nodes - self.shape[1], np.prod(self.shape))
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def nodes_at_left_edge(self):
         return np.arange(0, np.prod(self.shape), self.shape[1])
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def nodes_at_bottom_edge(self):
         return np.arange(self.shape[1])
@@ -459,12 +458,12 @@ class StructuredQuadGraphTopology:
         )
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def horizontal_links(self):
         return self._layout.horizontal_links(self.shape)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def vertical_links(self):
         return self._layout.vertical_links(self.shape)
 
@@ -474,28 +473,28 @@ class StructuredQuadGraphTopology:
         return (n_rows * n_cols - 1, (n_rows - 1) * n_cols, 0, n_cols - 1)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def perimeter_nodes(self):
         return self._layout.perimeter_nodes(self.shape)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def links_at_node(self):
         return self._layout.links_at_node(self.shape)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     def link_dirs_at_node(self):
         return self._layout.link_dirs_at_node(self.shape)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def patches_at_link(self):
         return self._layout.patches_at_link(self.shape)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @read_only_array
     def patches_at_node(self):
         return self._layout.patches_at_node(self.shape)
@@ -659,3 +658,8 @@ class UniformRectilinearGraph(StructuredQuadGraphExtras):
     @property
     def dy(self):
         return self._spacing[0]
+
+    def _create_spatial_index(self):
+        from ..spatial_index import UniformRectilinearSpatialIndex
+
+        return UniformRectilinearSpatialIndex(self)
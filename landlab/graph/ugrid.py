@@ -15,70 +15,121 @@ _MESH_ATTRS = {
     "edge_dimension": "link",
 }
 
+# Dimensions and attributes of the topology variables of a ugrid dataset.
+_VARIABLES = {
+    "y_of_node": (("node",), {"long_name": "y", "units": "m"}),
+    "x_of_node": (("node",), {"long_name": "x", "units": "m"}),
+    "nodes_at_link": (
+        ("link", "Two"),
+        {
+            "cf_role": "edge_node_connectivity",
+            "long_name": "nodes a link tail and head",
+            "start_index": 0,
+        },
+    ),
+    "links_at_patch": (
+        ("patch", "max_patch_links"),
+        {
+            "cf_role": "face_edge_connectivity",
+            "long_name": "Maps every face to its edges",
+            "start_index": 0,
+        },
+    ),
+    "node_at_cell": (
+        ("cell",),
+        {
+            "cf_role": "cell_node_connectivity",
+            "long_name": "nodes centered at cells",
+            "start_index": 0,
+        },
+    ),
+    "nodes_at_face": (
+        ("face", "Two"),
+        {
+            "cf_role": "face_node_connectivity",
+            "long_name": "nodes on either side of a face",
+            "start_index": 0,
+        },
+    ),
+}
 
-def ugrid_from_unstructured(node_y_and_x, links=None, patches=None):
-    ugrid = xr.Dataset({"mesh": xr.DataArray(data="a", attrs=_MESH_ATTRS)})
-
-    _update_node_coords(ugrid, node_y_and_x)
-
-    if links is not None:
-        _update_nodes_at_link(ugrid, links)
 
-    if patches is not None and "nodes_at_link" in ugrid:
-        _update_links_at_patch(ugrid, patches)
+def topology_from_unstructured(node_y_and_x, links=None, patches=None):
+    """Create the arrays that define the topology of a graph.
 
-    return ugrid
+    Parameters
+    ----------
+    node_y_and_x : tuple of array_like
+        Coordinates of nodes as (y, x).
+    links : array_like of int, shape `(n_links, 2)`, optional
+        Nodes at link tail and head.
+    patches : array_like of array_like of int, optional
+        Links that define each patch.
 
+    Returns
+    -------
+    dict
+        Topology arrays, keyed by variable name.
+    """
+    topology = {}
 
-def _update_node_coords(ugrid, node_y_and_x):
     node_y, node_x = (
         np.asarray(node_y_and_x[0], dtype=float),
         np.asarray(node_y_and_x[1], dtype=float),
     )
-    y_of_node = xr.DataArray(
-        data=node_y.reshape((-1,)),
-        coords={"node": np.arange(node_y.size)},
-        dims=("node",),
-        attrs={"long_name": "y", "units": "m"},
-    )
-    x_of_node = xr.DataArray(
-        data=node_x.reshape((-1,)),
-        coords={"node": np.arange(node_x.size)},
-        dims=("node",),
-        attrs={"long_name": "x", "units": "m"},
-    )
-    ugrid.update({"y_of_node": y_of_node, "x_of_node": x_of_node})
+    topology["y_of_node"] = node_y.reshape((-1,))
+    topology["x_of_node"] = node_x.reshape((-1,))
 
-    return ugrid
+    if links is not None:
+        topology["nodes_at_link"] = np.asarray(links, dtype=int).reshape((-1, 2))
 
+    if patches is not None and "nodes_at_link" in topology:
+        topology["links_at_patch"] = _links_at_patch(patches)
 
-def _update_nodes_at_link(ugrid, node_links):
-    node_links = np.asarray(node_links, dtype=np.int).reshape((-1, 2))
-    nodes_at_link = xr.DataArray(
-        data=node_links,
-        dims=("link", "Two"),
-        attrs={
-            "cf_role": "edge_node_connectivity",
-            "long_name": "nodes a link tail and head",
-            "start_index": 0,
-        },
-    )
-    ugrid.update({"nodes_at_link": nodes_at_link})
+    return topology
 
 
-def _update_links_at_patch(ugrid, patches):
+def _links_at_patch(patches):
     from .matrix.at_patch import links_at_patch
 
+    if isinstance(patches, np.ndarray) and patches.ndim == 2:
+        return np.array(patches, dtype=int)
+
     if len(patches) > 0:
         patches = flatten_jagged_array(patches, dtype=int)
-    patch_links = links_at_patch(patches)
-    links_at_patch = xr.DataArray(
-        data=patch_links,
-        dims=("patch", "max_patch_links"),
-        attrs={
-            "cf_role": "face_edge_connectivity",
-            "long_name": "Maps every face to its edges",
-            "start_index": 0,
-        },
+    return links_at_patch(patches)
+
+
+def ugrid_from_topology(topology):
+    """Create a ugrid dataset from an array-based topology.
+
+    The dataset's variables are views of the topology arrays.
+
+    Parameters
+    ----------
+    topology : dict
+        Topology arrays, keyed by variable name.
+
+    Returns
+    -------
+    xarray.Dataset
+        The topology as a ugrid dataset.
+    """
+    ugrid = xr.Dataset({"mesh": xr.DataArray(data="a", attrs=_MESH_ATTRS)})
+
+    variables = {}
+    for name, array in topology.items():
+        dims, attrs = _VARIABLES.get(name, (None, {}))
+        variables[name] = xr.DataArray(data=array, dims=dims, attrs=attrs)
+    ugrid.update(variables)
+
+    if "node" in ugrid.dims:
+        ugrid.coords["node"] = np.arange(ugrid.dims["node"])
+
+    return ugrid
+
+
+def ugrid_from_unstructured(node_y_and_x, links=None, patches=None):
+    return ugrid_from_topology(
+        topology_from_unstructured(node_y_and_x, links=links, patches=patches)
     )
-    ugrid.update({"links_at_patch": links_at_patch})
@@ -6,8 +6,6 @@ Do NOT add new documentation here. Grid documentation is now built in a
 semi- automated fashion. To modify the text seen on the web, edit the
 files `docs/text_for_[gridfile].py.txt`.
 """
-from functools import lru_cache
-
 import numpy as np
 
 from landlab.utils.decorators import make_return_array_immutable
@@ -1873,7 +1871,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         return shaded.clip(0.0)
 
     @property
-    @lru_cache()
+    @cache_result_in_object()
     @make_return_array_immutable
     def cell_area_at_node(self):
         """Cell areas in a nnodes-long array.
@@ -2364,6 +2362,41 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         else:
             return self._node_status[ids] == boundary_flag
 
+    def find_nearest_node(self, coords):
+        """Node nearest a point.
+
+        Find the node nearest each of the given x, y coordinates, using the
+        grid's spatial index. Coordinates are provided as a tuple of
+        scalars or arrays.
+
+        Parameters
+        ----------
+        coords : tuple of array-like
+            Coordinates of points as (x, y).
+
+        Returns
+        -------
+        int or ndarray of int
+            IDs of the nearest nodes.
+
+        See Also
+        --------
+        landlab.graph.spatial_index.SpatialIndex.locate : Find the nearest
+            nodes, and the cells and patches that contain points.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid((3, 3))
+        >>> grid.find_nearest_node((0.9, 0.2))
+        0
+        >>> grid.find_nearest_node(([0.9, 1.4, 3.0], [0.2, 0.8, 2.0]))
+        array([0, 4, 9])
+
+        LLCATS: NINF SUBSET
+        """
+        return self.spatial_index.find_nearest_node(coords[0], coords[1])
+
     def calc_distances_of_nodes_to_point(
         self, coord, get_az=None, node_subset=None, out_distance=None, out_azimuth=None
     ):
@@ -2563,6 +2596,10 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
     def all_node_distances_map(self):
         """Get distances from every node to every other node.
 
+        The map is a ``number_of_nodes`` by ``number_of_nodes`` array that
+        is kept by the grid. For large grids, use :attr:`node_distances`,
+        which calculates distances only between the nodes requested.
+
         Examples
         --------
         >>> from landlab import RasterModelGrid
@@ -2595,6 +2632,10 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
     def all_node_azimuths_map(self):
         """Get azimuths from every node to every other node.
 
+        The map is a ``number_of_nodes`` by ``number_of_nodes`` array that
+        is kept by the grid. For large grids, use :attr:`node_distances`,
+        which calculates azimuths only between the nodes requested.
+
         Examples
         --------
         >>> import numpy as np
@@ -2636,7 +2677,10 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
 
         This is useful if your module needs to make repeated lookups of
         distances between the same nodes, but does potentially use up a lot
-        of memory so should be used with caution.
+        of memory so should be used with caution. A
+        :class:`~landlab.graph.node_distances.NodeDistances` with a
+        *max_cache_bytes* caches distances from the nodes that are looked up
+        under a memory cap instead.
 
         The map is symmetrical, so it does not matter whether rows are
         "from" or "to".
@@ -2650,26 +2694,10 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         tuple of ndarrays
             Tuple of (distances, azimuths)
         """
-        self._all_node_distances_map = np.empty(
-            (self.number_of_nodes, self.number_of_nodes)
-        )
-        self._all_node_azimuths_map = np.empty(
-            (self.number_of_nodes, self.number_of_nodes)
-        )
-
-        node_coords = np.empty((self.number_of_nodes, 2))
-        node_coords[:, 0] = self.node_x
-        node_coords[:, 1] = self.node_y
-
-        for i in range(self.number_of_nodes):
-            (
-                self._all_node_distances_map[i, :],
-                self._all_node_azimuths_map[i, :],
-            ) = self.calc_distances_of_nodes_to_point(
-                (node_coords[i, 0], node_coords[i, 1]), get_az="angles"
-            )
-
-        assert np.all(self._all_node_distances_map >= 0.0)
+        (
+            self._all_node_distances_map,
+            self._all_node_azimuths_map,
+        ) = self.node_distances.between(get_az=True)
 
         return self._all_node_distances_map, self._all_node_azimuths_map
 
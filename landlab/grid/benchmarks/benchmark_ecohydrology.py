@@ -0,0 +1,50 @@
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import SoilMoisture, Vegetation
+
+
+def _ecohydrology_grid():
+    rs = np.random.RandomState(1945)
+    rmg = RasterModelGrid((1002, 1002))
+    n_cells = rmg.number_of_cells
+
+    rmg.add_field(
+        "vegetation__plant_functional_type", rs.randint(0, 6, n_cells), at="cell"
+    )
+    rmg.add_field("vegetation__cover_fraction", rs.rand(n_cells), at="cell")
+    rmg.add_field("vegetation__live_leaf_area_index", 3.0 * rs.rand(n_cells), at="cell")
+    rmg.add_field(
+        "surface__potential_evapotranspiration_rate", 6.0 * rs.rand(n_cells), at="cell"
+    )
+    rmg.add_field(
+        "surface__potential_evapotranspiration_30day_mean",
+        6.0 * rs.rand(n_cells),
+        at="cell",
+    )
+    rmg.add_field(
+        "soil_moisture__initial_saturation_fraction", rs.rand(n_cells), at="cell"
+    )
+    rmg.add_field(
+        "rainfall__daily_depth",
+        np.where(rs.rand(n_cells) < 0.5, 0.0, 30.0 * rs.rand(n_cells)),
+        at="cell",
+    )
+    return rmg
+
+
+def bench_soil_moisture_update():
+    sm = SoilMoisture(_ecohydrology_grid())
+    sm.Tb = 6.0
+    sm.Tr = 48.0
+    sm.update()
+
+
+def bench_vegetation_update():
+    rmg = _ecohydrology_grid()
+    SoilMoisture(rmg)
+    veg = Vegetation(rmg)
+    veg.Tb = 6.0
+    veg.Tr = 48.0
+    veg.PETthreshold_switch = 1
+    veg.update()
@@ -0,0 +1,37 @@
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowDirectorMFD
+from landlab.components.flow_accum.flow_accum_to_n import (
+    _DrainageStack_to_n,
+    _make_array_of_donors_to_n,
+    _make_delta_array_to_n,
+    _make_number_of_donors_array_to_n,
+    make_ordered_node_array_to_n,
+)
+
+
+def _mfd_receivers():
+    rmg = RasterModelGrid((500, 500))
+    rmg.add_field(
+        "topographic__elevation",
+        rmg.x_of_node
+        + rmg.y_of_node
+        + np.random.RandomState(1945).rand(rmg.number_of_nodes),
+        at="node",
+    )
+    FlowDirectorMFD(rmg, diagonals=True).run_one_step()
+    return rmg.at_node["flow__receiver_node"], rmg.at_node["flow__receiver_proportions"]
+
+
+def bench_set_based_stack_to_n():
+    r, p = _mfd_receivers()
+    delta = _make_delta_array_to_n(_make_number_of_donors_array_to_n(r, p))
+    D = _make_array_of_donors_to_n(r, p, delta)
+    dstack = _DrainageStack_to_n(delta, D, np.sum(r >= 0, axis=1))
+    dstack.construct__stack(np.where(r[:, 0] == np.arange(r.shape[0]))[0])
+
+
+def bench_compiled_stack_to_n():
+    r, p = _mfd_receivers()
+    make_ordered_node_array_to_n(r, p)
@@ -0,0 +1,25 @@
+from landlab import RasterModelGrid
+from landlab.components import OverlandFlow
+
+
+def _overland_flow(steep_slopes=False):
+    rmg = RasterModelGrid((500, 500), xy_spacing=10.0)
+    rmg.add_field(
+        "topographic__elevation",
+        0.001 * rmg.x_of_node + 0.0005 * rmg.y_of_node,
+        at="node",
+    )
+    rmg.add_full("surface_water__depth", 0.01, at="node")
+    return OverlandFlow(rmg, rainfall_intensity=1e-5, steep_slopes=steep_slopes)
+
+
+def bench_overland_flow_substeps():
+    of = _overland_flow()
+    for _ in range(100):
+        of.run_one_step()
+
+
+def bench_overland_flow_substeps_steep_slopes():
+    of = _overland_flow(steep_slopes=True)
+    for _ in range(100):
+        of.run_one_step()
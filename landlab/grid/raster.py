@@ -1589,126 +1589,44 @@ class RasterModelGrid(
         >>> neighbors[5]
         array([3, 0, 2, 1, 4, 1, 2, 0])
         """
-        # CAUTION: Some terminology concerning cells in this module
-        # is asynchronous to general understanding. This is intentionally
-        # left as is until further discussion among dev group.
-        # Any such instances are marked with (*TC - Terminoly Caution)
-        nrows, ncols = self.cell_grid_shape
-        interior_cells = sgrid.interior_nodes(self.cell_grid_shape)  # *TC
-        cells_at_corners_of_grid = self.cells_at_corners_of_grid  # *TC
-
-        # The cells along the edges minus the corner cells.
-        top_edge_cells = self.cell_at_node[self.nodes[-2, :]][2:-2]
-        bottom_edge_cells = self.cell_at_node[self.nodes[1, :]][2:-2]
-        left_edge_cells = self.cell_at_node[self.nodes[:, 1]][2:-2]
-        right_edge_cells = self.cell_at_node[self.nodes[:, -2]][2:-2]
-
-        looped_cell_neighbors = np.empty([self.number_of_cells, 8], dtype=int)
-
-        # order = [E,NE,N,NW,W,SW,S,SE]
-        for cell in range(0, self.number_of_cells):
-            if cell in interior_cells:
-                neighbor_ = [
-                    cell + 1,
-                    cell + 1 + ncols,
-                    cell + ncols,
-                    cell + ncols - 1,
-                    cell - 1,
-                    cell - ncols - 1,
-                    cell - ncols,
-                    cell - ncols + 1,
-                ]
-            elif cell in bottom_edge_cells:
-                neighbor_ = [
-                    cell + 1,
-                    cell + 1 + ncols,
-                    cell + ncols,
-                    cell + ncols - 1,
-                    cell - 1,
-                    cell + (nrows - 1) * ncols - 1,
-                    cell + (nrows - 1) * ncols,
-                    cell + (nrows - 1) * ncols + 1,
-                ]
-            elif cell in top_edge_cells:
-                neighbor_ = [
-                    cell + 1,
-                    cell - (nrows - 1) * ncols + 1,
-                    cell - (nrows - 1) * ncols,
-                    cell - (nrows - 1) * ncols - 1,
-                    cell - 1,
-                    cell - ncols - 1,
-                    cell - ncols,
-                    cell - ncols + 1,
-                ]
-            elif cell in right_edge_cells:
-                neighbor_ = [
-                    cell - ncols + 1,
-                    cell + 1,
-                    cell + ncols,
-                    cell + ncols - 1,
-                    cell - 1,
-                    cell - ncols - 1,
-                    cell - ncols,
-                    cell - 2 * ncols + 1,
-                ]
-            elif cell in left_edge_cells:
-                neighbor_ = [
-                    cell + 1,
-                    cell + ncols + 1,
-                    cell + ncols,
-                    cell + 2 * ncols - 1,
-                    cell + ncols - 1,
-                    cell - 1,
-                    cell - ncols,
-                    cell - ncols + 1,
-                ]
-            elif cell == cells_at_corners_of_grid[0]:  # SW corner
-                neighbor_ = [
-                    cell + 1,
-                    cell + ncols + 1,
-                    cell + ncols,
-                    cell + 2 * ncols - 1,
-                    cell + ncols - 1,
-                    cell + nrows * ncols - 1,
-                    cell + (nrows - 1) * ncols,
-                    cell + (nrows - 1) * ncols + 1,
-                ]
-            elif cell == cells_at_corners_of_grid[1]:  # SE corner
-                neighbor_ = [
-                    cell - ncols + 1,
-                    cell + 1,
-                    cell + ncols,
-                    cell + ncols - 1,
-                    cell - 1,
-                    cell + (nrows - 1) * ncols - 1,
-                    cell + (nrows - 1) * ncols,
-                    cell + (nrows - 2) * ncols + 1,
-                ]
-            elif cell == cells_at_corners_of_grid[2]:  # NW corner
-                neighbor_ = [
-                    cell + 1,
-                    cell - (nrows - 1) * ncols + 1,
-                    cell - (nrows - 1) * ncols,
-                    cell - (nrows - 2) * ncols - 1,
-                    cell + ncols - 1,
-                    cell - 1,
-                    cell - ncols,
-                    cell - ncols + 1,
-                ]
-            elif cell == cells_at_corners_of_grid[3]:  # NE corner
-                neighbor_ = [
-                    cell - ncols + 1,
-                    cell - nrows * ncols + 1,
-                    cell - (nrows - 1) * ncols,
-                    cell - (nrows - 1) * ncols - 1,
-                    cell - 1,
-                    cell - ncols - 1,
-                    cell - ncols,
-                    cell - 2 * ncols + 1,
-                ]
-            looped_cell_neighbors[cell] = neighbor_
+        return self._looped_cells_at_offsets(
+            [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
+        )
+
+    def _looped_cells_at_offsets(self, offsets):
+        """Cells at row and column offsets from each cell, looping across edges.
+
+        Parameters
+        ----------
+        offsets : list of tuple of int
+            The *(row, column)* offsets of the neighbors, in order.
+
+        Returns
+        -------
+        ndarray of int, shape (n_cells, n_offsets)
+            The neighbors of each cell.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 5))
+        >>> grid._looped_cells_at_offsets([(0, 1), (-1, 0)])
+        array([[1, 3],
+               [2, 4],
+               [0, 5],
+               [4, 0],
+               [5, 1],
+               [3, 2]])
+        """
+        n_rows, n_cols = self.cell_grid_shape
+        rows, cols = np.divmod(np.arange(self.number_of_cells), n_cols)
 
-        return looped_cell_neighbors
+        neighbors = np.empty((self.number_of_cells, len(offsets)), dtype=int)
+        for col, (d_row, d_col) in enumerate(offsets):
+            neighbor_rows = (rows + d_row) % n_rows
+            neighbor_cols = (cols + d_col) % n_cols
+            neighbors[:, col] = neighbor_rows * n_cols + neighbor_cols
+        return neighbors
 
     @property
     @make_return_array_immutable
@@ -1749,6 +1667,7 @@ class RasterModelGrid(
             self.second_ring_looped_cell_neighbor_list = (
                 self._create_second_ring_looped_cell_neighbor_list()
             )
+            self._looped_second_ring_cell_neighbor_list_created = True
             return self.second_ring_looped_neighbors_at_cell
 
     def _create_second_ring_looped_cell_neighbor_list(self):
@@ -1758,30 +1677,26 @@ class RasterModelGrid(
         as a 2D array of size ( self.number_of_cells, 16 ). Order or
         neighbors: Starts with E and goes counter clockwise
         """
-        inf = self.looped_neighbors_at_cell
-        second_ring = np.empty([self.number_of_cells, 16], dtype=int)
-        order = np.arange(-1, 15)
-        order[0] = 15
-        for cell in range(0, self.number_of_cells):
-            cell1, cell2, cell3, cell4 = (
-                inf[cell][1],
-                inf[cell][3],
-                inf[cell][5],
-                inf[cell][7],
-            )
-            ring_tw = np.concatenate(
-                (
-                    inf[cell1][0:4],
-                    inf[cell2][2:6],
-                    inf[cell3][4:8],
-                    inf[cell4][6:8],
-                    inf[cell4][0:2],
-                )
-            )[order]
-            second_ring[cell] = ring_tw
-
-        self._looped_second_ring_cell_neighbor_list_created = True
-        return second_ring
+        return self._looped_cells_at_offsets(
+            [
+                (0, 2),
+                (1, 2),
+                (2, 2),
+                (2, 1),
+                (2, 0),
+                (2, -1),
+                (2, -2),
+                (1, -2),
+                (0, -2),
+                (-1, -2),
+                (-2, -2),
+                (-2, -1),
+                (-2, 0),
+                (-2, 1),
+                (-2, 2),
+                (-1, 2),
+            ]
+        )
 
     def set_watershed_boundary_condition(
         self,
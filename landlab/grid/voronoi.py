@@ -177,10 +177,6 @@ class VoronoiDelaunayGrid(DualVoronoiGraph, ModelGrid):
     def save(self, path, clobber=False):
         """Save a grid and fields.
 
-        This method uses pickle to save a Voronoi grid as a pickle file.
-        At the time of coding, this is the only convenient output format
-        for Voronoi grids, but support for netCDF is likely coming.
-
         All fields will be saved, along with the grid.
 
         The recommended suffix for the save file is '.grid'. This will
@@ -191,10 +187,6 @@ class VoronoiDelaunayGrid(DualVoronoiGraph, ModelGrid):
         :py:func:`~landlab.io.native_landlab.load_grid` can be used to
         load these files.
 
-        Caution: Pickling can be slow, and can produce very large files.
-        Caution 2: Future updates to Landlab could potentially render old
-        saves unloadable.
-
         Parameters
         ----------
         path : str
@@ -215,16 +207,6 @@ class VoronoiDelaunayGrid(DualVoronoiGraph, ModelGrid):
 
         LLCATS: GINF
         """
-        import os
-        import pickle
-
-        if os.path.exists(path) and not clobber:
-            raise ValueError("file exists")
-
-        (base, ext) = os.path.splitext(path)
-        if ext != ".grid":
-            ext = ext + ".grid"
-        path = base + ext
+        from ..io.native_landlab import save_grid
 
-        with open(path, "wb") as fp:
-            pickle.dump(self, fp)
+        save_grid(self, path, clobber=clobber)
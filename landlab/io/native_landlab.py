@@ -1,5 +1,5 @@
 #! /usr/bin/env python
-"""Read data from a pickled Landlab grid file into a RasterModelGrid.
+"""Read and write Landlab grids in Landlab's "native" format.
 
 Read Landlab native
 +++++++++++++++++++
@@ -8,27 +8,303 @@ Read Landlab native
 
     ~landlab.io.native_landlab.load_grid
     ~landlab.io.native_landlab.save_grid
+
+A native grid file starts with a short, versioned header that describes the
+grid (its type and the parameters needed to build it) along with the name,
+location, data type, shape and position of each of the arrays stored in the
+file. Each array (node status, fields, and any arrays the grid needs to
+rebuild its connectivity) follows the header as a raw block of bytes aligned
+on a 64-byte boundary so that it can be memory-mapped.
+
+Raster, hex, radial, Voronoi-Delaunay and network grids can be saved. Layers
+(:attr:`~landlab.grid.base.ModelGrid.event_layers` and
+:attr:`~landlab.grid.base.ModelGrid.material_layers`) and fields of objects
+are not saved; :func:`save_grid` raises an error for grids that have them
+before anything is written.
+
+Grids that were saved with older versions of Landlab, as pickle files, can
+still be read by :func:`load_grid`.
 """
 
+import json
 import os
 import pickle
+import struct
+
+import numpy as np
+
+from landlab import ModelGrid, NetworkModelGrid
+
+_MAGIC = b"\x93LANDLAB"
+_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sHQ")
+_ALIGNMENT = 64
+
+_FIELD_LOCATIONS = ("node", "link", "patch", "corner", "face", "cell", "grid")
+
+
+class NativeGridFormatError(Exception):
+    """Raise this error if a native grid file can not be read."""
+
+    pass
+
+
+def _raster_params(grid):
+    return {
+        "shape": list(grid.shape),
+        "xy_spacing": [grid.dx, grid.dy],
+        "xy_of_lower_left": list(grid.xy_of_lower_left),
+    }, {}
+
+
+def _hex_params(grid):
+    return {
+        "shape": list(grid.shape),
+        "spacing": grid.spacing,
+        "xy_of_lower_left": list(grid.xy_of_lower_left),
+        "orientation": grid.orientation,
+        "node_layout": grid.node_layout,
+    }, {}
+
+
+def _radial_params(grid):
+    n_rings, nodes_in_first_ring = grid.shape
+    return {
+        "n_rings": n_rings,
+        "nodes_in_first_ring": nodes_in_first_ring,
+        "spacing": grid.spacing,
+        "xy_of_center": list(grid.xy_of_center),
+    }, {}
+
+
+def _voronoi_params(grid):
+    return {}, {"x": grid.x_of_node, "y": grid.y_of_node}
+
+
+def _create_voronoi(cls, params):
+    return cls(params.pop("x"), params.pop("y"), **params)
+
+
+def _network_params(grid):
+    return {}, {"x": grid.x_of_node, "y": grid.y_of_node, "links": grid.nodes_at_link}
+
+
+def _create_network(cls, params):
+    return cls((params.pop("y"), params.pop("x")), params.pop("links"), **params)
+
+
+# Grid types that can be stored in the native format. For each, the
+# functions that get the parameters needed to recreate a grid (as header
+# values and as arrays), and that create a grid from those parameters.
+_GRID_TYPES = {
+    "RasterModelGrid": (_raster_params, None),
+    "HexModelGrid": (_hex_params, None),
+    "RadialModelGrid": (_radial_params, None),
+    "VoronoiDelaunayGrid": (_voronoi_params, _create_voronoi),
+    "NetworkModelGrid": (_network_params, _create_network),
+}
+
+_LAYERS = ("_event_layers", "_material_layers")
+
+
+def _grid_type_name(grid):
+    """Name of the first grid type in the grid's mro that can be saved."""
+    for cls in type(grid).__mro__:
+        if cls.__name__ in _GRID_TYPES and cls.__module__.startswith("landlab."):
+            return cls.__name__
+    raise TypeError("{0}: unable to save grid type".format(type(grid).__name__))
+
+
+def _grid_class(name):
+    import landlab
+
+    return getattr(landlab, name)
+
+
+def _as_json(value):
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError("{0}: not JSON serializable".format(type(value).__name__))
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _collect_arrays(grid):
+    """Arrays, and their descriptions, to write to a native grid file."""
+    for name in _LAYERS:
+        layers = getattr(grid, name, None)
+        if layers is not None and layers.number_of_layers > 0:
+            raise ValueError("{0}: unable to save layers".format(name[1:]))
+
+    arrays = []
+
+    params, param_arrays = _GRID_TYPES[_grid_type_name(grid)][0](grid)
+    for name, array in param_arrays.items():
+        arrays.append(({"group": "param", "name": name}, array))
 
-from landlab import ModelGrid
+    arrays.append(({"group": "status", "name": "status_at_node"}, grid.status_at_node))
+
+    for at in _FIELD_LOCATIONS:
+        if at not in grid.groups:
+            continue
+        for name in sorted(grid[at].keys()):
+            arrays.append(
+                (
+                    {
+                        "group": "field",
+                        "at": at,
+                        "name": name,
+                        "units": grid.field_units(at, name),
+                    },
+                    grid.field_values(at, name),
+                )
+            )
+
+    offset = 0
+    for desc, array in arrays:
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise ValueError(
+                "{0}: unable to save an array of objects".format(desc["name"])
+            )
+        desc.update(
+            dtype=array.dtype.str,
+            shape=list(array.shape),
+            offset=offset,
+            nbytes=array.nbytes,
+        )
+        offset = _aligned(offset + array.nbytes)
+
+    return params, arrays
+
+
+def _encode_native(grid):
+    """Header, and arrays to follow it, of a native grid file."""
+    params, arrays = _collect_arrays(grid)
+    params.update(
+        xy_of_reference=list(grid.xy_of_reference),
+        xy_axis_name=list(grid.axis_name),
+        xy_axis_units=list(grid.axis_units),
+    )
+    header = json.dumps(
+        {
+            "type": _grid_type_name(grid),
+            "params": params,
+            "arrays": [desc for desc, _ in arrays],
+        },
+        default=_as_json,
+    ).encode("utf-8")
+
+    return header, arrays
+
+
+def _write_native(header, arrays, file_like):
+    file_like.write(_PREAMBLE.pack(_MAGIC, _FORMAT_VERSION, len(header)))
+    file_like.write(header)
+
+    data_start = _aligned(_PREAMBLE.size + len(header))
+    file_like.write(b"\x00" * (data_start - _PREAMBLE.size - len(header)))
+    for desc, array in arrays:
+        file_like.seek(data_start + desc["offset"])
+        np.ascontiguousarray(array).tofile(file_like)
+
+
+def _read_header(file_like):
+    """Read the header of a native grid file.
+
+    Returns
+    -------
+    (dict, int) or (None, None)
+        The header and the position of the start of the data, or ``None``
+        if the file is not a native grid file.
+    """
+    preamble = file_like.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size or not preamble.startswith(_MAGIC):
+        return None, None
+
+    _, version, header_size = _PREAMBLE.unpack(preamble)
+    if version > _FORMAT_VERSION:
+        raise NativeGridFormatError(
+            "native grid format version {0} is newer than the newest version "
+            "that can be read ({1})".format(version, _FORMAT_VERSION)
+        )
+    header = json.loads(file_like.read(header_size).decode("utf-8"))
+
+    return header, _aligned(_PREAMBLE.size + header_size)
+
+
+def _read_array(path, file_like, desc, data_start, mmap=False):
+    dtype, shape = np.dtype(desc["dtype"]), tuple(desc["shape"])
+    offset = data_start + desc["offset"]
+
+    if mmap and desc["nbytes"] > 0:
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    array = np.empty(shape, dtype=dtype)
+    file_like.seek(offset)
+    if file_like.readinto(array.data.cast("B")) != desc["nbytes"]:
+        raise NativeGridFormatError("{0}: unexpected end of file".format(desc["name"]))
+    return array
+
+
+def _read_native(path, file_like, header, data_start, mmap=False):
+    params = header["params"]
+    arrays = {"param": {}, "status": {}, "field": []}
+    for desc in header["arrays"]:
+        if desc["group"] == "field":
+            arrays["field"].append(desc)
+        else:
+            arrays[desc["group"]][desc["name"]] = _read_array(
+                path, file_like, desc, data_start
+            )
+    params.update(arrays["param"])
+
+    if header["type"] not in _GRID_TYPES:
+        raise NativeGridFormatError("{0}: unknown grid type".format(header["type"]))
+    cls = _grid_class(header["type"])
+    create = _GRID_TYPES[header["type"]][1]
+    if create is None:
+        grid = cls.from_dict(params)
+    else:
+        grid = create(cls, params)
+
+    grid.status_at_node = arrays["status"]["status_at_node"]
+
+    for desc in arrays["field"]:
+        grid.add_field(
+            desc["name"],
+            _read_array(path, file_like, desc, data_start, mmap=mmap),
+            at=desc["at"],
+            units=desc["units"],
+            copy=False,
+            clobber=True,
+        )
+
+    return grid
+
+
+def _with_suffix(path):
+    (base, ext) = os.path.splitext(path)
+    if ext != ".grid":
+        ext = ext + ".grid"
+    return base + ext
 
 
 def save_grid(grid, path, clobber=False):
     """Save a grid and fields to a Landlab "native" format.
 
-    This method uses pickle to save a grid as a pickle file.
-    All fields will be saved, along with the grid.
+    The grid is saved as a header, that describes the grid and its fields,
+    followed by the raw values of each field. All fields will be saved,
+    along with the grid.
+
+    Raster, hex, radial, Voronoi-Delaunay and network grids can be saved.
+    Layers and fields of objects can not be saved.
 
     The recommended suffix for the save file is '.grid'. This will
     be added to your save if you don't include it.
 
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
-
     Parameters
     ----------
     grid : object of subclass ModelGrid
@@ -38,6 +314,14 @@ def save_grid(grid, path, clobber=False):
     clobber : bool (default False)
         Set to True to allow overwrites of existing files
 
+    Raises
+    ------
+    TypeError
+        If the grid is not of a type that can be saved.
+    ValueError
+        If the grid has layers or a field of objects, or if the file exists
+        and *clobber* is ``False``. The file is not written.
+
     Examples
     --------
     >>> from landlab import RasterModelGrid
@@ -50,33 +334,28 @@ def save_grid(grid, path, clobber=False):
     if os.path.exists(path) and not clobber:
         raise ValueError("file exists")
 
-    # test it's a grid
-    assert issubclass(type(grid), ModelGrid)
+    header, arrays = _encode_native(grid)
 
-    (base, ext) = os.path.splitext(path)
-    if ext != ".grid":
-        ext = ext + ".grid"
-    path = base + ext
+    path = _with_suffix(path)
 
     with open(path, "wb") as file_like:
-        pickle.dump(grid, file_like)
+        _write_native(header, arrays, file_like)
 
 
-def load_grid(path):
+def load_grid(path, mmap=False):
     """Load a grid and its fields from a Landlab "native" format.
 
-    This method uses pickle to load a saved grid.
     It assumes you saved using vmg.save() or save_grid, i.e., that the
-    pickle file is a .grid file.
-
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
+    file is a .grid file. Files written as pickles, by older versions of
+    Landlab, can also be read.
 
     Parameters
     ----------
     path : str
         Path to output file, either without suffix, or '.grid'
+    mmap : bool, optional
+        If ``True``, fields are read-only, memory-mapped views into the file
+        rather than copies in memory.
 
     Examples
     --------
@@ -91,11 +370,13 @@ def load_grid(path):
     >>> grid_in = load_grid('testsavedgrid.grid')
     >>> os.remove('testsavedgrid.grid') #to remove traces of this test
     """
-    (base, ext) = os.path.splitext(path)
-    if ext != ".grid":
-        ext = ext + ".grid"
-    path = base + ext
+    path = _with_suffix(path)
     with open(path, "rb") as file_like:
-        loaded_grid = pickle.load(file_like)
-    assert issubclass(type(loaded_grid), ModelGrid)
+        header, data_start = _read_header(file_like)
+        if header is None:
+            file_like.seek(0)
+            loaded_grid = pickle.load(file_like)
+        else:
+            loaded_grid = _read_native(path, file_like, header, data_start, mmap=mmap)
+    assert isinstance(loaded_grid, (ModelGrid, NetworkModelGrid))
     return loaded_grid
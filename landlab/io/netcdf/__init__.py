@@ -1,5 +1,11 @@
 from .errors import NotRasterGridError
 from .read import read_netcdf
-from .write import write_netcdf, write_raster_netcdf
+from .write import NetcdfWriter, write_netcdf, write_raster_netcdf
 
-__all__ = ["read_netcdf", "write_netcdf", "write_raster_netcdf", "NotRasterGridError"]
+__all__ = [
+    "read_netcdf",
+    "write_netcdf",
+    "write_raster_netcdf",
+    "NetcdfWriter",
+    "NotRasterGridError",
+]
@@ -7,10 +7,14 @@ Write netcdf
 .. autosummary::
 
     ~landlab.io.netcdf.write.write_netcdf
+    ~landlab.io.netcdf.write.write_raster_netcdf
+    ~landlab.io.netcdf.write.NetcdfWriter
 """
 
 
 import os
+import queue
+import threading
 import warnings
 
 import numpy as np
@@ -843,3 +847,315 @@ def write_raster_netcdf(
     # print(warning_message(message))
 
     root.close()
+
+
+class NetcdfWriter:
+
+    """Append time slices of grid fields to a NetCDF4 file.
+
+    A *NetcdfWriter* opens its file once, sets up the grid dimensions,
+    coordinates and field variables, and then appends the current values
+    of the selected fields along an unlimited time dimension with each
+    call to :meth:`write`. Unlike repeated calls to :func:`write_netcdf`
+    with ``append=True``, the file is neither reopened nor is its
+    structure reset at each step.
+
+    Node fields are stored with dimensions ``(nt, nj, ni)``, as with
+    :func:`write_netcdf`, so that files can be read with
+    :func:`~landlab.io.netcdf.read.read_netcdf`. Cell fields are stored with
+    dimensions ``(nt, nj_cell, ni_cell)``.
+
+    Parameters
+    ----------
+    path : str
+        Path to output file.
+    grid : RasterModelGrid
+        Grid that holds the fields to write.
+    at_node : str or iterable of str, optional
+        Names of node fields to write. If neither *at_node* nor *at_cell*
+        are given, write all node fields.
+    at_cell : str or iterable of str, optional
+        Names of cell fields to write. Node and cell fields are stored in
+        variables of the same name, so the names must not overlap with
+        those in *at_node*.
+    attrs : dict, optional
+        Attributes to add to netcdf file.
+    format : {'NETCDF4', 'NETCDF4_CLASSIC'}, optional
+        Format of output netcdf file.
+    chunksizes : tuple of int, optional
+        Chunk shape for the spatial dimensions of each field variable. Each
+        chunk is one time slice deep. The default is to use a single chunk
+        for each time slice.
+    zlib : bool, optional
+        Compress field variables with zlib.
+    complevel : int, optional
+        Compression level (1 to 9) to use if *zlib* is ``True``.
+    threaded : bool, optional
+        If ``True``, write to the file from a background thread so that
+        output overlaps with whatever the caller does next. Values are
+        copied when :meth:`write` is called.
+    max_queued : int, optional
+        If *threaded*, the number of time slices that may be waiting to be
+        written before :meth:`write` blocks.
+    units : str, optional
+        Time units.
+    reference : str, optional
+        Reference time.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.netcdf import NetcdfWriter
+
+    >>> grid = RasterModelGrid((4, 3))
+    >>> z = grid.add_zeros("topographic__elevation", at="node")
+    >>> _ = grid.add_zeros("air__temperature", at="cell")
+
+    Create a temporary directory to write the netcdf file into.
+
+    >>> import tempfile, os
+    >>> temp_dir = tempfile.mkdtemp()
+    >>> os.chdir(temp_dir)
+
+    >>> with NetcdfWriter(
+    ...     "test.nc",
+    ...     grid,
+    ...     at_node="topographic__elevation",
+    ...     at_cell="air__temperature",
+    ...     zlib=True,
+    ... ) as nc_file:
+    ...     for time in [0.0, 10.0, 20.0]:
+    ...         z += 1.0
+    ...         nc_file.write(time)
+    >>> nc_file.number_of_records
+    3
+
+    >>> import netCDF4
+    >>> root = netCDF4.Dataset("test.nc", "r")
+    >>> root.variables["t"][:].data
+    array([  0.,  10.,  20.])
+    >>> root.variables["topographic__elevation"].shape
+    (3, 4, 3)
+    >>> root.variables["topographic__elevation"][:, 0, 0].data
+    array([ 1.,  2.,  3.])
+    >>> root.variables["air__temperature"].shape
+    (3, 2, 1)
+    >>> root.close()
+    """
+
+    def __init__(
+        self,
+        path,
+        grid,
+        at_node=None,
+        at_cell=None,
+        attrs=None,
+        format="NETCDF4",
+        chunksizes=None,
+        zlib=False,
+        complevel=4,
+        threaded=False,
+        max_queued=2,
+        units="days",
+        reference="00:00:00 UTC",
+    ):
+        from landlab import RasterModelGrid
+
+        if not isinstance(grid, RasterModelGrid):
+            raise NotImplementedError(
+                "NetcdfWriter only supports grids of type Raster, "
+                "for other grid types use write_netcdf"
+            )
+        if format not in ("NETCDF4", "NETCDF4_CLASSIC"):
+            raise ValueError("format must be one of 'NETCDF4' or 'NETCDF4_CLASSIC'")
+
+        if isinstance(at_node, str):
+            at_node = (at_node,)
+        if isinstance(at_cell, str):
+            at_cell = (at_cell,)
+        if at_node is None and at_cell is None:
+            at_node = grid.at_node.keys()
+
+        self._grid = grid
+        self._names = {
+            "node": tuple(at_node or ()),
+            "cell": tuple(at_cell or ()),
+        }
+        for at, names in self._names.items():
+            missing = set(names) - set(grid[at].keys())
+            if missing:
+                raise ValueError(
+                    "{names}: missing {at} field(s)".format(
+                        names=", ".join(sorted(missing)), at=at
+                    )
+                )
+        duplicates = set(self._names["node"]) & set(self._names["cell"])
+        if duplicates:
+            raise ValueError(
+                "{names}: field(s) at both node and cell would be written to the "
+                "same variable".format(names=", ".join(sorted(duplicates)))
+            )
+
+        self._shape = {
+            "node": tuple(grid.shape),
+            "cell": tuple(dim - 2 for dim in grid.shape),
+        }
+        self._number_of_records = 0
+        self._error = None
+
+        self._root = nc4.Dataset(path, "w", format=format)
+        try:
+            self._create_variables(
+                attrs or {},
+                chunksizes=chunksizes,
+                zlib=zlib,
+                complevel=complevel,
+                units=units,
+                reference=reference,
+            )
+        except Exception:
+            self._root.close()
+            raise
+
+        if threaded:
+            self._queue = queue.Queue(maxsize=max_queued)
+            self._thread = threading.Thread(target=self._drain_queue, daemon=True)
+            self._thread.start()
+        else:
+            self._queue = None
+            self._thread = None
+
+    def _create_variables(self, attrs, chunksizes, zlib, complevel, units, reference):
+        """Set up the dimensions and variables of the file."""
+        root = self._root
+        grid = self._grid
+
+        _set_netcdf_attributes(root, attrs)
+        _set_netcdf_structured_dimensions(root, self._shape["node"])
+        _add_spatial_variables(root, grid)
+
+        dimensions = {"node": _get_dimension_names(self._shape["node"])}
+        if self._names["cell"]:
+            dimensions["cell"] = [name + "_cell" for name in dimensions["node"]]
+            for name, dim_size in zip(dimensions["cell"], self._shape["cell"]):
+                root.createDimension(name, dim_size)
+
+        time_var = root.createVariable("t", "f8", ("nt",))
+        time_var.units = " ".join([units, "since", reference])
+        time_var.long_name = "time"
+
+        if hasattr(grid, "grid_mapping"):
+            _set_netcdf_grid_mapping_variable(root, dict(grid.grid_mapping))
+
+        for at, names in self._names.items():
+            shape = self._shape[at]
+            if chunksizes is None:
+                chunks = shape
+            else:
+                chunks = tuple(min(c, n) for c, n in zip(chunksizes, shape))
+            for name in names:
+                values = grid[at][name]
+                var = root.createVariable(
+                    name,
+                    _NP_TO_NC_TYPE[str(values.dtype)],
+                    ["nt"] + dimensions[at],
+                    zlib=zlib,
+                    complevel=complevel,
+                    chunksizes=(1,) + chunks,
+                )
+                var.units = str(grid[at].units[name] or "?")
+                var.long_name = name
+                if hasattr(grid, "grid_mapping"):
+                    var.grid_mapping = grid.grid_mapping["name"]
+
+    @property
+    def number_of_records(self):
+        """Number of time slices that have been written, or queued."""
+        return self._number_of_records
+
+    @property
+    def closed(self):
+        """Indicate if the file has been closed."""
+        return self._root is None
+
+    def write(self, time=None):
+        """Append the current field values as a new time slice.
+
+        Parameters
+        ----------
+        time : float, optional
+            Time of the slice. If not given, use the index of the slice.
+        """
+        if self._root is None:
+            raise ValueError("I/O operation on closed file")
+        self._raise_if_error()
+
+        record = self._number_of_records
+        if time is None:
+            time = record
+
+        data = {}
+        for at, names in self._names.items():
+            for name in names:
+                values = self._grid[at][name].reshape(self._shape[at])
+                if self._queue is not None:
+                    values = values.copy()
+                data[name] = values
+
+        if self._queue is None:
+            self._write_record(record, time, data)
+        else:
+            self._queue.put((record, time, data))
+        self._number_of_records += 1
+
+    def flush(self):
+        """Write any queued time slices and sync the file to disk."""
+        if self._root is None:
+            raise ValueError("I/O operation on closed file")
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_if_error()
+        self._root.sync()
+
+    def close(self):
+        """Write any queued time slices and close the file."""
+        if self._root is None:
+            return
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._root.close()
+        self._root = None
+        self._raise_if_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_record(self, record, time, data):
+        netcdf_vars = self._root.variables
+        netcdf_vars["t"][record] = time
+        for name, values in data.items():
+            netcdf_vars[name][record] = values
+
+    def _drain_queue(self):
+        """Write queued time slices until told to stop."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    self._write_record(*item)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _raise_if_error(self):
+        if self._error is not None:
+            raise self._error
@@ -27,6 +27,13 @@ except ImportError:
 
 
 class cache_result_in_object(object):
+    """Cache the result of a method as an attribute of its object.
+
+    The name of the attribute is stored as the *cache_as* attribute of the
+    decorated function so that cached values can be found, and removed,
+    later.
+    """
+
     def __init__(self, cache_as=None):
         self._attr = cache_as
 
@@ -39,6 +46,8 @@ class cache_result_in_object(object):
                 setattr(obj, name, func(obj))
             return getattr(obj, name)
 
+        _wrapped.cache_as = name
+
         return _wrapped
 
 
@@ -0,0 +1,15 @@
+cdef struct StableEntry:
+    double priority
+    long count
+    long item
+
+
+cdef class StableHeap:
+    cdef StableEntry *heap
+    cdef long size
+    cdef long counter
+
+    cdef bint _less(self, long i, long j)
+    cdef void _swap(self, long i, long j)
+    cdef void push(self, long item, double priority)
+    cdef long pop(self)
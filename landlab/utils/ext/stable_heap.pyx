@@ -0,0 +1,76 @@
+from libc.stdlib cimport malloc, free
+
+
+cdef class StableHeap:
+
+    """A binary min-heap of items that breaks ties by insertion order.
+
+    Items come off the heap in the same order as from a
+    :class:`~landlab.utils.StablePriorityQueue`: by priority and then, for
+    equal priorities, in the order in which they were pushed. The heap
+    holds at most *capacity* items, which is not checked when pushing, and
+    *size* is the number of items it holds.
+    """
+
+    def __cinit__(self, long capacity):
+        self.heap = <StableEntry *>malloc(max(capacity, 1) * sizeof(StableEntry))
+        if not self.heap:
+            raise MemoryError()
+        self.size = 0
+        self.counter = 0
+
+    def __dealloc__(self):
+        free(self.heap)
+
+    cdef bint _less(self, long i, long j):
+        cdef StableEntry *a = &self.heap[i]
+        cdef StableEntry *b = &self.heap[j]
+        if a.priority < b.priority:
+            return True
+        elif a.priority == b.priority:
+            return a.count < b.count
+        return False
+
+    cdef void _swap(self, long i, long j):
+        cdef StableEntry tmp = self.heap[i]
+        self.heap[i] = self.heap[j]
+        self.heap[j] = tmp
+
+    cdef void push(self, long item, double priority):
+        cdef long i = self.size
+        cdef long parent
+
+        self.heap[i].priority = priority
+        self.heap[i].count = self.counter
+        self.heap[i].item = item
+        self.counter += 1
+        self.size += 1
+
+        while i > 0:
+            parent = (i - 1) >> 1
+            if self._less(i, parent):
+                self._swap(i, parent)
+                i = parent
+            else:
+                break
+
+    cdef long pop(self):
+        cdef long top = self.heap[0].item
+        cdef long i = 0
+        cdef long child, smallest
+
+        self.size -= 1
+        self.heap[0] = self.heap[self.size]
+        while True:
+            smallest = i
+            child = 2 * i + 1
+            if child < self.size and self._less(child, smallest):
+                smallest = child
+            child += 1
+            if child < self.size and self._less(child, smallest):
+                smallest = child
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+        return top
@@ -115,5 +115,6 @@ def test_shift_link_and_transition_data_upward():
         [0.75, 0.84, 2.6, 0.07, 0.09, 0.8, 0.02, 1.79, 1.51, 2.04, 3.85],
     )
     assert_equal(pq._queue[0][2], 14)  # new soonest event
-    assert_equal(pq._queue[9][2], 13)  # was previously 7, now shifted up...
-    assert_equal(round(pq._queue[9][0], 2), 0.8)  # ...still sched for t = 0.80
+    event_time = dict((link, time) for (time, _, link) in pq._queue)
+    assert_equal(round(event_time[13], 2), 0.8)  # was 7, now shifted up
+    assert_equal(len(pq), mg.number_of_active_links)  # one event per link
@@ -8,7 +8,9 @@ Created on Thu Jul  9 08:20:06 2015
 """
 
 import numpy as np
+import pytest
 from numpy.testing import assert_array_equal, assert_raises
+from pytest import approx
 
 from landlab import HexModelGrid, RasterModelGrid
 
@@ -233,6 +235,33 @@ def test_priority_queue():
     assert item == 5, "incorrect item in PQ test"
 
 
+def test_priority_queue_one_event_per_item():
+    """Pushing a queued item changes its priority in place."""
+    from landlab.ca.cfuncs import PriorityQueue
+
+    pq = PriorityQueue()
+    for item, priority in enumerate([5.0, 3.0, 4.0, 1.0, 2.0]):
+        pq.push(item, priority)
+
+    pq.push(0, 0.5)  # decrease the key of the last item
+    pq.push(3, 6.0)  # increase the key of the first item
+    pq.push(100, 2.5)  # the index grows as needed
+    pq.remove(2)
+    pq.remove(50)  # not queued, so nothing to remove
+    assert len(pq) == 5
+    assert 2 not in pq and 100 in pq
+
+    pq.move(1, 3)  # the entry of item 3 is replaced by that of item 1
+    assert 1 not in pq and 3 in pq
+    assert len(pq) == 4
+
+    assert [pq.pop()[2] for _ in range(4)] == [0, 4, 100, 3]
+    assert len(pq) == 0
+
+    with pytest.raises(ValueError):
+        pq.push(-1, 1.0)
+
+
 def test_run_oriented_raster():
     """Test running with a small grid, 2 states, 4 transition types."""
 
@@ -273,6 +302,90 @@ def test_run_oriented_raster():
     assert_array_equal(cts.node_state, [0, 1, 0, 1, 0, 1, 0, 0, 1, 1, 0, 1, 0, 1, 0])
 
 
+def _make_swap_and_decay_model(seed):
+    """A 2-state raster model with diffusion (swaps), decay and birth."""
+    grid = RasterModelGrid((24, 24))
+    nsd = {0: "empty", 1: "full"}
+    trn_list = []
+    trn_list.append(Transition((0, 1, 0), (1, 0, 0), 1.0, swap_properties=True))
+    trn_list.append(Transition((1, 0, 0), (0, 1, 0), 1.0, swap_properties=True))
+    trn_list.append(Transition((1, 1, 0), (0, 1, 0), 0.2))
+    trn_list.append(Transition((0, 0, 0), (1, 0, 0), 0.05))
+    ins = np.random.RandomState(seed).randint(0, 2, grid.number_of_nodes)
+    return RasterCTS(grid, nsd, trn_list, ins, seed=seed)
+
+
+def test_run_in_blocks_conserves_states():
+    """Swaps within a closed lattice conserve the number of each state."""
+    grid = HexModelGrid((12, 16))
+    grid.status_at_node[grid.perimeter_nodes] = grid.BC_NODE_IS_CLOSED
+    nsd = {0: "zero", 1: "one"}
+    trn_list = []
+    for orientation in range(3):
+        trn_list.append(
+            Transition((0, 1, orientation), (1, 0, orientation), 1.0, "", True)
+        )
+        trn_list.append(
+            Transition((1, 0, orientation), (0, 1, orientation), 1.0, "", True)
+        )
+    ins = np.random.RandomState(0).randint(0, 2, grid.number_of_nodes)
+    ins[grid.perimeter_nodes] = 0
+    n_ones = np.count_nonzero(ins)
+    ca = OrientedHexCTS(grid, nsd, trn_list, ins.copy())
+
+    ca.run(10.0, n_blocks=3, window=0.1)
+
+    assert ca.current_time == 10.0
+    assert np.count_nonzero(ca.node_state) == n_ones
+    assert_array_equal(np.sort(ca.propid), np.arange(grid.number_of_nodes))
+    assert_array_equal(ca.node_state, ins[ca.propid])
+
+
+def test_run_in_blocks_matches_serial_statistics():
+    """The fraction of full cells at equilibrium does not depend on blocks."""
+    fraction = {}
+    for n_blocks in (1, 4):
+        fraction[n_blocks] = []
+        for seed in range(3):
+            ca = _make_swap_and_decay_model(seed)
+            ca.run(20.0, n_blocks=n_blocks, window=0.1)
+            fraction[n_blocks].append(np.mean(ca.node_state[ca.grid.core_nodes]))
+
+    assert np.mean(fraction[4]) == approx(np.mean(fraction[1]), abs=0.03)
+
+
+def test_run_in_blocks_then_serially():
+    """Events held by the blocks are moved back onto the priority queue."""
+    ca = _make_swap_and_decay_model(0)
+    ca.run(1.0, n_blocks=2, window=0.1)
+    assert len(ca.priority_queue._queue) == 0
+
+    ca.run(2.0)
+    assert ca.current_time == approx(2.0, abs=0.1)
+    active_links = ca.grid.active_links
+    scheduled = active_links[ca.next_update[active_links] < 1e50]
+    assert np.all(ca.next_update[scheduled] > ca.current_time)
+    assert len(ca.priority_queue._queue) >= len(scheduled)
+
+
+def test_run_in_blocks_with_callback():
+    """Transition callbacks are not run in blocks."""
+    grid = RasterModelGrid((4, 6))
+    ns_dict = {0: "black", 1: "white"}
+    xn_list = [Transition((1, 0, 0), (0, 1, 0), 0.1, "", True, callback_function)]
+    ca = RasterCTS(grid, ns_dict, xn_list, np.arange(24) % 2)
+    with pytest.raises(ValueError):
+        ca.run(1.0, n_blocks=2, window=0.1)
+
+
+@pytest.mark.parametrize("window", [None, 0.0])
+def test_run_in_blocks_needs_window(window):
+    """Running in blocks is approximate, so the window must be chosen."""
+    ca = _make_swap_and_decay_model(0)
+    with pytest.raises(ValueError):
+        ca.run(1.0, n_blocks=2, window=window)
+
+
 def test_grain_hill_model():
     """Run a lattice-grain-based hillslope evolution model."""
     from .grain_hill import GrainHill
@@ -1997,3 +1997,93 @@ def test_find_lowest_node_on_lake_perimeter_c():
     assert find_lowest_node_on_lake_perimeter_c(
         node_nbrs, flood_status, elev, nodes_this_depression, pit_count, BIG_ELEV
     ) == (0, 2)
+
+
+def _map_lakes_from_scratch(z, routing):
+    grid = RasterModelGrid((30, 30))
+    grid.add_field("topographic__elevation", z.copy(), at="node")
+    FlowAccumulator(grid, flow_director=routing).run_one_step()
+    df = DepressionFinderAndRouter(grid, routing=routing)
+    df.map_depressions()
+    return df
+
+
+@pytest.mark.parametrize("routing", ["D4", "D8"])
+def test_incremental_matches_remapping(routing):
+    grid = RasterModelGrid((30, 30))
+    np.random.seed(3)
+    z = grid.add_field(
+        "topographic__elevation",
+        0.01 * grid.y_of_node + np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    fa = FlowAccumulator(grid, flow_director=routing)
+    df = DepressionFinderAndRouter(grid, routing=routing, incremental=True)
+
+    for _ in range(20):
+        z[np.random.choice(grid.core_nodes, size=3)] += np.random.rand(3) - 0.5
+        fa.run_one_step()
+        df.map_depressions()
+
+        expected = _map_lakes_from_scratch(z, routing)
+        assert_array_equal(df.lake_at_node, expected.lake_at_node)
+        assert_array_equal(df.depression_depth, expected.depression_depth)
+        assert_array_equal(df.depression_outlet_map, expected.depression_outlet_map)
+        assert_array_equal(np.sort(df.lake_outlets), np.sort(expected.lake_outlets))
+        assert grid.at_node["drainage_area"][grid.boundary_nodes].sum() == approx(
+            grid.cell_area_at_node[grid.core_nodes].sum()
+        )
+
+
+def test_incremental_keeps_unchanged_lakes():
+    grid = RasterModelGrid((30, 30))
+    np.random.seed(3)
+    z = grid.add_field(
+        "topographic__elevation", np.random.rand(grid.number_of_nodes), at="node"
+    )
+    fa = FlowAccumulator(grid, flow_director="D8")
+    df = DepressionFinderAndRouter(grid, incremental=True, tolerance=1e-3)
+    fa.run_one_step()
+    df.map_depressions()
+    lake_map = df.lake_map.copy()
+    depth = df.depression_depth.copy()
+
+    z[grid.core_nodes] += 1e-4
+    fa.run_one_step()
+    df.map_depressions()
+
+    assert df._pits_flooded == 0
+    assert_array_equal(df.lake_map, lake_map)
+    assert df.depression_depth == approx(depth, abs=1e-3)
+
+
+@pytest.mark.parametrize("routing", ["D4", "D8"])
+def test_incremental_remaps_changed_lakes(routing):
+    grid = RasterModelGrid((10, 20))
+    z = grid.add_field("topographic__elevation", 0.1 * grid.y_of_node, at="node")
+    z[[76, 103, 108, 113]] -= 1.0
+    fa = FlowAccumulator(grid, flow_director=routing)
+    df = DepressionFinderAndRouter(grid, routing=routing, incremental=True)
+    fa.run_one_step()
+    df.map_depressions()
+    assert df.number_of_lakes == 4
+
+    z[108] -= 0.5
+    fa.run_one_step()
+    df.map_depressions()
+    assert df._pits_flooded == 1
+    assert df.number_of_lakes == 4
+    assert df.depression_depth[108] == approx(1.4)
+
+    z[113] += 1.0
+    fa.run_one_step()
+    df.map_depressions()
+    assert df._pits_flooded == 0
+    assert df.number_of_lakes == 3
+    assert_array_equal(np.sort(df.lake_codes), [76, 103, 108])
+
+    z[[31, 76]] += 0.01
+    fa.run_one_step()
+    df.map_depressions()
+    assert df._pits_flooded == 1
+    assert_array_equal(np.sort(df.lake_codes), [76, 103, 108])
@@ -6,9 +6,10 @@ functionality is working.
 import os
 
 import numpy as np
+import pytest
 from numpy.testing import assert_array_almost_equal, assert_equal
 
-from landlab import RasterModelGrid
+from landlab import HexModelGrid, RasterModelGrid
 from landlab.components.diffusion import LinearDiffuser
 
 _THIS_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -279,3 +280,122 @@ def test_diffusion_no_deposit():
     z_7_after = z[7]
 
     assert_equal(z_7_before, z_7_after)
+
+
+def _run_diffuser(grid, dt, n_steps, **kwds):
+    z = grid.at_node["topographic__elevation"]
+    z_initial = z.copy()
+    dfn = LinearDiffuser(grid, **kwds)
+    for _ in range(n_steps):
+        dfn.run_one_step(dt)
+    z_final = z.copy()
+    z[:] = z_initial
+    return z_final
+
+
+@pytest.mark.parametrize(
+    "edges",
+    [
+        ("fixed", "fixed", "fixed", "fixed"),
+        ("closed", "closed", "closed", "closed"),
+        ("fixed", "closed", "fixed", "closed"),
+        ("closed", "fixed", "closed", "fixed"),
+    ],
+)
+def test_implicit_transform_matches_sparse(edges):
+    mg = RasterModelGrid((7, 10), xy_spacing=(2.0, 3.0))
+    z = mg.add_field(
+        "topographic__elevation",
+        np.random.RandomState(0).rand(mg.number_of_nodes),
+        at="node",
+    )
+    mg.set_closed_boundaries_at_grid_edges(*[edge == "closed" for edge in edges])
+
+    dfn = LinearDiffuser(mg, linear_diffusivity=5.0, implicit=True)
+    dfn.run_one_step(10.0)
+    z_transform = z.copy()
+
+    mg.at_node["topographic__elevation"] = np.random.RandomState(0).rand(
+        mg.number_of_nodes
+    )
+    z = mg.at_node["topographic__elevation"]
+    dfn = LinearDiffuser(mg, linear_diffusivity=5.0, implicit=True)
+    dfn._transform_solver = lambda *args: None
+    dfn.run_one_step(10.0)
+
+    assert_array_almost_equal(z_transform, z)
+
+
+def test_implicit_converges_to_explicit():
+    mg = RasterModelGrid((8, 10), xy_spacing=10.0)
+    mg.add_field(
+        "topographic__elevation",
+        np.random.RandomState(1).rand(mg.number_of_nodes),
+        at="node",
+    )
+    mg.status_at_node[mg.nodes_at_left_edge] = mg.BC_NODE_IS_FIXED_GRADIENT
+    mg.status_at_node[mg.nodes_at_top_edge] = mg.BC_NODE_IS_CLOSED
+    kd = mg.add_field("kd", 10.0 + mg.x_of_node, at="node")
+
+    z_explicit = _run_diffuser(mg, 0.01, 1000, linear_diffusivity=kd)
+    z_implicit = _run_diffuser(mg, 0.01, 1000, linear_diffusivity=kd, implicit=True)
+    z_one_step = _run_diffuser(mg, 10.0, 1, linear_diffusivity=kd, implicit=True)
+
+    assert_array_almost_equal(z_implicit, z_explicit, decimal=3)
+    assert np.abs(z_one_step - z_explicit).max() < 0.1
+
+
+def test_implicit_is_stable_for_large_steps():
+    mg = HexModelGrid((7, 7), spacing=10.0)
+    z = mg.add_field(
+        "topographic__elevation",
+        np.random.RandomState(2).rand(mg.number_of_nodes),
+        at="node",
+    )
+    mg.status_at_node[mg.boundary_nodes] = mg.BC_NODE_IS_CLOSED
+    volume = np.sum(z[mg.core_nodes])
+
+    dfn = LinearDiffuser(mg, linear_diffusivity=1.0, implicit=True)
+    dfn.run_one_step(1.0e9)
+
+    assert_array_almost_equal(z[mg.core_nodes], volume / mg.number_of_core_nodes)
+    assert z[mg.core_nodes].sum() == pytest.approx(volume)
+
+
+def test_implicit_keeps_stable_time_step():
+    mg = RasterModelGrid((5, 5), xy_spacing=10.0)
+    mg.add_zeros("topographic__elevation", at="node")
+    explicit = LinearDiffuser(mg, linear_diffusivity=1.0)
+    implicit = LinearDiffuser(mg, linear_diffusivity=1.0, implicit=True)
+
+    explicit.run_one_step(1.0e6)
+    implicit.run_one_step(1.0e6)
+    assert implicit.time_step == pytest.approx(explicit.time_step)
+    assert implicit.time_step < 1.0e6
+
+
+def test_implicit_reuses_factorization():
+    mg = RasterModelGrid((5, 5))
+    mg.add_zeros("topographic__elevation", at="node")
+    dfn = LinearDiffuser(mg, linear_diffusivity=1.0, implicit=True)
+
+    dfn.run_one_step(1.0)
+    solve = dfn._implicit_solve
+    dfn.run_one_step(1.0)
+    assert dfn._implicit_solve is solve
+
+    dfn.run_one_step(2.0)
+    assert dfn._implicit_solve is not solve
+    solve = dfn._implicit_solve
+
+    mg.status_at_node[mg.nodes_at_top_edge] = mg.BC_NODE_IS_CLOSED
+    dfn.run_one_step(2.0)
+    assert dfn._implicit_solve is not solve
+
+
+@pytest.mark.parametrize("kwds", [{"method": "on_diagonals"}, {"deposit": False}])
+def test_implicit_bad_keywords(kwds):
+    mg = RasterModelGrid((5, 5))
+    mg.add_zeros("topographic__elevation", at="node")
+    with pytest.raises(ValueError):
+        LinearDiffuser(mg, implicit=True, **kwds)
@@ -2,6 +2,7 @@
 """
 Unit tests for landlab.components.flexure.flexure
 """
+
 import numpy as np
 import pytest
 
@@ -16,6 +17,7 @@ def test_method_names():
     grid.add_zeros("lithosphere__overlying_pressure_increment", at="node")
     assert Flexure(grid, method="airy").method == "airy"
     assert Flexure(grid, method="flexure").method == "flexure"
+    assert Flexure(grid, method="fft").method == "fft"
     with pytest.raises(ValueError):
         Flexure(grid, method="bad-name")
 
@@ -144,3 +146,42 @@ def test_subside_loads():
     out = np.zeros((n, n))
     dz = flex.subside_loads(load, out=out)
     assert dz is out
+
+
+@pytest.mark.parametrize("shape", [(11, 11), (16, 9), (3, 12)])
+def test_fft_matches_flexure(shape):
+    grid = RasterModelGrid(shape, xy_spacing=(2e3, 1e3))
+    load = grid.add_zeros("lithosphere__overlying_pressure_increment", at="node")
+    load[:] = np.random.RandomState(1945).uniform(0.0, 1e9, size=load.size)
+
+    flex = Flexure(grid, method="flexure")
+    flex.update()
+    dz_expected = grid.at_node["lithosphere_surface__elevation_increment"].copy()
+
+    flex = Flexure(grid, method="fft")
+    flex.update()
+    dz = grid.at_node["lithosphere_surface__elevation_increment"]
+
+    assert dz == pytest.approx(dz_expected, rel=1e-9, abs=1e-12)
+
+
+def test_fft_spectrum_is_cached():
+    grid = RasterModelGrid((9, 10), xy_spacing=1e3)
+    grid.add_zeros("lithosphere__overlying_pressure_increment", at="node")
+    grid.at_node["lithosphere__overlying_pressure_increment"][44] = 1e9
+
+    flex = Flexure(grid, method="fft")
+    flex.update()
+    spectrum = flex._get_kei_func_spectrum()
+    flex.update()
+    assert flex._get_kei_func_spectrum() is spectrum
+
+    flex.eet = 2.0 * flex.eet
+    assert flex._get_kei_func_spectrum() is not spectrum
+
+    dz = flex.subside_loads(grid.at_node["lithosphere__overlying_pressure_increment"])
+    flex = Flexure(grid, eet=flex.eet, method="flexure")
+    dz_expected = flex.subside_loads(
+        grid.at_node["lithosphere__overlying_pressure_increment"]
+    )
+    assert dz == pytest.approx(dz_expected, rel=1e-9, abs=1e-12)
@@ -1,9 +1,26 @@
 import numpy as np
 from numpy.testing import assert_array_equal
 
-from landlab.components.flow_accum import find_drainage_area_and_discharge
+from landlab import RasterModelGrid
+from landlab.components import FlowDirectorD8, FlowDirectorMFD
+from landlab.components.flow_accum import (
+    find_drainage_area_and_discharge,
+    flow_accumulation,
+    make_flow_structures_and_accumulate,
+    make_ordered_node_array,
+)
+from landlab.components.flow_accum.flow_accum_bw import (
+    _make_array_of_donors,
+    _make_delta_array,
+    _make_number_of_donors_array,
+)
 from landlab.components.flow_accum.flow_accum_to_n import (
+    _DrainageStack_to_n,
+    _make_array_of_donors_to_n,
+    _make_delta_array_to_n,
+    _make_number_of_donors_array_to_n,
     find_drainage_area_and_discharge_to_n,
+    make_ordered_node_array_to_n,
 )
 
 
@@ -49,3 +66,171 @@ def test_boundary_bw():
     a, q = find_drainage_area_and_discharge(s, r, boundary_nodes=[0])
     true_a = np.array([0.0, 2.0, 1.0, 1.0, 9.0, 4.0, 3.0, 2.0, 1.0, 1.0])
     assert_array_equal(a, true_a)
+
+
+def test_boundary_flow_accumulation():
+    r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8]) - 1
+    a, q, s = flow_accumulation(r, boundary_nodes=[0])
+    assert_array_equal(a, [0.0, 2.0, 1.0, 1.0, 9.0, 4.0, 3.0, 2.0, 1.0, 1.0])
+    assert_array_equal(q, a)
+    assert_array_equal(s, [4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+
+
+def _random_receivers(shape, seed):
+    grid = RasterModelGrid(shape)
+    grid.add_field(
+        "topographic__elevation",
+        np.random.RandomState(seed).rand(grid.number_of_nodes),
+        at="node",
+    )
+    FlowDirectorD8(grid).run_one_step()
+    return grid.at_node["flow__receiver_node"].copy()
+
+
+def test_fused_matches_separate_passes():
+    r = _random_receivers((30, 40), 1066)
+    area = np.random.RandomState(1945).rand(len(r))
+    runoff = np.random.RandomState(1815).rand(len(r)) - 0.25
+
+    delta, D, s, a, q = make_flow_structures_and_accumulate(r, area, runoff)
+
+    expected_delta = _make_delta_array(_make_number_of_donors_array(r))
+    expected_s = make_ordered_node_array(r)
+    expected_a, expected_q = find_drainage_area_and_discharge(
+        expected_s, r, area, runoff
+    )
+    assert_array_equal(delta, expected_delta)
+    assert_array_equal(D, _make_array_of_donors(r, expected_delta))
+    assert_array_equal(s, expected_s)
+    assert_array_equal(a, expected_a)
+    assert_array_equal(q, expected_q)
+
+
+def test_fused_reuses_buffers():
+    n_nodes = 12 * 9
+    out = (
+        np.empty(n_nodes + 1, dtype=int),
+        np.empty(n_nodes, dtype=int),
+        np.empty(n_nodes, dtype=int),
+        np.empty(n_nodes, dtype=float),
+        np.empty(n_nodes, dtype=float),
+    )
+    work = np.empty(n_nodes, dtype=int)
+
+    for seed in (1, 2):
+        r = _random_receivers((12, 9), seed)
+        rtn = make_flow_structures_and_accumulate(r, out=out, work=work)
+        assert all(actual is buffer for actual, buffer in zip(rtn, out))
+
+        a, q, s = flow_accumulation(r)
+        assert_array_equal(out[2], s)
+        assert_array_equal(out[3], a)
+        assert_array_equal(out[4], q)
+
+
+def _mfd_receivers(shape, seed):
+    grid = RasterModelGrid(shape)
+    grid.add_field(
+        "topographic__elevation",
+        grid.x_of_node + np.random.RandomState(seed).rand(grid.number_of_nodes),
+        at="node",
+    )
+    FlowDirectorMFD(grid, diagonals=True).run_one_step()
+    return (
+        grid.at_node["flow__receiver_node"].copy(),
+        grid.at_node["flow__receiver_proportions"].copy(),
+    )
+
+
+def test_stack_to_n_is_topological():
+    r, p = _mfd_receivers((20, 30), 1945)
+    s = make_ordered_node_array_to_n(r, p)
+
+    assert_array_equal(np.sort(s), np.arange(len(r)))
+    position = np.empty_like(s)
+    position[s] = np.arange(len(s))
+    donor, receiver = np.where(p > 0)
+    is_not_base = r[donor, receiver] != donor
+    assert np.all(
+        position[donor[is_not_base]] > position[r[donor, receiver][is_not_base]]
+    )
+
+
+def test_stack_to_n_matches_set_based_stack():
+    r, p = _mfd_receivers((20, 30), 1973)
+    delta = _make_delta_array_to_n(_make_number_of_donors_array_to_n(r, p))
+    D = _make_array_of_donors_to_n(r, p, delta)
+    num_receivers = np.sum(r >= 0, axis=1)
+    old_stack = _DrainageStack_to_n(delta, D, num_receivers)
+    old_stack.construct__stack(np.where(r[:, 0] == np.arange(len(r)))[0])
+
+    s = make_ordered_node_array_to_n(r, p)
+
+    a, q = find_drainage_area_and_discharge_to_n(s, r, p)
+    expected_a, expected_q = find_drainage_area_and_discharge_to_n(old_stack.s, r, p)
+    np.testing.assert_array_almost_equal(a, expected_a)
+    np.testing.assert_array_almost_equal(q, expected_q)
+
+    a, q = find_drainage_area_and_discharge_to_n(None, r, p)
+    np.testing.assert_array_almost_equal(a, expected_a)
+
+
+def _accumulate_reference(s, r, p, area, runoff):
+    """Accumulate in float64, one node at a time, with numpy scalars."""
+    drainage_area = np.asarray(area, dtype=np.float64).copy()
+    discharge = drainage_area * np.asarray(runoff, dtype=np.float64)
+    for donor in s[::-1]:
+        for recvr, proportion in zip(r[donor], p[donor]):
+            if proportion > 0.0 and donor != recvr:
+                drainage_area[recvr] += proportion * drainage_area[donor]
+                discharge[recvr] = max(
+                    discharge[recvr] + proportion * discharge[donor], 0.0
+                )
+    return drainage_area, discharge.clip(0.0)
+
+
+def test_bw_accumulation_is_double_precision():
+    r = _random_receivers((25, 35), 1789)
+    area = np.random.RandomState(1848).rand(len(r)) * 1e3 + np.pi
+    runoff = np.random.RandomState(1917).rand(len(r)) - 0.1
+    s = make_ordered_node_array(r)
+
+    expected_a, expected_q = _accumulate_reference(
+        s, r.reshape((-1, 1)), np.ones((len(r), 1)), area, runoff
+    )
+
+    a, q = find_drainage_area_and_discharge(s, r, area, runoff)
+    assert_array_equal(a, expected_a)
+    assert_array_equal(q, expected_q)
+
+    _, _, _, a, q = make_flow_structures_and_accumulate(r, area, runoff)
+    assert_array_equal(a, expected_a)
+    assert_array_equal(q, expected_q)
+
+
+def test_to_n_accumulation_is_double_precision():
+    r, p = _mfd_receivers((25, 35), 1789)
+    area = np.random.RandomState(1848).rand(len(r)) * 1e3 + np.pi
+    runoff = np.random.RandomState(1917).rand(len(r)) - 0.1
+    s = make_ordered_node_array_to_n(r, p)
+
+    expected_a, expected_q = _accumulate_reference(s, r, p, area, runoff)
+
+    a, q = find_drainage_area_and_discharge_to_n(s, r, p, area, runoff)
+    assert_array_equal(a, expected_a)
+    assert_array_equal(q, expected_q)
+
+
+def test_accumulate_grids_in_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    receivers = [_random_receivers((60, 80), seed) for seed in range(8)]
+    expected = [flow_accumulation(r) for r in receivers]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        actual = list(executor.map(flow_accumulation, receivers))
+
+    for (a, q, s), (expected_a, expected_q, expected_s) in zip(actual, expected):
+        assert_array_equal(a, expected_a)
+        assert_array_equal(q, expected_q)
+        assert_array_equal(s, expected_s)
@@ -7,10 +7,14 @@ Created on Tue Jun  4 16:26:31 2019
 """
 
 import numpy as np
+import pytest
 from numpy.testing import assert_almost_equal, assert_equal
 
 from landlab import HexModelGrid, RasterModelGrid
 from landlab.components import FlowAccumulator, GroundwaterDupuitPercolator
+from landlab.components.groundwater.dupuit_percolator import (
+    get_link_hydraulic_conductivity,
+)
 from landlab.grid.mappers import map_mean_of_link_nodes_to_link
 
 
@@ -304,3 +308,98 @@ def test_k_func():
 
     gdp1.run_with_adaptive_time_step_solver(0)
     assert np.equal(0.005, gdp1.K).all()
+
+
+def test_simple_water_table_implicit():
+    """Test a one-node steady simulation with the implicit solver.
+
+    Notes
+    -----
+    This test demonstrates the same simple water table as
+    test_simple_water_table, but with the run_with_implicit_solver method
+    and time steps far longer than the explicit stability limit.
+    """
+    boundaries = {"top": "closed", "left": "closed", "bottom": "closed"}
+    rg = RasterModelGrid((3, 3), bc=boundaries)
+    rg.add_zeros("aquifer_base__elevation", at="node")
+    rg.add_ones("topographic__elevation", at="node")
+    gdp = GroundwaterDupuitPercolator(
+        rg, recharge_rate=1.0e-8, hydraulic_conductivity=0.01
+    )
+    for i in range(10):
+        gdp.run_with_implicit_solver(1e7)
+
+    assert_equal(np.round(gdp._thickness[4], 5), 0.001)
+    assert gdp.number_of_iterations == 1
+
+
+def test_conservation_of_mass_implicit():
+    """Test conservation of mass in a sloping aquifer with the implicit solver.
+
+    Notes
+    ----
+    The same sloping aquifer as test_conservation_of_mass_adaptive_dt, with
+    constant recharge and seepage to the surface, run with time steps ten
+    times longer. The fluxes are those of the implicit time step, so mass is
+    conserved to within the tolerance of the solver.
+    """
+    grid = RasterModelGrid((3, 10), xy_spacing=10.0)
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    elev = grid.add_zeros("topographic__elevation", at="node")
+    grid.add_zeros("aquifer_base__elevation", at="node")
+
+    elev[:] = grid.x_of_node / 100 + 1
+    wt = grid.add_zeros("water_table__elevation", at="node")
+    wt[:] = elev
+
+    gdp = GroundwaterDupuitPercolator(
+        grid, hydraulic_conductivity=0.0005, recharge_rate=1e-7
+    )
+    fa = FlowAccumulator(grid, runoff_rate="surface_water__specific_discharge")
+
+    recharge_flux = 0
+    gw_flux = 0
+    sw_flux = 0
+    storage_0 = gdp.calc_total_storage()
+
+    dt = 1e5
+    for i in range(50):
+        gdp.run_with_implicit_solver(dt)
+        fa.run_one_step()
+
+        recharge_flux += gdp.calc_recharge_flux_in() * dt
+        gw_flux += gdp.calc_gw_flux_out() * dt
+        sw_flux += gdp.calc_sw_flux_out() * dt
+    storage = gdp.calc_total_storage()
+
+    assert_almost_equal(
+        (gw_flux + sw_flux + storage - storage_0) / recharge_flux, 1.0, decimal=6
+    )
+    assert sw_flux > 0.0
+
+
+def test_implicit_solver_not_converged():
+    """Test that the implicit solver raises if it runs out of iterations."""
+    grid = RasterModelGrid((3, 10), xy_spacing=10.0)
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    elev = grid.add_zeros("topographic__elevation", at="node")
+    grid.add_zeros("aquifer_base__elevation", at="node")
+    elev[:] = grid.x_of_node / 100 + 1
+    grid.add_field("water_table__elevation", elev.copy(), at="node")
+
+    gdp = GroundwaterDupuitPercolator(
+        grid, hydraulic_conductivity=0.0005, recharge_rate=1e-7
+    )
+    with pytest.raises(RuntimeError, match="1e-12"):
+        gdp.run_with_implicit_solver(1e5, tolerance=1e-12, max_iterations=1)
+    with pytest.raises(ValueError):
+        gdp.run_with_implicit_solver(1e5, max_iterations=0)
+
+
+def test_link_hydraulic_conductivity():
+    """Test the link conductivity of an anisotropic conductivity tensor."""
+    hmg = HexModelGrid((3, 3), spacing=10.0)
+    K = np.array([[2e-4, 1e-4], [1e-4, 3e-4]])
+
+    expected = [np.dot(np.dot(u, K), u) for u in hmg.unit_vector_at_link]
+    assert_almost_equal(get_link_hydraulic_conductivity(hmg, K), expected)
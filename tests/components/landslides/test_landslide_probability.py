@@ -256,3 +256,91 @@ def test_calculate_landslide_probability_lognormal_spatial_method():
     np.testing.assert_almost_equal(
         grid_3.at_node["landslide__probability_of_failure"][9], 0.29999999
     )
+
+
+def _make_landslide_grid(shape, seed):
+    grid = RasterModelGrid(shape, xy_spacing=10.0)
+    rng = np.random.RandomState(seed)
+    n_nodes = grid.number_of_nodes
+    grid.at_node["topographic__slope"] = rng.uniform(0.1, 1.0, n_nodes)
+    grid.at_node["topographic__specific_contributing_area"] = rng.uniform(
+        30.0, 900.0, n_nodes
+    )
+    grid.at_node["soil__transmissivity"] = rng.uniform(5.0, 20.0, n_nodes)
+    grid.add_zeros("soil__saturated_hydraulic_conductivity", at="node")
+    cohesion = rng.uniform(30.0, 900.0, n_nodes)
+    grid.at_node["soil__mode_total_cohesion"] = cohesion
+    grid.at_node["soil__minimum_total_cohesion"] = cohesion - 5.0
+    grid.at_node["soil__maximum_total_cohesion"] = cohesion + 5.0
+    grid.at_node["soil__internal_friction_angle"] = rng.uniform(26.0, 37.0, n_nodes)
+    grid.at_node["soil__thickness"] = rng.uniform(1.0, 10.0, n_nodes)
+    grid.at_node["soil__density"] = np.full(n_nodes, 2000.0)
+    return grid
+
+
+@pytest.mark.parametrize(
+    "distribution,kwds",
+    [
+        ("uniform", {}),
+        (
+            "lognormal_spatial",
+            {
+                "groundwater__recharge_mean": np.full(400, 30.0),
+                "groundwater__recharge_standard_deviation": np.full(400, 10.0),
+            },
+        ),
+    ],
+)
+def test_vectorized_matches_node_by_node(distribution, kwds):
+    outputs = (
+        "landslide__probability_of_failure",
+        "soil__mean_relative_wetness",
+        "soil__probability_of_saturation",
+    )
+
+    grid = _make_landslide_grid((20, 20), 1973)
+    LandslideProbability(
+        grid,
+        number_of_iterations=2000,
+        groundwater__recharge_distribution=distribution,
+        **kwds
+    ).calculate_landslide_probability()
+    expected = {name: grid.at_node[name].copy() for name in outputs}
+
+    LandslideProbability(
+        grid,
+        number_of_iterations=2000,
+        groundwater__recharge_distribution=distribution,
+        vectorized=True,
+        chunk_size=20000,
+        **kwds
+    ).calculate_landslide_probability()
+
+    for name in outputs:
+        assert np.all(
+            grid.at_node[name][grid.boundary_nodes]
+            == expected[name][grid.boundary_nodes]
+        )
+        assert_array_almost_equal(grid.at_node[name], expected[name], decimal=1)
+        assert grid.at_node[name][grid.core_nodes].mean() == pytest.approx(
+            expected[name][grid.core_nodes].mean(), abs=0.01
+        )
+
+
+def test_vectorized_is_reproducible():
+    grid = _make_landslide_grid((10, 10), 1945)
+
+    results = []
+    for n_procs in (1, 1, 2):
+        LandslideProbability(
+            grid,
+            number_of_iterations=100,
+            seed=5,
+            vectorized=True,
+            chunk_size=1000,
+            n_procs=n_procs,
+        ).calculate_landslide_probability()
+        results.append(grid.at_node["landslide__probability_of_failure"].copy())
+
+    assert np.all(results[0] == results[1])
+    assert np.all(results[0] == results[2])
@@ -11,6 +11,7 @@ to prevent grid changes damaging core component functionality.
 """
 
 import numpy as np
+import pytest
 from numpy.testing import assert_array_almost_equal
 
 from landlab import RasterModelGrid
@@ -245,3 +246,28 @@ def test_sniff_Perron():
         elapsed_time += dt
 
     assert_array_almost_equal(mg.at_node["topographic__elevation"], t_z)
+
+
+@pytest.mark.parametrize("solver", ["bicgstab", "gmres", "lgmres"])
+def test_iterative_solver_matches_direct(solver):
+    elevs = []
+    for name in ("direct", solver):
+        mg = RasterModelGrid((nrows, ncols), xy_spacing=(dx, dx))
+        mg.set_closed_boundaries_at_grid_edges(False, False, True, True)
+        z = mg.add_zeros("topographic__elevation", at="node")
+        diffuser = PerronNLDiffuse(
+            mg, nonlinear_diffusivity=100.0, S_crit=0.56, solver=name
+        )
+        for _ in range(3):
+            z[mg.core_nodes] += uplift * dt
+            diffuser.run_one_step(dt)
+        elevs.append(z)
+
+    assert_array_almost_equal(elevs[1], elevs[0], decimal=10)
+
+
+def test_bad_solver():
+    mg = RasterModelGrid((nrows, ncols))
+    mg.add_zeros("topographic__elevation", at="node")
+    with pytest.raises(ValueError):
+        PerronNLDiffuse(mg, solver="jacobi")
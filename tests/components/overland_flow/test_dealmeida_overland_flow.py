@@ -143,3 +143,51 @@ def test_deAlm_analytical_imposed_dt_long():
     hdeAlm = hdeAlm[1][1:]
     hdeAlm = np.append(hdeAlm, [0])
     np.testing.assert_almost_equal(h_analytical, hdeAlm, decimal=1)
+
+
+def test_deAlm_fields_updated_in_place():
+    grid = RasterModelGrid((10, 12), xy_spacing=10.0)
+    grid.add_zeros("surface_water__depth", at="node")
+    grid.add_field("topographic__elevation", 0.01 * grid.x_of_node, at="node")
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    q = grid.add_zeros("surface_water__discharge", at="link")
+    h = grid.at_node["surface_water__depth"]
+    deAlm = OverlandFlow(grid, rainfall_intensity=1e-4)
+
+    deAlm.run_one_step(100.0)
+
+    assert grid.at_link["surface_water__discharge"] is q
+    assert grid.at_node["surface_water__depth"] is h
+    assert np.all(q[grid.horizontal_links] <= 0.0)
+    assert np.any(q[grid.horizontal_links] < 0.0)
+
+
+def test_deAlm_mannings_n_at_links():
+    elevs = []
+    for mannings_n in (0.02, "mannings_n"):
+        grid = RasterModelGrid((10, 12), xy_spacing=10.0)
+        grid.add_zeros("surface_water__depth", at="node")
+        grid.add_field("topographic__elevation", 0.01 * grid.x_of_node, at="node")
+        grid.add_full("mannings_n", 0.02, at="link")
+        deAlm = OverlandFlow(grid, mannings_n=mannings_n, rainfall_intensity=1e-4)
+        deAlm.run_one_step(100.0)
+        elevs.append(grid.at_node["surface_water__depth"])
+
+    np.testing.assert_array_equal(elevs[0], elevs[1])
+
+
+def test_deAlm_boundary_conditions_changed():
+    grid = RasterModelGrid((10, 12), xy_spacing=10.0)
+    grid.add_zeros("surface_water__depth", at="node")
+    grid.add_field("topographic__elevation", 0.01 * grid.x_of_node, at="node")
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    h = grid.at_node["surface_water__depth"]
+    deAlm = OverlandFlow(grid, rainfall_intensity=1e-4)
+    deAlm.run_one_step(100.0)
+
+    closed_nodes = grid.nodes[1:-1, 5]
+    grid.status_at_node[closed_nodes] = grid.BC_NODE_IS_CLOSED
+    h_before = h.copy()
+    deAlm.run_one_step(100.0)
+
+    np.testing.assert_array_equal(h[closed_nodes], h_before[closed_nodes])
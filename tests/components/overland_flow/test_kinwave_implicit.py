@@ -9,9 +9,14 @@ Created on Sat Apr  1 10:49:33 2017
 """
 
 import numpy as np
+import pytest
 
 from landlab import RasterModelGrid
 from landlab.components import KinwaveImplicitOverlandFlow
+from landlab.components.overland_flow.cfuncs import sweep_kinwave_implicit
+from landlab.components.overland_flow.generate_overland_flow_implicit_kinwave import (
+    water_fn,
+)
 
 
 def test_initialization():
@@ -137,8 +142,74 @@ def test_curved_surface():
         )
 
 
+def test_depth_solves_water_fn():
+    """Test that new depths are roots of the water-depth equation."""
+    rg = RasterModelGrid((12, 15), xy_spacing=(2, 2))
+    rg.add_field(
+        "topographic__elevation",
+        0.05 * rg.y_of_node + 0.3 * np.sin(rg.x_of_node / 7.0),
+        at="node",
+    )
+    kw = KinwaveImplicitOverlandFlow(rg, runoff_rate=50.0, depth_exp=5.0 / 3.0)
+    kw.run_one_step(5.0)
+
+    old_depth = kw.depth.copy()
+    kw.run_one_step(5.0)
+
+    cores = rg.core_nodes
+    inflow = 5.0 * kw.runoff_rate + 5.0 * kw._disch_in[cores] / 4.0
+    residual = water_fn(
+        kw.depth[cores], kw._alpha[cores], 1.0, old_depth[cores], 5.0 / 3.0, inflow
+    )
+    np.testing.assert_allclose(residual, 0.0, atol=1e-12)
+    assert np.all(kw.depth[cores] > old_depth[cores])
+
+
+def test_depth_not_converged():
+    """Test that an unsolvable water-depth equation raises an error."""
+    rg = RasterModelGrid((4, 5))
+    rg.add_field("topographic__elevation", 0.1 * rg.x_of_node, at="node")
+    kw = KinwaveImplicitOverlandFlow(rg, runoff_rate=1.0, weight=0.1)
+    kw.depth[:] = 1.0
+
+    with pytest.raises(RuntimeError, match="did not converge"):
+        kw.run_one_step(1.0)
+
+
+@pytest.mark.parametrize("max_iter,converged", [(50, True), (1, False)])
+def test_sweep_reports_unconverged_node(max_iter, converged):
+    """Test that the sweep returns the node that ran out of iterations."""
+    rg = RasterModelGrid((4, 5))
+    rg.add_field("topographic__elevation", 0.1 * rg.x_of_node, at="node")
+    kw = KinwaveImplicitOverlandFlow(rg, runoff_rate=50.0)
+    kw.run_one_step(5.0)
+
+    failed = sweep_kinwave_implicit(
+        kw._nodes_ordered,
+        rg.status_at_node,
+        rg.adjacent_nodes_at_node,
+        kw._flow_accum.flow_director._proportions,
+        rg.cell_area_at_node,
+        kw._alpha,
+        kw._grad_width_sum,
+        kw.depth.copy(),
+        np.zeros(rg.number_of_nodes),
+        5.0,
+        50.0,
+        kw._vel_coef,
+        5.0 / 3.0,
+        1.0,
+        max_iter=max_iter,
+    )
+    if converged:
+        assert failed == -1
+    else:
+        assert failed in rg.core_nodes
+
+
 if __name__ == "__main__":
     test_initialization()
     test_first_iteration()
     test_steady_basic_ramp()
     test_curved_surface()
+    test_depth_solves_water_fn()
@@ -3,7 +3,10 @@ Unit tests for landlab.components.plant_competition_ca.plant_competition_ca
 """
 import numpy as np
 import pytest
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.components import VegCA
 
 (_SHAPE, _SPACING, _ORIGIN) = ((20, 20), (10e0, 10e0), (0.0, 0.0))
 _ARGS = (_SHAPE, _SPACING, _ORIGIN)
@@ -71,3 +74,48 @@ def test_field_initialized_to_zero(ca_veg):
     for name in ca_veg.grid["node"]:
         field = ca_veg.grid["node"][name]
         assert_array_almost_equal(field, np.zeros(ca_veg.grid.number_of_nodes))
+
+
+def _run_veg_ca(seed, n_steps=10):
+    grid = RasterModelGrid((12, 10))
+    grid.add_field(
+        "vegetation__plant_functional_type",
+        np.arange(grid.number_of_cells) % 6,
+        at="cell",
+    )
+    water_stress = grid.add_zeros("vegetation__cumulative_water_stress", at="cell")
+    water_stress[:] = np.linspace(0.0, 1.0, grid.number_of_cells)
+    ca_veg = VegCA(grid, seed=seed)
+    for _ in range(n_steps):
+        ca_veg.update()
+    return (
+        grid.at_cell["vegetation__plant_functional_type"].copy(),
+        grid.at_cell["plant__age"].copy(),
+    )
+
+
+def test_seed_is_reproducible():
+    veg_type, age = _run_veg_ca(seed=1945)
+    assert_array_equal(_run_veg_ca(seed=1945)[0], veg_type)
+    assert_array_equal(_run_veg_ca(seed=1945)[1], age)
+    assert not np.all(_run_veg_ca(seed=1973)[0] == veg_type)
+
+
+def test_seed_matches_global_random_state():
+    np.random.seed(1945)
+    veg_type, age = _run_veg_ca(seed=None)
+    assert_array_equal(_run_veg_ca(seed=1945)[0], veg_type)
+    assert_array_equal(_run_veg_ca(seed=1945)[1], age)
+
+
+def test_looped_neighbors_wrap_across_edges():
+    grid = RasterModelGrid((6, 7))
+    first_ring = grid.looped_neighbors_at_cell
+    second_ring = grid.second_ring_looped_neighbors_at_cell
+
+    assert first_ring.shape == (grid.number_of_cells, 8)
+    assert second_ring.shape == (grid.number_of_cells, 16)
+    assert_array_equal(first_ring[0], [1, 6, 5, 9, 4, 19, 15, 16])
+    assert_array_equal(
+        second_ring[0], [2, 7, 12, 11, 10, 14, 13, 8, 3, 18, 13, 14, 10, 11, 12, 17]
+    )
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.components import SinkFillerBarnes
+from landlab.components.sink_fill import fill_sinks_tiled
+
+
+def _fill_with_sink_filler_barnes(z, method="D8", nodata=None):
+    grid = RasterModelGrid(z.shape)
+    grid.add_field("topographic__elevation", z.flatten(), at="node")
+    if nodata is not None:
+        grid.status_at_node[(z == nodata).flatten()] = grid.BC_NODE_IS_CLOSED
+    SinkFillerBarnes(grid, method=method, fill_flat=True).run_one_step()
+    return grid.at_node["topographic__elevation"].reshape(z.shape)
+
+
+@pytest.mark.parametrize("method", ["D8", "Steepest"])
+@pytest.mark.parametrize("tile_shape", [(1, 1), (3, 4), (7, 5), (50, 50)])
+def test_matches_sink_filler_barnes(method, tile_shape):
+    z = np.random.RandomState(1945).randint(0, 10, size=(23, 17)).astype(float)
+
+    assert_array_equal(
+        fill_sinks_tiled(z, tile_shape=tile_shape, method=method),
+        _fill_with_sink_filler_barnes(z, method=method),
+    )
+
+
+@pytest.mark.parametrize("method", ["D8", "Steepest"])
+def test_nodata(method):
+    z = np.random.RandomState(1973).randint(0, 10, size=(20, 18)).astype(float)
+    z[np.random.RandomState(2001).rand(*z.shape) < 0.15] = -9999.0
+
+    filled = fill_sinks_tiled(z, tile_shape=(6, 4), method=method, nodata=-9999.0)
+
+    assert_array_equal(filled[z == -9999.0], -9999.0)
+    assert_array_equal(
+        filled, _fill_with_sink_filler_barnes(z, method=method, nodata=-9999.0)
+    )
+
+
+def test_nan_is_nodata():
+    z = np.random.RandomState(1973).randint(0, 10, size=(12, 12)).astype(float)
+    z[3:9, 6] = np.nan
+
+    filled = fill_sinks_tiled(z, tile_shape=(5, 5))
+
+    assert np.all(np.isnan(filled[3:9, 6]))
+    z[3:9, 6] = -9999.0
+    filled[3:9, 6] = -9999.0
+    assert_array_equal(filled, _fill_with_sink_filler_barnes(z, nodata=-9999.0))
+
+
+def test_memmap_in_place(tmpdir):
+    z = np.random.RandomState(1066).randint(0, 10, size=(31, 29)).astype(float)
+    expected = _fill_with_sink_filler_barnes(z)
+
+    with tmpdir.as_cwd():
+        elevation = np.memmap("dem.dat", dtype=float, mode="w+", shape=z.shape)
+        elevation[:] = z
+        elevation.flush()
+        del elevation
+
+        elevation = np.memmap("dem.dat", dtype=float, mode="r+", shape=z.shape)
+        out = fill_sinks_tiled(
+            elevation, out=elevation, tile_shape=(8, 8), scratch_dir=str(tmpdir)
+        )
+        assert out is elevation
+        elevation.flush()
+        del elevation, out
+
+        assert_array_equal(
+            np.memmap("dem.dat", dtype=float, mode="r", shape=z.shape), expected
+        )
+        assert sorted(p.basename for p in tmpdir.listdir()) == ["dem.dat"]
+
+
+def test_process_pool():
+    z = np.random.RandomState(1815).randint(0, 10, size=(40, 30)).astype(float)
+
+    assert_array_equal(
+        fill_sinks_tiled(z, tile_shape=(9, 7), n_workers=2),
+        _fill_with_sink_filler_barnes(z),
+    )
+
+
+def test_bad_method():
+    with pytest.raises(ValueError):
+        fill_sinks_tiled(np.zeros((4, 4)), method="D4")
+
+
+def test_bad_shapes():
+    with pytest.raises(ValueError):
+        fill_sinks_tiled(np.zeros(16))
+    with pytest.raises(ValueError):
+        fill_sinks_tiled(np.zeros((4, 4)), out=np.zeros((4, 5)))
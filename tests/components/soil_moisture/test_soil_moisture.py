@@ -6,6 +6,9 @@ import numpy as np
 import pytest
 from numpy.testing import assert_array_almost_equal
 
+from landlab import RasterModelGrid
+from landlab.components.soil_moisture import SoilMoisture
+
 (_SHAPE, _SPACING, _ORIGIN) = ((20, 20), (10e0, 10e0), (0.0, 0.0))
 _ARGS = (_SHAPE, _SPACING, _ORIGIN)
 
@@ -92,3 +95,102 @@ def test_field_initialized_to_zero(sm):
     for name in sm.grid["cell"]:
         field = sm.grid["cell"][name]
         assert_array_almost_equal(field, np.zeros(sm.grid.number_of_cells))
+
+
+@pytest.mark.parametrize(
+    "Tb,expected",
+    [
+        (
+            2.0,
+            {
+                "soil_moisture__saturation_fraction": [
+                    0.8759683,
+                    0.49879845,
+                    0.25590713,
+                    0.11991405,
+                    0.57564618,
+                    0.5992372,
+                ],
+                "soil_moisture__root_zone_leakage": [
+                    15.68168644,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.03190366,
+                    0.10765696,
+                ],
+                "surface__evapotranspiration": [
+                    0.31840278,
+                    0.25833333,
+                    0.09791667,
+                    0.00554361,
+                    0.10416667,
+                    0.31875,
+                ],
+                "surface__runoff": [6.9, 0.0, 0.0, 0.0, 0.0, 0.0],
+                "vegetation__water_stress": [0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            },
+        ),
+        (
+            48.0,
+            {
+                "soil_moisture__saturation_fraction": [
+                    0.63881816,
+                    0.47116279,
+                    0.25187835,
+                    0.11803606,
+                    0.56266704,
+                    0.58286811,
+                ],
+                "soil_moisture__root_zone_leakage": [
+                    38.95079118,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.42658623,
+                    1.92672532,
+                ],
+                "surface__evapotranspiration": [
+                    7.64166667,
+                    6.2,
+                    2.35,
+                    0.12667411,
+                    2.5,
+                    7.65,
+                ],
+                "surface__runoff": [6.9, 0.0, 0.0, 0.0, 0.0, 0.0],
+                "vegetation__water_stress": [0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            },
+        ),
+    ],
+)
+def test_update_each_vegetation_type(Tb, expected):
+    grid = RasterModelGrid((4, 5))
+    grid.add_field(
+        "vegetation__plant_functional_type", np.array([0, 1, 2, 3, 4, 5]), at="cell"
+    )
+    grid.add_field(
+        "vegetation__cover_fraction", [0.2, 0.5, 0.8, 0.0, 0.4, 0.6], at="cell"
+    )
+    grid.add_field(
+        "vegetation__live_leaf_area_index", [1.0, 0.5, 3.0, 0.0, 1.5, 2.0], at="cell"
+    )
+    grid.add_field(
+        "surface__potential_evapotranspiration_rate",
+        [5.0, 4.0, 3.0, 6.0, 2.0, 4.5],
+        at="cell",
+    )
+    grid.add_field(
+        "soil_moisture__initial_saturation_fraction",
+        [0.9, 0.5, 0.25, 0.12, 0.3, 0.6],
+        at="cell",
+    )
+    grid.add_field("rainfall__daily_depth", [20.0, 0.0, 5.0, 0.0, 60.0, 0.0], at="cell")
+
+    sm = SoilMoisture(grid)
+    sm.Tb = Tb
+    sm.Tr = 24.0
+    sm.update()
+
+    for name, values in expected.items():
+        assert_array_almost_equal(grid.at_cell[name], values)
@@ -6,6 +6,9 @@ import numpy as np
 import pytest
 from numpy.testing import assert_array_almost_equal
 
+from landlab import RasterModelGrid
+from landlab.components.vegetation_dynamics.vegetation_dynamics import Vegetation
+
 (_SHAPE, _SPACING, _ORIGIN) = ((20, 20), (10e0, 10e0), (0.0, 0.0))
 _ARGS = (_SHAPE, _SPACING, _ORIGIN)
 
@@ -90,3 +93,54 @@ def test_field_initialized_to_zero(veg):
     for name in veg.grid["cell"]:
         field = veg.grid["cell"][name]
         assert_array_almost_equal(field, np.zeros(veg.grid.number_of_cells))
+
+
+def test_update_each_vegetation_type():
+    grid = RasterModelGrid((4, 5))
+    grid.add_field(
+        "vegetation__plant_functional_type", np.array([0, 0, 1, 2, 3, 4]), at="cell"
+    )
+    grid.add_field(
+        "surface__evapotranspiration", [3.0, 1.0, 2.0, 4.0, 0.5, 1.5], at="cell"
+    )
+    grid.add_field(
+        "vegetation__water_stress", [0.1, 0.8, 0.3, 0.0, 1.0, 0.5], at="cell"
+    )
+    grid.add_field(
+        "surface__potential_evapotranspiration_rate",
+        [5.0, 2.0, 4.0, 3.0, 6.0, 1.0],
+        at="cell",
+    )
+    grid.add_field(
+        "surface__potential_evapotranspiration_30day_mean",
+        [5.0, 2.0, 4.0, 3.0, 6.0, 1.0],
+        at="cell",
+    )
+
+    veg = Vegetation(grid)
+    veg.Tb = 6.0
+    veg.Tr = 30.0
+    veg.PETthreshold_switch = 1
+    for _ in range(2):
+        veg.update()
+
+    assert_array_almost_equal(
+        grid.at_cell["vegetation__live_biomass"],
+        [98.12519958, 100.78331471, 103.89661562, 118.94882008, 0.0, 101.61997017],
+    )
+    assert_array_almost_equal(
+        grid.at_cell["vegetation__dead_biomass"],
+        [449.13203613, 451.2158947, 448.93471933, 449.23789969, 0.0, 449.80923397],
+    )
+    assert_array_almost_equal(
+        grid.at_cell["vegetation__live_leaf_area_index"],
+        [0.46569372, 0.4751069, 0.41370644, 0.45895578, 0.0, 0.40685571],
+    )
+    assert_array_almost_equal(
+        grid.at_cell["vegetation__dead_leaf_area_index"],
+        [1.53430628, 1.5248931, 1.58629356, 3.54104422, 0.0, 1.59314429],
+    )
+    assert_array_almost_equal(
+        grid.at_cell["vegetation__cover_fraction"],
+        [0.77686984, 0.77686984, 1.0, 1.0, 1.0, 1.0],
+    )
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import ComponentEnsemble, RasterModelGrid
+from landlab.components import FastscapeEroder, FlowAccumulator, LinearDiffuser
+
+PARAMS = [(0.001, 0.5, 1.0), (0.002, 0.4, 1.0), (0.001, 0.5, 1.5)]
+
+
+def _make_grid(seed=42):
+    grid = RasterModelGrid((6, 8), xy_spacing=10.0)
+    grid.add_field(
+        "topographic__elevation",
+        grid.x_of_node * 0.1 + np.random.RandomState(seed).rand(grid.number_of_nodes),
+        at="node",
+    )
+    return grid
+
+
+def _run_alone(k, m, n, n_steps=5):
+    grid = _make_grid()
+    fa = FlowAccumulator(grid)
+    sp = FastscapeEroder(grid, K_sp=k, m_sp=m, n_sp=n)
+    for _ in range(n_steps):
+        fa.run_one_step()
+        sp.run_one_step(100.0)
+    return grid.at_node["topographic__elevation"]
+
+
+def _make_ensemble(n_workers=1):
+    k, m, n = zip(*PARAMS)
+    ensemble = ComponentEnsemble(_make_grid(), len(PARAMS), n_workers=n_workers)
+    ensemble.add_field("topographic__elevation")
+    ensemble.add_component(FlowAccumulator)
+    ensemble.add_component(
+        FastscapeEroder, member_kwds={"K_sp": k, "m_sp": m, "n_sp": n}
+    )
+    return ensemble
+
+
+def test_matches_separate_runs():
+    ensemble = _make_ensemble()
+    for _ in range(5):
+        ensemble.run_one_step(100.0)
+
+    z = ensemble.at_node["topographic__elevation"]
+    assert z.shape == (len(PARAMS), ensemble.grid.number_of_nodes)
+    for member, (k, m, n) in enumerate(PARAMS):
+        assert_array_almost_equal(z[member], _run_alone(k, m, n))
+
+
+@pytest.mark.slow
+def test_process_pool_matches_serial():
+    serial = _make_ensemble()
+    pooled = _make_ensemble(n_workers=2)
+    try:
+        for _ in range(5):
+            serial.run_one_step(100.0)
+            pooled.run_one_step(100.0)
+    finally:
+        pooled.close()
+
+    assert_array_equal(
+        pooled.at_node["topographic__elevation"],
+        serial.at_node["topographic__elevation"],
+    )
+
+
+def _make_diffusion_ensemble(n_workers=1):
+    grid = _make_grid()
+    grid.add_ones("kd", at="node")
+    values = grid.at_node["topographic__elevation"] * [[1.0], [2.0], [3.0]]
+
+    ensemble = ComponentEnsemble(grid, 3, n_workers=n_workers)
+    ensemble.add_field("topographic__elevation", values)
+    ensemble.add_component(LinearDiffuser, linear_diffusivity="kd")
+    return ensemble
+
+
+@pytest.mark.slow
+def test_process_pool_sees_shared_fields():
+    serial = _make_diffusion_ensemble()
+    with _make_diffusion_ensemble(n_workers=2) as pooled:
+        for kd in (1.0, 5.0, 0.0):
+            for ensemble in (serial, pooled):
+                ensemble.grid.at_node["kd"].fill(kd)
+                ensemble.run_one_step(1.0)
+    assert pooled._executor is None
+
+    assert_array_equal(
+        pooled.at_node["topographic__elevation"],
+        serial.at_node["topographic__elevation"],
+    )
+
+
+def test_per_member_initial_values():
+    grid = RasterModelGrid((3, 5))
+    values = np.arange(3 * grid.number_of_nodes, dtype=float).reshape((3, -1))
+
+    ensemble = ComponentEnsemble(grid, 3)
+    z = ensemble.add_field("topographic__elevation", values)
+    ensemble.add_component(
+        LinearDiffuser, member_kwds={"linear_diffusivity": [0.0] * 3}
+    )
+    ensemble.run_one_step(1.0)
+
+    assert_array_equal(z, values)
+    assert_array_equal(grid.at_node["topographic__elevation"], values[-1])
+
+
+def test_bad_shapes():
+    grid = RasterModelGrid((3, 5))
+    ensemble = ComponentEnsemble(grid, 3)
+
+    with pytest.raises(ValueError):
+        ensemble.add_field("topographic__elevation")
+    with pytest.raises(ValueError):
+        ensemble.add_field("topographic__elevation", np.zeros((2, 15)))
+
+    ensemble.add_field("topographic__elevation", 0.0)
+    with pytest.raises(ValueError):
+        ensemble.add_component(
+            LinearDiffuser, member_kwds={"linear_diffusivity": [1.0]}
+        )
+
+    with pytest.raises(ValueError):
+        ComponentEnsemble(grid, 0)
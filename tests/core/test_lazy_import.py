@@ -0,0 +1,125 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import landlab
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(landlab.__file__)))
+
+_SCRIPT = """
+import builtins, json, sys
+
+_import = builtins.__import__
+_imported_by_landlab = set()
+
+
+def _record_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level == 0 and (globals or {{}}).get("__name__", "").startswith("landlab"):
+        _imported_by_landlab.add(name.split(".")[0])
+    return _import(name, globals, locals, fromlist, level)
+
+
+builtins.__import__ = _record_import
+{statement}
+print(json.dumps([sorted(sys.modules), sorted(_imported_by_landlab)]))
+"""
+
+
+def _run_and_list_imports(statement):
+    """Run *statement* and list the modules that were imported.
+
+    Returns the names of all modules that have been imported and the names
+    of the packages that landlab modules import themselves.
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", _SCRIPT.format(statement=statement)], cwd=_ROOT
+    )
+    modules, imported_by_landlab = json.loads(output.decode().splitlines()[-1])
+    return set(modules), set(imported_by_landlab)
+
+
+def _modules_imported_by(statement):
+    """Names of the modules that have been imported after running *statement*."""
+    return _run_and_list_imports(statement)[0]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "matplotlib",
+        "xarray",
+        "scipy",
+        "landlab.components",
+        "landlab.field",
+        "landlab.graph",
+        "landlab.grid",
+        "landlab.plot",
+    ],
+)
+def test_import_landlab_is_lazy(module):
+    assert module not in _modules_imported_by("import landlab")
+
+
+def test_import_grid_does_not_import_plot():
+    modules, imported_by_landlab = _run_and_list_imports(
+        "from landlab import RasterModelGrid"
+    )
+    assert "landlab.grid" in modules
+    assert "landlab.plot" not in modules
+    assert "matplotlib" not in imported_by_landlab
+    assert "landlab.components" not in modules
+
+
+def test_import_components_is_lazy():
+    modules, imported_by_landlab = _run_and_list_imports(
+        "from landlab.components import LinearDiffuser; LinearDiffuser"
+    )
+    assert "landlab.components.diffusion" in modules
+    assert "landlab.components.flow_accum" not in modules
+    assert "landlab.components.overland_flow" not in modules
+    assert "matplotlib" not in imported_by_landlab
+
+
+def test_import_plot_imports_matplotlib():
+    modules, imported_by_landlab = _run_and_list_imports("import landlab.plot")
+    assert "matplotlib" in imported_by_landlab
+
+
+def test_lazy_attributes():
+    import landlab
+    from landlab.grid import RasterModelGrid
+    from landlab.plot import imshow_grid
+
+    assert landlab.RasterModelGrid is RasterModelGrid
+    assert landlab.imshow_grid is imshow_grid
+    assert set(landlab.__all__) <= set(dir(landlab))
+
+    with pytest.raises(AttributeError):
+        landlab.NotAGrid
+
+
+def test_lazy_subpackages():
+    import landlab
+
+    assert landlab.plot.imshow_grid is landlab.imshow_grid
+    assert landlab.io.read_esri_ascii is not None
+
+
+def test_lazy_components():
+    import landlab.components
+    from landlab.components.flow_accum import FlowAccumulator
+
+    assert landlab.components.FlowAccumulator is FlowAccumulator
+    assert landlab.components.flow_accum.FlowAccumulator is FlowAccumulator
+    assert set(landlab.components.__all__) <= set(dir(landlab.components))
+    assert [cls.__name__ for cls in landlab.components.COMPONENTS] == list(
+        landlab.components.__all__
+    )
+
+    with pytest.raises(AttributeError):
+        landlab.components.NotAComponent
+    with pytest.raises(AttributeError):
+        landlab.components.not_a_module
@@ -129,3 +129,69 @@ def test_ffill_grid_element_and_id(dr_2dim):
     assert dr_2dim.dataset["element_id"].values[0, 0] == (
         dr_2dim.dataset["element_id"].values[0, 1]
     )
+
+
+def test_add_many_records(dr_2dim):
+    for time in range(1, 100):
+        dr_2dim.add_record(
+            time=[float(time)],
+            item_id=[0, 1],
+            new_record={
+                "mean_elevation": (["time"], [110.0 + time]),
+                "item_size": (["item_id", "time"], np.full((2, 1), float(time))),
+            },
+        )
+        if time % 10 == 0:
+            dr_2dim.add_item(
+                time=[float(time)],
+                new_item={
+                    "grid_element": np.array([["node"]]),
+                    "element_id": np.array([[4]]),
+                },
+            )
+
+    assert dr_2dim.number_of_timesteps == 100
+    assert dr_2dim.number_of_items == 11
+    assert dr_2dim.time_coordinates == list(np.arange(100.0))
+    assert np.all(dr_2dim.dataset["mean_elevation"] == np.arange(100.0) + 110.0)
+    np.testing.assert_array_equal(
+        dr_2dim.dataset["item_size"].values[:2, 1:], [np.arange(1.0, 100.0)] * 2
+    )
+    assert np.all(np.isnan(dr_2dim.dataset["item_size"].values[2:]))
+    assert dr_2dim.dataset["element_id"].values[10, 90] == 4.0
+    assert np.isnan(dr_2dim.dataset["element_id"].values[10, 91])
+
+
+def test_add_record_between_times(dr_2dim):
+    dr_2dim.add_record(time=[20.0], new_record={"mean_elevation": (["time"], [130.0])})
+    dr_2dim.add_record(time=[10.0], new_record={"mean_elevation": (["time"], [120.0])})
+    dr_2dim.add_record(time=[30.0], new_record={"mean_elevation": (["time"], [140.0])})
+    assert dr_2dim.time_coordinates == [0.0, 10.0, 20.0, 30.0]
+    np.testing.assert_array_equal(
+        dr_2dim.dataset["mean_elevation"], [110.0, 120.0, 130.0, 140.0]
+    )
+
+
+def test_changes_to_dataset_are_kept(dr_2dim):
+    dr_2dim.dataset["item_size"][1, 0] = 0.5
+    dr_2dim.dataset["color"] = (["item_id"], np.array(["red", "blue"]))
+    dr_2dim.add_record(time=[10.0])
+
+    assert dr_2dim.dataset["item_size"].values[1, 0] == 0.5
+    assert list(dr_2dim.dataset["color"].values) == ["red", "blue"]
+    assert "color" in dr_2dim.variable_names
+
+
+def test_records_are_appended_in_place(dr_2dim):
+    sizes = []
+    for time in (10.0, 20.0, 30.0):
+        dr_2dim.add_record(
+            time=[time],
+            item_id=[0, 1],
+            new_record={"item_size": (["item_id", "time"], np.full((2, 1), time))},
+        )
+        sizes.append(dr_2dim.dataset["item_size"].values)
+
+    assert np.shares_memory(sizes[1], sizes[2])
+    np.testing.assert_array_equal(sizes[1], [[0.3, 10.0, 20.0], [0.4, 10.0, 20.0]])
+    assert np.all(np.isnan(dr_2dim.dataset["mean_elevation"].values[1:]))
@@ -109,3 +109,54 @@ def test_nodes_at_patch_ccw():
     )
 
     assert_array_equal(graph.nodes_at_patch, [[4, 3, 0, 1], [5, 4, 1, 2]])
+
+
+def test_ds_is_created_lazily():
+    graph = Graph((NODE_Y, NODE_X), links=NODES_AT_LINK, patches=LINKS_AT_PATCH)
+
+    assert "_ds" not in graph.__dict__
+    assert "ds" not in graph.cached_nbytes()
+
+    ds = graph.ds
+    assert graph.ds is ds
+    assert ds.dims["node"] == 6
+    assert ds.dims["link"] == 7
+    assert ds.dims["patch"] == 2
+    assert_array_equal(ds["nodes_at_link"].values, graph.nodes_at_link)
+    assert_array_equal(ds["links_at_patch"].values, graph.links_at_patch)
+    assert "ds" in graph.cached_nbytes()
+
+
+def test_cached_nbytes():
+    graph = Graph((NODE_Y, NODE_X), links=NODES_AT_LINK, patches=LINKS_AT_PATCH)
+    assert graph.cached_nbytes() == {}
+
+    graph.patches_at_node
+    nbytes = graph.cached_nbytes()
+    assert nbytes["patches_at_node"] == graph.patches_at_node.nbytes
+    assert nbytes["nodes_at_patch"] == graph.nodes_at_patch.nbytes
+    assert "links_at_node" not in nbytes
+
+
+def test_clear_cache():
+    graph = Graph((NODE_Y, NODE_X), links=NODES_AT_LINK, patches=LINKS_AT_PATCH)
+    links_at_node = graph.links_at_node.copy()
+    link_dirs_at_node = graph.link_dirs_at_node.copy()
+    graph.length_of_link
+
+    graph.clear_cache("links_at_node")
+    assert "links_at_node" not in graph.cached_nbytes()
+    assert "link_dirs_at_node" in graph.cached_nbytes()
+    assert_array_equal(graph.links_at_node, links_at_node)
+    assert not graph.links_at_node.flags.writeable
+
+    graph.clear_cache()
+    assert graph.cached_nbytes() == {}
+    assert_array_equal(graph.link_dirs_at_node, link_dirs_at_node)
+    assert not graph.links_at_node.flags.writeable
+
+
+def test_clear_cache_with_bad_name():
+    graph = Graph((NODE_Y, NODE_X), links=NODES_AT_LINK)
+    with pytest.raises(ValueError):
+        graph.clear_cache("x_of_node")
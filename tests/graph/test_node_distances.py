@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import HexModelGrid, NetworkModelGrid, RasterModelGrid, VoronoiDelaunayGrid
+from landlab.graph.node_distances import NodeDistances
+
+
+def _brute_force_distances(grid):
+    dx = grid.x_of_node[None, :] - grid.x_of_node[:, None]
+    dy = grid.y_of_node[None, :] - grid.y_of_node[:, None]
+    azimuths = np.arctan2(dx, dy)
+    azimuths[azimuths < 0.0] += 2.0 * np.pi
+    return np.hypot(dx, dy), azimuths
+
+
+def _make_grids():
+    rs = np.random.RandomState(1945)
+    return [
+        RasterModelGrid((6, 7), xy_spacing=(1.5, 2.0)),
+        HexModelGrid((5, 5)),
+        VoronoiDelaunayGrid(10.0 * rs.rand(50), 10.0 * rs.rand(50)),
+    ]
+
+
+@pytest.mark.parametrize("grid", _make_grids())
+@pytest.mark.parametrize("max_cache_bytes", (0, 2 ** 20))
+def test_between_matches_brute_force(grid, max_cache_bytes):
+    expected_distances, expected_azimuths = _brute_force_distances(grid)
+    distances = NodeDistances(grid, max_cache_bytes=max_cache_bytes, block_size=8)
+
+    nodes, other = [11, 3, 12, 20, 3], [0, 17, 5, 5]
+    actual_distances, actual_azimuths = distances.between(nodes, other, get_az=True)
+
+    assert_array_almost_equal(actual_distances, expected_distances[nodes][:, other])
+    assert_array_almost_equal(actual_azimuths, expected_azimuths[nodes][:, other])
+    assert_array_almost_equal(distances.between(), expected_distances)
+
+
+def test_all_node_maps():
+    grid = RasterModelGrid((4, 5), xy_spacing=(1.0, 2.0))
+    expected_distances, expected_azimuths = _brute_force_distances(grid)
+
+    assert_array_almost_equal(grid.all_node_distances_map, expected_distances)
+    assert_array_almost_equal(grid.all_node_azimuths_map, expected_azimuths)
+
+
+def test_scalar_node():
+    grid = RasterModelGrid((3, 4))
+    assert grid.node_distances.between(5).shape == (grid.number_of_nodes,)
+    assert grid.node_distances.between(5, [1, 2]).shape == (2,)
+    assert grid.node_distances.between([5], [1, 2]).shape == (1, 2)
+
+
+def test_cache_is_bounded():
+    grid = RasterModelGrid((10, 10))
+    block_nbytes = 2 * 10 * grid.number_of_nodes * 8
+    distances = NodeDistances(grid, max_cache_bytes=2 * block_nbytes, block_size=10)
+
+    distances.between([5, 15, 25])
+    assert distances.nbytes == 2 * block_nbytes
+
+    distances.between(45)
+    assert distances.nbytes == 2 * block_nbytes
+    assert sorted(distances._blocks) == [2, 4]
+
+    distances.clear_cache()
+    assert distances.nbytes == 0
+
+
+def test_cache_not_used_if_block_is_too_big():
+    grid = RasterModelGrid((10, 10))
+    distances = NodeDistances(grid, max_cache_bytes=1024, block_size=10)
+    distances.between([5, 15, 25])
+    assert distances.nbytes == 0
+
+
+def test_cache_dropped_when_coordinates_change():
+    grid = RasterModelGrid((3, 4))
+    distances = NodeDistances(grid, max_cache_bytes=2 ** 20)
+    assert distances.between(0, 5) == pytest.approx(np.sqrt(2.0))
+
+    with grid.thawed():
+        grid.x_of_node[5] += 1.0
+    assert distances.between(0, 5) == pytest.approx(np.sqrt(5.0))
+
+
+def test_node_distances_is_cached():
+    grid = RasterModelGrid((3, 4))
+    assert grid.node_distances is grid.node_distances
+    assert grid.node_distances.max_cache_bytes == 0
+
+
+@pytest.mark.parametrize("grid", _make_grids())
+def test_within_matches_brute_force(grid):
+    expected_distances, expected_azimuths = _brute_force_distances(grid)
+    nodes = [0, 7, 13, 7]
+    radius = 3.1
+
+    neighbors, distances, azimuths, offset = grid.node_distances.within(
+        nodes, radius, get_az=True
+    )
+
+    assert len(offset) == len(nodes) + 1
+    for i, node in enumerate(nodes):
+        expected = np.nonzero(expected_distances[node] <= radius)[0]
+        expected = expected[np.lexsort((expected, expected_distances[node, expected]))]
+        actual = slice(offset[i], offset[i + 1])
+
+        assert_array_equal(neighbors[actual], expected)
+        assert_array_almost_equal(distances[actual], expected_distances[node, expected])
+        assert_array_almost_equal(azimuths[actual], expected_azimuths[node, expected])
+
+
+@pytest.mark.parametrize("grid", _make_grids())
+def test_nearest_matches_brute_force(grid):
+    expected_distances, expected_azimuths = _brute_force_distances(grid)
+    nodes = [0, 7, 13]
+
+    neighbors, distances, azimuths = grid.node_distances.nearest(nodes, 5, get_az=True)
+
+    assert neighbors.shape == (len(nodes), 5)
+    assert_array_equal(neighbors[:, 0], nodes)
+    for i, node in enumerate(nodes):
+        assert_array_almost_equal(distances[i], np.sort(expected_distances[node])[:5])
+        assert_array_almost_equal(distances[i], expected_distances[node, neighbors[i]])
+        assert_array_almost_equal(azimuths[i], expected_azimuths[node, neighbors[i]])
+
+
+@pytest.mark.parametrize("k", (0, 13))
+def test_nearest_with_bad_k(k):
+    grid = RasterModelGrid((3, 4))
+    with pytest.raises(ValueError):
+        grid.node_distances.nearest([0], k)
+
+
+def test_network_grid():
+    grid = NetworkModelGrid(((0.0, 1.0, 2.0, 2.0), (0.0, 1.0, 1.0, 3.0)), [(0, 1)])
+    neighbors, distances, offset = grid.node_distances.within([0, 2], 1.5)
+    assert_array_equal(neighbors, [0, 1, 2, 1])
+    assert_array_equal(offset, [0, 2, 4])
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import (
+    HexModelGrid,
+    NetworkModelGrid,
+    RadialModelGrid,
+    RasterModelGrid,
+    VoronoiDelaunayGrid,
+)
+from landlab.graph.spatial_index import (
+    SpatialIndex,
+    TriSpatialIndex,
+    UniformRectilinearSpatialIndex,
+    _is_inside_convex_polygon,
+)
+
+
+def _random_points_around(grid, n_points=2000, seed=1945):
+    rs = np.random.RandomState(seed)
+    x = rs.uniform(grid.x_of_node.min() - 1.0, grid.x_of_node.max() + 1.0, n_points)
+    y = rs.uniform(grid.y_of_node.min() - 1.0, grid.y_of_node.max() + 1.0, n_points)
+    return x, y
+
+
+def _brute_force_locate(grid, x, y):
+    """Distances to every node and containment in every patch."""
+    distance = np.hypot(
+        grid.x_of_node[None, :] - x[:, None], grid.y_of_node[None, :] - y[:, None]
+    )
+    nodes_at_patch = np.where(
+        grid.nodes_at_patch == -1, grid.nodes_at_patch[:, :1], grid.nodes_at_patch
+    )
+    xy_of_vertex = grid.xy_of_node[nodes_at_patch]
+    is_inside = np.vstack(
+        [
+            _is_inside_convex_polygon(
+                np.full(grid.number_of_patches, x_i),
+                np.full(grid.number_of_patches, y_i),
+                xy_of_vertex,
+            )
+            for x_i, y_i in zip(x, y)
+        ]
+    )
+    return distance, is_inside
+
+
+def _make_grids():
+    grids = [
+        RasterModelGrid((5, 7), xy_spacing=(2.0, 1.5), xy_of_lower_left=(3.0, -2.0))
+    ]
+    for node_layout in ("hex", "rect"):
+        for orientation in ("horizontal", "vertical"):
+            for shape in ((5, 4), (4, 6)):
+                grids.append(
+                    HexModelGrid(
+                        shape,
+                        spacing=1.7,
+                        node_layout=node_layout,
+                        orientation=orientation,
+                        xy_of_lower_left=(-3.3, 1.1),
+                    )
+                )
+    rs = np.random.RandomState(1973)
+    grids.append(VoronoiDelaunayGrid(10.0 * rs.rand(60), 5.0 * rs.rand(60)))
+    grids.append(RadialModelGrid(3))
+    return grids
+
+
+@pytest.mark.parametrize("grid", _make_grids())
+@pytest.mark.parametrize("structured", (True, False))
+def test_locate_matches_brute_force(grid, structured):
+    x, y = _random_points_around(grid)
+    index = grid.spatial_index if structured else SpatialIndex(grid)
+    distance, is_inside = _brute_force_locate(grid, x, y)
+
+    nodes, cells, patches = index.locate(x, y)
+
+    assert_array_almost_equal(distance[np.arange(len(x)), nodes], distance.min(axis=1))
+    assert_array_equal(cells, grid.cell_at_node[nodes])
+    assert_array_equal(patches >= 0, is_inside.any(axis=1))
+    assert np.all(is_inside[patches >= 0, patches[patches >= 0]])
+
+
+@pytest.mark.parametrize(
+    "grid,index_type",
+    [
+        (RasterModelGrid((3, 4)), UniformRectilinearSpatialIndex),
+        (HexModelGrid((3, 4)), TriSpatialIndex),
+        (
+            VoronoiDelaunayGrid([0.0, 1.0, 0.0, 1.0, 0.4], [0.0, 0.0, 1.0, 1.0, 0.6]),
+            SpatialIndex,
+        ),
+    ],
+)
+def test_index_type(grid, index_type):
+    assert type(grid.spatial_index) is index_type
+
+
+def test_index_is_cached():
+    grid = RasterModelGrid((3, 4))
+    assert grid.spatial_index is grid.spatial_index
+
+
+def test_index_is_dropped_when_coordinates_change():
+    grid = RasterModelGrid((3, 4))
+    assert grid.find_nearest_node((2.2, 0.9)) == 6
+
+    grid.xy_of_lower_left = (1.0, 0.0)
+    assert grid.spatial_index.find_nearest_node(2.2, 0.9) == 5
+
+    grid = HexModelGrid((3, 3))
+    assert grid.find_nearest_node((0.9, 0.6)) == 4
+
+    grid.xy_of_lower_left = (1.0, 0.0)
+    assert grid.find_nearest_node((0.9, 0.6)) == 3
+
+
+def test_index_is_not_cached_while_thawed():
+    grid = VoronoiDelaunayGrid([0.0, 1.0, 0.0, 1.0, 0.4], [0.0, 0.0, 1.0, 1.0, 0.6])
+    with grid.thawed():
+        assert grid.spatial_index is not grid.spatial_index
+    assert grid.spatial_index is grid.spatial_index
+
+
+def test_network_grid():
+    grid = NetworkModelGrid(((0.0, 1.0, 2.0, 2.0), (0.0, 1.0, 1.0, 3.0)), [(0, 1)])
+    nodes, cells, patches = grid.spatial_index.locate([0.1, 2.9], [0.2, 2.2])
+    assert_array_equal(nodes, [0, 3])
+    assert_array_equal(cells, [-1, -1])
+    assert_array_equal(patches, [-1, -1])
+
+
+def test_shape_of_ids():
+    grid = HexModelGrid((4, 4))
+    x, y = np.meshgrid([1.0, 2.0, 3.0], [0.5, 1.5])
+
+    assert grid.spatial_index.find_nearest_node(x, y).shape == (2, 3)
+    assert grid.spatial_index.find_patch(x, y).shape == (2, 3)
+    assert grid.spatial_index.find_patch(x, 1.5).shape == (2, 3)
+    assert np.ndim(grid.spatial_index.find_cell(1.0, 1.0)) == 0
@@ -0,0 +1,173 @@
+import os
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import HexModelGrid, RasterModelGrid
+from landlab.io.netcdf import NetcdfWriter, read_netcdf
+
+try:
+    import netCDF4 as nc
+except ImportError:
+    pass
+
+
+@pytest.mark.parametrize("threaded", [False, True])
+def test_append_time_slices(tmpdir, threaded):
+    grid = RasterModelGrid((4, 3))
+    z = grid.add_field("topographic__elevation", np.ones(12, dtype=np.int64), at="node")
+
+    with tmpdir.as_cwd():
+        with NetcdfWriter("test.nc", grid, threaded=threaded) as nc_file:
+            nc_file.write(0.0)
+            z *= 2
+            nc_file.write(1.0)
+        assert nc_file.closed
+        assert nc_file.number_of_records == 2
+
+        root = nc.Dataset("test.nc", "r")
+        assert "nt" in root.dimensions
+        assert root.dimensions["nt"].isunlimited()
+        assert len(root.dimensions["nt"]) == 2
+        assert_array_equal(root.variables["t"][:], [0.0, 1.0])
+        assert_array_equal(
+            root.variables["topographic__elevation"][:],
+            [
+                [[1, 1, 1], [1, 1, 1], [1, 1, 1], [1, 1, 1]],
+                [[2, 2, 2], [2, 2, 2], [2, 2, 2], [2, 2, 2]],
+            ],
+        )
+        assert root.variables["topographic__elevation"][:].dtype == "int64"
+        root.close()
+
+
+def test_default_time_is_record_number(tmpdir):
+    grid = RasterModelGrid((4, 3))
+    grid.add_zeros("topographic__elevation", at="node")
+
+    with tmpdir.as_cwd():
+        with NetcdfWriter("test.nc", grid) as nc_file:
+            for _ in range(3):
+                nc_file.write()
+
+        root = nc.Dataset("test.nc", "r")
+        assert_array_equal(root.variables["t"][:], [0.0, 1.0, 2.0])
+        root.close()
+
+
+def test_cell_fields(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros("topographic__elevation", at="node")
+    temp = grid.add_field("air__temperature", np.arange(6.0), at="cell")
+
+    with tmpdir.as_cwd():
+        with NetcdfWriter(
+            "test.nc", grid, at_cell="air__temperature", threaded=True
+        ) as nc_file:
+            nc_file.write(0.0)
+            temp += 10.0
+            nc_file.write(1.0)
+
+        root = nc.Dataset("test.nc", "r")
+        assert "topographic__elevation" not in root.variables
+        assert root.variables["air__temperature"].dimensions == (
+            "nt",
+            "nj_cell",
+            "ni_cell",
+        )
+        assert_array_equal(
+            root.variables["air__temperature"][:],
+            [
+                [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]],
+                [[10.0, 11.0, 12.0], [13.0, 14.0, 15.0]],
+            ],
+        )
+        root.close()
+
+
+def test_chunking_and_compression(tmpdir):
+    grid = RasterModelGrid((10, 8))
+    grid.add_zeros("topographic__elevation", at="node")
+
+    with tmpdir.as_cwd():
+        with NetcdfWriter(
+            "test.nc", grid, chunksizes=(5, 100), zlib=True, complevel=6
+        ) as nc_file:
+            nc_file.write(0.0)
+
+        root = nc.Dataset("test.nc", "r")
+        var = root.variables["topographic__elevation"]
+        assert var.chunking() == [1, 5, 8]
+        assert var.filters()["zlib"]
+        assert var.filters()["complevel"] == 6
+        root.close()
+
+
+def test_read_back(tmpdir):
+    grid = RasterModelGrid((4, 3), xy_spacing=2.0)
+    grid.add_field("topographic__elevation", np.arange(12.0), at="node")
+
+    with tmpdir.as_cwd():
+        with NetcdfWriter("test.nc", grid) as nc_file:
+            nc_file.write(0.0)
+
+        new_grid = read_netcdf("test.nc")
+        assert new_grid.shape == grid.shape
+        assert_array_equal(new_grid.x_of_node, grid.x_of_node)
+        assert_array_equal(new_grid.y_of_node, grid.y_of_node)
+        assert_array_equal(new_grid.at_node["topographic__elevation"], np.arange(12.0))
+
+
+def test_write_after_close(tmpdir):
+    grid = RasterModelGrid((4, 3))
+    grid.add_zeros("topographic__elevation", at="node")
+
+    with tmpdir.as_cwd():
+        nc_file = NetcdfWriter("test.nc", grid)
+        nc_file.close()
+        nc_file.close()
+        with pytest.raises(ValueError):
+            nc_file.write(0.0)
+
+
+def test_missing_field(tmpdir):
+    grid = RasterModelGrid((4, 3))
+
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError):
+            NetcdfWriter("test.nc", grid, at_node="topographic__elevation")
+
+
+def test_same_name_at_node_and_cell(tmpdir):
+    grid = RasterModelGrid((4, 3))
+    grid.add_zeros("air__temperature", at="node")
+    grid.add_zeros("air__temperature", at="cell")
+
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError, match="air__temperature"):
+            NetcdfWriter(
+                "test.nc",
+                grid,
+                at_node="air__temperature",
+                at_cell="air__temperature",
+            )
+        assert not os.path.exists("test.nc")
+
+
+def test_not_raster(tmpdir):
+    grid = HexModelGrid((3, 3))
+    grid.add_zeros("topographic__elevation", at="node")
+
+    with tmpdir.as_cwd():
+        with pytest.raises(NotImplementedError):
+            NetcdfWriter("test.nc", grid)
+
+
+def test_bad_format(tmpdir):
+    grid = RasterModelGrid((4, 3))
+    grid.add_zeros("topographic__elevation", at="node")
+
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError):
+            NetcdfWriter("test.nc", grid, format="NETCDF3_64BIT")
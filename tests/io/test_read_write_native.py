@@ -2,11 +2,13 @@
 import os
 import pickle
 
+import numpy as np
+import pytest
 from numpy.testing import assert_array_equal
 
-from landlab import HexModelGrid, RasterModelGrid
+from landlab import HexModelGrid, NetworkModelGrid, RasterModelGrid, VoronoiDelaunayGrid
 from landlab.components import FlowAccumulator
-from landlab.io.native_landlab import load_grid, save_grid
+from landlab.io.native_landlab import NativeGridFormatError, load_grid, save_grid
 
 
 def compare_dictionaries(dict_1, dict_2, dict_1_name, dict_2_name, path=""):
@@ -158,3 +160,130 @@ def test_save_and_load_hex(tmpdir):
         assert_array_equal(mg1.status_at_node, mg2.status_at_node)
         for name in mg1.at_node:
             assert_array_equal(mg1.at_node[name], mg2.at_node[name])
+
+
+def test_save_and_load_fields(tmpdir):
+    with tmpdir.as_cwd():
+        mg1 = RasterModelGrid((4, 5), xy_spacing=(2.0, 3.0), xy_of_lower_left=(1, 2))
+        mg1.add_field("topographic__elevation", mg1.x_of_node, at="node", units="m")
+        mg1.add_ones("air__temperature", at="cell", dtype=np.int32)
+        mg1.add_zeros("water__flux", at="link")
+        mg1.set_closed_boundaries_at_grid_edges(True, False, True, False)
+
+        save_grid(mg1, "testsavedgrid.grid")
+        mg2 = load_grid("testsavedgrid.grid")
+
+        assert isinstance(mg2, RasterModelGrid)
+        assert mg2.shape == mg1.shape
+        assert (mg2.dx, mg2.dy) == (2.0, 3.0)
+        assert mg2.xy_of_lower_left == (1.0, 2.0)
+        assert_array_equal(mg2.status_at_node, mg1.status_at_node)
+        assert_array_equal(mg2.at_node["topographic__elevation"], mg1.x_of_node)
+        assert mg2.field_units("node", "topographic__elevation") == "m"
+        assert mg2.at_cell["air__temperature"].dtype == np.int32
+        assert_array_equal(mg2.at_cell["air__temperature"], 1)
+        assert_array_equal(mg2.at_link["water__flux"], 0.0)
+
+
+def test_load_with_mmap(tmpdir):
+    with tmpdir.as_cwd():
+        mg1 = RasterModelGrid((4, 5))
+        mg1.add_field("topographic__elevation", np.arange(20.0), at="node")
+        save_grid(mg1, "testsavedgrid.grid")
+
+        mg2 = load_grid("testsavedgrid.grid", mmap=True)
+        z = mg2.at_node["topographic__elevation"]
+        assert not z.flags.writeable
+        assert_array_equal(z, np.arange(20.0))
+
+        with open("testsavedgrid.grid", "r+b") as f:
+            contents = f.read()
+            f.seek(contents.index(np.arange(20.0).tobytes()))
+            f.write(np.full(20, 7.0).tobytes())
+
+        assert_array_equal(z, 7.0)
+
+
+def test_save_and_load_voronoi(tmpdir):
+    x = np.array([0.0, 1.0, 2.0, 0.5, 1.5, 0.0, 1.0, 2.0])
+    y = np.array([0.0, 0.1, 0.0, 1.0, 1.1, 2.0, 2.1, 2.0])
+    with tmpdir.as_cwd():
+        mg1 = VoronoiDelaunayGrid(x, y)
+        mg1.add_field("topographic__elevation", mg1.y_of_node, at="node")
+        save_grid(mg1, "testsavedgrid.grid")
+        mg2 = load_grid("testsavedgrid.grid")
+
+        assert isinstance(mg2, VoronoiDelaunayGrid)
+        assert_array_equal(mg2.x_of_node, mg1.x_of_node)
+        assert_array_equal(mg2.y_of_node, mg1.y_of_node)
+        assert_array_equal(mg2.nodes_at_link, mg1.nodes_at_link)
+        assert_array_equal(mg2.at_node["topographic__elevation"], mg1.y_of_node)
+
+
+def test_save_and_load_network(tmpdir):
+    with tmpdir.as_cwd():
+        mg1 = NetworkModelGrid(
+            ((0.0, 1.0, 2.0, 2.0), (0.0, 0.0, -1.0, 1.0)),
+            ((1, 0), (2, 1), (3, 1)),
+            xy_of_reference=(10.0, 20.0),
+        )
+        mg1.add_field("channel__width", [1.0, 2.0, 3.0], at="link", units="m")
+        mg1.status_at_node[0] = mg1.BC_NODE_IS_FIXED_VALUE
+        save_grid(mg1, "testsavedgrid.grid")
+        mg2 = load_grid("testsavedgrid.grid")
+
+        assert isinstance(mg2, NetworkModelGrid)
+        assert_array_equal(mg2.x_of_node, mg1.x_of_node)
+        assert_array_equal(mg2.y_of_node, mg1.y_of_node)
+        assert_array_equal(mg2.nodes_at_link, mg1.nodes_at_link)
+        assert_array_equal(mg2.status_at_node, mg1.status_at_node)
+        assert mg2.xy_of_reference == (10.0, 20.0)
+        assert_array_equal(mg2.at_link["channel__width"], [1.0, 2.0, 3.0])
+        assert mg2.field_units("link", "channel__width") == "m"
+
+
+@pytest.mark.parametrize("layers", ("event_layers", "material_layers"))
+def test_save_with_layers(tmpdir, layers):
+    grid = RasterModelGrid((4, 5))
+    getattr(grid, layers).add(1.0)
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError, match=layers):
+            save_grid(grid, "testsavedgrid.grid")
+        assert not os.path.exists("testsavedgrid.grid")
+
+
+def test_save_with_object_field(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    with tmpdir.as_cwd():
+        save_grid(grid, "testsavedgrid.grid")
+        with open("testsavedgrid.grid", "rb") as f:
+            contents = f.read()
+
+        grid.add_field("rock_type", np.full(20, None), at="node")
+        with pytest.raises(ValueError, match="rock_type"):
+            save_grid(grid, "testsavedgrid.grid", clobber=True)
+        with open("testsavedgrid.grid", "rb") as f:
+            assert f.read() == contents
+
+
+def test_load_pickled_grid(tmpdir):
+    with tmpdir.as_cwd():
+        mg1 = RasterModelGrid((4, 5), xy_spacing=2.0)
+        mg1.add_field("topographic__elevation", np.arange(20.0), at="node")
+        with open("testsavedgrid.grid", "wb") as f:
+            pickle.dump(mg1, f)
+
+        mg2 = load_grid("testsavedgrid.grid")
+        assert mg2.shape == mg1.shape
+        assert_array_equal(mg2.at_node["topographic__elevation"], np.arange(20.0))
+
+
+def test_load_newer_version(tmpdir):
+    with tmpdir.as_cwd():
+        save_grid(RasterModelGrid((4, 5)), "testsavedgrid.grid")
+        with open("testsavedgrid.grid", "r+b") as f:
+            f.seek(8)
+            f.write(b"\xff\x00")
+
+        with pytest.raises(NativeGridFormatError):
+            load_grid("testsavedgrid.grid")